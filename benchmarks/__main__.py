@@ -0,0 +1,5 @@
+"""Permite ejecutar los benchmarks con ``python -m benchmarks``."""
+
+from .ejecutar_benchmarks import main
+
+main()
@@ -0,0 +1,303 @@
+"""Suite de benchmarks por etapas de GraphQLStore CLI."""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+from source.cli.generators.generator_db_schema import GeneratorDBSchema
+from source.cli.generators.migration.migration_factory import (
+    MigrationGeneratorFactory,
+)
+from source.cli.graphql.configuracion_y_constantes import DatabaseType
+from source.cli.graphql.parser import ParserGraphQLEsquema
+from source.cli.graphql.procesar_relaciones import ProcesarRelaciones
+
+from .esquema_sintetico import generar_esquema_sintetico
+
+TAMANOS_POR_DEFECTO = [100, 1_000, 10_000, 50_000]
+
+DIRECTORIO_RESULTADOS = Path(__file__).parent / "resultados"
+
+# incrementar si cambia el formato del JSON de resultados
+VERSION_FORMATO_RESULTADOS = 1
+
+MOTORES = {
+    "mysql": DatabaseType.MYSQL,
+    "postgresql": DatabaseType.POSTGRESQL,
+}
+
+
+def medir(funcion: Callable[[], object], repeticiones: int) -> Dict:
+    """
+    Mide el tiempo de ejecucion de una funcion.
+
+    :param funcion: Funcion sin argumentos a medir.
+    :param repeticiones: Numero de veces que se ejecuta la funcion.
+    :return: Diccionario con el tiempo minimo, la mediana y las \
+        muestras en segundos.
+    """
+    muestras = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        muestras.append(time.perf_counter() - inicio)
+
+    return {
+        "minimo": min(muestras),
+        "mediana": statistics.median(muestras),
+        "muestras": muestras,
+    }
+
+
+def ejecutar_benchmark(num_tipos: int, repeticiones: int = 3) -> Dict:
+    """
+    Ejecuta todas las etapas del benchmark para un tamaño de esquema.
+
+    Cada etapa recibe como entrada el resultado de la etapa anterior \
+        calculado fuera de la medicion, de modo que los tiempos son \
+        independientes entre si.
+
+    :param num_tipos: Numero de tipos del esquema sintetico.
+    :param repeticiones: Numero de repeticiones de cada etapa.
+    :return: Diccionario etapa -> tiempos.
+    """
+    esquema = generar_esquema_sintetico(num_tipos)
+    esquema_nuevo = generar_esquema_sintetico(num_tipos, evolucionado=True)
+    etapas = {}
+
+    parser = ParserGraphQLEsquema()
+    etapas["parse_esquema"] = medir(
+        lambda: parser.parse_esquema(esquema),
+        repeticiones,
+    )
+    info = parser.parse_esquema(esquema)
+
+    def procesar_relaciones():
+        return ProcesarRelaciones(
+            tablas=info.tablas,
+            scalar_types=ParserGraphQLEsquema.get_type_mapping(),
+            enum_types=info.enums,
+        ).procesar_relaciones()
+
+    etapas["procesar_relaciones"] = medir(procesar_relaciones, repeticiones)
+    relaciones = procesar_relaciones()
+
+    for nombre_motor, motor in MOTORES.items():
+        etapas[f"generate_schema_{nombre_motor}"] = medir(
+            lambda motor=motor: GeneratorDBSchema(motor).generate_schema(
+                tables=info.tablas,
+                enums=info.enums,
+                relationships=relaciones,
+                print_output=False,
+                print_sql=False,
+            ),
+            repeticiones,
+        )
+
+    for nombre_motor, motor in MOTORES.items():
+        generador = MigrationGeneratorFactory.create_generator(motor)
+        generador.print_output = False
+        generador.print_sql = False
+
+        etapas[f"diff_schemas_{nombre_motor}"] = medir(
+            lambda generador=generador: generador.diff_schemas(
+                esquema,
+                esquema_nuevo,
+            ),
+            repeticiones,
+        )
+        diferencias = generador.diff_schemas(esquema, esquema_nuevo)
+
+        etapas[f"generate_sql_migration_{nombre_motor}"] = medir(
+            lambda generador=generador: generador.generate_sql_migration(
+                diferencias,
+            ),
+            repeticiones,
+        )
+
+    return etapas
+
+
+def ejecutar_suite(
+    tamanos: List[int],
+    repeticiones: int = 3,
+    consola: Optional[Console] = None,
+) -> Dict:
+    """
+    Ejecuta el benchmark para cada tamaño de esquema.
+
+    :param tamanos: Numeros de tipos de los esquemas a medir.
+    :param repeticiones: Numero de repeticiones de cada etapa.
+    :param consola: Consola donde mostrar el progreso.
+    :return: Resultados con los metadatos del entorno.
+    """
+    resultados = {
+        "version_formato": VERSION_FORMATO_RESULTADOS,
+        "version_graphqlstore": _version_graphqlstore(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "fecha": datetime.datetime.now().isoformat(),
+        "repeticiones": repeticiones,
+        "tamanos": {},
+    }
+
+    for num_tipos in tamanos:
+        if consola:
+            consola.print(f"⏱️  Midiendo esquema de {num_tipos} tipos...")
+        resultados["tamanos"][str(num_tipos)] = ejecutar_benchmark(
+            num_tipos,
+            repeticiones,
+        )
+
+    return resultados
+
+
+def guardar_resultados(resultados: Dict, ruta: Path) -> None:
+    """Guardar los resultados del benchmark en un archivo JSON."""
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2)
+
+
+def cargar_resultados(ruta: Path) -> Dict:
+    """Cargar los resultados de un benchmark desde un archivo JSON."""
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def comparar_resultados(
+    anteriores: Dict,
+    actuales: Dict,
+) -> List[Tuple[str, str, float, float, float]]:
+    """
+    Compara las medianas de dos ejecuciones del benchmark.
+
+    Solo se comparan los tamaños y etapas presentes en ambas ejecuciones.
+
+    :param anteriores: Resultados de referencia.
+    :param actuales: Resultados nuevos.
+    :return: Lista de (tamaño, etapa, anterior, actual, ratio), donde \
+        un ratio mayor que 1 indica una regresion.
+    """
+    comparacion = []
+    for tamano, etapas in actuales["tamanos"].items():
+        etapas_anteriores = anteriores["tamanos"].get(tamano, {})
+        for etapa, tiempos in etapas.items():
+            if etapa not in etapas_anteriores:
+                continue
+            anterior = etapas_anteriores[etapa]["mediana"]
+            actual = tiempos["mediana"]
+            ratio = actual / anterior if anterior else float("inf")
+            comparacion.append((tamano, etapa, anterior, actual, ratio))
+
+    return comparacion
+
+
+def mostrar_resultados(
+    resultados: Dict,
+    consola: Console,
+    anteriores: Optional[Dict] = None,
+) -> None:
+    """Mostrar los resultados (y la comparacion si existe) en una tabla."""
+    tabla = Table(title="Benchmark GraphQLStore")
+    tabla.add_column("Tipos", justify="right")
+    tabla.add_column("Etapa")
+    tabla.add_column("Mediana (s)", justify="right")
+    tabla.add_column("Minimo (s)", justify="right")
+
+    ratios = {}
+    if anteriores:
+        tabla.add_column("Ratio", justify="right")
+        ratios = {
+            (tamano, etapa): ratio
+            for tamano, etapa, _, _, ratio in comparar_resultados(
+                anteriores,
+                resultados,
+            )
+        }
+
+    for tamano, etapas in resultados["tamanos"].items():
+        for etapa, tiempos in etapas.items():
+            fila = [
+                tamano,
+                etapa,
+                f"{tiempos['mediana']:.4f}",
+                f"{tiempos['minimo']:.4f}",
+            ]
+            if anteriores:
+                ratio = ratios.get((tamano, etapa))
+                fila.append("-" if ratio is None else f"{ratio:.2f}x")
+            tabla.add_row(*fila)
+
+    consola.print(tabla)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    """Punto de entrada de la suite de benchmarks."""
+    parser = argparse.ArgumentParser(
+        description="Benchmarks por etapas de GraphQLStore CLI",
+    )
+    parser.add_argument(
+        "--tamanos",
+        "-t",
+        type=int,
+        nargs="+",
+        default=TAMANOS_POR_DEFECTO,
+        help="Numero de tipos de los esquemas sinteticos",
+    )
+    parser.add_argument(
+        "--repeticiones",
+        "-r",
+        type=int,
+        default=3,
+        help="Repeticiones de cada etapa",
+    )
+    parser.add_argument(
+        "--salida",
+        "-s",
+        default=None,
+        help="Archivo JSON donde guardar los resultados (por defecto "
+        "benchmarks/resultados/<version>.json)",
+    )
+    parser.add_argument(
+        "--comparar",
+        "-c",
+        default=None,
+        help="Archivo JSON de resultados previos con el que comparar",
+    )
+    args = parser.parse_args(argv)
+
+    consola = Console()
+    resultados = ejecutar_suite(args.tamanos, args.repeticiones, consola)
+
+    salida = args.salida
+    if salida is None:
+        version = resultados["version_graphqlstore"]
+        salida = DIRECTORIO_RESULTADOS / f"{version}.json"
+    guardar_resultados(resultados, Path(salida))
+
+    anteriores = None
+    if args.comparar:
+        anteriores = cargar_resultados(Path(args.comparar))
+    mostrar_resultados(resultados, consola, anteriores)
+    consola.print(f"💾 Resultados guardados en {salida}")
+
+    return resultados
+
+
+def _version_graphqlstore() -> str:
+    """Obtener la version instalada de graphqlstore."""
+    try:
+        return metadata.version("graphqlstore")
+    except metadata.PackageNotFoundError:
+        return "desconocida"
@@ -0,0 +1,115 @@
+"""Generador de esquemas GraphQL sinteticos para los benchmarks."""
+
+from typing import List
+
+# numero de valores de cada enum sintetico
+VALORES_POR_ENUM = 4
+
+# cada cuantos tipos se genera un enum distinto
+TIPOS_POR_ENUM = 10
+
+# cada cuantos tipos se añade un campo en el esquema evolucionado
+TIPOS_POR_CAMPO_NUEVO = 10
+
+# relacion 1:N añadida en el esquema evolucionado
+RELACION_NUEVA = '@relation(name: "RelacionNueva")'
+
+
+def nombre_tipo(indice: int) -> str:
+    """Obtener el nombre del tipo sintetico con el indice dado."""
+    return f"T{indice}"
+
+
+def generar_esquema_sintetico(
+    num_tipos: int,
+    evolucionado: bool = False,
+) -> str:
+    """
+    Genera un esquema GraphQL sintetico y determinista.
+
+    Los tipos se agrupan de cuatro en cuatro (A, B, C, D) y cada grupo \
+        contiene una relacion 1:1 (A-B), una 1:N (A-C) y una N:M (C-D). \
+        Todos los tipos tienen campos con @unique, @default y un enum.
+
+    :param num_tipos: Numero de tipos del esquema.
+    :param evolucionado: Si es True se genera una version modificada del \
+        esquema (campos nuevos, un valor de enum nuevo y un tipo nuevo \
+        relacionado) para medir las migraciones.
+    :return: Texto del esquema GraphQL.
+    """
+    num_enums = max(1, num_tipos // TIPOS_POR_ENUM)
+    campos_relacion: List[List[str]] = [[] for _ in range(num_tipos)]
+
+    for grupo in range(num_tipos // 4):
+        a, b, c, d = range(4 * grupo, 4 * grupo + 4)
+        # 1:1
+        campos_relacion[a].append(
+            f"perfil: {nombre_tipo(b)} "
+            f'@relation(name: "Uno{grupo}", onDelete: CASCADE)'
+        )
+        campos_relacion[b].append(
+            f'duenio: {nombre_tipo(a)} @relation(name: "Uno{grupo}")'
+        )
+        # 1:N
+        campos_relacion[a].append(
+            f"elementos: [{nombre_tipo(c)}] "
+            f'@relation(name: "Muchos{grupo}", onDelete: CASCADE)'
+        )
+        campos_relacion[c].append(
+            f'padre: {nombre_tipo(a)} @relation(name: "Muchos{grupo}")'
+        )
+        # N:M
+        campos_relacion[c].append(
+            f"etiquetas: [{nombre_tipo(d)}] "
+            f'@relation(name: "Tabla{grupo}", link: TABLE)'
+        )
+        campos_relacion[d].append(
+            f"etiquetados: [{nombre_tipo(c)}] "
+            f'@relation(name: "Tabla{grupo}", link: TABLE)'
+        )
+
+    if evolucionado and num_tipos:
+        campos_relacion[0].append(
+            f"nuevos: [TNuevo] {RELACION_NUEVA}",
+        )
+
+    bloques = []
+    for indice in range(num_tipos):
+        campos = [
+            "id: ID! @id",
+            "nombre: String! @unique",
+            f'estado: Estado{indice % num_enums} @default(value: "V0")',
+            "cantidad: Int @default(value: 0)",
+            "creadoEn: DateTime @createdAt",
+        ]
+        if evolucionado and indice % TIPOS_POR_CAMPO_NUEVO == 0:
+            campos.append("nota: String")
+        campos.extend(campos_relacion[indice])
+        bloques.append(_bloque("type", nombre_tipo(indice), campos))
+
+    if evolucionado and num_tipos:
+        bloques.append(
+            _bloque(
+                "type",
+                "TNuevo",
+                [
+                    "id: ID! @id",
+                    f"origen: {nombre_tipo(0)} {RELACION_NUEVA}",
+                ],
+            )
+        )
+
+    for indice in range(num_enums):
+        num_valores = VALORES_POR_ENUM
+        if evolucionado and indice == 0:
+            num_valores += 1
+        valores = [f"V{valor}" for valor in range(num_valores)]
+        bloques.append(_bloque("enum", f"Estado{indice}", valores))
+
+    return "\n\n".join(bloques) + "\n"
+
+
+def _bloque(palabra_clave: str, nombre: str, lineas: List[str]) -> str:
+    """Formatear la definicion de un tipo o enum GraphQL."""
+    cuerpo = "\n".join(f"  {linea}" for linea in lineas)
+    return f"{palabra_clave} {nombre} {{\n{cuerpo}\n}}"
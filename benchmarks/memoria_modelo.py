@@ -0,0 +1,103 @@
+"""Benchmark de memoria del modelo de esquema con tracemalloc."""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rich.console import Console
+
+from source.cli.graphql.parser import ParserGraphQLEsquema
+from source.cli.graphql.procesar_relaciones import ProcesarRelaciones
+
+from .esquema_sintetico import generar_esquema_sintetico
+
+TIPOS_POR_DEFECTO = 10_000
+
+DIRECTORIO_RESULTADOS = Path(__file__).parent / "resultados"
+
+
+def medir_memoria(num_tipos: int = TIPOS_POR_DEFECTO) -> Dict:
+    """
+    Mide la memoria retenida por el modelo de un esquema sintetico.
+
+    Solo se cuentan los objetos que siguen vivos despues de parsear y \
+        procesar las relaciones (el AST de graphql-core ya liberado no \
+        cuenta), ademas del pico durante el proceso.
+
+    :param num_tipos: Numero de tipos del esquema sintetico.
+    :return: Bytes retenidos por el modelo parseado, por las \
+        relaciones y pico de memoria.
+    """
+    esquema = generar_esquema_sintetico(num_tipos)
+    parser = ParserGraphQLEsquema()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        inicio, _ = tracemalloc.get_traced_memory()
+
+        info = parser.parse_esquema(esquema)
+        gc.collect()
+        tras_parseo, _ = tracemalloc.get_traced_memory()
+
+        relaciones = ProcesarRelaciones(
+            tablas=info.tablas,
+            scalar_types=ParserGraphQLEsquema.get_type_mapping(),
+            enum_types=info.enums,
+        ).procesar_relaciones()
+        gc.collect()
+        tras_relaciones, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    num_campos = sum(len(tabla.campos) for tabla in info.tablas.values())
+    return {
+        "tipos": num_tipos,
+        "campos": num_campos,
+        "relaciones": len(relaciones),
+        "bytes_modelo": tras_parseo - inicio,
+        "bytes_relaciones": tras_relaciones - tras_parseo,
+        "bytes_por_campo": (tras_parseo - inicio) / max(num_campos, 1),
+        "bytes_pico": pico - inicio,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    """Punto de entrada del benchmark de memoria."""
+    parser = argparse.ArgumentParser(
+        description="Memoria del modelo de esquema de GraphQLStore",
+    )
+    parser.add_argument(
+        "--tipos",
+        "-t",
+        type=int,
+        default=TIPOS_POR_DEFECTO,
+        help="Numero de tipos del esquema sintetico",
+    )
+    parser.add_argument(
+        "--salida",
+        "-s",
+        default=str(DIRECTORIO_RESULTADOS / "memoria.json"),
+        help="Archivo JSON donde guardar los resultados",
+    )
+    args = parser.parse_args(argv)
+
+    resultados = medir_memoria(args.tipos)
+    ruta = Path(args.salida)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2)
+
+    consola = Console()
+    for clave, valor in resultados.items():
+        consola.print(f"{clave}: {valor:,.0f}")
+    consola.print(f"💾 Resultados guardados en {ruta}")
+
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark del tiempo de arranque de la CLI con ``python -X importtime``."""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+# comandos cortos que se ejecutan desde los scripts de despliegue
+COMANDOS_POR_DEFECTO = [
+    ["--help"],
+    ["conexion", "--help"],
+    ["probar-conexion", "--help"],
+]
+
+# modulo raiz cuyo tiempo de importacion se desglosa
+MODULO_CLI = "source.cli.main"
+
+# numero de modulos mas lentos guardados en los resultados
+NUM_MODULOS_LENTOS = 15
+
+DIRECTORIO_RESULTADOS = Path(__file__).parent / "resultados"
+
+
+def parsear_importtime(salida: str) -> Dict[str, Dict[str, int]]:
+    """
+    Parsea la salida de ``python -X importtime``.
+
+    :param salida: Texto escrito por el interprete en stderr.
+    :return: Diccionario modulo -> tiempo propio y acumulado (us).
+    """
+    modulos = {}
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        partes = linea.removeprefix("import time:").split("|")
+        if len(partes) != 3 or not partes[0].strip().isdigit():
+            # cabecera "self [us] | cumulative | imported package"
+            continue
+        nombre = partes[2].strip()
+        modulos[nombre] = {
+            "propio": int(partes[0]),
+            "acumulado": int(partes[1]),
+        }
+    return modulos
+
+
+def medir_importacion(modulo: str = MODULO_CLI) -> Dict[str, Dict[str, int]]:
+    """Importar el modulo en un interprete nuevo con -X importtime."""
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parsear_importtime(resultado.stderr)
+
+
+def medir_comando(argumentos: List[str], repeticiones: int) -> Dict:
+    """Medir el tiempo real de una invocacion completa de la CLI."""
+    muestras = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "source.main", *argumentos],
+            capture_output=True,
+            check=False,
+        )
+        muestras.append(time.perf_counter() - inicio)
+
+    return {
+        "minimo": min(muestras),
+        "mediana": statistics.median(muestras),
+        "muestras": muestras,
+    }
+
+
+def ejecutar(repeticiones: int = 5) -> Dict:
+    """
+    Ejecuta el benchmark de arranque.
+
+    :param repeticiones: Invocaciones de cada comando.
+    :return: Tiempo de importacion del modulo de la CLI, modulos mas \
+        lentos y tiempo real de cada comando corto.
+    """
+    modulos = medir_importacion()
+    lentos = sorted(
+        modulos.items(),
+        key=lambda item: item[1]["acumulado"],
+        reverse=True,
+    )[:NUM_MODULOS_LENTOS]
+
+    return {
+        "python": sys.version.split()[0],
+        "importacion_cli_us": modulos.get(MODULO_CLI, {}).get("acumulado"),
+        "modulos_cargados": len(modulos),
+        "modulos_lentos": dict(lentos),
+        "comandos": {
+            " ".join(argumentos): medir_comando(argumentos, repeticiones)
+            for argumentos in COMANDOS_POR_DEFECTO
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    """Punto de entrada del benchmark de arranque."""
+    parser = argparse.ArgumentParser(
+        description="Tiempo de arranque de GraphQLStore CLI",
+    )
+    parser.add_argument(
+        "--repeticiones",
+        "-r",
+        type=int,
+        default=5,
+        help="Invocaciones de cada comando",
+    )
+    parser.add_argument(
+        "--salida",
+        "-s",
+        default=str(DIRECTORIO_RESULTADOS / "arranque.json"),
+        help="Archivo JSON donde guardar los resultados",
+    )
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.repeticiones)
+    ruta = Path(args.salida)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2)
+
+    consola = Console()
+    tabla = Table(title="Arranque GraphQLStore CLI")
+    tabla.add_column("Medicion")
+    tabla.add_column("Mediana (s)", justify="right")
+    tabla.add_row(
+        f"import {MODULO_CLI}",
+        f"{(resultados['importacion_cli_us'] or 0) / 1_000_000:.4f}",
+    )
+    for comando, tiempos in resultados["comandos"].items():
+        tabla.add_row(f"graphqlstore {comando}", f"{tiempos['mediana']:.4f}")
+    consola.print(tabla)
+    consola.print(f"💾 Resultados guardados en {ruta}")
+
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
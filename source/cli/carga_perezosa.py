@@ -0,0 +1,37 @@
+"""Modulo para cargar los modulos de la CLI solo cuando se usan."""
+
+import sys
+from collections.abc import Callable
+from importlib import import_module
+
+
+def exportaciones_perezosas(
+    paquete: str,
+    exportaciones: dict[str, str],
+) -> tuple[Callable[[str], object], Callable[[], list[str]]]:
+    """
+    Crea las funciones ``__getattr__`` y ``__dir__`` (PEP 562) de un \
+        paquete que reexporta nombres de sus submodulos sin importarlos \
+        hasta que se accede a ellos.
+
+    :param paquete: Nombre del paquete (``__name__``).
+    :param exportaciones: Diccionario nombre -> submodulo relativo \
+        donde esta definido. Los nombres no deben coincidir con el de \
+        un submodulo, ya que importarlo sobrescribe el atributo.
+    :return: Tupla con las funciones ``__getattr__`` y ``__dir__``.
+    """
+
+    def __getattr__(nombre: str) -> object:
+        if nombre not in exportaciones:
+            mensaje = f"module {paquete!r} has no attribute {nombre!r}"
+            raise AttributeError(mensaje)
+        modulo = import_module(exportaciones[nombre], paquete)
+        valor = getattr(modulo, nombre)
+        # guardar el valor en el paquete para no volver a resolverlo
+        setattr(sys.modules[paquete], nombre, valor)
+        return valor
+
+    def __dir__() -> list[str]:
+        return sorted(exportaciones)
+
+    return __getattr__, __dir__
@@ -1,6 +1,11 @@
 """Modulo de conexion"""
 
-from .main import conexion
-from .comando_conexion import ComandoConexion
+from ..carga_perezosa import exportaciones_perezosas
 
 __all__ = ["conexion", "ComandoConexion"]
+
+# las dependencias del comando se cargan solo al ejecutarlo
+__getattr__, __dir__ = exportaciones_perezosas(
+    __name__,
+    {"conexion": ".main", "ComandoConexion": ".comando_conexion"},
+)
@@ -1,7 +1,15 @@
 """Modulo del comando conexion"""
 
 from ..base import Comando
-from .main import conexion
+
+
+def conexion(args):
+    """Configurar la conexion importando el modulo del comando \
+        solo cuando se ejecuta."""
+    # pylint: disable-next=import-outside-toplevel
+    from .main import conexion as ejecutar
+
+    ejecutar(args)
 
 
 class ComandoConexion(Comando):
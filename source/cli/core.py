@@ -11,10 +11,31 @@ class ConstructorCLI:
     def __init__(self, titulo: str = "GraphQLStore CLI"):
         self.titulo = titulo
         self.parser = argparse.ArgumentParser(description=self.titulo)
+        self.agregar_opciones_globales()
         self.subparsers = self.parser.add_subparsers(
             dest="comando", help="Comando a ejecutar"
         )
 
+    def agregar_opciones_globales(self):
+        """Metodo para agregar las opciones comunes a todos los comandos"""
+        self.parser.add_argument(
+            "--perfil",
+            default=False,
+            action="store_true",
+            help="Mostrar el tiempo real y de CPU de cada fase y sentencia",
+        )
+        self.parser.add_argument(
+            "--perfil-json",
+            default=None,
+            help="Guardar la traza del perfil en un archivo JSON "
+            "(formato Trace Event)",
+        )
+        self.parser.add_argument(
+            "--perfil-cprofile",
+            default=None,
+            help="Guardar las estadisticas de cProfile (pstats) en un archivo",
+        )
+
     def agregar_comando(self, comando: Comando):
         """Metodo para agregar un comando al parser
 
@@ -0,0 +1,124 @@
+"""Modulo con la version asyncio de los adaptadores de bases de datos."""
+
+import asyncio
+from contextlib import nullcontext
+from typing import Any, Callable, Iterable, List, TypeVar
+
+from .adaptador_database import AdaptadorDatabase, ResultadoSentencia, TAM_LOTE
+
+T = TypeVar("T")
+
+
+class AdaptadorAsincrono:
+    """Clase que expone un adaptador con metodos ``async``.
+
+    Los drivers (mysql.connector, psycopg2) son bloqueantes, asi que \
+        cada operacion se ejecuta en un hilo y el bucle de eventos queda \
+        libre para atender otras bases de datos a la vez. Las operaciones \
+        de una misma instancia se ejecutan de una en una, porque comparten \
+        la conexion.
+    """
+
+    def __init__(self, adaptador: AdaptadorDatabase):
+        """
+        Inicializa el adaptador asincrono.
+
+        :param adaptador: Adaptador sincrono que hace el trabajo.
+        """
+        self.adaptador = adaptador
+        self._candado = asyncio.Lock()
+
+    async def _en_hilo(self, funcion: Callable[..., T], *args) -> T:
+        """Ejecutar una operacion bloqueante del adaptador en un hilo."""
+        async with self._candado:
+            return await asyncio.to_thread(funcion, *args)
+
+    async def conectar(self, config: dict) -> None:
+        """
+        Conecta a la base de datos.
+
+        :raises ConnectionError: Si no se pudo abrir la conexion (el \
+            adaptador sincrono solo muestra el error).
+        """
+        await self._en_hilo(self.adaptador.conectar, config)
+        if self.adaptador.conexion is None:
+            raise ConnectionError("No se pudo conectar a la base de datos.")
+
+    async def ejecutar_consulta(self, sql: str) -> Any:
+        """Ejecuta una consulta SQL."""
+        return await self._en_hilo(self.adaptador.ejecutar_consulta, sql)
+
+    async def consultar(self, sql: str) -> List[tuple]:
+        """
+        Ejecuta una consulta de lectura (por ejemplo, sobre \
+            information_schema) y devuelve sus filas.
+        """
+
+        def leer() -> List[tuple]:
+            self.adaptador.ejecutar_consulta(sql)
+            return self.adaptador.cursor.fetchall()
+
+        return await self._en_hilo(leer)
+
+    async def ejecutar_script(
+        self,
+        script: str,
+        tam_lote: int = TAM_LOTE,
+    ) -> List[ResultadoSentencia]:
+        """Ejecuta un script con varias sentencias por lotes."""
+        return await self._en_hilo(
+            self.adaptador.ejecutar_script,
+            script,
+            tam_lote,
+        )
+
+    async def ejecutar_sentencias(
+        self,
+        sentencias: Iterable[str],
+        tam_lote: int = TAM_LOTE,
+        arranque: bool = False,
+    ) -> int:
+        """
+        Ejecuta sentencias ya separadas (por ejemplo, las del generador).
+
+        :param sentencias: Sentencias SQL.
+        :param tam_lote: Sentencias enviadas en cada ida y vuelta.
+        :param arranque: Ejecutarlas en la sesion de arranque rapido.
+        :return: Numero de sentencias ejecutadas.
+        """
+
+        def ejecutar() -> int:
+            sesion = nullcontext()
+            if arranque:
+                sesion = self.adaptador.sesion_arranque()
+            with sesion:
+                flujo = self.adaptador.ejecutar_en_flujo(sentencias, tam_lote)
+                return sum(1 for _ in flujo)
+
+        return await self._en_hilo(ejecutar)
+
+    async def en_hilo(self, funcion: Callable[..., T], *args) -> T:
+        """
+        Ejecuta en un hilo una operacion que combina varios metodos del \
+            adaptador sincrono (por ejemplo, aplicar una migracion \
+            guardandola en el historial).
+
+        :param funcion: Recibe el adaptador sincrono y ``args``.
+        :return: Lo que devuelva ``funcion``.
+        """
+        return await self._en_hilo(funcion, self.adaptador, *args)
+
+    async def empty_database(self) -> bool:
+        """Verifica si la base de datos esta vacia."""
+        return await self._en_hilo(self.adaptador.empty_database)
+
+    async def cerrar_conexion(self) -> None:
+        """Cierra (o devuelve al pool) la conexion."""
+        await self._en_hilo(self.adaptador.cerrar_conexion)
+
+    async def __aenter__(self) -> "AdaptadorAsincrono":
+        return self
+
+    async def __aexit__(self, *excepcion) -> None:
+        if self.adaptador.conexion is not None:
+            await self.cerrar_conexion()
@@ -1,20 +1,448 @@
 """Modulo que define la clase abstracta AdaptadorDatabase."""
 
 from abc import abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from .directivas import (
+    TIPO_ELIMINAR_UNIQUE,
+    TIPO_RELLENO,
+    Directiva,
+    dividir_script,
+)
+from .historial import (
+    CONSULTA_ESTADO_HISTORIAL,
+    RegistroMigracion,
+    ResumenHistorial,
+)
+from .pool_conexiones import ConfiguracionPool, PoolConexiones, obtener_pool
+from .relleno import ConfiguracionRelleno, PasoRelleno, rellenar_por_lotes
+from .tokenizador_sql import DIALECTO_MYSQL, DialectoSQL
+from ..utilidades.perfilador import obtener_perfilador
+
+# sentencias enviadas al servidor en cada ida y vuelta
+TAM_LOTE = 50
+
+
+@dataclass
+class ResultadoSentencia:
+    """Clase con el resultado de una sentencia de un lote."""
+
+    sentencia: str
+    filas_afectadas: int = -1
+    error: Optional[str] = None
+    # ALGORITHM con el que el servidor aplico un ALTER TABLE (MySQL)
+    algoritmo: Optional[str] = None
+
+    @property
+    def exitosa(self) -> bool:
+        """Indica si la sentencia se ejecuto sin error."""
+        return self.error is None
+
+
+@dataclass
+class EstadisticasTabla:
+    """Clase con el tamano de una tabla segun el catalogo del motor."""
+
+    filas: int = 0
+    bytes_datos: int = 0
+    bytes_indices: int = 0
 
 
 class AdaptadorDatabase:
     """Clase abstracta para manejar operaciones de base de datos."""
 
+    # reglas lexicas usadas para dividir scripts en sentencias
+    dialecto: DialectoSQL = DIALECTO_MYSQL
+    # pool del que se obtuvo la conexion (None si no se usa pool)
+    pool: Optional[PoolConexiones] = None
+    # ajustes de los rellenos por lotes (None usa los de por defecto)
+    relleno: Optional[ConfiguracionRelleno] = None
+    # errores del driver que un relleno devuelve como sentencia fallida
+    errores_driver: Tuple[Type[Exception], ...] = ()
+    # tabla, filas, bytes de datos y bytes de indices de cada tabla
+    consulta_estadisticas: str = ""
+    # creacion de la tabla de historial de migraciones y su indice
+    sql_historial: str = ""
+    # constraints unique de una sola columna, por (tabla, columna), con
+    # su nombre listo para escribirlo en una sentencia
+    consulta_nombres_unique: str = ""
+    # numero de tablas de historial (0 si nunca se aplico una migracion)
+    consulta_existe_historial: str = ""
+    # insercion de una fila del historial que actualiza la existente
+    sql_registrar_migracion: str = ""
+
     @abstractmethod
     def conectar(self, config):
         """Conectar a la base de datos usando la configuración \
             proporcionada."""
 
+    def _abrir_conexion(self, config: dict, crear: Callable[[], Any]) -> Any:
+        """
+        Obtiene una conexion del pool configurado o abre una nueva.
+
+        :param config: Configuracion de la conexion.
+        :param crear: Abre una conexion con el driver del motor.
+        :return: Conexion lista para crear cursores.
+        """
+        configuracion = ConfiguracionPool.desde_config(config)
+        if configuracion is None:
+            self.pool = None
+            return crear()
+
+        clave = (
+            type(self).__name__,
+            config.get("DB_HOST"),
+            config.get("DB_PUERTO"),
+            config.get("DB_USUARIO"),
+            config.get("DB_NOMBRE"),
+        )
+        self.pool = obtener_pool(
+            clave,
+            crear,
+            self._conexion_valida,
+            configuracion,
+        )
+        return self.pool.obtener()
+
+    def _conexion_valida(self, conexion: Any) -> bool:
+        # pylint: disable=unused-argument
+        """Comprobar que una conexion del pool sigue viva."""
+        return True
+
+    def _liberar_conexion(self, reutilizable: bool = True) -> None:
+        """Devolver la conexion al pool o cerrarla si no hay pool."""
+        if self.pool is None:
+            self.conexion.close()
+        elif reutilizable:
+            self.pool.devolver(self.conexion)
+        else:
+            self.pool.descartar(self.conexion)
+
     @abstractmethod
     def ejecutar_consulta(self, sql: str):
         """Ejecutar una consulta SQL en la base de datos."""
 
+    @abstractmethod
+    def _ejecutar_lote(
+        self,
+        sentencias: List[str],
+    ) -> List[ResultadoSentencia]:
+        """
+        Ejecutar varias sentencias en una sola ida y vuelta.
+
+        Se detiene en la primera sentencia que falla; su resultado es \
+            el ultimo de la lista devuelta.
+        """
+
+    def ejecutar_script(
+        self,
+        script: str,
+        tam_lote: int = TAM_LOTE,
+        desde: int = 0,
+        al_avanzar: Optional[Callable[[int], None]] = None,
+    ) -> List[ResultadoSentencia]:
+        """
+        Ejecuta un script con varias sentencias y comentarios.
+
+        :param script: Texto SQL (por ejemplo, una migracion generada).
+        :param tam_lote: Sentencias enviadas en cada ida y vuelta.
+        :param desde: Partes del script (sentencias y directivas) ya \
+            aplicadas en un intento anterior; no se vuelven a ejecutar.
+        :param al_avanzar: Recibe las partes aplicadas cada vez que \
+            avanzan, tambien antes de que se lance un error.
+        :return: Resultado de cada sentencia.
+        :raises SQLExecutionError: Si una sentencia falla; las \
+            siguientes no se ejecutan.
+        """
+        resultados: List[ResultadoSentencia] = []
+        sentencias: List[str] = []
+        aplicadas = desde
+
+        def avanzar(cantidad: int) -> None:
+            nonlocal aplicadas
+            if cantidad:
+                aplicadas += cantidad
+                if al_avanzar:
+                    al_avanzar(aplicadas)
+
+        for parte in dividir_script(script, self.dialecto)[desde:]:
+            if isinstance(parte, Directiva):
+                self._ejecutar_por_lotes(
+                    sentencias,
+                    tam_lote,
+                    resultados,
+                    avanzar,
+                )
+                sentencias = []
+                with obtener_perfilador().sentencia(parte.sentencia):
+                    resultados_directiva = self._ejecutar_directiva(parte)
+                # una directiva a medias se repite entera
+                avanzar(int(all(r.exitosa for r in resultados_directiva)))
+                self._acumular(resultados_directiva, resultados)
+            else:
+                sentencias.append(parte)
+        self._ejecutar_por_lotes(sentencias, tam_lote, resultados, avanzar)
+        return resultados
+
+    def _ejecutar_por_lotes(
+        self,
+        sentencias: List[str],
+        tam_lote: int,
+        resultados: List[ResultadoSentencia],
+        avanzar: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Enviar las sentencias en lotes de ``tam_lote``."""
+        for inicio in range(0, len(sentencias), tam_lote):
+            fin = inicio + tam_lote
+            self._ejecutar_lote_medido(
+                sentencias[inicio:fin],
+                resultados,
+                avanzar,
+            )
+
+    def _ejecutar_directiva(
+        self,
+        directiva: Directiva,
+    ) -> List[ResultadoSentencia]:
+        """Ejecutar una directiva del script; si el motor no la \
+            conoce se ejecuta la sentencia equivalente."""
+        if directiva.tipo == TIPO_RELLENO:
+            return [self._rellenar(directiva)]
+        if directiva.tipo == TIPO_ELIMINAR_UNIQUE:
+            return self._eliminar_unique(directiva)
+        return self._ejecutar_lote([directiva.sentencia])
+
+    def _eliminar_unique(
+        self,
+        directiva: Directiva,
+    ) -> List[ResultadoSentencia]:
+        """Eliminar las constraints unique de una columna con el nombre \
+            que tienen en la base de datos, que en un esquema creado \
+            antes de llamarlas uk_<tabla>_<columna> es otro."""
+        if not self.cursor:
+            raise ValueError("Base de datos no conectada.")
+
+        datos = directiva.datos
+        self.cursor.execute(
+            self.consulta_nombres_unique,
+            (datos["tabla"], datos["columna"]),
+        )
+        nombres = [nombre for (nombre,) in self.cursor.fetchall()]
+        if not nombres:
+            # la columna ya no es unique
+            return [ResultadoSentencia(directiva.sentencia, 0)]
+
+        # el nombre es el ultimo identificador de la sentencia
+        antes, _, despues = directiva.sentencia.rpartition(datos["nombre"])
+        return self._ejecutar_lote(
+            [f"{antes}{nombre}{despues}" for nombre in nombres],
+        )
+
+    def _rellenar(self, directiva: Directiva) -> ResultadoSentencia:
+        """Aplicar por rangos de clave primaria una sentencia que \
+            mueve datos, confirmando cada lote."""
+        if not self.conexion:
+            raise ValueError("Base de datos no conectada.")
+
+        paso = PasoRelleno(**directiva.datos)
+        configuracion = self.relleno or ConfiguracionRelleno()
+        try:
+            filas = rellenar_por_lotes(
+                self.cursor,
+                paso,
+                configuracion,
+                self._confirmar_lote,
+            )
+        except self.errores_driver as err:
+            # los lotes anteriores quedan confirmados y el progreso
+            # guarda la ultima clave para reanudar
+            self._deshacer_lote()
+            return ResultadoSentencia(directiva.sentencia, error=str(err))
+        return ResultadoSentencia(directiva.sentencia, filas)
+
+    def _confirmar_lote(self) -> None:
+        """Confirmar la transaccion de un lote de un relleno."""
+        self.conexion.commit()
+
+    def _deshacer_lote(self) -> None:
+        """Deshacer el lote fallido de un relleno, para que la \
+            conexion siga disponible."""
+        self.conexion.rollback()
+
+    def ejecutar_en_flujo(
+        self,
+        sentencias: Iterable[str],
+        tam_lote: int = 1,
+    ) -> Iterator[str]:
+        """
+        Ejecuta las sentencias a medida que se reciben.
+
+        La sentencia ejecutada se devuelve para poder encadenar otro \
+            consumidor (por ejemplo, escribirla en un archivo).
+
+        :param sentencias: Sentencias SQL, normalmente generadas bajo \
+            demanda por el generador de esquemas.
+        :param tam_lote: Sentencias acumuladas antes de enviarlas juntas.
+        :return: Iterador de las sentencias ya ejecutadas.
+        :raises SQLExecutionError: Si una sentencia falla.
+        """
+        lote: List[str] = []
+        for sentencia in sentencias:
+            lote.append(sentencia)
+            if len(lote) >= tam_lote:
+                self._ejecutar_lote_medido(lote, [])
+                yield from lote
+                lote = []
+
+        if lote:
+            self._ejecutar_lote_medido(lote, [])
+            yield from lote
+
+    def _ejecutar_lote_medido(
+        self,
+        sentencias: List[str],
+        resultados: List[ResultadoSentencia],
+        avanzar: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Ejecutar un lote midiendolo, acumular sus resultados y \
+            convertir su fallo en error; ``avanzar`` recibe antes las \
+            sentencias que quedaron aplicadas."""
+        with obtener_perfilador().sentencia("\n".join(sentencias)):
+            resultados_lote = self._ejecutar_lote(sentencias)
+        if avanzar:
+            # las anteriores a la fallida quedan aplicadas
+            avanzar(sum(resultado.exitosa for resultado in resultados_lote))
+        self._acumular(resultados_lote, resultados)
+
+    @staticmethod
+    def _acumular(
+        resultados_lote: List[ResultadoSentencia],
+        resultados: List[ResultadoSentencia],
+    ) -> None:
+        """Acumular los resultados de un lote y convertir su fallo \
+            en error."""
+        resultados.extend(resultados_lote)
+
+        if resultados_lote and not resultados_lote[-1].exitosa:
+            # las excepciones cargan el paquete graphql, solo se importan
+            # cuando realmente hay un error
+            # pylint: disable-next=import-outside-toplevel
+            from ..graphql.exceptions import SQLExecutionError
+
+            fallida = resultados_lote[-1]
+            mensaje = f"Error en '{fallida.sentencia}': {fallida.error}"
+            raise SQLExecutionError(mensaje, resultados)
+
+    def estadisticas_tablas(self) -> Dict[str, EstadisticasTabla]:
+        """
+        Lee del catalogo el tamano de cada tabla de la base de datos.
+
+        :return: Estadisticas por nombre de tabla; las filas son la \
+            estimacion del motor, no un COUNT(*).
+        """
+        if not self.conexion or not self.cursor:
+            raise ValueError("Base de datos no conectada.")
+
+        self.ejecutar_consulta(self.consulta_estadisticas)
+        return {
+            nombre: EstadisticasTabla(
+                int(filas or 0),
+                int(datos or 0),
+                int(indices or 0),
+            )
+            for nombre, filas, datos, indices in self.cursor.fetchall()
+        }
+
+    def asegurar_historial(self) -> None:
+        """Crea la tabla de historial de migraciones si no existe."""
+        self.ejecutar_consulta(self.sql_historial)
+
+    def registrar_migracion(self, registro: RegistroMigracion) -> None:
+        """
+        Guarda una migracion en el historial, o actualiza su fila si \
+            ya existe.
+
+        :param registro: Fila de la migracion.
+        """
+        if not self.conexion or not self.cursor:
+            raise ValueError("Base de datos no conectada.")
+
+        sql = self.sql_registrar_migracion
+        with obtener_perfilador().sentencia(sql):
+            self.cursor.execute(sql, registro.parametros())
+        self.conexion.commit()
+
+    def estado_historial(self, hash_esquema: str) -> ResumenHistorial:
+        """
+        Consulta el historial sin crear su tabla si aun no existe; el \
+            estado se lee en una sola consulta.
+
+        :param hash_esquema: Huella del esquema que se va a aplicar.
+        :return: Si ese esquema es el de la ultima migracion aplicada y \
+            las migraciones pendientes o fallidas.
+        """
+        if not self.conexion or not self.cursor:
+            raise ValueError("Base de datos no conectada.")
+
+        # sin tabla no hay nada aplicado; se crea al aplicar la migracion
+        self.ejecutar_consulta(self.consulta_existe_historial)
+        (existe,) = self.cursor.fetchone()
+        if not existe:
+            return ResumenHistorial()
+
+        # el enum carga el paquete graphql
+        # pylint: disable-next=import-outside-toplevel
+        from ..graphql.configuracion_y_constantes import EstadoMigracion
+
+        parametros = (
+            EstadoMigracion.PENDIENTE.value,
+            EstadoMigracion.FALLIDA.value,
+            EstadoMigracion.APLICADA.value,
+        )
+        with obtener_perfilador().sentencia(CONSULTA_ESTADO_HISTORIAL):
+            self.cursor.execute(CONSULTA_ESTADO_HISTORIAL, parametros)
+            filas = self.cursor.fetchall()
+
+        resumen = ResumenHistorial()
+        for fila in filas:
+            id_migracion, estado, huella, checksum, duracion, aplicadas = fila
+            registro = RegistroMigracion(
+                id_migracion,
+                huella,
+                checksum,
+                EstadoMigracion(estado),
+                duracion,
+                aplicadas,
+            )
+            if registro.estado is EstadoMigracion.APLICADA:
+                resumen.esquema_aplicado = huella == hash_esquema
+                continue
+            resumen.sin_terminar.append(registro)
+        return resumen
+
+    @contextmanager
+    def sesion_arranque(self) -> Iterator[None]:
+        """
+        Sesion optimizada para crear el esquema en una base de datos \
+            vacia (por defecto no cambia nada).
+
+        Los adaptadores aplican sus ajustes al entrar y los restauran \
+            al salir, tambien si una sentencia falla.
+        """
+        yield
+
     @abstractmethod
     def cerrar_conexion(self):
         """Cerrar la conexión a la base de datos."""
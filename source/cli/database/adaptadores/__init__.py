@@ -1,6 +1,41 @@
 """Modulo de adaptadores específicos para bases de datos."""
 
-from .mysql import AdaptadorMySQL
-from .postgresql import AdaptadorPostgreSQL
+from ...carga_perezosa import exportaciones_perezosas
 
-__all__ = ["AdaptadorMySQL", "AdaptadorPostgreSQL"]
+__all__ = [
+    "AdaptadorMySQL",
+    "AdaptadorPostgreSQL",
+    "AdaptadorMySQLAsincrono",
+    "AdaptadorPostgreSQLAsincrono",
+    "crear_adaptador_asincrono",
+]
+
+# cada conector (mysql.connector, psycopg2) se importa solo al usarlo
+__getattr__, __dir__ = exportaciones_perezosas(
+    __name__,
+    {
+        "AdaptadorMySQL": ".mysql",
+        "AdaptadorPostgreSQL": ".postgresql",
+        "AdaptadorMySQLAsincrono": ".mysql",
+        "AdaptadorPostgreSQLAsincrono": ".postgresql",
+    },
+)
+
+
+def crear_adaptador_asincrono(db_type):
+    """
+    Crea el adaptador asyncio del motor indicado.
+
+    :param db_type: Tipo de base de datos (``DatabaseType``).
+    :return: Adaptador asincrono sin conectar.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from ...graphql.configuracion_y_constantes import DatabaseType
+
+    clases = {
+        DatabaseType.MYSQL: "AdaptadorMySQLAsincrono",
+        DatabaseType.POSTGRESQL: "AdaptadorPostgreSQLAsincrono",
+    }
+    if db_type not in clases:
+        raise ValueError(f"Database type not supported: {db_type.value}")
+    return __getattr__(clases[db_type])()
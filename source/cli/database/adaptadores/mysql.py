@@ -1,14 +1,94 @@
 """Modulo para adaptador MySQL."""
 
+import re
 import traceback
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
 import mysql.connector
+from mysql.connector import errorcode
 from rich.console import Console
-from ..adaptador_database import AdaptadorDatabase
+from ..adaptador_asincrono import AdaptadorAsincrono
+from ..adaptador_database import AdaptadorDatabase, ResultadoSentencia
+from ..directivas import TIPO_TABLA_SOMBRA, Directiva
+from ..historial import INDICE_HISTORIAL, TABLA_HISTORIAL
+from ...utilidades.perfilador import obtener_perfilador
+from .tabla_sombra import CopiaTablaSombra
+
+# algoritmos de ALTER TABLE, de menor a mayor coste; si el servidor
+# rechaza uno se prueba el siguiente
+ALGORITMOS_ALTER = ("INSTANT", "INPLACE", "COPY")
+ERRORES_ALGORITMO = {
+    errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED,
+    errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED_REASON,
+}
+_CLAUSULA_ALGORITMO = re.compile(r"ALGORITHM\s*=\s*(\w+)", re.IGNORECASE)
+_CLAUSULA_BLOQUEO = re.compile(r",\s*LOCK\s*=\s*\w+", re.IGNORECASE)
+
+
+def algoritmo_sentencia(sentencia: str) -> Optional[str]:
+    """Devuelve el ALGORITHM pedido en un ALTER TABLE, si lo tiene."""
+    clausula = _CLAUSULA_ALGORITMO.search(sentencia)
+    return clausula.group(1).upper() if clausula else None
+
+
+def con_algoritmo(sentencia: str, algoritmo: str) -> str:
+    """Devuelve un ALTER TABLE con otro ALGORITHM; INPLACE se pide con \
+        LOCK=NONE para que el servidor lo rechace antes que bloquear \
+        las escrituras, y COPY con el bloqueo por defecto."""
+    opciones = f"ALGORITHM={algoritmo}"
+    if algoritmo == "INPLACE":
+        opciones += ", LOCK=NONE"
+    sentencia = _CLAUSULA_BLOQUEO.sub("", sentencia)
+    return _CLAUSULA_ALGORITMO.sub(opciones, sentencia, count=1)
 
 
 class AdaptadorMySQL(AdaptadorDatabase):
     """Adaptador para bases de datos MySQL."""
 
+    errores_driver = (mysql.connector.Error,)
+    # un ALTER TABLE rechazado puede repetirse con ALGORITHM=COPY, que
+    # bloquea las escrituras; el modo online lo desactiva
+    permitir_copia = True
+    consulta_estadisticas = (
+        "SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH "
+        "FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE';"
+    )
+    sql_historial = (
+        f"CREATE TABLE IF NOT EXISTS {TABLA_HISTORIAL} ("
+        "id VARCHAR(100) PRIMARY KEY, "
+        "hash_esquema CHAR(64) NOT NULL, "
+        "checksum_sql CHAR(64) NOT NULL, "
+        "estado VARCHAR(10) NOT NULL, "
+        "duracion DOUBLE, "
+        "sentencias_aplicadas INT NOT NULL DEFAULT 0, "
+        "actualizada TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) "
+        "ON UPDATE CURRENT_TIMESTAMP(6), "
+        f"INDEX {INDICE_HISTORIAL} (estado, actualizada));"
+    )
+    # los indices unique de una columna creados por migraciones antiguas
+    # pueden estar repetidos (email, email_2...)
+    consulta_nombres_unique = (
+        "SELECT INDEX_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+        "AND NON_UNIQUE = 0 AND INDEX_NAME <> 'PRIMARY' "
+        "GROUP BY INDEX_NAME HAVING COUNT(*) = 1 AND MAX(COLUMN_NAME) = %s;"
+    )
+    consulta_existe_historial = (
+        "SELECT COUNT(*) FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() "
+        f"AND TABLE_NAME = '{TABLA_HISTORIAL}';"
+    )
+    sql_registrar_migracion = (
+        f"INSERT INTO {TABLA_HISTORIAL} "
+        "(id, hash_esquema, checksum_sql, estado, duracion, "
+        "sentencias_aplicadas) VALUES (%s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE estado = VALUES(estado), "
+        "duracion = VALUES(duracion), "
+        "sentencias_aplicadas = VALUES(sentencias_aplicadas);"
+    )
+
     def __init__(self):
         """Implementacion del adaptador MySQL."""
         self.conexion = None
@@ -18,12 +98,15 @@ class AdaptadorMySQL(AdaptadorDatabase):
     def conectar(self, config) -> None:
         """Conectar a la base de datos MySQL."""
         try:
-            self.conexion = mysql.connector.connect(
-                host=config.get("DB_HOST", "localhost"),
-                port=config.get("DB_PUERTO", "3306"),
-                user=config.get("DB_USUARIO", ""),
-                password=config.get("DB_PASSWORD", ""),
-                database=config.get("DB_NOMBRE", ""),
+            self.conexion = self._abrir_conexion(
+                config,
+                lambda: mysql.connector.connect(
+                    host=config.get("DB_HOST", "localhost"),
+                    port=config.get("DB_PUERTO", "3306"),
+                    user=config.get("DB_USUARIO", ""),
+                    password=config.get("DB_PASSWORD", ""),
+                    database=config.get("DB_NOMBRE", ""),
+                ),
             )
             self.cursor = self.conexion.cursor()
         except mysql.connector.Error as err:
@@ -78,7 +161,6 @@ class AdaptadorMySQL(AdaptadorDatabase):
                         consola.print(f"\t\t- {tabla[0]}", style="green")
 
                 consola.print("\n")
-                self.cerrar_conexion()
 
             return
 
@@ -93,14 +175,143 @@ class AdaptadorMySQL(AdaptadorDatabase):
         """Ejecutar una consulta SQL en la base de datos."""
         if not self.cursor:
             raise ValueError("Base de datos no conectada.")
-        self.cursor.execute(sql)
+        with obtener_perfilador().sentencia(sql):
+            self.cursor.execute(sql)
+
+    def _ejecutar_lote(
+        self,
+        sentencias: List[str],
+    ) -> List[ResultadoSentencia]:
+        """Enviar las sentencias como un solo script multi-sentencia y \
+            leer el resultado de cada una con nextset()."""
+        if not self.cursor:
+            raise ValueError("Base de datos no conectada.")
+
+        resultados: List[ResultadoSentencia] = []
+        try:
+            self.cursor.execute("\n".join(sentencias))
+            for indice, sentencia in enumerate(sentencias):
+                # el error de una sentencia aparece al pedir su resultado
+                if indice:
+                    self.cursor.nextset()
+                if self.cursor.with_rows:
+                    self.cursor.fetchall()
+                resultados.append(
+                    ResultadoSentencia(
+                        sentencia,
+                        self.cursor.rowcount,
+                        algoritmo=algoritmo_sentencia(sentencia),
+                    ),
+                )
+        except mysql.connector.Error as err:
+            fallida = sentencias[len(resultados)]
+            if err.errno not in ERRORES_ALGORITMO:
+                resultados.append(ResultadoSentencia(fallida, error=str(err)))
+                return resultados
+
+            resultado = self._ejecutar_con_otro_algoritmo(fallida, err)
+            resultados.append(resultado)
+            # el resto del lote no se ejecuto tras el error
+            ejecutadas = len(resultados)
+            resto = sentencias[ejecutadas:]
+            if resultado.exitosa and resto:
+                resultados.extend(self._ejecutar_lote(resto))
+        return resultados
+
+    def _ejecutar_con_otro_algoritmo(
+        self,
+        sentencia: str,
+        error: mysql.connector.Error,
+    ) -> ResultadoSentencia:
+        """Repetir un ALTER TABLE rechazado con los algoritmos \
+            siguientes al pedido (INSTANT -> INPLACE -> COPY); sin \
+            ``permitir_copia`` no se llega a COPY."""
+        pedido = algoritmo_sentencia(sentencia)
+        if pedido not in ALGORITMOS_ALTER:
+            return ResultadoSentencia(sentencia, error=str(error))
+
+        inicio = ALGORITMOS_ALTER.index(pedido) + 1
+        siguientes = ALGORITMOS_ALTER[inicio:]
+        if not self.permitir_copia:
+            siguientes = tuple(a for a in siguientes if a != "COPY")
+        for algoritmo in siguientes:
+            alternativa = con_algoritmo(sentencia, algoritmo)
+            try:
+                with obtener_perfilador().sentencia(alternativa):
+                    self.cursor.execute(alternativa)
+            except mysql.connector.Error as err:
+                if err.errno not in ERRORES_ALGORITMO:
+                    return ResultadoSentencia(sentencia, error=str(err))
+                error = err
+                continue
+            return ResultadoSentencia(
+                alternativa,
+                self.cursor.rowcount,
+                algoritmo=algoritmo,
+            )
+        if not self.permitir_copia:
+            mensaje = f"{error} (el modo online no copia la tabla)"
+            return ResultadoSentencia(sentencia, error=mensaje)
+        return ResultadoSentencia(sentencia, error=str(error))
+
+    def _ejecutar_directiva(
+        self,
+        directiva: Directiva,
+    ) -> List[ResultadoSentencia]:
+        """Ejecutar la copia en tabla sombra pedida por una migracion \
+            online."""
+        if directiva.tipo != TIPO_TABLA_SOMBRA:
+            return super()._ejecutar_directiva(directiva)
+        if not self.conexion:
+            raise ValueError("Base de datos no conectada.")
+
+        copia = CopiaTablaSombra(
+            self.conexion,
+            directiva.datos["tabla"],
+            directiva.datos["alteraciones"],
+            self.relleno,
+        )
+        return [copia.ejecutar(directiva.sentencia)]
+
+    @contextmanager
+    def sesion_arranque(self) -> Iterator[None]:
+        """Desactivar foreign_key_checks y unique_checks en la sesion \
+            mientras se crea el esquema y restaurar sus valores."""
+        self.ejecutar_consulta(
+            "SELECT @@SESSION.foreign_key_checks, @@SESSION.unique_checks;"
+        )
+        fk_checks, unique_checks = self.cursor.fetchone()
+
+        desactivar = "SET SESSION foreign_key_checks = 0, unique_checks = 0;"
+        self.ejecutar_consulta(desactivar)
+        try:
+            yield
+        finally:
+            self.ejecutar_consulta(
+                f"SET SESSION foreign_key_checks = {int(fk_checks)}, "
+                f"unique_checks = {int(unique_checks)};"
+            )
 
     def cerrar_conexion(self) -> None:
-        """Cerrar la conexión a la base de datos."""
+        """Cerrar la conexión a la base de datos (con pool, la conexion \
+            se devuelve para reutilizarla)."""
         if self.cursor:
             self.cursor.close()
         if self.conexion:
-            self.conexion.close()
+            reutilizable = True
+            if self.pool:
+                # la siguiente sesion no hereda cambios sin confirmar
+                try:
+                    self.conexion.rollback()
+                except mysql.connector.Error:
+                    reutilizable = False
+            self._liberar_conexion(reutilizable)
+        self.conexion = None
+        self.cursor = None
+
+    def _conexion_valida(self, conexion) -> bool:
+        """Comprobar que una conexion del pool sigue viva."""
+        return conexion.is_connected()
 
     def empty_database(self) -> bool:
         """Verificar si la base de datos está vacía."""
@@ -108,5 +319,14 @@ class AdaptadorMySQL(AdaptadorDatabase):
             raise ValueError("Base de datos no conectada.")
 
         self.ejecutar_consulta("SHOW TABLES;")
-        tablas = self.cursor.fetchall()
-        return len(tablas) == 0
+        # la tabla del historial no forma parte del esquema
+        tablas = {tabla for (tabla,) in self.cursor.fetchall()}
+        return not tablas - {TABLA_HISTORIAL}
+
+
+class AdaptadorMySQLAsincrono(AdaptadorAsincrono):
+    """Adaptador asyncio para bases de datos MySQL."""
+
+    def __init__(self):
+        """Implementacion del adaptador MySQL asincrono."""
+        super().__init__(AdaptadorMySQL())
@@ -1,29 +1,89 @@
 """Adaptador para PostgreSQL."""
 
 import traceback
+from contextlib import contextmanager
+from typing import Iterator, List
+
 import psycopg2
 from rich.console import Console
-from ..adaptador_database import AdaptadorDatabase
+from ..adaptador_asincrono import AdaptadorAsincrono
+from ..adaptador_database import AdaptadorDatabase, ResultadoSentencia
+from ..directivas import TIPO_SIN_TRANSACCION, Directiva
+from ..historial import INDICE_HISTORIAL, TABLA_HISTORIAL
+from ..tokenizador_sql import DIALECTO_POSTGRESQL
+from ...utilidades.perfilador import obtener_perfilador
 
 
 class AdaptadorPostgreSQL(AdaptadorDatabase):
     """Adaptador para bases de datos PostgreSQL."""
 
+    dialecto = DIALECTO_POSTGRESQL
+    errores_driver = (psycopg2.Error,)
+    # reltuples es -1 en las tablas que aun no se han analizado
+    consulta_estadisticas = (
+        "SELECT c.relname, GREATEST(c.reltuples, 0)::bigint, "
+        "pg_relation_size(c.oid), pg_indexes_size(c.oid) "
+        "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relkind IN ('r', 'p') AND n.nspname = current_schema();"
+    )
+    sql_historial = (
+        f"CREATE TABLE IF NOT EXISTS {TABLA_HISTORIAL} ("
+        "id VARCHAR(100) PRIMARY KEY, "
+        "hash_esquema CHAR(64) NOT NULL, "
+        "checksum_sql CHAR(64) NOT NULL, "
+        "estado VARCHAR(10) NOT NULL, "
+        "duracion DOUBLE PRECISION, "
+        "sentencias_aplicadas INT NOT NULL DEFAULT 0, "
+        "actualizada TIMESTAMP DEFAULT CURRENT_TIMESTAMP);\n"
+        f"CREATE INDEX IF NOT EXISTS {INDICE_HISTORIAL} "
+        f"ON {TABLA_HISTORIAL} (estado, actualizada);"
+    )
+    # las migraciones escriben la tabla y la columna con y sin comillas
+    consulta_nombres_unique = (
+        "SELECT quote_ident(con.conname) FROM pg_constraint con "
+        "JOIN pg_class c ON c.oid = con.conrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "JOIN pg_attribute a "
+        "ON a.attrelid = c.oid AND a.attnum = con.conkey[1] "
+        "WHERE con.contype = 'u' AND cardinality(con.conkey) = 1 "
+        "AND n.nspname = current_schema() "
+        "AND lower(c.relname) = lower(%s) AND lower(a.attname) = lower(%s);"
+    )
+    consulta_existe_historial = (
+        "SELECT COUNT(*) FROM information_schema.tables "
+        "WHERE table_schema = current_schema() "
+        f"AND table_name = '{TABLA_HISTORIAL}';"
+    )
+    sql_registrar_migracion = (
+        f"INSERT INTO {TABLA_HISTORIAL} "
+        "(id, hash_esquema, checksum_sql, estado, duracion, "
+        "sentencias_aplicadas) VALUES (%s, %s, %s, %s, %s, %s) "
+        "ON CONFLICT (id) DO UPDATE SET "
+        "estado = EXCLUDED.estado, duracion = EXCLUDED.duracion, "
+        "sentencias_aplicadas = EXCLUDED.sentencias_aplicadas, "
+        "actualizada = CURRENT_TIMESTAMP;"
+    )
+
     def __init__(self):
         """Implementacion del adaptador PostgreSQL."""
         self.conexion = None
         self.cursor = None
         self.consola = Console()
+        # dentro de sesion_arranque se confirma una sola vez al final
+        self.en_transaccion = False
 
     def conectar(self, config) -> None:
         """Conectar a la base de datos PostgreSQL."""
         try:
-            self.conexion = psycopg2.connect(
-                host=config.get("DB_HOST", "localhost"),
-                port=config.get("DB_PUERTO", "5432"),
-                user=config.get("DB_USUARIO", "postgres"),
-                password=config.get("DB_PASSWORD", ""),
-                database=config.get("DB_NOMBRE", "postgres"),
+            self.conexion = self._abrir_conexion(
+                config,
+                lambda: psycopg2.connect(
+                    host=config.get("DB_HOST", "localhost"),
+                    port=config.get("DB_PUERTO", "5432"),
+                    user=config.get("DB_USUARIO", "postgres"),
+                    password=config.get("DB_PASSWORD", ""),
+                    database=config.get("DB_NOMBRE", "postgres"),
+                ),
             )
             self.cursor = self.conexion.cursor()
         except psycopg2.Error as err:
@@ -80,7 +140,6 @@ class AdaptadorPostgreSQL(AdaptadorDatabase):
                         consola.print(f"\t\t- {tabla[0]}", style="green")
 
                 consola.print("\n")
-                self.cerrar_conexion()
 
             return
 
@@ -95,15 +154,150 @@ class AdaptadorPostgreSQL(AdaptadorDatabase):
         """Ejecutar una consulta SQL en la base de datos."""
         if not self.cursor:
             raise ValueError("Base de datos no conectada.")
-        self.cursor.execute(sql)
+        with obtener_perfilador().sentencia(sql):
+            self.cursor.execute(sql)
+            if not self.en_transaccion:
+                self.conexion.commit()
+
+    def _ejecutar_lote(
+        self,
+        sentencias: List[str],
+    ) -> List[ResultadoSentencia]:
+        """Enviar las sentencias en una sola consulta protegida por un \
+            savepoint; si falla, repetirlas una a una para saber cual \
+            fallo y conservar las anteriores."""
+        if not self.cursor:
+            raise ValueError("Base de datos no conectada.")
+
+        try:
+            self.cursor.execute(
+                "SAVEPOINT lote;\n"
+                + "\n".join(sentencias)
+                + "\nRELEASE SAVEPOINT lote;"
+            )
+        except psycopg2.Error:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT lote;")
+            return self._ejecutar_una_a_una(sentencias)
+
+        if not self.en_transaccion:
+            self.conexion.commit()
+        # psycopg2 solo informa las filas de la ultima sentencia
+        resultados = [ResultadoSentencia(sql) for sql in sentencias]
+        resultados[-1].filas_afectadas = self.cursor.rowcount
+        return resultados
+
+    def _ejecutar_una_a_una(
+        self,
+        sentencias: List[str],
+    ) -> List[ResultadoSentencia]:
+        """Ejecutar cada sentencia con su savepoint hasta la que falla."""
+        resultados: List[ResultadoSentencia] = []
+        for sentencia in sentencias:
+            try:
+                self.cursor.execute(f"SAVEPOINT sentencia;\n{sentencia}")
+            except psycopg2.Error as err:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT sentencia;")
+                fallida = ResultadoSentencia(sentencia, error=str(err))
+                resultados.append(fallida)
+                break
+            resultados.append(
+                ResultadoSentencia(sentencia, self.cursor.rowcount),
+            )
+
+        # las sentencias anteriores a la fallida quedan aplicadas
+        if not self.en_transaccion:
+            self.conexion.commit()
+        return resultados
+
+    def _ejecutar_directiva(
+        self,
+        directiva: Directiva,
+    ) -> List[ResultadoSentencia]:
+        """Ejecutar en autocommit las sentencias que PostgreSQL no \
+            admite dentro de una transaccion (CREATE INDEX CONCURRENTLY)."""
+        if directiva.tipo != TIPO_SIN_TRANSACCION:
+            return super()._ejecutar_directiva(directiva)
+        if not self.cursor:
+            raise ValueError("Base de datos no conectada.")
+
+        sentencia = directiva.sentencia
+        if self.en_transaccion:
+            return [
+                ResultadoSentencia(
+                    sentencia,
+                    error="No puede ejecutarse dentro de una transaccion",
+                ),
+            ]
+
+        # autocommit solo se puede cambiar sin una transaccion abierta
         self.conexion.commit()
+        self.conexion.autocommit = True
+        try:
+            self.cursor.execute(sentencia)
+        except psycopg2.Error as err:
+            return [ResultadoSentencia(sentencia, error=str(err))]
+        finally:
+            self.conexion.autocommit = False
+        return [ResultadoSentencia(sentencia, self.cursor.rowcount)]
+
+    def _confirmar_lote(self) -> None:
+        """Confirmar un lote de un relleno, salvo dentro de \
+            sesion_arranque."""
+        if not self.en_transaccion:
+            self.conexion.commit()
+
+    def _deshacer_lote(self) -> None:
+        """Deshacer el lote fallido de un relleno, salvo dentro de \
+            sesion_arranque."""
+        if not self.en_transaccion:
+            self.conexion.rollback()
+
+    @contextmanager
+    def sesion_arranque(self) -> Iterator[None]:
+        """Crear el esquema en una sola transaccion; si una sentencia \
+            falla no queda nada creado."""
+        if not self.cursor:
+            raise ValueError("Base de datos no conectada.")
+
+        self.en_transaccion = True
+        try:
+            yield
+        except BaseException:
+            self.conexion.rollback()
+            raise
+        else:
+            self.conexion.commit()
+        finally:
+            self.en_transaccion = False
 
     def cerrar_conexion(self) -> None:
-        """Cerrar la conexión a la base de datos."""
+        """Cerrar la conexión a la base de datos (con pool, la conexion \
+            se devuelve para reutilizarla)."""
         if self.cursor:
             self.cursor.close()
         if self.conexion:
-            self.conexion.close()
+            reutilizable = True
+            if self.pool:
+                # la siguiente sesion no hereda cambios sin confirmar
+                try:
+                    self.conexion.rollback()
+                except psycopg2.Error:
+                    reutilizable = False
+            self._liberar_conexion(reutilizable)
+        self.conexion = None
+        self.cursor = None
+
+    def _conexion_valida(self, conexion) -> bool:
+        """Comprobar que una conexion del pool sigue viva."""
+        if conexion.closed:
+            return False
+        try:
+            with conexion.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            conexion.rollback()
+        except psycopg2.Error:
+            return False
+        return True
 
     def empty_database(self) -> bool:
         """Verificar si la base de datos está vacía."""
@@ -114,5 +308,14 @@ class AdaptadorPostgreSQL(AdaptadorDatabase):
             "SELECT table_name FROM information_schema.tables "
             "WHERE table_schema = 'public';",
         )
-        tablas = self.cursor.fetchall()
-        return len(tablas) == 0
+        # la tabla del historial no forma parte del esquema
+        tablas = {tabla for (tabla,) in self.cursor.fetchall()}
+        return not tablas - {TABLA_HISTORIAL}
+
+
+class AdaptadorPostgreSQLAsincrono(AdaptadorAsincrono):
+    """Adaptador asyncio para bases de datos PostgreSQL."""
+
+    def __init__(self):
+        """Implementacion del adaptador PostgreSQL asincrono."""
+        super().__init__(AdaptadorPostgreSQL())
@@ -0,0 +1,188 @@
+"""Modulo con la copia en tabla sombra de MySQL, usada para los \
+    ALTER TABLE que copian la tabla sin bloquear sus escrituras."""
+
+from dataclasses import replace
+from typing import List, Optional, Sequence
+
+import mysql.connector
+
+from ..adaptador_database import ResultadoSentencia
+from ..relleno import (
+    MARCA_RANGO,
+    ConfiguracionRelleno,
+    PasoRelleno,
+    rellenar_por_lotes,
+)
+from ...utilidades.perfilador import obtener_perfilador
+
+CLAVE = "id"
+
+_COLUMNAS = (
+    "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+    "ORDER BY ORDINAL_POSITION;"
+)
+_CLAVES_FORANEAS = (
+    "SELECT COUNT(*) FROM information_schema.KEY_COLUMN_USAGE "
+    "WHERE TABLE_SCHEMA = DATABASE() "
+    "AND REFERENCED_TABLE_NAME IS NOT NULL "
+    "AND %s IN (TABLE_NAME, REFERENCED_TABLE_NAME);"
+)
+
+
+def _nombre(identificador: str) -> str:
+    """Identificador MySQL entre comillas invertidas."""
+    return f"`{identificador}`"
+
+
+class CopiaTablaSombra:
+    """
+    Aplica un ALTER TABLE sobre una copia de la tabla y la intercambia \
+        con la original.
+
+    Pasos: crear la tabla sombra con el ALTER aplicado, replicar con \
+        triggers las escrituras que llegan durante la copia, copiar \
+        las filas por rangos de clave primaria e intercambiar las \
+        tablas con un RENAME TABLE atomico.
+    """
+
+    def __init__(
+        self,
+        conexion,
+        tabla: str,
+        alteraciones: str,
+        configuracion: Optional[ConfiguracionRelleno] = None,
+    ):
+        """
+        Inicializa la copia.
+
+        :param conexion: Conexion MySQL abierta.
+        :param tabla: Tabla a modificar (sin comillas).
+        :param alteraciones: Clausulas del ALTER TABLE, sin ALGORITHM \
+            ni LOCK.
+        :param configuracion: Lotes de la copia de filas; una copia \
+            fallida se descarta, asi que no se reanuda.
+        """
+        self.conexion = conexion
+        self.cursor = conexion.cursor()
+        self.tabla = tabla
+        self.alteraciones = alteraciones
+        self.configuracion = replace(
+            configuracion or ConfiguracionRelleno(),
+            progreso=None,
+        )
+        self.sombra = f"_{tabla}_sombra"
+        self.antigua = f"_{tabla}_antigua"
+        self.columnas: List[str] = []
+        # un trigger por escritura: insercion, actualizacion y borrado
+        sufijos = ("ai", "au", "ad")
+        self.triggers = [f"{self.sombra}_{sufijo}" for sufijo in sufijos]
+
+    def _ejecutar(self, sql: str, parametros: Sequence = ()) -> None:
+        """Ejecutar una sentencia de la copia midiendola."""
+        with obtener_perfilador().sentencia(sql):
+            self.cursor.execute(sql, tuple(parametros))
+
+    def _columnas(self, tabla: str) -> List[str]:
+        """Columnas de una tabla, en su orden."""
+        self._ejecutar(_COLUMNAS, (tabla,))
+        return [fila[0] for fila in self.cursor.fetchall()]
+
+    def ejecutar(self, sentencia: str) -> ResultadoSentencia:
+        """
+        Ejecuta la copia completa.
+
+        :param sentencia: ALTER TABLE equivalente, usado en el resultado.
+        :return: Resultado con las filas copiadas o el error; si falla \
+            antes del intercambio la tabla original no cambia.
+        """
+        tabla = _nombre(self.tabla)
+        antigua = _nombre(self.antigua)
+        sombra = _nombre(self.sombra)
+        try:
+            self._ejecutar(_CLAVES_FORANEAS, (self.tabla,))
+            if self.cursor.fetchone()[0]:
+                # CREATE TABLE ... LIKE no copia las claves foraneas y
+                # las que apuntan a la tabla seguirian a la antigua
+                return ResultadoSentencia(
+                    sentencia,
+                    error=f"La tabla '{self.tabla}' tiene claves "
+                    "foraneas; no se puede copiar en una tabla sombra",
+                )
+
+            self._crear_sombra()
+            filas = self._copiar_filas()
+            intercambio = f"{tabla} TO {antigua}, {sombra} TO {tabla}"
+            self._ejecutar(f"RENAME TABLE {intercambio};")
+            # los triggers se van con la tabla antigua
+            self._ejecutar(f"DROP TABLE {antigua};")
+        except mysql.connector.Error as err:
+            self._limpiar()
+            return ResultadoSentencia(sentencia, error=str(err))
+        finally:
+            self.cursor.close()
+
+        return ResultadoSentencia(sentencia, filas, algoritmo="COPY")
+
+    def _crear_sombra(self) -> None:
+        """Crear la tabla sombra y los triggers que le replican las \
+            escrituras de la tabla original."""
+        tabla = _nombre(self.tabla)
+        sombra = _nombre(self.sombra)
+        self._ejecutar(f"DROP TABLE IF EXISTS {sombra};")
+        self._ejecutar(f"CREATE TABLE {sombra} LIKE {tabla};")
+        self._ejecutar(f"ALTER TABLE {sombra} {self.alteraciones};")
+
+        # solo se copian las columnas que siguen existiendo
+        nuevas = set(self._columnas(self.sombra))
+        columnas = self._columnas(self.tabla)
+        self.columnas = [columna for columna in columnas if columna in nuevas]
+        lista = ", ".join(_nombre(columna) for columna in self.columnas)
+        valores = ", ".join(f"NEW.{_nombre(c)}" for c in self.columnas)
+        replicar = f"REPLACE INTO {sombra} ({lista}) VALUES ({valores})"
+        clave = _nombre(CLAVE)
+        insercion, actualizacion, borrado = self.triggers
+        self._ejecutar(
+            f"CREATE TRIGGER {_nombre(insercion)} AFTER INSERT "
+            f"ON {tabla} FOR EACH ROW {replicar};"
+        )
+        self._ejecutar(
+            f"CREATE TRIGGER {_nombre(actualizacion)} AFTER UPDATE "
+            f"ON {tabla} FOR EACH ROW {replicar};"
+        )
+        self._ejecutar(
+            f"CREATE TRIGGER {_nombre(borrado)} AFTER DELETE "
+            f"ON {tabla} FOR EACH ROW "
+            f"DELETE FROM {sombra} WHERE {clave} = OLD.{clave};"
+        )
+
+    def _copiar_filas(self) -> int:
+        """Copiar las filas por rangos de clave, confirmando cada \
+            lote para no retener bloqueos."""
+        tabla = _nombre(self.tabla)
+        lista = ", ".join(_nombre(columna) for columna in self.columnas)
+        # las filas ya replicadas por los triggers son mas recientes
+        copiar = PasoRelleno(
+            tabla,
+            f"INSERT IGNORE INTO {_nombre(self.sombra)} ({lista}) "
+            f"SELECT {lista} FROM {tabla} WHERE {MARCA_RANGO};",
+            _nombre(CLAVE),
+        )
+        return rellenar_por_lotes(
+            self.cursor,
+            copiar,
+            self.configuracion,
+            self.conexion.commit,
+            self._ejecutar,
+        )
+
+    def _limpiar(self) -> None:
+        """Eliminar los triggers y la tabla sombra de una copia fallida."""
+        try:
+            for trigger in self.triggers:
+                self._ejecutar(f"DROP TRIGGER IF EXISTS {_nombre(trigger)};")
+            self._ejecutar(f"DROP TABLE IF EXISTS {_nombre(self.sombra)};")
+        except mysql.connector.Error:
+            # la conexion puede haberse perdido; el error original
+            # es el que se informa
+            pass
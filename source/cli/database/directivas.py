@@ -0,0 +1,80 @@
+"""Directivas de ejecucion incluidas en los scripts SQL como \
+    comentarios."""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Union
+
+from .tokenizador_sql import DIALECTO_MYSQL, DialectoSQL, dividir_sentencias
+
+PREFIJO_DIRECTIVA = "-- graphqlstore:"
+# ALTER TABLE aplicado con una copia en tabla sombra (MySQL)
+TIPO_TABLA_SOMBRA = "tabla-sombra"
+# sentencia que se ejecuta fuera de la transaccion del script, porque no
+# puede ejecutarse en una o para no retener sus bloqueos (PostgreSQL)
+TIPO_SIN_TRANSACCION = "sin-transaccion"
+# sentencia que mueve datos, aplicada por rangos de clave primaria
+TIPO_RELLENO = "relleno"
+# eliminacion de la constraint unique de una columna con el nombre que
+# tiene en la base de datos: las creadas antes de llamarlas
+# uk_<tabla>_<columna> conservan su nombre anterior
+TIPO_ELIMINAR_UNIQUE = "eliminar-unique"
+_LINEA_DIRECTIVA = re.compile(
+    rf"^{re.escape(PREFIJO_DIRECTIVA)}([\w-]+)[ \t]*(.*)$",
+    re.MULTILINE,
+)
+
+
+@dataclass(frozen=True)
+class Directiva:
+    """Operacion que el adaptador ejecuta en lugar de la sentencia \
+        siguiente del script.
+
+    Un cliente SQL cualquiera ignora el comentario y ejecuta la \
+        sentencia, que debe dar el mismo resultado final.
+    """
+
+    tipo: str
+    datos: Dict[str, Any] = field(default_factory=dict)
+    sentencia: str = ""
+
+    def linea(self) -> str:
+        """Comentario que marca la directiva en el script."""
+        datos = json.dumps(self.datos, ensure_ascii=False)
+        return f"{PREFIJO_DIRECTIVA}{self.tipo} {datos}"
+
+    def con_sentencia(self) -> str:
+        """Comentario de la directiva seguido de su sentencia."""
+        return f"{self.linea()}\n{self.sentencia}"
+
+
+def dividir_script(
+    script: str,
+    dialecto: DialectoSQL = DIALECTO_MYSQL,
+) -> List[Union[str, Directiva]]:
+    """
+    Divide un script en sentencias y directivas.
+
+    :param script: Texto SQL con sentencias, comentarios y directivas.
+    :param dialecto: Reglas lexicas del motor.
+    :return: Sentencias en orden; cada directiva sustituye a la \
+        sentencia que la sigue y la guarda en ``sentencia``.
+    """
+    partes = _LINEA_DIRECTIVA.split(script)
+    resultado: List[Union[str, Directiva]] = []
+    resultado.extend(dividir_sentencias(partes[0], dialecto))
+
+    # partes: texto, tipo, datos, texto, tipo, datos, texto...
+    for indice in range(1, len(partes), 3):
+        tipo = partes[indice]
+        datos = partes[indice + 1]
+        texto = partes[indice + 2]
+        sentencias = dividir_sentencias(texto, dialecto)
+        if not sentencias:
+            continue
+        resultado.append(
+            Directiva(tipo, json.loads(datos or "{}"), sentencias[0]),
+        )
+        resultado.extend(sentencias[1:])
+    return resultado
@@ -0,0 +1,91 @@
+"""Modulo con el historial de migraciones que los adaptadores guardan \
+    en la propia base de datos."""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from .directivas import PREFIJO_DIRECTIVA
+
+if TYPE_CHECKING:
+    from ..graphql.configuracion_y_constantes import EstadoMigracion
+
+TABLA_HISTORIAL = "graphqlstore_migraciones"
+# el indice (estado, actualizada) resuelve la consulta sin leer la tabla
+INDICE_HISTORIAL = "ix_graphqlstore_migraciones_estado"
+_COLUMNAS_HISTORIAL = (
+    "id, estado, hash_esquema, checksum_sql, duracion, sentencias_aplicadas"
+)
+# migraciones sin terminar y la ultima aplicada, que indica el esquema
+# que tiene la base de datos (uno aplicado antes pudo revertirse despues)
+CONSULTA_ESTADO_HISTORIAL = (
+    f"SELECT {_COLUMNAS_HISTORIAL} FROM {TABLA_HISTORIAL} "
+    "WHERE estado IN (%s, %s) UNION ALL "
+    f"(SELECT {_COLUMNAS_HISTORIAL} FROM {TABLA_HISTORIAL} "
+    "WHERE estado = %s ORDER BY actualizada DESC, id DESC LIMIT 1);"
+)
+
+
+def _sha256(contenido: str) -> str:
+    """Huella hexadecimal de un texto."""
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def hash_esquema(esquema: str) -> str:
+    """Identifica el esquema GraphQL que deja aplicado una migracion."""
+    return _sha256(esquema)
+
+
+def checksum_sql(sql: str) -> str:
+    """Identifica el SQL aplicado por una migracion; los comentarios no \
+        cuentan (la cabecera lleva la fecha de generacion), asi el mismo \
+        SQL generado de nuevo tiene el mismo checksum."""
+    lineas = []
+    for linea in sql.splitlines():
+        linea = linea.strip()
+        if not linea:
+            continue
+        if linea.startswith("--") and not linea.startswith(PREFIJO_DIRECTIVA):
+            continue
+        lineas.append(linea)
+    return _sha256("\n".join(lineas))
+
+
+@dataclass
+class RegistroMigracion:
+    """Clase con una fila del historial de migraciones."""
+
+    id_migracion: str
+    hash_esquema: str
+    checksum_sql: str
+    estado: "EstadoMigracion"
+    # segundos que tardo en aplicarse (None mientras esta pendiente)
+    duracion: Optional[float] = None
+    # partes del script ya aplicadas, para reanudar un reintento
+    sentencias_aplicadas: int = 0
+
+    def parametros(self) -> Tuple:
+        """Valores de la fila en el orden de las columnas."""
+        return (
+            self.id_migracion,
+            self.hash_esquema,
+            self.checksum_sql,
+            self.estado.value,
+            self.duracion,
+            self.sentencias_aplicadas,
+        )
+
+
+@dataclass
+class ResumenHistorial:
+    """Clase con lo que indica el historial antes de migrar."""
+
+    # el esquema destino es el de la ultima migracion aplicada
+    esquema_aplicado: bool = False
+    # migraciones pendientes o fallidas
+    sin_terminar: List[RegistroMigracion] = field(default_factory=list)
+
+    @property
+    def hay_pendientes(self) -> bool:
+        """Indica si queda algo por aplicar."""
+        return not self.esquema_aplicado or bool(self.sin_terminar)
@@ -0,0 +1,218 @@
+"""Modulo para reutilizar conexiones a la base de datos."""
+
+import atexit
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+# claves opcionales de .graphqlstore_config.json
+CLAVE_TAMANO = "DB_POOL_TAMANO"
+CLAVE_INACTIVIDAD = "DB_POOL_INACTIVIDAD"
+CLAVE_VERIFICAR = "DB_POOL_VERIFICAR_TRAS"
+CLAVE_ESPERA = "DB_POOL_ESPERA"
+
+
+@dataclass(frozen=True)
+class ConfiguracionPool:
+    """Clase con los parametros del pool de conexiones."""
+
+    tamano: int = 5
+    # segundos sin uso tras los que una conexion libre se cierra
+    inactividad: float = 300.0
+    # segundos sin uso tras los que se comprueba la conexion al reusarla
+    verificar_tras: float = 30.0
+    # segundos de espera por una conexion cuando el pool esta lleno
+    espera: float = 30.0
+
+    @classmethod
+    def desde_config(cls, config: dict) -> Optional["ConfiguracionPool"]:
+        """
+        Lee los parametros del pool de la configuracion.
+
+        :param config: Configuracion de la conexion.
+        :return: Parametros del pool, o None si no se configuro \
+            ``DB_POOL_TAMANO`` (cada comando abre su propia conexion).
+        """
+        tamano = int(config.get(CLAVE_TAMANO, 0) or 0)
+        if tamano <= 0:
+            return None
+
+        defecto = cls()
+        inactividad = config.get(CLAVE_INACTIVIDAD, defecto.inactividad)
+        verificar_tras = config.get(CLAVE_VERIFICAR, defecto.verificar_tras)
+        return cls(
+            tamano=tamano,
+            inactividad=float(inactividad),
+            verificar_tras=float(verificar_tras),
+            espera=float(config.get(CLAVE_ESPERA, defecto.espera)),
+        )
+
+
+class PoolConexiones:
+    """Clase que mantiene conexiones abiertas para reutilizarlas.
+
+    Las conexiones libres se reutilizan de la mas reciente a la mas \
+        antigua; las que pasan ``inactividad`` segundos sin uso se cierran \
+        y las que no pasan la verificacion se descartan.
+    """
+
+    def __init__(
+        self,
+        crear: Callable[[], Any],
+        verificar: Callable[[Any], bool],
+        configuracion: ConfiguracionPool,
+    ):
+        """
+        Inicializa el pool.
+
+        :param crear: Abre una conexion nueva.
+        :param verificar: Comprueba que una conexion sigue viva.
+        :param configuracion: Parametros del pool.
+        """
+        self.crear = crear
+        self.verificar = verificar
+        self.configuracion = configuracion
+        self._libres: Deque[Tuple[Any, float]] = deque()
+        self._abiertas = 0
+        self._condicion = threading.Condition()
+
+    @property
+    def libres(self) -> int:
+        """Numero de conexiones libres."""
+        return len(self._libres)
+
+    @property
+    def abiertas(self) -> int:
+        """Numero de conexiones abiertas (libres y en uso)."""
+        return self._abiertas
+
+    def obtener(self) -> Any:
+        """
+        Obtiene una conexion libre o abre una nueva.
+
+        :raises TimeoutError: Si el pool esta lleno durante ``espera`` \
+            segundos.
+        """
+        limite = time.monotonic() + self.configuracion.espera
+        with self._condicion:
+            while True:
+                self._desalojar_inactivas()
+                while self._libres:
+                    conexion, ultimo_uso = self._libres.pop()
+                    inactiva = time.monotonic() - ultimo_uso
+                    if inactiva < self.configuracion.verificar_tras or (
+                        self.verificar(conexion)
+                    ):
+                        return conexion
+                    self._cerrar(conexion)
+
+                if self._abiertas < self.configuracion.tamano:
+                    # se reserva el hueco antes de abrir la conexion
+                    self._abiertas += 1
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise TimeoutError(
+                        "No hay conexiones libres en el pool "
+                        f"({self.configuracion.tamano} en uso)"
+                    )
+                self._condicion.wait(restante)
+
+        try:
+            return self.crear()
+        except BaseException:
+            with self._condicion:
+                self._abiertas -= 1
+                self._condicion.notify()
+            raise
+
+    def devolver(self, conexion: Any) -> None:
+        """Devuelve una conexion en buen estado al pool."""
+        with self._condicion:
+            self._libres.append((conexion, time.monotonic()))
+            self._desalojar_inactivas()
+            self._condicion.notify()
+
+    def descartar(self, conexion: Any) -> None:
+        """Cierra una conexion en uso que ya no es valida."""
+        with self._condicion:
+            self._cerrar(conexion)
+            self._condicion.notify()
+
+    @contextmanager
+    def conexion(self) -> Iterator[Any]:
+        """Presta una conexion durante el bloque."""
+        conexion = self.obtener()
+        try:
+            yield conexion
+        except BaseException:
+            self.descartar(conexion)
+            raise
+        self.devolver(conexion)
+
+    def cerrar(self) -> None:
+        """Cierra todas las conexiones libres."""
+        with self._condicion:
+            while self._libres:
+                conexion, _ = self._libres.popleft()
+                self._cerrar(conexion)
+
+    def _desalojar_inactivas(self) -> None:
+        """Cerrar las conexiones libres inactivas (las mas antiguas \
+            estan al principio)."""
+        limite = time.monotonic() - self.configuracion.inactividad
+        while self._libres and self._libres[0][1] < limite:
+            conexion, _ = self._libres.popleft()
+            self._cerrar(conexion)
+
+    def _cerrar(self, conexion: Any) -> None:
+        """Cerrar una conexion ignorando si ya estaba cerrada."""
+        self._abiertas -= 1
+        try:
+            conexion.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # la conexion ya estaba rota, solo se libera su hueco
+            pass
+
+
+# pools del proceso, compartidos por todos los adaptadores
+_pools: Dict[Tuple, PoolConexiones] = {}
+_candado_pools = threading.Lock()
+
+
+def obtener_pool(
+    clave: Tuple,
+    crear: Callable[[], Any],
+    verificar: Callable[[Any], bool],
+    configuracion: ConfiguracionPool,
+) -> PoolConexiones:
+    """
+    Devuelve el pool de una base de datos, creandolo la primera vez.
+
+    :param clave: Identifica el servidor, usuario y base de datos.
+    :param crear: Abre una conexion nueva.
+    :param verificar: Comprueba que una conexion sigue viva.
+    :param configuracion: Parametros del pool.
+    :return: Pool compartido para la clave.
+    """
+    with _candado_pools:
+        pool = _pools.get(clave)
+        if pool is None:
+            pool = PoolConexiones(crear, verificar, configuracion)
+            _pools[clave] = pool
+        return pool
+
+
+def cerrar_pools() -> None:
+    """Cierra las conexiones libres de todos los pools."""
+    with _candado_pools:
+        for pool in _pools.values():
+            pool.cerrar()
+        _pools.clear()
+
+
+atexit.register(cerrar_pools)
@@ -0,0 +1,198 @@
+"""Modulo con el relleno de datos por rangos de clave primaria, para \
+    mover los datos de una tabla en transacciones cortas."""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utilidades.gestor_archivo import GestorArchivo
+
+# filas de cada lote
+TAM_LOTE_RELLENO = 1000
+# marca de la sentencia donde va la condicion del rango
+MARCA_RANGO = "{rango}"
+ARCHIVO_PROGRESO_RELLENO = ".relleno_progreso.json"
+
+
+@dataclass(frozen=True)
+class PasoRelleno:
+    """
+    Sentencia que mueve datos, aplicada por rangos de clave.
+
+    ``sentencia`` contiene ``{rango}`` donde va la condicion del lote; \
+        ``tabla`` y ``clave`` son identificadores tal como se escriben \
+        en el SQL.
+    """
+
+    tabla: str
+    sentencia: str
+    clave: str = "id"
+
+    @property
+    def huella(self) -> str:
+        """Identifica el paso para reanudarlo."""
+        contenido = f"{self.tabla}\0{self.clave}\0{self.sentencia}"
+        return hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:16]
+
+    def _rango(self, desde: Any, hasta: Any) -> Tuple[str, List[Any]]:
+        """Condicion de las claves en (desde, hasta]; None es sin limite."""
+        condiciones: List[str] = []
+        parametros: List[Any] = []
+        if desde is not None:
+            condiciones.append(f"{self.clave} > %s")
+            parametros.append(desde)
+        if hasta is not None:
+            condiciones.append(f"{self.clave} <= %s")
+            parametros.append(hasta)
+        return " AND ".join(condiciones) or "1 = 1", parametros
+
+    def sentencia_lote(
+        self,
+        desde: Any,
+        hasta: Any,
+    ) -> Tuple[str, List[Any]]:
+        """Sentencia y parametros del lote de claves (desde, hasta]."""
+        condicion, parametros = self._rango(desde, hasta)
+        # los % del texto no son parametros del driver
+        plantilla = self.sentencia.replace("%", "%%")
+        return plantilla.replace(MARCA_RANGO, condicion), parametros
+
+    def consulta_limite(
+        self,
+        desde: Any,
+        tam_lote: int,
+    ) -> Tuple[str, List[Any]]:
+        """Consulta de la ultima clave del lote que empieza en desde."""
+        condicion, parametros = self._rango(desde, None)
+        sql = (
+            f"SELECT {self.clave} FROM {self.tabla} WHERE {condicion} "
+            f"ORDER BY {self.clave} LIMIT 1 OFFSET {tam_lote - 1};"
+        )
+        return sql, parametros
+
+
+class ProgresoRelleno:
+    """Clase que guarda en disco la ultima clave completada de cada \
+        paso, para reanudar un relleno interrumpido."""
+
+    def __init__(self, ruta: Path, ambito: str = ""):
+        """
+        Inicializa el progreso.
+
+        :param ruta: Archivo JSON del progreso.
+        :param ambito: Migracion a la que pertenecen los pasos; el \
+            mismo paso de otra migracion empieza desde el principio.
+        """
+        self.ruta = ruta
+        self.ambito = ambito
+        # se lee al empezar el primer paso
+        self.claves: Optional[Dict[str, Any]] = None
+
+    def _clave(self, paso: PasoRelleno) -> str:
+        """Entrada del paso en el archivo de progreso."""
+        return f"{self.ambito}:{paso.huella}" if self.ambito else paso.huella
+
+    def _cargar(self) -> Dict[str, Any]:
+        """Leer el progreso de la ejecucion anterior."""
+        if self.claves is None:
+            self.claves = {}
+            if self.ruta.exists():
+                try:
+                    contenido = GestorArchivo.leer_archivo(self.ruta)
+                    self.claves = json.loads(contenido)
+                except (OSError, ValueError):
+                    pass
+        return self.claves
+
+    def ultima_clave(self, paso: PasoRelleno) -> Any:
+        """Ultima clave completada del paso, o None si no empezo."""
+        return self._cargar().get(self._clave(paso))
+
+    def registrar(self, paso: PasoRelleno, clave: Any) -> None:
+        """Guarda la ultima clave completada del paso."""
+        self._cargar()[self._clave(paso)] = clave
+        self._guardar()
+
+    def terminar(self, paso: PasoRelleno) -> None:
+        """Olvida un paso terminado; sin pasos se elimina el archivo."""
+        claves = self._cargar()
+        claves.pop(self._clave(paso), None)
+        if claves:
+            self._guardar()
+        else:
+            self.ruta.unlink(missing_ok=True)
+
+    def _guardar(self) -> None:
+        """Escribir el progreso en disco."""
+        GestorArchivo.asegurar_dir_existe(self.ruta.parent)
+        GestorArchivo.escribir_archivo(json.dumps(self.claves), self.ruta)
+
+
+@dataclass
+class ConfiguracionRelleno:
+    """Clase con los ajustes de los rellenos por lotes."""
+
+    tam_lote: int = TAM_LOTE_RELLENO
+    # segundos de espera entre lotes, para no saturar la replicacion
+    pausa: float = 0.0
+    progreso: Optional[ProgresoRelleno] = None
+    # recibe el paso, las filas acumuladas y la ultima clave
+    al_avanzar: Optional[Callable[[PasoRelleno, int, Any], None]] = None
+
+
+def rellenar_por_lotes(
+    cursor,
+    paso: PasoRelleno,
+    configuracion: ConfiguracionRelleno,
+    confirmar: Callable[[], None],
+    ejecutar: Optional[Callable[[str, Sequence], None]] = None,
+) -> int:
+    """
+    Aplica un paso de relleno lote a lote.
+
+    Cada lote se confirma antes de buscar el siguiente, asi ninguna \
+        transaccion retiene bloqueos ni deshacer de toda la tabla.
+
+    :param cursor: Cursor DB-API de la conexion.
+    :param paso: Sentencia a aplicar por rangos de clave.
+    :param configuracion: Tamano de lote, pausa, progreso y aviso.
+    :param confirmar: Confirma la transaccion de un lote.
+    :param ejecutar: Ejecuta una sentencia con parametros (por \
+        defecto ``cursor.execute``).
+    :return: Filas afectadas por todos los lotes.
+    """
+    if ejecutar is None:
+        ejecutar = cursor.execute
+    progreso = configuracion.progreso
+
+    desde = progreso.ultima_clave(paso) if progreso else None
+    filas = 0
+    while True:
+        sql, parametros = paso.consulta_limite(desde, configuracion.tam_lote)
+        ejecutar(sql, tuple(parametros))
+        fila = cursor.fetchone()
+        # sin limite, el ultimo lote llega hasta el final de la tabla
+        hasta = fila[0] if fila else None
+
+        sql, parametros = paso.sentencia_lote(desde, hasta)
+        ejecutar(sql, tuple(parametros))
+        filas += max(cursor.rowcount, 0)
+        confirmar()
+
+        if hasta is None:
+            if progreso:
+                progreso.terminar(paso)
+            if configuracion.al_avanzar:
+                configuracion.al_avanzar(paso, filas, desde)
+            return filas
+
+        desde = hasta
+        if progreso:
+            progreso.registrar(paso, desde)
+        if configuracion.al_avanzar:
+            configuracion.al_avanzar(paso, filas, desde)
+        if configuracion.pausa:
+            time.sleep(configuracion.pausa)
@@ -0,0 +1,84 @@
+"""Modulo para dividir scripts SQL en sentencias."""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Pattern
+
+
+@dataclass(frozen=True)
+class DialectoSQL:
+    """Clase con las diferencias lexicas entre motores."""
+
+    # en MySQL "#" inicia un comentario y "\" escapa dentro de cadenas
+    comentarios_almohadilla: bool = False
+    escapes_barra: bool = False
+
+
+DIALECTO_MYSQL = DialectoSQL(comentarios_almohadilla=True, escapes_barra=True)
+DIALECTO_POSTGRESQL = DialectoSQL()
+
+
+@lru_cache(maxsize=None)
+def _patron_tokens(dialecto: DialectoSQL) -> Pattern[str]:
+    """Construir la expresion que reconoce cadenas, comentarios y ';'."""
+    escape = r"\\." if dialecto.escapes_barra else r"(?!)"
+    caracter = r"[^'\\]" if dialecto.escapes_barra else r"[^']"
+    caracter_doble = r'[^"\\]' if dialecto.escapes_barra else r'[^"]'
+    alternativas = [
+        rf"(?P<cadena>'(?:{caracter}|{escape}|'')*'"
+        rf'|"(?:{caracter_doble}|{escape}|"")*"'
+        r"|`(?:[^`]|``)*`"
+        r"|\$(?P<etiqueta>[A-Za-z_]\w*|)\$.*?\$(?P=etiqueta)\$)",
+        r"(?P<linea>--[^\n]*)",
+        r"(?P<bloque>/\*.*?\*/)",
+        r"(?P<fin>;)",
+    ]
+    if dialecto.comentarios_almohadilla:
+        alternativas.append(r"(?P<almohadilla>\#[^\n]*)")
+    return re.compile("|".join(alternativas), re.DOTALL)
+
+
+def dividir_sentencias(
+    script: str,
+    dialecto: DialectoSQL = DIALECTO_MYSQL,
+) -> List[str]:
+    """
+    Divide un script en sentencias terminadas en ';'.
+
+    Los ';' dentro de cadenas, identificadores entre comillas, bloques \
+        $$ de PostgreSQL y comentarios no separan sentencias. Los \
+        comentarios se eliminan y las sentencias vacias se descartan.
+
+    :param script: Texto SQL con una o varias sentencias.
+    :param dialecto: Reglas lexicas del motor.
+    :return: Lista de sentencias, cada una terminada en ';'.
+    """
+    sentencias: List[str] = []
+    partes: List[str] = []
+    posicion = 0
+
+    for token in _patron_tokens(dialecto).finditer(script):
+        inicio = token.start()
+        partes.append(script[posicion:inicio])
+        posicion = token.end()
+
+        if token.group("cadena") is not None:
+            partes.append(token.group())
+        elif token.group("bloque") is not None:
+            # un comentario de bloque separa los tokens que lo rodean
+            partes.append(" ")
+        elif token.group("fin") is not None:
+            _agregar_sentencia(sentencias, partes)
+            partes = []
+
+    partes.append(script[posicion:])
+    _agregar_sentencia(sentencias, partes)
+    return sentencias
+
+
+def _agregar_sentencia(sentencias: List[str], partes: List[str]) -> None:
+    """Agregar la sentencia formada por las partes si no esta vacia."""
+    sentencia = "".join(partes).strip()
+    if sentencia:
+        sentencias.append(f"{sentencia};")
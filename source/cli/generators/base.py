@@ -1,13 +1,25 @@
 """Base module for database schema generators."""
 
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Optional
+from dataclasses import asdict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
 from rich.console import Console
 from rich.tree import Tree
 from rich.syntax import Syntax
 from rich.panel import Panel
 
 from source.cli.graphql.exceptions import RelationshipError
+from source.cli.utilidades.perfilador import medir_fase
+from source.cli.graphql.nombres_constraint import (
+    LONGITUD_MAXIMA_IDENTIFICADOR,
+    RegistroNombresConstraint,
+)
+from .call_state import CallState, SchemaGenerationState, StateAttribute
+from .dependency_order import (
+    InlineForeignKey,
+    is_inline_relationship,
+    order_tables,
+)
 
 
 from ..graphql.configuracion_y_constantes import (
@@ -21,13 +33,36 @@ from ..graphql.configuracion_y_constantes import (
 
 
 class BaseSchemaGenerator(ABC):
-    """Base abstract class for database schema generators."""
+    """Base abstract class for database schema generators.
+
+    The state of each generation (options, constraint names, generated \
+        tables) lives in a per-call state object, so one instance can \
+        serve concurrent calls from several threads.
+    """
+
+    print_output = StateAttribute()
+    print_sql = StateAttribute()
+    registro_nombres = StateAttribute()
+    schema_sql = StateAttribute()
+    store_schema_sql = StateAttribute()
 
     def __init__(self):
         self.console = Console()
-        self.schema_sql = []
-        self.print_output = None
-        self.print_sql = None
+        self.call_state = CallState(self._new_state)
+
+    def _new_state(
+        self,
+        print_output: Optional[bool] = None,
+        print_sql: Optional[bool] = None,
+    ) -> SchemaGenerationState:
+        """Create the state of a new generate_schema call."""
+        return SchemaGenerationState(
+            registro_nombres=RegistroNombresConstraint(
+                self.get_max_identifier_length(),
+            ),
+            print_output=print_output,
+            print_sql=print_sql,
+        )
 
     @abstractmethod
     def get_type_mapping(self) -> Dict[str, str]:
@@ -75,6 +110,24 @@ class BaseSchemaGenerator(ABC):
     def get_database_type(self) -> DatabaseType:
         """Return the type of database handled by this generator."""
 
+    @abstractmethod
+    def get_foreign_key_column(self, foreign_key: InlineForeignKey) -> str:
+        """Return the column definition of an inline foreign key, used \
+            inside CREATE TABLE."""
+
+    @abstractmethod
+    def get_foreign_key_constraint(
+        self,
+        foreign_key: InlineForeignKey,
+    ) -> str:
+        """Return the constraint of an inline foreign key, used inside \
+            CREATE TABLE."""
+
+    def get_max_identifier_length(self) -> int:
+        """Return the maximum length of identifiers (constraint and \
+            index names) for the database engine."""
+        return LONGITUD_MAXIMA_IDENTIFICADOR
+
     def generate_schema(
         self,
         tables: Dict[str, InfoTabla],
@@ -82,13 +135,29 @@ class BaseSchemaGenerator(ABC):
         relationships: List[InfoRelacion],
         print_output: bool = True,
         print_sql: bool = True,
+        inline_foreign_keys: bool = False,
     ) -> str:
         # pylint: disable=too-many-arguments,too-many-positional-arguments
-        """Generates a database schema from a GraphQL schema."""
+        """Generates a database schema from a GraphQL schema.
+
+        With ``inline_foreign_keys`` the tables are created in dependency \
+            order with their foreign keys inside CREATE TABLE.
+        """
         schema_sql = []
 
-        self.print_output = print_output
-        self.print_sql = print_sql
+        self.call_state.start(self._new_state(print_output, print_sql))
+        self._reserve_constraint_names(relationships)
+
+        if inline_foreign_keys:
+            return "\n\n".join(
+                self._iter_ordered_schema(
+                    tables,
+                    enums,
+                    relationships,
+                    print_output,
+                    print_sql,
+                )
+            )
 
         # generate tables
         tabla_sql = self._generate_tables(
@@ -112,6 +181,140 @@ class BaseSchemaGenerator(ABC):
         return join_schema_sql
         # pylint: enable=too-many-arguments,too-many-positional-arguments
 
+    def generate_schema_stream(
+        self,
+        tables: Dict[str, InfoTabla],
+        enums: Dict[str, InfoEnum],
+        relationships: List[InfoRelacion],
+        print_output: bool = True,
+        print_sql: bool = True,
+        inline_foreign_keys: bool = False,
+    ) -> Iterator[str]:
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """Yield the statements of the database schema one by one.
+
+        Nothing is generated until the iterator is consumed, and the \
+            statements are not kept in ``schema_sql``, so they can go \
+            straight to a file or to the database adapter.
+        """
+        state = self._new_state(print_output, print_sql)
+        state.store_schema_sql = False
+
+        def statements() -> Iterator[str]:
+            self._reserve_constraint_names(relationships)
+            if inline_foreign_keys:
+                yield from self._iter_ordered_schema(
+                    tables,
+                    enums,
+                    relationships,
+                    print_output,
+                    print_sql,
+                )
+                return
+            yield from self._iter_tables(
+                tables,
+                enums,
+                print_output,
+                print_sql,
+            )
+            yield from self._iter_relationships(tables, relationships)
+
+        return self.call_state.iterate(state, statements())
+        # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def _iter_ordered_schema(
+        self,
+        tables: Dict[str, InfoTabla],
+        enums: Dict[str, InfoEnum],
+        relationships: List[InfoRelacion],
+        print_output: bool = True,
+        print_sql: bool = True,
+    ) -> Iterator[str]:
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """Yield the schema with the tables in dependency order.
+
+        Each inline foreign key goes inside the CREATE TABLE of its table \
+            when the referenced table already exists. Only the foreign \
+            keys of a cycle are added afterwards with ALTER TABLE.
+        """
+        yield from self._iter_enum_types(enums)
+
+        inline = [rel for rel in relationships if is_inline_relationship(rel)]
+        build = self._build_inline_foreign_key
+        foreign_keys = [build(rel, tables) for rel in inline]
+        order = order_tables(tables, foreign_keys)
+        position = {name: index for index, name in enumerate(order)}
+
+        folded: Dict[str, List[InlineForeignKey]] = {n: [] for n in order}
+        deferred = []
+        for relationship, foreign_key in zip(inline, foreign_keys):
+            table_pos = position.get(foreign_key.table_fk)
+            ref_pos = position.get(foreign_key.table_ref)
+            if None not in (table_pos, ref_pos) and ref_pos <= table_pos:
+                folded[foreign_key.table_fk].append(foreign_key)
+            else:
+                deferred.append(relationship)
+
+        for table_name in order:
+            table_info = tables[table_name]
+            table_sql = self._generate_table(
+                table_name,
+                table_info,
+                enums,
+                folded[table_name],
+            )
+            if table_sql:
+                if print_output:
+                    self._print_output_tables(
+                        table_name,
+                        table_info,
+                        table_sql,
+                        print_sql,
+                    )
+                yield table_sql
+
+        # foreign keys that close a cycle
+        for relationship in deferred:
+            yield self._generate_relationship_inline(
+                relationship,
+                tables,
+                self.get_foreign_key_template,
+            )
+
+        for relationship in relationships:
+            if is_inline_relationship(relationship):
+                continue
+            relation_sql = self._generate_relationship(relationship, tables)
+            if relation_sql:
+                yield relation_sql
+        # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def _iter_enum_types(
+        self,
+        enums: Dict[str, InfoEnum],
+    ) -> Iterator[str]:
+        # pylint: disable=unused-argument
+        """Yield the statements creating the enum types (only for engines \
+            with named enum types)."""
+        yield from ()
+
+    def _reserve_constraint_names(
+        self,
+        relationships: List[InfoRelacion],
+    ) -> None:
+        """Reserve the constraint names of the relationships."""
+        # constraint names already allocated to the relationships share
+        # the registry with the names allocated while generating tables
+        for relationship in relationships:
+            self.registro_nombres.nombres_usados.update(
+                nombre
+                for nombre in (
+                    relationship.fuente.nombre_constraint_fuente,
+                    relationship.objetivo.nombre_constraint_objetivo,
+                )
+                if nombre
+            )
+
     def get_schema_sql(self) -> str:
         """Get the generated SQL schema."""
         return "\n\n".join(self.schema_sql)
@@ -175,6 +378,25 @@ class BaseSchemaGenerator(ABC):
         get_foreign_key_template: Callable,
     ) -> str:
         """Generar relaciones inline para MySQL."""
+        foreign_key = self._build_inline_foreign_key(relationship, tables)
+        sql_alter = get_foreign_key_template(**asdict(foreign_key))
+
+        self._print_output_relationships(
+            relationship=relationship,
+            data_sql=sql_alter,
+            print_output=self.print_output,
+            print_sql=self.print_sql,
+            sql_name=foreign_key.table_fk,
+        )
+        return sql_alter
+
+    def _build_inline_foreign_key(
+        self,
+        relationship: InfoRelacion,
+        tables: Dict[str, InfoTabla],
+    ) -> InlineForeignKey:
+        """Resolve the table, column and constraint of the foreign key \
+            of an inline relationship."""
         table_fk = self._determine_fk_table(relationship)
         field_fk = self._determine_fk_field(relationship)
 
@@ -219,7 +441,7 @@ class BaseSchemaGenerator(ABC):
 
         is_null = "" if not is_required else " NOT NULL"
 
-        sql_alter = get_foreign_key_template(
+        return InlineForeignKey(
             table_fk=table_fk,
             field_fk=field_fk,
             unique=unique,
@@ -229,15 +451,6 @@ class BaseSchemaGenerator(ABC):
             is_null=is_null,
         )
 
-        self._print_output_relationships(
-            relationship=relationship,
-            data_sql=sql_alter,
-            print_output=self.print_output,
-            print_sql=self.print_sql,
-            sql_name=table_fk,
-        )
-        return sql_alter
-
     def _get_current_on_delete(
         self,
         relationship: InfoRelacion,
@@ -281,14 +494,34 @@ class BaseSchemaGenerator(ABC):
     ) -> str:
         """Generates the SQL statements to create tables."""
 
+    def _iter_tables(
+        self,
+        tables: Dict[str, InfoTabla],
+        enums: Dict[str, InfoEnum],
+        print_output: bool = True,
+        print_sql: bool = True,
+    ) -> Iterator[str]:
+        """Yield the SQL statements to create tables (engines override \
+            it to stream them one by one)."""
+        tables_sql = self._generate_tables(
+            tables,
+            enums,
+            print_output,
+            print_sql,
+        )
+        if tables_sql:
+            yield tables_sql
+
     @abstractmethod
     def _generate_table(
         self,
         table_name: str,
         table_info: InfoTabla,
         enums: Dict[str, InfoEnum],
+        foreign_keys: Sequence[InlineForeignKey] = (),
     ) -> str:
-        """Generates the SQL statement to create a table."""
+        """Generates the SQL statement to create a table (with the inline \
+            foreign keys whose referenced table already exists)."""
 
     @abstractmethod
     def _generate_relationships(
@@ -298,6 +531,20 @@ class BaseSchemaGenerator(ABC):
     ) -> str:
         """Generates the SQL statements to create relationships."""
 
+    def _iter_relationships(
+        self,
+        tables: Dict[str, InfoTabla],
+        relationships: List[InfoRelacion],
+    ) -> Iterator[str]:
+        """Yield the SQL statements to create relationships (engines \
+            override it to stream them one by one)."""
+        relationships_sql = self._generate_relationships(
+            tables,
+            relationships,
+        )
+        if relationships_sql:
+            yield relationships_sql
+
     @abstractmethod
     def _generate_relationship(
         self,
@@ -306,6 +553,7 @@ class BaseSchemaGenerator(ABC):
     ) -> Optional[str]:
         """Generates the SQL statement to create a relationship."""
 
+    @medir_fase("renderizado")
     def _print_output_tables(
         self,
         table_name: str,
@@ -342,6 +590,7 @@ class BaseSchemaGenerator(ABC):
         msg = f"Type `{table_name}` created successfully :white_check_mark:"
         self.console.print(msg, style="bold green")
 
+    @medir_fase("renderizado")
     def _print_output_relationships(
         self,
         relationship: InfoRelacion,
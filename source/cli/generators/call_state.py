@@ -0,0 +1,132 @@
+"""Per-call state shared by the schema and migration generators."""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+from ..graphql.configuracion_y_constantes import (
+    InfoEnum,
+    InfoTabla,
+    ModoOnline,
+)
+from ..graphql.nombres_constraint import RegistroNombresConstraint
+
+T = TypeVar("T")
+
+
+@dataclass
+class SchemaGenerationState:
+    """State of a single generate_schema call."""
+
+    registro_nombres: RegistroNombresConstraint
+    print_output: Optional[bool] = None
+    print_sql: Optional[bool] = None
+    schema_sql: List[str] = field(default_factory=list)
+    # streaming mode does not keep a copy of every CREATE TABLE
+    store_schema_sql: bool = True
+
+
+@dataclass
+class MigrationState:
+    """State of a single migration run (diff and SQL generation)."""
+
+    print_output: bool = True
+    print_sql: bool = True
+    migrations_sql: List[str] = field(default_factory=list)
+    available_enums: Optional[Dict[str, InfoEnum]] = None
+    existing_tables: Optional[Dict[str, InfoTabla]] = None
+    processed_junction_tables: Set[str] = field(default_factory=set)
+    # how ALTER TABLE statements avoid locking (None: not online)
+    online: Optional[ModoOnline] = None
+
+
+class CallState(Generic[T]):
+    """Holds the state of the call running in each thread, so one \
+        generator instance can serve concurrent calls."""
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Initialize the holder.
+
+        :param factory: Builds the state of a thread with no call yet.
+        """
+        self._factory = factory
+        self._local = threading.local()
+
+    @property
+    def current(self) -> T:
+        """State of the call running in this thread."""
+        state = getattr(self._local, "state", None)
+        if state is None:
+            state = self._factory()
+            self._local.state = state
+        return state
+
+    def start(self, state: T) -> T:
+        """Make ``state`` the current state of this thread.
+
+        It stays current after the call returns (so results such as \
+            ``get_schema_sql()`` can still be read) and is replaced by \
+            the next call, so each thread keeps at most one state.
+        """
+        self._local.state = state
+        return state
+
+    @contextmanager
+    def activate(self, state: T) -> Iterator[T]:
+        """Make ``state`` current only inside the block."""
+        previous = getattr(self._local, "state", None)
+        self._local.state = state
+        try:
+            yield state
+        finally:
+            self._local.state = previous
+
+    def iterate(self, state: T, iterator: Iterator[str]) -> Iterator[str]:
+        """Run each step of a lazy iterator with its own state active.
+
+        Between steps the caller may run other calls on the same \
+            instance and thread without seeing this state.
+        """
+        while True:
+            with self.activate(state):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+class StateAttribute:
+    """Instance attribute stored in the current per-call state."""
+
+    def __init__(self, state_field: Optional[str] = None):
+        """
+        Initialize the descriptor.
+
+        :param state_field: Name of the field in the state (defaults to \
+            the attribute name).
+        """
+        self.state_field = state_field
+
+    def __set_name__(self, owner, name):
+        if self.state_field is None:
+            self.state_field = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj.call_state.current, self.state_field)
+
+    def __set__(self, obj, value):
+        setattr(obj.call_state.current, self.state_field, value)
@@ -0,0 +1,95 @@
+"""Dependency order of the tables for DDL with inline foreign keys."""
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set
+
+from ..graphql.configuracion_y_constantes import (
+    InfoRelacion,
+    TipoLink,
+    TipoRelacion,
+)
+
+
+@dataclass(frozen=True)
+class InlineForeignKey:
+    """Foreign key column of an inline relationship."""
+
+    table_fk: str
+    field_fk: str
+    unique: str
+    constraint: str
+    table_ref: str
+    on_delete: str
+    is_null: str
+
+
+def is_inline_relationship(relationship: InfoRelacion) -> bool:
+    """Check if the relationship is stored as a foreign key column."""
+    return relationship.tipo_link == TipoLink.INLINE.value and (
+        relationship.tipo_relation
+        in (
+            TipoRelacion.ONE_TO_ONE.value,
+            TipoRelacion.MANY_TO_ONE.value,
+            TipoRelacion.ONE_TO_MANY.value,
+        )
+    )
+
+
+def order_tables(
+    tables: Iterable[str],
+    foreign_keys: Iterable[InlineForeignKey],
+) -> List[str]:
+    """
+    Sort the tables so referenced tables are created first.
+
+    Kahn's algorithm with a queue of the tables whose references are \
+        all created, taken in schema order. When only cycles are left, \
+        the first remaining table is emitted and the foreign keys that \
+        still point forward are the only ones that need an ALTER TABLE.
+
+    :param tables: Table names in schema order.
+    :param foreign_keys: Inline foreign keys between the tables.
+    :return: Table names in creation order.
+    """
+    names = list(tables)
+    position = {name: index for index, name in enumerate(names)}
+    dependents: Dict[str, Set[str]] = {name: set() for name in names}
+    for fk in foreign_keys:
+        # self references are valid inside CREATE TABLE
+        if fk.table_ref == fk.table_fk:
+            continue
+        if fk.table_ref not in position or fk.table_fk not in position:
+            continue
+        dependents[fk.table_ref].add(fk.table_fk)
+
+    in_degree = {name: 0 for name in names}
+    for referencing in dependents.values():
+        for name in referencing:
+            in_degree[name] += 1
+
+    ready = [position[name] for name in names if in_degree[name] == 0]
+    heapq.heapify(ready)
+    order: List[str] = []
+    created: Set[str] = set()
+    # first table in schema order that may still be pending
+    next_pending = 0
+    while len(order) < len(names):
+        if ready:
+            name = names[heapq.heappop(ready)]
+            if name in created:
+                continue
+        else:
+            # break the cycle with the first table in schema order
+            while names[next_pending] in created:
+                next_pending += 1
+            name = names[next_pending]
+
+        order.append(name)
+        created.add(name)
+        for dependent in dependents[name]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0 and dependent not in created:
+                heapq.heappush(ready, position[dependent])
+
+    return order
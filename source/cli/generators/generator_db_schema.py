@@ -1,6 +1,6 @@
 """Refactored module that maintains backward compatibility."""
 
-from typing import Dict, List
+from typing import Dict, Iterator, List
 from ..graphql.configuracion_y_constantes import (
     InfoEnum,
     InfoRelacion,
@@ -60,6 +60,7 @@ class GeneratorDBSchema:
         relationships: List[InfoRelacion],
         print_output: bool = True,
         print_sql: bool = True,
+        inline_foreign_keys: bool = False,
     ) -> str:
         # pylint: disable=too-many-arguments, too-many-positional-arguments
         """Generate database schema from a GraphQL schema."""
@@ -69,6 +70,27 @@ class GeneratorDBSchema:
             relationships=relationships,
             print_output=print_output,
             print_sql=print_sql,
+            inline_foreign_keys=inline_foreign_keys,
+        )
+
+    def generate_schema_stream(
+        self,
+        tables: Dict[str, InfoTabla],
+        enums: Dict[str, InfoEnum],
+        relationships: List[InfoRelacion],
+        print_output: bool = True,
+        print_sql: bool = True,
+        inline_foreign_keys: bool = False,
+    ) -> Iterator[str]:
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        """Yield the database schema statements one by one."""
+        return self._generator.generate_schema_stream(
+            tables=tables,
+            enums=enums,
+            relationships=relationships,
+            print_output=print_output,
+            print_sql=print_sql,
+            inline_foreign_keys=inline_foreign_keys,
         )
 
     def get_schema_sql(self) -> str:
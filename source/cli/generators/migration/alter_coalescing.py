@@ -0,0 +1,163 @@
+"""Merge the ALTER TABLE statements of a migration phase per table."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from ...database.directivas import PREFIJO_DIRECTIVA, Directiva, dividir_script
+from ...database.tokenizador_sql import DialectoSQL
+
+_TABLE_NAME = r"(`[^`]+`|\"[^\"]+\"|[\w.]+)"
+_ALTER_TABLE = re.compile(
+    rf"ALTER\s+TABLE\s+{_TABLE_NAME}\s+(.*?)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_UPDATE_TABLE = re.compile(rf"UPDATE\s+{_TABLE_NAME}\s", re.IGNORECASE)
+# table options apply to the whole ALTER, not to a single clause
+_TABLE_OPTION = re.compile(
+    r",\s*((?:ALGORITHM|LOCK)\s*=\s*\w+)\s*$",
+    re.IGNORECASE,
+)
+# PostgreSQL does not allow RENAME together with other actions, and
+# VALIDATE CONSTRAINT must not share the lock of the ALTER that adds it
+_NOT_MERGEABLE = re.compile(r"(RENAME|VALIDATE)\b", re.IGNORECASE)
+
+
+@dataclass
+class _AlterGroup:
+    """ALTER TABLE clauses pending to be emitted for one table."""
+
+    table: str
+    options: Tuple[str, ...]
+    statements: List[str] = field(default_factory=list)
+    clauses: List[str] = field(default_factory=list)
+    comments: List[str] = field(default_factory=list)
+
+    def render(self) -> str:
+        """Build one ALTER TABLE with every clause of the group."""
+        if len(self.statements) == 1:
+            sql = self.statements[0]
+        else:
+            clauses = self.clauses + list(self.options)
+            body = ",\n  ".join(clauses)
+            sql = f"ALTER TABLE {self.table}\n  {body};"
+        return "\n".join(self.comments + [sql])
+
+
+def parse_alter_statement(statement: str) -> Optional[Tuple[str, str, Tuple]]:
+    """Split a mergeable ALTER TABLE into table, clauses and options."""
+    match = _ALTER_TABLE.match(statement)
+    if not match:
+        return None
+    table, body = match.groups()
+    if _NOT_MERGEABLE.match(body):
+        return None
+
+    options: List[str] = []
+    option = _TABLE_OPTION.search(body)
+    while option:
+        options.insert(0, option.group(1))
+        end = option.start()
+        body = body[:end]
+        option = _TABLE_OPTION.search(body)
+    return table, body.strip(), tuple(options)
+
+
+def split_block(
+    block: str,
+    dialect: DialectoSQL,
+) -> Tuple[List[str], List[Union[str, Directiva]]]:
+    """
+    Split a SQL block into its comments and its statements.
+
+    Args:
+        block: SQL block with its leading comments
+        dialect: Lexical rules used to split the block
+
+    Returns:
+        The comment lines, and the statements with each directive \
+            kept together with the statement it replaces
+    """
+    comments = [
+        line
+        for line in block.splitlines()
+        if line.lstrip().startswith("--")
+        if not line.startswith(PREFIJO_DIRECTIVA)
+    ]
+    return comments, dividir_script(block, dialect)
+
+
+def _statement_table(statement: str) -> Optional[str]:
+    """Table changed by a statement that cannot be merged, if known."""
+    match = _ALTER_TABLE.match(statement) or _UPDATE_TABLE.match(statement)
+    return match.group(1) if match else None
+
+
+def coalesce_alter_statements(
+    blocks: List[str],
+    dialect: DialectoSQL,
+) -> List[str]:
+    """
+    Merge the ALTER TABLE statements on the same table into one.
+
+    The order of the statements of each table is kept: an UPDATE or \
+        RENAME on a table emits its pending clauses first, and any \
+        other statement (CREATE TYPE, DROP TABLE...) emits all of them.
+
+    Args:
+        blocks: SQL blocks of one migration phase, each with its \
+            leading comments
+        dialect: Lexical rules used to split the blocks
+
+    Returns:
+        The blocks with the merged statements, or the same blocks if \
+            nothing could be merged
+    """
+    output: List[str] = []
+    pending: Dict[str, _AlterGroup] = {}
+    merged = False
+
+    def flush(table: Optional[str] = None) -> None:
+        for name in list(pending):
+            if table is None or name == table:
+                output.append(pending.pop(name).render())
+
+    for block in blocks:
+        comments, statements = split_block(block, dialect)
+        for statement in statements:
+            if isinstance(statement, Directiva):
+                # a directive replaces its statement when it runs
+                flush(_statement_table(statement.sentencia))
+                marked = statement.con_sentencia()
+                output.append("\n".join(comments + [marked]))
+                comments = []
+                continue
+
+            alter = parse_alter_statement(statement)
+            if alter is None:
+                flush(_statement_table(statement))
+                output.append("\n".join(comments + [statement]))
+                comments = []
+                continue
+
+            table, clause, options = alter
+            group = pending.get(table)
+            if group is not None and group.options != options:
+                flush(table)
+                group = None
+            if group is None:
+                group = pending[table] = _AlterGroup(table, options)
+            else:
+                merged = True
+
+            group.statements.append(statement)
+            group.clauses.append(clause)
+            group.comments.extend(comments)
+            comments = []
+
+        if comments:
+            # a block with only comments keeps its place
+            output.append("\n".join(comments))
+
+    flush()
+    return output if merged else blocks
@@ -0,0 +1,121 @@
+"""Cost estimate of the statements of a migration from the table \
+    statistics of the target database."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ...database.adaptador_database import EstadisticasTabla
+
+# how each statement changes its table
+KIND_INSTANT = "instant"
+KIND_INPLACE = "in-place"
+KIND_REWRITE = "table-rewrite"
+KINDS = (KIND_INSTANT, KIND_INPLACE, KIND_REWRITE)
+
+# what the statement blocks while it runs
+LOCK_NONE = "none"
+LOCK_WRITES = "writes"
+LOCK_ALL = "reads and writes"
+LOCKS = (LOCK_NONE, LOCK_WRITES, LOCK_ALL)
+
+# rough throughput of a server on SSD; the estimate is an order of
+# magnitude, not a promise
+REWRITE_BYTES_PER_SECOND = 50 * 1024 * 1024
+SCAN_BYTES_PER_SECOND = 100 * 1024 * 1024
+UPDATED_ROWS_PER_SECOND = 20_000
+
+_TABLE_NAME = r"(`[^`]+`|\"[^\"]+\"|[\w.]+)"
+_STATEMENT_TABLE = re.compile(
+    rf"(?:ALTER\s+TABLE|UPDATE|DROP\s+TABLE(?:\s+IF\s+EXISTS)?"
+    rf"|CREATE\s+(?:UNIQUE\s+)?INDEX\s+.*?\s+ON)\s+{_TABLE_NAME}",
+    re.IGNORECASE | re.DOTALL,
+)
+
+Cost = Tuple[str, str]
+
+
+def most_expensive(costs: Iterable[Cost]) -> Cost:
+    """Worst kind and worst lock among the clauses of a statement."""
+    kinds, locks = zip(*costs)
+    return max(kinds, key=KINDS.index), max(locks, key=LOCKS.index)
+
+
+def statement_table(statement: str) -> Optional[str]:
+    """Table changed by a statement, without quotes."""
+    match = _STATEMENT_TABLE.match(statement)
+    return match.group(1).strip('`"') if match else None
+
+
+def find_table_stats(
+    stats: Dict[str, EstadisticasTabla],
+    table: Optional[str],
+) -> Optional[EstadisticasTabla]:
+    """Statistics of a table; unquoted PostgreSQL names are stored in \
+        lower case by the catalog."""
+    if table is None:
+        return None
+    if table in stats:
+        return stats[table]
+    return stats.get(table.lower())
+
+
+@dataclass
+class StatementCost:
+    """Estimated cost of one statement."""
+
+    statement: str
+    table: Optional[str]
+    kind: str
+    lock: str
+    seconds: float = 0.0
+
+    @property
+    def blocks(self) -> bool:
+        """Whether the statement blocks its table while it runs."""
+        return self.lock != LOCK_NONE
+
+
+@dataclass
+class MigrationEstimate:
+    """Estimated cost of every statement of a migration."""
+
+    statements: List[StatementCost] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        """Estimated duration of the whole migration."""
+        return sum(cost.seconds for cost in self.statements)
+
+    @property
+    def blocking_seconds(self) -> float:
+        """Estimated time the migration keeps some table blocked."""
+        return sum(cost.seconds for cost in self.statements if cost.blocks)
+
+
+def estimate_seconds(
+    kind: str,
+    stats: Optional[EstadisticasTabla],
+    moves_rows: bool = False,
+) -> float:
+    """
+    Estimate how long a statement takes on a table.
+
+    Args:
+        kind: How the statement changes the table
+        stats: Table statistics (None for tables not created yet)
+        moves_rows: The statement updates every row (UPDATE or backfill)
+
+    Returns:
+        Estimated seconds; instant changes and new tables take none
+    """
+    if stats is None:
+        return 0.0
+    if moves_rows:
+        return stats.filas / UPDATED_ROWS_PER_SECOND
+    if kind == KIND_REWRITE:
+        total_bytes = stats.bytes_datos + stats.bytes_indices
+        return total_bytes / REWRITE_BYTES_PER_SECOND
+    if kind == KIND_INPLACE:
+        return stats.bytes_datos / SCAN_BYTES_PER_SECOND
+    return 0.0
@@ -1,13 +1,19 @@
 """ Wrapper for backward compatibility with original \
     mysql_migracion module. """
 
-from typing import Optional
+from typing import Dict, Optional, Union
 
+from .cost_estimation import MigrationEstimate
 from .migration_factory import MigrationGeneratorFactory
+from ...database.adaptador_database import EstadisticasTabla
+from ...graphql.cache_esquema import CacheParseEsquema
+from ...graphql.parser import ParserGraphQLEsquema
+from ...graphql.pipeline_esquema import PipelineEsquema
 from ...graphql.configuracion_y_constantes import (
     DatabaseType,
     InfoDiffEsquema,
     InfoMigracion,
+    ModoOnline,
 )
 
 
@@ -15,12 +21,19 @@ class GeneratorDBMigration:
     """Wrapper for backward compatibility with original \
         mysql_migracion module."""
 
-    def __init__(self, db_type: DatabaseType = DatabaseType.MYSQL):
+    def __init__(
+        self,
+        db_type: DatabaseType = DatabaseType.MYSQL,
+        cache: Optional[CacheParseEsquema] = None,
+    ):
         """Initialize the migration generator with the specified \
-            database type."""
+            database type and an optional parse cache."""
         self._generator = MigrationGeneratorFactory.create_generator(db_type)
         self.db_type = db_type
 
+        if cache is not None:
+            self._generator.parser = ParserGraphQLEsquema(cache=cache)
+
     @property
     def console(self):
         """Access to the internal generator console."""
@@ -54,11 +67,12 @@ class GeneratorDBMigration:
 
     def generar_migracion(
         self,
-        previous_schema: str,
-        new_schema: str,
+        previous_schema: Union[str, PipelineEsquema],
+        new_schema: Union[str, PipelineEsquema],
         migration_id: Optional[str] = None,
         print_output: bool = True,
         print_sql: bool = True,
+        online: Optional[ModoOnline] = None,
     ) -> InfoMigracion:
         """Generate migration for backward compatibility."""
         return self._generator.generate_migration(
@@ -67,12 +81,13 @@ class GeneratorDBMigration:
             migration_id,
             print_output,
             print_sql,
+            online,
         )
 
     def diff_schemas(
         self,
-        schema_actual: str,
-        schema_nuevo: str,
+        schema_actual: Union[str, PipelineEsquema],
+        schema_nuevo: Union[str, PipelineEsquema],
     ) -> InfoDiffEsquema:
         """Compare schemas for backward compatibility."""
         return self._generator.diff_schemas(schema_actual, schema_nuevo)
@@ -81,6 +96,14 @@ class GeneratorDBMigration:
         """Generate SQL migration for backward compatibility."""
         return self._generator.generate_sql_migration(diff_schema)
 
+    def estimar_costo(
+        self,
+        sql: str,
+        estadisticas: Dict[str, EstadisticasTabla],
+    ) -> MigrationEstimate:
+        """Estimate the cost of each statement of a generated migration."""
+        return self._generator.estimate_cost(sql, estadisticas)
+
     def get_migration_sql(self) -> list:
         """Get the generated SQL migration."""
         return self._generator.migrations_sql
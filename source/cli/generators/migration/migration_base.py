@@ -3,7 +3,8 @@
 from abc import ABC, abstractmethod
 import datetime
 import hashlib
-from typing import Callable, Dict, List, Optional, Set
+import re
+from typing import Callable, Dict, List, Optional, Union
 from rich.console import Console
 from rich.tree import Tree
 from rich.syntax import Syntax
@@ -25,6 +26,7 @@ from ...graphql.configuracion_y_constantes import (
     InfoCambioCampo,
     InfoCambioEnum,
     InfoMigracion,
+    ModoOnline,
     TipoRelacion,
     OnDelete,
 )
@@ -36,48 +38,103 @@ from ...graphql.exceptions import (
     SchemaComparisonError,
     MigrationGenerationError,
 )
+from ...database.adaptador_database import EstadisticasTabla
+from ...database.directivas import (
+    TIPO_ELIMINAR_UNIQUE,
+    TIPO_RELLENO,
+    TIPO_TABLA_SOMBRA,
+    Directiva,
+    dividir_script,
+)
+from ...database.relleno import MARCA_RANGO
+from ...database.tokenizador_sql import DIALECTO_MYSQL, DialectoSQL
 from ...graphql.parser import ParserGraphQLEsquema
-from ...graphql.procesar_relaciones import ProcesarRelaciones
+from ...graphql.pipeline_esquema import PipelineEsquema
+from ...utilidades.perfilador import medir_fase
+from ..call_state import CallState, MigrationState, StateAttribute
+from .alter_coalescing import coalesce_alter_statements
+from .cost_estimation import (
+    KIND_INPLACE,
+    KIND_INSTANT,
+    KIND_REWRITE,
+    LOCK_NONE,
+    LOCK_WRITES,
+    Cost,
+    MigrationEstimate,
+    StatementCost,
+    estimate_seconds,
+    find_table_stats,
+    most_expensive,
+    statement_table,
+)
+from .online_mysql import split_clauses
+
+_ALTER_BODY = re.compile(
+    r"ALTER\s+TABLE\s+\S+\s+(.*?)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_UPDATE = re.compile(r"UPDATE\s", re.IGNORECASE)
 
 
 class BaseMigrationGenerator(ABC):
-    """Abstract base class for database migration generators."""
+    """Abstract base class for database migration generators.
+
+    Options and intermediate results of each run live in a per-call \
+        state object, so one instance can serve concurrent migrations.
+    """
+
+    # lexical rules used to split the generated SQL into statements
+    sql_dialect: DialectoSQL = DIALECTO_MYSQL
+    # primary key that splits the backfills in ranges, as written in SQL
+    backfill_key: str = "id"
+
+    print_output = StateAttribute()
+    print_sql = StateAttribute()
+    migrations_sql = StateAttribute()
+    _available_enums = StateAttribute("available_enums")
+    _existing_tables = StateAttribute("existing_tables")
+    _processed_junction_tables = StateAttribute("processed_junction_tables")
+    online = StateAttribute()
 
     def __init__(self):
         """Initialize the migration generator."""
         self.console = Console()
-        self.migrations_sql = []
         self.parser = ParserGraphQLEsquema()
-        self.print_output = True
-        self.print_sql = True
-
-        self._available_enums = None
-        self._existing_tables = None
-        self._processed_junction_tables: Set[str] = set()
+        self.call_state = CallState(MigrationState)
 
     def generate_migration(
         self,
-        previous_schema: str,
-        new_schema: str,
+        previous_schema: Union[str, PipelineEsquema],
+        new_schema: Union[str, PipelineEsquema],
         migration_id: Optional[str] = None,
         print_output: bool = True,
         print_sql: bool = True,
+        online: Optional[ModoOnline] = None,
     ) -> InfoMigracion:
         """
         Generate a complete migration from two GraphQL schemas.
 
         Args:
-            previous_schema: Previous GraphQL schema
-            new_schema: New GraphQL schema
+            previous_schema: Previous GraphQL schema (text or pipeline)
+            new_schema: New GraphQL schema (text or pipeline, so the \
+                caller can reuse its parsed document)
             migration_id: Custom migration ID
             print_output: Whether to show detailed output
             print_sql: Whether to show generated SQL
+            online: Change tables without locking them, and how to \
+                treat the changes that still need to lock them
 
         Returns:
             Complete migration information
         """
-        self.print_output = print_output
-        self.print_sql = print_sql
+        self.call_state.start(
+            MigrationState(print_output, print_sql, online=online),
+        )
+
+        previous = PipelineEsquema.desde(previous_schema, self.parser)
+        new = PipelineEsquema.desde(new_schema, self.parser)
+        previous_schema = previous.esquema
+        new_schema = new.esquema
 
         try:
             # Generate migration ID if not provided
@@ -93,10 +150,7 @@ class BaseMigrationGenerator(ABC):
                 self._show_migration_start(migration_id)
 
             # Compare schemas
-            differences = self.diff_schemas(
-                previous_schema,
-                new_schema,
-            )
+            differences = self.diff_schemas(previous, new)
 
             if not differences.tiene_cambios():
                 if self.print_output:
@@ -137,10 +191,11 @@ class BaseMigrationGenerator(ABC):
                 f"Error generating migration: {str(e)}",
             ) from e
 
+    @medir_fase("diff_esquemas")
     def diff_schemas(
         self,
-        previous_schema: str,
-        new_schema: str,
+        previous_schema: Union[str, PipelineEsquema],
+        new_schema: Union[str, PipelineEsquema],
     ) -> InfoDiffEsquema:
         """
         Compare two GraphQL schemas and detect differences.
@@ -153,30 +208,31 @@ class BaseMigrationGenerator(ABC):
             Detected differences
         """
         try:
-            # Parse previous schema
-            prev_info = self.parser.parse_esquema(previous_schema)
-            prev_processor = ProcesarRelaciones(
-                tablas=prev_info.tablas,
-                scalar_types=ParserGraphQLEsquema.get_type_mapping(),
-                enum_types=prev_info.enums,
-            )
-            prev_relations = prev_processor.procesar_relaciones()
-
-            # Parse new schema
-            new_info = self.parser.parse_esquema(new_schema)
-            new_processor = ProcesarRelaciones(
-                tablas=new_info.tablas,
-                scalar_types=ParserGraphQLEsquema.get_type_mapping(),
-                enum_types=new_info.enums,
-            )
-            new_relations = new_processor.procesar_relaciones()
+            # Parse both schemas
+            previous = PipelineEsquema.desde(previous_schema, self.parser)
+            prev_info = previous.info
+            new = PipelineEsquema.desde(new_schema, self.parser)
+            new_info = new.info
 
-            self._available_enums = {}
-            self._available_enums.update(prev_info.enums)
-            self._available_enums.update(new_info.enums)
+            available_enums = {}
+            available_enums.update(prev_info.enums)
+            available_enums.update(new_info.enums)
+            self._available_enums = available_enums
 
             # Compare and generate differences
-            differences = InfoDiffEsquema()
+            differences = InfoDiffEsquema(enums_disponibles=available_enums)
+
+            # Relations derive from tables and enums, so equal schema
+            # hashes mean there is nothing to compare
+            if prev_info.huella and prev_info.huella == new_info.huella:
+                differences.tablas_existentes = dict(new_info.tablas)
+                self._existing_tables = differences.tablas_existentes
+                if self.print_output:
+                    self._show_detected_differences(differences)
+                return differences
+
+            prev_relations = previous.relaciones
+            new_relations = new.relaciones
 
             # Compare tables and fields
             differences.tablas = self._compare_tables(
@@ -185,13 +241,15 @@ class BaseMigrationGenerator(ABC):
             )
 
             # Filter existing tables and update with new information
-            self._existing_tables = {}
+            existing_tables = {}
             for t, i in prev_info.tablas.items():
                 if t not in differences.tablas.eliminadas:
                     if t in new_info.tablas:
-                        self._existing_tables[t] = new_info.tablas[t]
+                        existing_tables[t] = new_info.tablas[t]
                     else:
-                        self._existing_tables[t] = i
+                        existing_tables[t] = i
+            differences.tablas_existentes = existing_tables
+            self._existing_tables = existing_tables
 
             # Compare relations
             differences.relaciones = self._compare_relations(
@@ -214,6 +272,7 @@ class BaseMigrationGenerator(ABC):
                 f"Error comparing schemas: {str(e)}",
             ) from e
 
+    @medir_fase("generacion_sql")
     def generate_sql_migration(self, differences: InfoDiffEsquema) -> str:
         """
         Generate migration SQL from detected differences.
@@ -224,11 +283,23 @@ class BaseMigrationGenerator(ABC):
         Returns:
             Complete migration SQL
         """
-        try:
-            sql_statements = []
+        # the differences carry the context of the diff that built them,
+        # so they can be turned into SQL in another call or thread
+        if differences.enums_disponibles is not None:
+            self._available_enums = differences.enums_disponibles
+        if differences.tablas_existentes is not None:
+            self._existing_tables = differences.tablas_existentes
+        self._processed_junction_tables = set()
 
-            # Migration header
-            sql_statements.extend(self._generate_migration_header())
+        try:
+            # one list per phase: ALTERs are only merged within a phase,
+            # so the dependency order between phases is kept
+            create_tables: List[str] = []
+            remove_relations: List[str] = []
+            fields_changes: List[str] = []
+            enums_changes: List[str] = []
+            add_relations: List[str] = []
+            remove_tables: List[str] = []
 
             # 1. Create new tables (so foreign keys can reference them
             # correctly)
@@ -239,12 +310,12 @@ class BaseMigrationGenerator(ABC):
                         table_name,
                         fields,
                     )
-                    sql_statements.append(sql_table)
+                    create_tables.append(sql_table)
 
             # 2. Remove relationships (before removing fields/tables)
             for relation in differences.relaciones.eliminadas:
                 sql_remove = self._generate_sql_remove_relation(relation)
-                sql_statements.append(sql_remove)
+                remove_relations.append(sql_remove)
 
             # 3. Remove fields
             for table_name, field_changes in differences.tablas.campos.items():
@@ -254,7 +325,7 @@ class BaseMigrationGenerator(ABC):
                             table_name,
                             field,
                         )
-                        sql_statements.append(sql_remove)
+                        fields_changes.append(sql_remove)
 
             # 4. Add fields to existing tables
             for table_name, field_changes in differences.tablas.campos.items():
@@ -264,7 +335,7 @@ class BaseMigrationGenerator(ABC):
                             table_name,
                             field,
                         )
-                        sql_statements.append(sql_add)
+                        fields_changes.append(sql_add)
 
             # 5. Modify existing fields
             for table_name, field_changes in differences.tablas.campos.items():
@@ -273,23 +344,38 @@ class BaseMigrationGenerator(ABC):
                         table_name,
                         change,
                     )
-                    sql_statements.append(sql_modify)
+                    fields_changes.append(sql_modify)
 
             # 6. Modify enums
             for enum_modified in differences.enums.modificados:
                 sql_enum = self._generate_sql_modify_enum(enum_modified)
-                sql_statements.extend(sql_enum)
+                enums_changes.extend(sql_enum)
 
             # 7. Add new relationships
             for relation in differences.relaciones.agregadas:
                 sql_relation = self._generate_sql_add_relation(relation)
-                sql_statements.append(sql_relation)
+                add_relations.append(sql_relation)
 
             # 8. Remove tables (at the end, since foreign keys are already
             # removed)
             for table_name in differences.tablas.eliminadas:
                 sql_remove = self._generate_sql_remove_table(table_name)
-                sql_statements.append(sql_remove)
+                remove_tables.append(sql_remove)
+
+            # Migration header
+            sql_statements = self._generate_migration_header()
+            sql_statements.extend(create_tables)
+            # one ALTER TABLE per table and phase, so a table is rebuilt
+            # once instead of once per column
+            for phase in (
+                remove_relations,
+                fields_changes,
+                enums_changes,
+                add_relations,
+            ):
+                blocks = self._coalesce_alters(phase)
+                sql_statements.extend(self._apply_online_mode(blocks))
+            sql_statements.extend(remove_tables)
 
             # Filter empty statements and join
             filtered_stmts = [sql for sql in sql_statements if sql.strip()]
@@ -321,8 +407,15 @@ class BaseMigrationGenerator(ABC):
         # Compare fields in existing tables
         for table_name in new_tables:
             if table_name in previous_tables:
-                prev_fields = previous_tables[table_name].campos
-                new_fields = new_tables[table_name].campos
+                prev_table = previous_tables[table_name]
+                new_table = new_tables[table_name]
+
+                # one hash comparison skips an unchanged table
+                if prev_table.huella and prev_table.huella == new_table.huella:
+                    continue
+
+                prev_fields = prev_table.campos
+                new_fields = new_table.campos
 
                 if prev_fields == new_fields:
                     continue
@@ -429,24 +522,25 @@ class BaseMigrationGenerator(ABC):
             if enum_name not in new_enums:
                 differences.eliminados.append(enum_name)
 
-        # Modified enums
+        # Modified enums (the declared order matters: the generators
+        # place new values by position and a reorder is also a change)
         for enum_name in new_enums:
             if enum_name in previous_enums:
-                prev_values = set(previous_enums[enum_name].valores)
-                new_values = set(new_enums[enum_name].valores)
+                prev_values = previous_enums[enum_name].valores
+                new_values = new_enums[enum_name].valores
 
                 if prev_values != new_values:
                     differences.modificados.append(
                         InfoCambioEnum(
                             nombre=enum_name,
-                            valores_antiguos=list(sorted(prev_values)),
-                            valores_nuevos=list(sorted(new_values)),
-                            valores_agregados=list(
-                                sorted(new_values - prev_values),
-                            ),
-                            valores_eliminados=list(
-                                sorted(prev_values - new_values),
-                            ),
+                            valores_antiguos=list(prev_values),
+                            valores_nuevos=list(new_values),
+                            valores_agregados=[
+                                v for v in new_values if v not in prev_values
+                            ],
+                            valores_eliminados=[
+                                v for v in prev_values if v not in new_values
+                            ],
                         )
                     )
 
@@ -478,6 +572,8 @@ class BaseMigrationGenerator(ABC):
         field2: InfoField,
     ) -> bool:
         """Check if two fields are different."""
+        if field1.huella and field1.huella == field2.huella:
+            return False
         return (
             field1.tipo_campo != field2.tipo_campo
             or field1.es_lista != field2.es_lista
@@ -494,12 +590,14 @@ class BaseMigrationGenerator(ABC):
             f"{relation.nombre_relacion}"
         )
 
+    @medir_fase("renderizado")
     def _show_migration_start(self, migration_id: str) -> None:
         """Show start of migration process."""
         self.console.print(
             f"\n🔄 Generating migration: {migration_id}", style="bold blue"
         )
 
+    @medir_fase("renderizado")
     def _show_detected_differences(
         self,
         differences: InfoDiffEsquema,
@@ -544,6 +642,7 @@ class BaseMigrationGenerator(ABC):
 
         self.console.print(tree)
 
+    @medir_fase("renderizado")
     def _show_migration_summary(self, num_statements: int) -> None:
         """Show final migration summary."""
         self.console.print(
@@ -555,6 +654,7 @@ class BaseMigrationGenerator(ABC):
             style="blue",
         )
 
+    @medir_fase("renderizado")
     def _visualize_sql_operation(
         self, operation_type: str, description: str, sql: str
     ) -> None:
@@ -588,6 +688,160 @@ class BaseMigrationGenerator(ABC):
         content = f"{schema1}{schema2}"
         return hashlib.md5(content.encode("utf-8")).hexdigest()
 
+    def _coalesce_alters(self, phase: List[str]) -> List[str]:
+        """Merge the ALTER TABLE statements of a phase per table."""
+        blocks = [sql for sql in phase if sql.strip()]
+        return coalesce_alter_statements(blocks, self.sql_dialect)
+
+    def _apply_online_mode(self, blocks: List[str]) -> List[str]:
+        """Rewrite the statements of a phase so they do not lock the \
+            tables (engines without an online mode keep them)."""
+        return blocks
+
+    def _warn_blocking_alter(self, table_name: str, reason: str) -> None:
+        """Warn that an online migration still blocks a table."""
+        if self.print_output:
+            self.console.print(
+                f"⚠️  ALTER TABLE {table_name} {reason}",
+                style="bold yellow",
+            )
+
+    @staticmethod
+    def _refuse_blocking_alters(statements: List[str]) -> None:
+        """Stop an online migration that would block some tables."""
+        if statements:
+            joined = "\n".join(statements)
+            raise MigrationGenerationError(
+                "Online migration refused, these statements lock "
+                f"their table:\n{joined}"
+            )
+
+    def _generate_backfill(
+        self,
+        table: str,
+        assignment: str,
+        condition: str,
+    ) -> str:
+        """
+        Generate an UPDATE that moves data, run by the adapters in \
+            primary key ranges with one short transaction per batch.
+
+        Args:
+            table: Table to update, as written in SQL
+            assignment: SET clause of the UPDATE
+            condition: WHERE condition of the rows to update
+
+        Returns:
+            The backfill directive followed by the equivalent UPDATE, \
+                which other SQL clients run in one statement
+        """
+        update = f"UPDATE {table} SET {assignment}"
+        batch = f"{update} WHERE ({condition}) AND {MARCA_RANGO};"
+        directive = Directiva(
+            TIPO_RELLENO,
+            {
+                "tabla": table,
+                "sentencia": batch,
+                "clave": self.backfill_key,
+            },
+            f"{update} WHERE {condition};",
+        )
+        return directive.con_sentencia()
+
+    @staticmethod
+    def _generate_drop_unique(
+        table: str,
+        column: str,
+        name: str,
+        statement: str,
+    ) -> str:
+        """
+        Generate the drop of the unique constraint of a column, run by \
+            the adapters with the name it has in the database (schemas \
+            created before uk_<table>_<column> named it differently).
+
+        Args:
+            table: Table of the constraint, without quotes
+            column: Column of the constraint, without quotes
+            name: Constraint name, the last identifier of ``statement``
+            statement: Drop of the constraint by that name
+
+        Returns:
+            The directive followed by the drop, which other SQL clients \
+                run as it is
+        """
+        directive = Directiva(
+            TIPO_ELIMINAR_UNIQUE,
+            {"tabla": table, "columna": column, "nombre": name},
+            statement,
+        )
+        return directive.con_sentencia()
+
+    def estimate_cost(
+        self,
+        sql: str,
+        stats: Dict[str, EstadisticasTabla],
+    ) -> MigrationEstimate:
+        """
+        Estimate the duration and lock impact of each statement.
+
+        Args:
+            sql: Generated migration SQL
+            stats: Table statistics read from the target database
+
+        Returns:
+            The cost of every statement, in execution order
+        """
+        estimate = MigrationEstimate()
+        for part in dividir_script(sql, self.sql_dialect):
+            if isinstance(part, Directiva):
+                statement = part.sentencia
+                kind, lock = self._classify_directive(part)
+                moves_rows = part.tipo == TIPO_RELLENO
+            else:
+                statement = part
+                kind, lock = self._classify_statement(part)
+                moves_rows = bool(_UPDATE.match(part))
+
+            table = statement_table(statement)
+            table_stats = find_table_stats(stats, table)
+            seconds = estimate_seconds(kind, table_stats, moves_rows)
+            estimate.statements.append(
+                StatementCost(statement, table, kind, lock, seconds)
+            )
+        return estimate
+
+    def _classify_directive(self, directive: Directiva) -> Cost:
+        """Cost of a statement the adapter runs in its own way."""
+        if directive.tipo == TIPO_RELLENO:
+            # one short transaction per batch
+            return KIND_INPLACE, LOCK_NONE
+        if directive.tipo == TIPO_TABLA_SOMBRA:
+            # triggers keep the original table writable during the copy
+            return KIND_REWRITE, LOCK_NONE
+        return self._classify_statement(directive.sentencia)
+
+    def _classify_statement(self, statement: str) -> Cost:
+        """Cost of one statement; an ALTER TABLE costs as much as its \
+            most expensive clause."""
+        alter = _ALTER_BODY.match(statement)
+        if alter:
+            clauses = split_clauses(alter.group(1))
+            return most_expensive(
+                self._classify_alter_clause(clause) for clause in clauses
+            )
+        if _UPDATE.match(statement):
+            # the updated rows stay locked until the statement ends
+            return KIND_INPLACE, LOCK_WRITES
+        # CREATE TABLE, DROP TABLE, CREATE TYPE... only change metadata
+        return KIND_INSTANT, LOCK_NONE
+
+    def _classify_alter_clause(self, clause: str) -> Cost:
+        # pylint: disable=unused-argument
+        """Cost of one ALTER TABLE clause (engines without rules \
+            assume a table copy)."""
+        return KIND_REWRITE, LOCK_WRITES
+
     def _generate_migration_header(self) -> List[str]:
         """Generate migration header."""
         timestamp = datetime.datetime.now().isoformat()
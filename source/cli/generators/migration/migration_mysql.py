@@ -1,6 +1,8 @@
 """MySQL-specific migration generator."""
 
-from typing import List
+import re
+from dataclasses import replace
+from typing import List, Optional
 
 from ...graphql.configuracion_y_constantes import (
     DatabaseType,
@@ -8,23 +10,58 @@ from ...graphql.configuracion_y_constantes import (
     InfoCambioCampo,
     InfoField,
     InfoRelacion,
+    ModoOnline,
     TipoRelacion,
 )
+from ...database.directivas import TIPO_ELIMINAR_UNIQUE, Directiva
+from ...graphql.nombres_constraint import LONGITUD_MAXIMA_MYSQL, nombre_unique
 from ...graphql.templates import (
     TEMPLATE_CREAR_TABLA,
     TEMPLATE_AGREGAR_CAMPO,
+    TEMPLATE_AGREGAR_INDICE_UNIQUE,
+    TEMPLATE_AGREGAR_UNIQUE,
     TEMPLATE_ELIMINAR_CAMPO,
+    TEMPLATE_ELIMINAR_INDICE,
     TEMPLATE_MODIFICAR_CAMPO,
+    TEMPLATE_MODIFICAR_CAMPO_ALGORITMO,
     TEMPLATE_ELIMINAR_FK,
     TEMPLATE_ELIMINAR_TABLA,
 )
 
+from .alter_coalescing import split_block
+from .cost_estimation import (
+    KIND_INPLACE,
+    KIND_INSTANT,
+    KIND_REWRITE,
+    LOCK_NONE,
+    LOCK_WRITES,
+    Cost,
+)
 from .migration_base import BaseMigrationGenerator
+from .online_mysql import (
+    ALGORITHM_COPY,
+    ALGORITHM_INPLACE,
+    ALGORITHM_INSTANT,
+    clause_algorithm,
+    plan_online_alter,
+)
+
+# an ENUM column uses 1 byte for up to 255 values and 2 bytes beyond that
+MAX_ENUM_VALUES_ONE_BYTE = 255
+# INPLACE changes keep reads and writes running; COPY takes LOCK=SHARED
+ALGORITHM_COSTS = {
+    ALGORITHM_INSTANT: (KIND_INSTANT, LOCK_NONE),
+    ALGORITHM_INPLACE: (KIND_INPLACE, LOCK_NONE),
+    ALGORITHM_COPY: (KIND_REWRITE, LOCK_WRITES),
+}
+_ALGORITHM_OPTION = re.compile(r",\s*ALGORITHM\s*=\s*(\w+)", re.IGNORECASE)
 
 
 class MySQLMigrationGenerator(BaseMigrationGenerator):
     """MySQL-specific implementation of the migration generator."""
 
+    backfill_key = "`id`"
+
     def get_database_type(self) -> DatabaseType:
         """Get the database type for this generator."""
         return DatabaseType.MYSQL
@@ -62,37 +99,38 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
             f"      REFERENCES {tabla_ref}(id){on_delete};"
         )
 
-    def _generate_field_definition(self, field: InfoField) -> str:
-        """Generate complete field definition for MySQL."""
-        sql_type = self.get_sql_type(field)
-
-        column_name = field.nombre
-
+    @staticmethod
+    def _column_name(field: InfoField) -> str:
+        """Column name of a field, taking @db(rename) into account."""
         db = "db" in field.directivas
         if db and "rename" in field.directivas["db"].argumentos:
-            column_name = field.directivas["db"].argumentos["rename"]
+            return field.directivas["db"].argumentos["rename"]
+        return field.nombre
 
-        definition = f"`{column_name}` {sql_type}"
+    @staticmethod
+    def _unique_constraint_name(table_name: str, column: str) -> str:
+        """Name of the unique index of a column; the schema generator \
+            gives it the same name."""
+        return nombre_unique(table_name, column, LONGITUD_MAXIMA_MYSQL)
+
+    def _generate_field_definition(self, field: InfoField) -> str:
+        """Generate complete field definition for MySQL; the UNIQUE \
+            index is added with its own name by the caller, so MODIFY \
+            COLUMN does not create a new one each time."""
+        sql_type = self.get_sql_type(field)
+
+        definition = f"`{self._column_name(field)}` {sql_type}"
 
         # Add constraints
         if field.es_requerido:
             definition += " NOT NULL"
 
-        if "unique" in field.directivas:
-            definition += " UNIQUE"
-
         if "id" in field.directivas:
             definition += " PRIMARY KEY"
 
-        df = "default" in field.directivas
-        if df and "value" in field.directivas["default"].argumentos:
-            default_value = field.directivas["default"].argumentos["value"]
-            lst = ("TEXT", "VARCHAR(255)")
-            if sql_type in lst or (sql_type.startswith("ENUM")):
-                definition += " DEFAULT '"
-                definition += f"{default_value}'"
-            else:
-                definition += f" DEFAULT {default_value}"
+        default = self._default_literal(field, sql_type)
+        if default is not None:
+            definition += f" DEFAULT {default}"
 
         if "createdAt" in field.directivas:
             definition += " DEFAULT CURRENT_TIMESTAMP"
@@ -108,6 +146,7 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
     ) -> str:
         """Generate SQL to create a new table in MySQL."""
         columns = []
+        uniques = []
         has_primary_key = False
 
         for field in fields:
@@ -116,6 +155,13 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
 
             column_def = self._generate_field_definition(field)
             columns.append(f"  {column_def}")
+            if "unique" in field.directivas:
+                column = self._column_name(field)
+                unique = TEMPLATE_AGREGAR_UNIQUE.format(
+                    nombre=self._unique_constraint_name(table_name, column),
+                    nom_columna=column,
+                )
+                uniques.append(f"  {unique}")
 
             # Check if it's a primary key
             if "id" in field.directivas:
@@ -126,7 +172,7 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
             columns.insert(0, "  `id` VARCHAR(25) NOT NULL PRIMARY KEY")
 
         # Join columns
-        table_content = ",\n".join(columns)
+        table_content = ",\n".join(columns + uniques)
 
         sql = TEMPLATE_CREAR_TABLA.format(
             nombre_tabla=table_name, columnas=table_content
@@ -151,6 +197,14 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
             tabla=table_name,
             definicion=definition,
         )
+        if "unique" in field.directivas:
+            column = self._column_name(field)
+            unique = TEMPLATE_AGREGAR_INDICE_UNIQUE.format(
+                tabla=table_name,
+                nombre=self._unique_constraint_name(table_name, column),
+                nom_columna=column,
+            )
+            sql = f"{sql}\n{unique}"
 
         if self.print_output:
             self._visualize_sql_operation(
@@ -182,6 +236,17 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
 
         return f"-- Remove field {field.nombre} from {table_name}\n{sql}"
 
+    @staticmethod
+    def _default_literal(field: InfoField, sql_type: str) -> Optional[str]:
+        """SQL literal of the default value of a field, if it has one."""
+        directive = field.directivas.get("default")
+        if directive is None or "value" not in directive.argumentos:
+            return None
+        value = directive.argumentos["value"]
+        if sql_type in ("TEXT", "VARCHAR(255)") or sql_type.startswith("ENUM"):
+            return f"'{value}'"
+        return f"{value}"
+
     def _generate_sql_modify_field(
         self, table_name: str, change: InfoCambioCampo
     ) -> str:
@@ -193,6 +258,46 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
             definicion=definition,
         )
 
+        old, new = change.info_antigua, change.info_nueva
+        sql_type = self.get_sql_type(new)
+        default = self._default_literal(new, sql_type)
+        same_type = self.get_sql_type(old) == sql_type
+        if new.es_requerido and not old.es_requerido and same_type:
+            if default is not None:
+                # strict mode refuses NOT NULL while rows are NULL
+                column = f"`{old.nombre}`"
+                backfill = self._generate_backfill(
+                    f"`{table_name}`",
+                    f"{column} = {default}",
+                    f"{column} IS NULL",
+                )
+                sql = f"{backfill}\n{sql}"
+
+        was_unique = "unique" in old.directivas
+        if ("unique" in new.directivas) != was_unique:
+            if was_unique:
+                name = self._unique_constraint_name(
+                    table_name,
+                    self._column_name(old),
+                )
+                unique = self._generate_drop_unique(
+                    table_name,
+                    self._column_name(new),
+                    name,
+                    TEMPLATE_ELIMINAR_INDICE.format(
+                        tabla=table_name,
+                        nombre=name,
+                    ),
+                )
+            else:
+                column = self._column_name(new)
+                unique = TEMPLATE_AGREGAR_INDICE_UNIQUE.format(
+                    tabla=table_name,
+                    nombre=self._unique_constraint_name(table_name, column),
+                    nom_columna=column,
+                )
+            sql = f"{sql}\n{unique}"
+
         if self.print_output:
             self._visualize_sql_operation(
                 "MODIFY FIELD",
@@ -249,6 +354,9 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
         if not tables_with_enum:
             return statements
 
+        # appending values can be applied without rebuilding the table
+        instant = self._is_instant_enum_change(enum_modified)
+
         # Update tables
         for table_name, fields in tables_with_enum.items():
             for field in fields:
@@ -260,10 +368,20 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
                     field,
                 )
 
-                sql_modify = TEMPLATE_MODIFICAR_CAMPO.format(
-                    tabla=table_name,
-                    definicion=definition,
-                )
+                if instant:
+                    # the adapter falls back to INPLACE (LOCK=NONE) and,
+                    # outside the online mode, to COPY if the server
+                    # refuses INSTANT
+                    sql_modify = TEMPLATE_MODIFICAR_CAMPO_ALGORITMO.format(
+                        tabla=table_name,
+                        definicion=definition,
+                        algoritmo="INSTANT",
+                    )
+                else:
+                    sql_modify = TEMPLATE_MODIFICAR_CAMPO.format(
+                        tabla=table_name,
+                        definicion=definition,
+                    )
 
                 enum_name = enum_modified.nombre
                 msg = f"-- Update enum {enum_name} in {table_name}"
@@ -278,6 +396,69 @@ class MySQLMigrationGenerator(BaseMigrationGenerator):
 
         return statements
 
+    def _is_instant_enum_change(self, enum_modified: InfoCambioEnum) -> bool:
+        """Check if MySQL 8 can widen the enum with ALGORITHM=INSTANT: \
+            values are only appended at the end and the storage size \
+            of the column does not change."""
+        old_values = enum_modified.valores_antiguos
+        new_values = enum_modified.valores_nuevos
+        if new_values[: len(old_values)] != old_values:
+            return False
+        old_size = len(old_values) > MAX_ENUM_VALUES_ONE_BYTE
+        return old_size == (len(new_values) > MAX_ENUM_VALUES_ONE_BYTE)
+
+    def _apply_online_mode(self, blocks: List[str]) -> List[str]:
+        """Choose ALGORITHM and LOCK for each ALTER TABLE and apply the \
+            online mode to the ones that copy the table."""
+        if self.online is None:
+            return blocks
+
+        output: List[str] = []
+        refused: List[str] = []
+        for block in blocks:
+            lines, statements = split_block(block, self.sql_dialect)
+            for statement in statements:
+                if isinstance(statement, Directiva):
+                    if statement.tipo == TIPO_ELIMINAR_UNIQUE:
+                        # dropping an index never copies the table
+                        drop = plan_online_alter(statement.sentencia)
+                        statement = replace(statement, sentencia=drop.render())
+                    lines.append(statement.con_sentencia())
+                    continue
+                alter = plan_online_alter(statement)
+                if alter is None:
+                    lines.append(statement)
+                elif not alter.copies_table:
+                    lines.append(alter.render())
+                elif self.online is ModoOnline.RECHAZAR:
+                    refused.append(statement)
+                elif self.online is ModoOnline.TABLA_SOMBRA:
+                    lines.append(alter.render_shadow_copy())
+                else:
+                    lines.append(alter.render())
+                    reason = "copies the table and blocks its writes"
+                    self._warn_blocking_alter(
+                        alter.table,
+                        f"{reason} (ALGORITHM=COPY)",
+                    )
+            output.append("\n".join(lines))
+
+        self._refuse_blocking_alters(refused)
+        return output
+
+    def _classify_statement(self, statement: str) -> Cost:
+        """Cost of a statement; an ALTER TABLE that already chooses its \
+            algorithm (enum widening, online mode) costs what it asks."""
+        option = _ALGORITHM_OPTION.search(statement)
+        if option and option.group(1).upper() in ALGORITHM_COSTS:
+            return ALGORITHM_COSTS[option.group(1).upper()]
+        return super()._classify_statement(statement)
+
+    def _classify_alter_clause(self, clause: str) -> Cost:
+        """Cost of an ALTER TABLE clause from the cheapest algorithm \
+            MySQL 8 can apply it with."""
+        return ALGORITHM_COSTS[clause_algorithm(clause)]
+
     def _generate_sql_remove_table(self, table_name: str) -> str:
         """Generate SQL to remove a table in MySQL."""
         sql = TEMPLATE_ELIMINAR_TABLA.format(tabla=table_name)
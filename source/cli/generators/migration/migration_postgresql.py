@@ -1,23 +1,85 @@
 """PostgreSQL-specific migration generator."""
 
-from typing import List
+import re
+from typing import List, Optional
+from ...database.directivas import TIPO_SIN_TRANSACCION, Directiva
+from ...database.tokenizador_sql import DIALECTO_POSTGRESQL
 from ...graphql.configuracion_y_constantes import (
     DatabaseType,
     InfoCambioEnum,
     InfoCambioCampo,
     InfoField,
     InfoRelacion,
+    ModoOnline,
     TipoRelacion,
 )
 from ...graphql.exceptions import (
     MigrationGenerationError,
 )
+from ...graphql.nombres_constraint import (
+    LONGITUD_MAXIMA_POSTGRESQL,
+    nombre_unique,
+)
+from .alter_coalescing import parse_alter_statement, split_block
+from .cost_estimation import (
+    KIND_INPLACE,
+    KIND_INSTANT,
+    KIND_REWRITE,
+    LOCK_ALL,
+    LOCK_NONE,
+    LOCK_WRITES,
+    Cost,
+)
 from .migration_base import BaseMigrationGenerator
 
+# statements PostgreSQL refuses inside a transaction block (a new enum
+# value can be added in one, but not used until it commits)
+_NON_TRANSACTIONAL = re.compile(
+    r"((CREATE\s+(UNIQUE\s+)?|DROP\s+)INDEX\s+CONCURRENTLY"
+    r"|ALTER\s+TYPE\s+\S+\s+ADD\s+VALUE)\b",
+    re.IGNORECASE,
+)
+# VALIDATE CONSTRAINT only blocks schema changes, but inside the script
+# transaction it would scan the table under the ACCESS EXCLUSIVE lock
+# taken by the statements before it, so it runs in its own transaction
+_OWN_TRANSACTION = re.compile(
+    r"ALTER\s+TABLE\s+\S+\s+VALIDATE\s+CONSTRAINT\b",
+    re.IGNORECASE,
+)
+# a column type change rewrites the table under an exclusive lock
+_REWRITES_TABLE = re.compile(
+    r"ALTER\s+COLUMN\s+\S+\s+TYPE\b",
+    re.IGNORECASE,
+)
+_CREATE_INDEX = re.compile(
+    r"CREATE\s+(UNIQUE\s+)?INDEX\s+(CONCURRENTLY\s+)?",
+    re.IGNORECASE,
+)
+# cost of the ALTER TABLE clauses that read or rewrite the table, in
+# order; any other clause only changes the catalog
+_CLAUSE_COSTS = (
+    (_REWRITES_TABLE, (KIND_REWRITE, LOCK_ALL)),
+    # SET NOT NULL scans the table under ACCESS EXCLUSIVE
+    (
+        re.compile(r"ALTER\s+COLUMN\s+\S+\s+SET\s+NOT\s+NULL\b", re.I),
+        (KIND_INPLACE, LOCK_ALL),
+    ),
+    # NOT VALID and USING INDEX skip the scan
+    (re.compile(r".*\b(NOT\s+VALID|USING\s+INDEX)\b", re.I), None),
+    (re.compile(r"VALIDATE\s+CONSTRAINT\b", re.I), (KIND_INPLACE, LOCK_NONE)),
+    # building a unique index or checking a foreign key blocks writes
+    (
+        re.compile(r"ADD\s.*\b(UNIQUE|REFERENCES|FOREIGN\s+KEY)\b", re.I),
+        (KIND_INPLACE, LOCK_WRITES),
+    ),
+)
+
 
 class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
     """PostgreSQL-specific implementation of the migration generator."""
 
+    sql_dialect = DIALECTO_POSTGRESQL
+
     def get_database_type(self) -> DatabaseType:
         """Get the database type for this generator."""
         return DatabaseType.POSTGRESQL
@@ -49,6 +111,14 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
         on_delete: str,
     ):
         """Template to modify a foreign key in MySQL."""
+        if self.online is not None:
+            return self._low_lock_foreign_key(
+                tabla_fk,
+                f"{campo_fk}_id",
+                bool(unique),
+                constraint,
+                f'"{tabla_ref}"(id) {on_delete}',
+            )
         return (
             f'ALTER TABLE "{tabla_fk}"\n'
             f"  ADD COLUMN {campo_fk}_id VARCHAR(25){unique},\n"
@@ -57,8 +127,64 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
             f'      REFERENCES "{tabla_ref}"(id){on_delete};'
         )
 
+    def _low_lock_foreign_key(
+        self,
+        table_name: str,
+        column: str,
+        unique: bool,
+        constraint: str,
+        reference: str,
+    ) -> str:
+        """Add a foreign key column without scanning the table under \
+            lock: the constraint is added NOT VALID and validated in a \
+            later statement, in its own transaction, that does not block \
+            writes."""
+        alter = f"ALTER TABLE {self._quoted(table_name)}"
+        statements = [f"{alter} ADD COLUMN {column} VARCHAR(25);"]
+        if unique:
+            index = self._unique_index_statements(table_name, column)
+            statements.extend(index)
+        statements.append(
+            f"{alter} ADD CONSTRAINT {constraint} "
+            f"FOREIGN KEY ({column}) REFERENCES {reference} NOT VALID;"
+        )
+        statements.append(f"{alter} VALIDATE CONSTRAINT {constraint};")
+        return "\n".join(statements)
+
+    @staticmethod
+    def _quoted(table_name: str) -> str:
+        """Table name as the schema generator creates it, keeping its \
+            case and allowing reserved words such as User."""
+        return f'"{table_name}"'
+
+    @staticmethod
+    def _unique_constraint_name(table_name: str, column: str) -> str:
+        """Name of the unique constraint of a column; the schema \
+            generator gives it the same name."""
+        return nombre_unique(table_name, column, LONGITUD_MAXIMA_POSTGRESQL)
+
+    def _unique_index_statements(
+        self,
+        table_name: str,
+        column: str,
+    ) -> List[str]:
+        """Build the unique index without blocking writes and attach it \
+            as the constraint of the column."""
+        name = self._unique_constraint_name(table_name, column)
+        table = self._quoted(table_name)
+        build = f"CREATE UNIQUE INDEX CONCURRENTLY {name}"
+        attach = f"ADD CONSTRAINT {name} UNIQUE USING INDEX {name}"
+        return [
+            # a concurrent build that failed leaves an INVALID index
+            # behind; dropping it lets a retry build the index again
+            f"DROP INDEX CONCURRENTLY IF EXISTS {name};",
+            f"{build} ON {table} ({column});",
+            f"ALTER TABLE {table} {attach};",
+        ]
+
     def _generate_field_definition(self, field: InfoField) -> str:
-        """Generate complete field definition for PostgreSQL."""
+        """Generate complete field definition for PostgreSQL; the \
+            UNIQUE constraint is added with its own name by the caller."""
         sql_type = self.get_sql_type(field)
 
         column_name = field.nombre
@@ -73,9 +199,6 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
         if field.es_requerido:
             definition += " NOT NULL"
 
-        if "unique" in field.directivas:
-            definition += " UNIQUE"
-
         if "id" in field.directivas:
             definition += " PRIMARY KEY"
 
@@ -123,6 +246,7 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
 
         # Now create the table
         columns = []
+        uniques = []
         has_primary_key = False
 
         for field in fields:
@@ -131,6 +255,10 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
 
             column_def = self._generate_field_definition(field)
             columns.append(f"  {column_def}")
+            if "unique" in field.directivas:
+                column = column_def.split(" ", 1)[0]
+                name = self._unique_constraint_name(table_name, column)
+                uniques.append(f"  CONSTRAINT {name} UNIQUE ({column})")
 
             # Check if it's a primary key
             if "id" in field.directivas:
@@ -141,7 +269,7 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
             columns.insert(0, "  id VARCHAR(25) NOT NULL PRIMARY KEY")
 
         # Join columns
-        table_content = ",\n".join(columns)
+        table_content = ",\n".join(columns + uniques)
 
         sql = f"CREATE TABLE {table_name} (\n{table_content}\n);"
 
@@ -181,6 +309,18 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
         emoji = self._visualize_field_requirement(field.es_requerido)
 
         sql = f"ALTER TABLE {table_name} ADD COLUMN {definition};"
+        if "unique" in field.directivas:
+            column = definition.split(" ", 1)[0]
+            if self.online is not None:
+                # a UNIQUE constraint would build its index under lock
+                unique_sql = self._unique_index_statements(table_name, column)
+            else:
+                name = self._unique_constraint_name(table_name, column)
+                unique_sql = [
+                    f"ALTER TABLE {table_name} ADD CONSTRAINT {name} "
+                    f"UNIQUE ({column});"
+                ]
+            sql = "\n".join([sql, *unique_sql])
 
         full_sql = enum_sql + sql
 
@@ -265,6 +405,16 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
         # Handle nullability changes
         if change.info_antigua.es_requerido != change.info_nueva.es_requerido:
             if change.info_nueva.es_requerido:
+                default = self._default_literal(change.info_nueva, new_type)
+                if default is not None:
+                    # rows left NULL would make SET NOT NULL fail
+                    statements.append(
+                        self._generate_backfill(
+                            table_name,
+                            f"{new_column_name} = {default}",
+                            f"{new_column_name} IS NULL",
+                        )
+                    )
                 statements.append(
                     f"ALTER TABLE {table_name} ALTER COLUMN {new_column_name} "
                     "SET NOT NULL;"
@@ -280,15 +430,35 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
         new_has_unique = "unique" in change.info_nueva.directivas
 
         if old_has_unique != new_has_unique:
-            if new_has_unique:
+            if new_has_unique and self.online is not None:
+                statements.extend(
+                    self._unique_index_statements(table_name, new_column_name)
+                )
+            elif new_has_unique:
+                unique_name = self._unique_constraint_name(
+                    table_name,
+                    new_column_name,
+                )
                 statements.append(
                     f"ALTER TABLE {table_name} ADD CONSTRAINT "
-                    f"{new_column_name}_unique UNIQUE ({new_column_name});"
+                    f"{unique_name} UNIQUE ({new_column_name});"
                 )
             else:
-                statements.append(
+                unique_name = self._unique_constraint_name(
+                    table_name,
+                    old_column_name,
+                )
+                drop = (
                     f"ALTER TABLE {table_name} DROP CONSTRAINT IF EXISTS "
-                    f"{old_column_name}_unique;"
+                    f"{unique_name};"
+                )
+                statements.append(
+                    self._generate_drop_unique(
+                        table_name,
+                        new_column_name,
+                        unique_name,
+                        drop,
+                    )
                 )
 
         # Handle default value changes
@@ -306,16 +476,11 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
 
         if old_default != new_default:
             if new_default is not None:
-                if new_type in ("TEXT", "VARCHAR(255)") or "_enum" in new_type:
-                    statements.append(
-                        f"ALTER TABLE {table_name} ALTER COLUMN "
-                        f"{new_column_name} SET DEFAULT '{new_default}';"
-                    )
-                else:
-                    statements.append(
-                        f"ALTER TABLE {table_name} ALTER COLUMN "
-                        f"{new_column_name} SET DEFAULT {new_default};"
-                    )
+                default = self._default_literal(change.info_nueva, new_type)
+                statements.append(
+                    f"ALTER TABLE {table_name} ALTER COLUMN "
+                    f"{new_column_name} SET DEFAULT {default};"
+                )
 
         sql = "\n".join(statements)
 
@@ -328,6 +493,17 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
 
         return f"-- Modify field {change.nombre} in {table_name}\n{sql}"
 
+    @staticmethod
+    def _default_literal(field: InfoField, sql_type: str) -> Optional[str]:
+        """SQL literal of the default value of a field, if it has one."""
+        directive = field.directivas.get("default")
+        if directive is None or "value" not in directive.argumentos:
+            return None
+        value = directive.argumentos["value"]
+        if sql_type in ("TEXT", "VARCHAR(255)") or "_enum" in sql_type:
+            return f"'{value}'"
+        return f"{value}"
+
     def _generate_sql_add_relation(self, relation: InfoRelacion) -> str:
         """Generate SQL to add a relation in PostgreSQL."""
         if relation.tipo_relation == TipoRelacion.MANY_TO_MANY.value:
@@ -361,6 +537,10 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
         enum_modified: InfoCambioEnum,
     ) -> List[str]:
         """Generate SQL to modify an enum in PostgreSQL."""
+        if enum_modified.solo_agrega_valores():
+            # no column uses a new type, so no table is rewritten
+            return [self._generate_sql_add_enum_values(enum_modified)]
+
         statements = []
         print("Modifying enum:", enum_modified)
         # PostgreSQL handles enums differently - we need to create a new type
@@ -420,10 +600,13 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
                 ]
 
                 if field.es_requerido:
+                    cast = f"{column_name}::{temp_type_name}"
                     migration_sql.append(
-                        f"UPDATE {table_name} SET {column_name}_new = "
-                        f"{column_name}::{temp_type_name} "
-                        f"WHERE {column_name} IS NOT NULL;"
+                        self._generate_backfill(
+                            table_name,
+                            f"{column_name}_new = {cast}",
+                            f"{column_name} IS NOT NULL",
+                        )
                     )
 
                 # If the field is required, we need to add NOT NULL constraint
@@ -461,6 +644,94 @@ class PostgreSQLMigrationGenerator(BaseMigrationGenerator):
 
         return statements
 
+    def _generate_sql_add_enum_values(
+        self,
+        enum_modified: InfoCambioEnum,
+    ) -> str:
+        """Generate ALTER TYPE ... ADD VALUE statements that insert the new \
+            values at their declared position."""
+        enum_name = enum_modified.nombre
+        values = enum_modified.valores_nuevos
+        added = set(enum_modified.valores_agregados)
+        # a new first value is anchored on a value that already exists
+        first_old = next(value for value in values if value not in added)
+
+        sql_values = []
+        for index, value in enumerate(values):
+            if value not in added:
+                continue
+            # values are added in order, so the previous one already exists
+            if index > 0:
+                position = f"AFTER '{values[index - 1]}'"
+            else:
+                position = f"BEFORE '{first_old}'"
+            sql_values.append(
+                f"ALTER TYPE {enum_name}_enum ADD VALUE IF NOT EXISTS "
+                f"'{value}' {position};"
+            )
+
+        sql = "\n".join(sql_values)
+
+        if self.print_output:
+            self._visualize_sql_operation(
+                "MODIFY ENUM",
+                f"Adding values to enum {enum_name}",
+                sql,
+            )
+
+        return f"-- Add values to enum {enum_name}\n{sql}"
+
+    def _apply_online_mode(self, blocks: List[str]) -> List[str]:
+        """Mark the statements that must run outside a transaction, \
+            with or without online mode, and apply the online mode to \
+            the ones that rewrite a table."""
+        output: List[str] = []
+        refused: List[str] = []
+        for block in blocks:
+            lines, statements = split_block(block, self.sql_dialect)
+            for statement in statements:
+                if isinstance(statement, Directiva):
+                    lines.append(statement.con_sentencia())
+                    continue
+                own = _OWN_TRANSACTION.match(statement)
+                if own or _NON_TRANSACTIONAL.match(statement):
+                    directive = Directiva(TIPO_SIN_TRANSACCION, {}, statement)
+                    lines.append(directive.con_sentencia())
+                    continue
+                if self.online and _REWRITES_TABLE.search(statement):
+                    if self.online is ModoOnline.RECHAZAR:
+                        refused.append(statement)
+                        continue
+                    # the shadow table copy is only available in MySQL
+                    table_name = parse_alter_statement(statement)[0]
+                    self._warn_blocking_alter(
+                        table_name,
+                        "rewrites the table and blocks its reads and "
+                        "writes (ALTER COLUMN ... TYPE)",
+                    )
+                lines.append(statement)
+            output.append("\n".join(lines))
+
+        self._refuse_blocking_alters(refused)
+        return output
+
+    def _classify_statement(self, statement: str) -> Cost:
+        """Cost of a statement; CREATE INDEX CONCURRENTLY builds the \
+            index without blocking writes."""
+        index = _CREATE_INDEX.match(statement)
+        if index:
+            lock = LOCK_NONE if index.group(2) else LOCK_WRITES
+            return KIND_INPLACE, lock
+        return super()._classify_statement(statement)
+
+    def _classify_alter_clause(self, clause: str) -> Cost:
+        """Cost of an ALTER TABLE clause in PostgreSQL 11 or later, \
+            where adding a column with a constant default is instant."""
+        for pattern, cost in _CLAUSE_COSTS:
+            if pattern.match(clause):
+                return cost or (KIND_INSTANT, LOCK_NONE)
+        return KIND_INSTANT, LOCK_NONE
+
     def _generate_sql_remove_table(self, table_name: str) -> str:
         """Generate SQL to remove a table in PostgreSQL."""
         sql = f"DROP TABLE IF EXISTS {table_name};"
@@ -0,0 +1,141 @@
+"""Online schema change rules for MySQL ALTER TABLE statements."""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ...database.directivas import TIPO_TABLA_SOMBRA, Directiva
+from .alter_coalescing import parse_alter_statement
+
+# ALTER TABLE algorithms, from cheapest to most expensive
+ALGORITHM_INSTANT = "INSTANT"
+ALGORITHM_INPLACE = "INPLACE"
+ALGORITHM_COPY = "COPY"
+ALGORITHMS = (ALGORITHM_INSTANT, ALGORITHM_INPLACE, ALGORITHM_COPY)
+
+# metadata only changes (DROP COLUMN is instant since MySQL 8.0.29;
+# the adapter falls back to INPLACE on older servers)
+_INSTANT_CLAUSE = re.compile(
+    r"(DROP\s+COLUMN|RENAME\s+COLUMN"
+    r"|ALTER\s+COLUMN\s+\S+\s+(SET|DROP)\s+DEFAULT)\b",
+    re.IGNORECASE,
+)
+# index changes built without blocking writes
+_INPLACE_CLAUSE = re.compile(
+    r"(ADD\s+(UNIQUE|INDEX|KEY)|DROP\s+(FOREIGN\s+KEY|INDEX|KEY))\b",
+    re.IGNORECASE,
+)
+_ADD_COLUMN = re.compile(r"ADD\s+COLUMN\b", re.IGNORECASE)
+_REBUILDS_TABLE = re.compile(
+    r"\b(AUTO_INCREMENT|PRIMARY\s+KEY)\b",
+    re.IGNORECASE,
+)
+_UNIQUE = re.compile(r"\bUNIQUE\b", re.IGNORECASE)
+
+
+def split_clauses(body: str) -> List[str]:
+    """Split the body of an ALTER TABLE on the commas that are not \
+        inside parentheses or quotes."""
+    clauses: List[str] = []
+    depth = 0
+    quote: Optional[str] = None
+    start = 0
+    for index, char in enumerate(body):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"`":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            clauses.append(body[start:index].strip())
+            start = index + 1
+    clauses.append(body[start:].strip())
+    return [clause for clause in clauses if clause]
+
+
+def clause_algorithm(clause: str) -> str:
+    """Cheapest algorithm MySQL 8 can use for one ALTER TABLE clause; \
+        unknown clauses (MODIFY COLUMN, FOREIGN KEY...) copy the table."""
+    if _ADD_COLUMN.match(clause):
+        if _REBUILDS_TABLE.search(clause):
+            return ALGORITHM_COPY
+        if _UNIQUE.search(clause):
+            return ALGORITHM_INPLACE
+        return ALGORITHM_INSTANT
+    if _INSTANT_CLAUSE.match(clause):
+        return ALGORITHM_INSTANT
+    if _INPLACE_CLAUSE.match(clause):
+        return ALGORITHM_INPLACE
+    return ALGORITHM_COPY
+
+
+@dataclass
+class OnlineAlter:
+    """ALTER TABLE statement with the algorithm it needs."""
+
+    table: str
+    clauses: List[str]
+    algorithm: str
+
+    @property
+    def copies_table(self) -> bool:
+        """Whether the table is copied, blocking its writes."""
+        return self.algorithm == ALGORITHM_COPY
+
+    def render(self) -> str:
+        """Statement with its ALGORITHM and the strictest LOCK the \
+            algorithm accepts, so the server refuses it instead of \
+            silently locking the table."""
+        options = [f"ALGORITHM={self.algorithm}"]
+        if self.algorithm == ALGORITHM_INPLACE:
+            options.append("LOCK=NONE")
+        elif self.copies_table:
+            options.append("LOCK=SHARED")
+        parts = self.clauses + options
+        if len(self.clauses) == 1:
+            return f"ALTER TABLE {self.table} {', '.join(parts)};"
+        body = ",\n  ".join(parts)
+        return f"ALTER TABLE {self.table}\n  {body};"
+
+    def render_shadow_copy(self) -> str:
+        """Statement preceded by the directive that makes the adapter \
+            apply it through a shadow table copy."""
+        directive = Directiva(
+            TIPO_TABLA_SOMBRA,
+            {
+                "tabla": self.table.strip("`"),
+                "alteraciones": ", ".join(self.clauses),
+            },
+            self.render(),
+        )
+        return directive.con_sentencia()
+
+
+def plan_online_alter(statement: str) -> Optional[OnlineAlter]:
+    """
+    Classify an ALTER TABLE statement.
+
+    Args:
+        statement: SQL statement of the migration
+
+    Returns:
+        The statement with its algorithm, or None if it is not an \
+            ALTER TABLE or it already chooses its algorithm
+    """
+    alter = parse_alter_statement(statement)
+    if alter is None:
+        return None
+    table, body, options = alter
+    if options:
+        return None
+
+    clauses = split_clauses(body)
+    algorithm = max(
+        (clause_algorithm(clause) for clause in clauses),
+        key=ALGORITHMS.index,
+    )
+    return OnlineAlter(table, clauses, algorithm)
@@ -1,6 +1,7 @@
 """Generator of MySQL schemas."""
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence
+from ..graphql.nombres_constraint import LONGITUD_MAXIMA_MYSQL
 from ..graphql.configuracion_y_constantes import (
     InfoEnum,
     InfoRelacion,
@@ -11,6 +12,7 @@ from ..graphql.configuracion_y_constantes import (
     DatabaseType,
 )
 from .base import BaseSchemaGenerator
+from .dependency_order import InlineForeignKey
 
 
 class GeneratorSchemaMySQL(BaseSchemaGenerator):
@@ -20,6 +22,10 @@ class GeneratorSchemaMySQL(BaseSchemaGenerator):
         """Return the type of MySQL database."""
         return DatabaseType.MYSQL
 
+    def get_max_identifier_length(self) -> int:
+        """Return the maximum identifier length in MySQL."""
+        return LONGITUD_MAXIMA_MYSQL
+
     def get_type_mapping(self) -> Dict[str, str]:
         """Return the mapping of GraphQL types to MySQL types."""
         return {
@@ -96,9 +102,29 @@ class GeneratorSchemaMySQL(BaseSchemaGenerator):
         )
         # pylint: enable=too-many-arguments, too-many-positional-arguments
 
+    def get_foreign_key_column(self, foreign_key: InlineForeignKey) -> str:
+        """Return the foreign key column inside CREATE TABLE in MySQL."""
+        return (
+            f"  `{foreign_key.field_fk}_id` VARCHAR(25)"
+            f"{foreign_key.unique}{foreign_key.is_null}"
+        )
+
+    def get_foreign_key_constraint(
+        self,
+        foreign_key: InlineForeignKey,
+    ) -> str:
+        """Return the foreign key constraint inside CREATE TABLE \
+            in MySQL."""
+        return (
+            f"CONSTRAINT `{foreign_key.constraint}`"
+            f" FOREIGN KEY (`{foreign_key.field_fk}_id`)"
+            f" REFERENCES `{foreign_key.table_ref}`(id)"
+            f"{foreign_key.on_delete}"
+        )
+
     def get_unique_constraint_template(self) -> str:
         """Return the template for unique constraints in MySQL."""
-        return "UNIQUE KEY `uk_{uk_column_name}` (`{column_name}`)"
+        return "UNIQUE KEY `{constraint_name}` (`{column_name}`)"
 
     def get_primary_key_column(self) -> str:
         """Return the primary key column definition for MySQL."""
@@ -117,14 +143,21 @@ class GeneratorSchemaMySQL(BaseSchemaGenerator):
         print_sql: bool = True,
     ) -> str:
         """Generate SQL statements to create tables."""
-        schema_tables = []
+        statements = self._iter_tables(tables, enums, print_output, print_sql)
+        return "\n\n".join(statements)
 
+    def _iter_tables(
+        self,
+        tables: Dict[str, InfoTabla],
+        enums: Dict[str, InfoEnum],
+        print_output: bool = True,
+        print_sql: bool = True,
+    ) -> Iterator[str]:
+        """Yield the CREATE TABLE statements one by one."""
         for table_name, table_info in tables.items():
             table_sql = self._generate_table(table_name, table_info, enums)
 
             if table_sql:
-                schema_tables.append(table_sql)
-
                 if print_output:
                     self._print_output_tables(
                         table_name,
@@ -133,7 +166,7 @@ class GeneratorSchemaMySQL(BaseSchemaGenerator):
                         print_sql,
                     )
 
-        return "\n\n".join(schema_tables)
+                yield table_sql
 
     def _generate_relationships(
         self,
@@ -141,15 +174,19 @@ class GeneratorSchemaMySQL(BaseSchemaGenerator):
         relationships: List[InfoRelacion],
     ) -> str:
         """Generate SQL statements to create relationships."""
-        schema_relationships = []
+        return "\n\n".join(self._iter_relationships(tables, relationships))
 
+    def _iter_relationships(
+        self,
+        tables: Dict[str, InfoTabla],
+        relationships: List[InfoRelacion],
+    ) -> Iterator[str]:
+        """Yield the relationship statements one by one."""
         for relation in relationships:
             relation_sql = self._generate_relationship(relation, tables)
 
             if relation_sql:
-                schema_relationships.append(relation_sql)
-
-        return "\n\n".join(schema_relationships)
+                yield relation_sql
 
     def _generate_relationship(
         self,
@@ -222,6 +259,7 @@ class GeneratorSchemaMySQL(BaseSchemaGenerator):
         table_name: str,
         table_info: InfoTabla,
         enums: Dict[str, InfoEnum],
+        foreign_keys: Sequence[InlineForeignKey] = (),
     ) -> str:
         """Generate the SQL statement to create a table in MySQL."""
         columns = []
@@ -284,12 +322,20 @@ class GeneratorSchemaMySQL(BaseSchemaGenerator):
             columns.append(def_column)
 
             if "unique" in directives:
+                # same name as the migrations use for this column
                 sql = self.get_unique_constraint_template().format(
-                    uk_column_name=field_name,
+                    constraint_name=self.registro_nombres.reservar_unique(
+                        table_name,
+                        column_name,
+                    ),
                     column_name=column_name,
                 )
                 indexs.append(sql)
 
+        for foreign_key in foreign_keys:
+            columns.append(self.get_foreign_key_column(foreign_key))
+            indexs.append(self.get_foreign_key_constraint(foreign_key))
+
         if not has_primary_key:
             columns.insert(0, f"  {self.get_primary_key_column()}")
 
@@ -304,6 +350,7 @@ class GeneratorSchemaMySQL(BaseSchemaGenerator):
             engine_settings=self.get_engine_specific_settings(),
         )
 
-        self.schema_sql.append(table_sql)
+        if self.store_schema_sql:
+            self.schema_sql.append(table_sql)
 
         return table_sql
@@ -1,6 +1,7 @@
 """Generador de esquemas PostgreSQL."""
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence
+from ..graphql.nombres_constraint import LONGITUD_MAXIMA_POSTGRESQL
 from ..graphql.configuracion_y_constantes import (
     InfoEnum,
     InfoRelacion,
@@ -11,6 +12,7 @@ from ..graphql.configuracion_y_constantes import (
     DatabaseType,
 )
 from .base import BaseSchemaGenerator
+from .dependency_order import InlineForeignKey
 
 
 class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
@@ -24,6 +26,10 @@ class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
         """Return the database type PostgreSQL."""
         return DatabaseType.POSTGRESQL
 
+    def get_max_identifier_length(self) -> int:
+        """Return the maximum identifier length in PostgreSQL."""
+        return LONGITUD_MAXIMA_POSTGRESQL
+
     def get_type_mapping(self) -> Dict[str, str]:
         """Return the mapping of GraphQL types to PostgreSQL types."""
         return {
@@ -101,9 +107,30 @@ class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
             f"REFERENCES {dq(table_ref)}(id){on_delete};"
         )
 
+    def get_foreign_key_column(self, foreign_key: InlineForeignKey) -> str:
+        """Return the foreign key column inside CREATE TABLE in PostgreSQL."""
+        id_type = self.get_type_mapping()[TipoField.ID.value]
+        return (
+            f"  {foreign_key.field_fk}_id {id_type}"
+            f"{foreign_key.unique}{foreign_key.is_null}"
+        )
+
+    def get_foreign_key_constraint(
+        self,
+        foreign_key: InlineForeignKey,
+    ) -> str:
+        """Return the foreign key constraint inside CREATE TABLE \
+            in PostgreSQL."""
+        return (
+            f"CONSTRAINT {foreign_key.constraint}"
+            f" FOREIGN KEY ({foreign_key.field_fk}_id)"
+            f" REFERENCES {self.dq(foreign_key.table_ref)}(id)"
+            f"{foreign_key.on_delete}"
+        )
+
     def get_unique_constraint_template(self) -> str:
         """Return the template for unique constraints in PostgreSQL."""
-        return "CONSTRAINT uk_{uk_column_name} UNIQUE ({column_name})"
+        return "CONSTRAINT {constraint_name} UNIQUE ({column_name})"
 
     def get_primary_key_column(self) -> str:
         """Return the primary key column definition for PostgreSQL."""
@@ -123,21 +150,25 @@ class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
         print_sql: bool = True,
     ) -> str:
         """Generate the table definitions for PostgreSQL."""
-        schema_tables = []
+        statements = self._iter_tables(tables, enums, print_output, print_sql)
+        return "\n\n".join(statements)
 
+    def _iter_tables(
+        self,
+        tables: Dict[str, InfoTabla],
+        enums: Dict[str, InfoEnum],
+        print_output: bool = True,
+        print_sql: bool = True,
+    ) -> Iterator[str]:
+        """Yield the enum types and then the tables one by one."""
         # first generate enum types if they exist
-        for enum_name, enum_info in enums.items():
-            values = enum_info.valores
-            enum_sql = self._generate_enum_type(enum_name, values)
-            schema_tables.append(enum_sql)
+        yield from self._iter_enum_types(enums)
 
         # then generate the tables
         for table_name, table_info in tables.items():
             table_sql = self._generate_table(table_name, table_info, enums)
 
             if table_sql:
-                schema_tables.append(table_sql)
-
                 if print_output:
                     self._print_output_tables(
                         table_name,
@@ -146,7 +177,15 @@ class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
                         print_sql,
                     )
 
-        return "\n\n".join(schema_tables)
+                yield table_sql
+
+    def _iter_enum_types(
+        self,
+        enums: Dict[str, InfoEnum],
+    ) -> Iterator[str]:
+        """Yield the custom ENUM types used by the tables."""
+        for enum_name, enum_info in enums.items():
+            yield self._generate_enum_type(enum_name, enum_info.valores)
 
     def _generate_enum_type(self, enum_name: str, values: List[str]) -> str:
         """Generate a custom ENUM type for PostgreSQL."""
@@ -161,15 +200,19 @@ class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
         relationships: List[InfoRelacion],
     ) -> str:
         """Generate the SQL statements to create relationships."""
-        scheme_relationships = []
+        return "\n\n".join(self._iter_relationships(tables, relationships))
 
+    def _iter_relationships(
+        self,
+        tables: Dict[str, InfoTabla],
+        relationships: List[InfoRelacion],
+    ) -> Iterator[str]:
+        """Yield the relationship statements one by one."""
         for relationship in relationships:
             relation_sql = self._generate_relationship(relationship, tables)
 
             if relation_sql:
-                scheme_relationships.append(relation_sql)
-
-        return "\n\n".join(scheme_relationships)
+                yield relation_sql
 
     def _generate_relationship(
         self,
@@ -243,6 +286,7 @@ class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
         table_name: str,
         table_info: InfoTabla,
         enums: Dict[str, InfoEnum],
+        foreign_keys: Sequence[InlineForeignKey] = (),
     ) -> str:
         """Generate the SQL statement to create a table in PostgreSQL."""
         columns = []
@@ -307,12 +351,21 @@ class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
             columns.append(def_column)
 
             if "unique" in directivas:
+                # unique constraints create an index whose name must be
+                # unique in the whole schema, so it includes the table
                 sql = self.get_unique_constraint_template().format(
-                    uk_column_name=column_name,
+                    constraint_name=self.registro_nombres.reservar_unique(
+                        table_name,
+                        column_name,
+                    ),
                     column_name=column_name,
                 )
                 indexs.append(sql)
 
+        for foreign_key in foreign_keys:
+            columns.append(self.get_foreign_key_column(foreign_key))
+            indexs.append(self.get_foreign_key_constraint(foreign_key))
+
         if not has_primary_key:
             columns.insert(0, f"  {self.get_primary_key_column()}")
 
@@ -327,6 +380,7 @@ class GeneratorSchemaPostgreSQL(BaseSchemaGenerator):
             engine_settings=self.get_engine_specific_settings(),
         )
 
-        self.schema_sql.append(table_sql)
+        if self.store_schema_sql:
+            self.schema_sql.append(table_sql)
 
         return table_sql
@@ -7,9 +7,12 @@ from .exceptions import (
     MigrationError,
     SchemaComparisonError,
     MigrationGenerationError,
+    SQLExecutionError,
 )
+from .cache_esquema import CacheParseEsquema
 from .parser import ParserGraphQLEsquema
 from .procesar_relaciones import ProcesarRelaciones
+from .pipeline_esquema import PipelineEsquema
 from .transform_schema_graphql import transform_schema_graphql
 
 __all__ = [
@@ -19,7 +22,10 @@ __all__ = [
     "MigrationError",
     "SchemaComparisonError",
     "MigrationGenerationError",
+    "SQLExecutionError",
+    "CacheParseEsquema",
     "ParserGraphQLEsquema",
     "ProcesarRelaciones",
+    "PipelineEsquema",
     "transform_schema_graphql",
 ]
@@ -0,0 +1,214 @@
+"""Modulo CacheParseEsquema"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .configuracion_y_constantes import (
+    InfoEnum,
+    InfoField,
+    InfoParseEsquema,
+    InfoTabla,
+    crear_directiva,
+    crear_directivas,
+)
+
+# directorio de cache local al proyecto (junto a .graphqlstore_config.json)
+DIRECTORIO_CACHE = ".graphqlstore_cache"
+
+# incrementar si cambia el formato serializado de InfoParseEsquema
+VERSION_FORMATO_CACHE = 2
+
+
+class CacheParseEsquema:
+    """Clase para cachear en disco el resultado de parsear \
+        un esquema GraphQL, indexado por el hash del texto."""
+
+    def __init__(
+        self,
+        directorio: Path,
+        max_entradas: int = 32,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Inicializa la cache de esquemas parseados.
+
+        :param directorio: Directorio donde se guardan las entradas.
+        :param max_entradas: Numero maximo de esquemas cacheados.
+        :param max_bytes: Tamaño maximo total de la cache en bytes.
+        """
+        self.directorio = Path(directorio)
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def calcular_clave(esquema: str) -> str:
+        """Calcular la clave de cache de un esquema a partir de su texto."""
+        contenido = f"{VERSION_FORMATO_CACHE}:{esquema}".encode("utf-8")
+        return hashlib.sha256(contenido).hexdigest()
+
+    def obtener(self, esquema: str) -> Optional[InfoParseEsquema]:
+        """
+        Obtener el esquema parseado de la cache si existe.
+
+        :param esquema: Texto del esquema GraphQL.
+        :return: InfoParseEsquema cacheado o None si no existe.
+        """
+        ruta = self._ruta_entrada(self.calcular_clave(esquema))
+
+        try:
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            info = deserializar_info_parse(datos)
+            # marcar la entrada como usada recientemente (LRU)
+            os.utime(ruta)
+        except (OSError, ValueError, KeyError, TypeError):
+            # una entrada ausente o corrupta se trata como fallo de cache
+            return None
+
+        return info
+
+    def guardar(self, esquema: str, info: InfoParseEsquema) -> None:
+        """
+        Guardar un esquema parseado en la cache.
+
+        :param esquema: Texto del esquema GraphQL.
+        :param info: Informacion parseada del esquema.
+        """
+        ruta = self._ruta_entrada(self.calcular_clave(esquema))
+        ruta_temporal = ruta.with_suffix(".tmp")
+
+        try:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            with open(ruta_temporal, "w", encoding="utf-8") as archivo:
+                json.dump(serializar_info_parse(info), archivo)
+            # reemplazo atomico para no dejar entradas a medio escribir
+            os.replace(ruta_temporal, ruta)
+            self._desalojar()
+        except OSError:
+            # la cache es una optimizacion, nunca debe romper el parseo
+            return
+
+    def limpiar(self) -> None:
+        """Eliminar todas las entradas de la cache."""
+        for ruta in self._entradas():
+            try:
+                ruta.unlink()
+            except OSError:
+                continue
+
+    def _ruta_entrada(self, clave: str) -> Path:
+        """Obtener la ruta del archivo de una entrada de cache."""
+        return self.directorio / f"{clave}.json"
+
+    def _entradas(self):
+        """Listar los archivos de entrada existentes en la cache."""
+        if not self.directorio.is_dir():
+            return []
+        return list(self.directorio.glob("*.json"))
+
+    def _desalojar(self) -> None:
+        """Eliminar las entradas menos usadas recientemente \
+            hasta respetar los limites de la cache."""
+        entradas = []
+        for ruta in self._entradas():
+            try:
+                stat = ruta.stat()
+            except OSError:
+                continue
+            entradas.append((stat.st_mtime, stat.st_size, ruta))
+
+        # mas antiguas primero
+        entradas.sort(key=lambda entrada: entrada[0])
+        total_bytes = sum(entrada[1] for entrada in entradas)
+
+        while entradas and (
+            len(entradas) > self.max_entradas or total_bytes > self.max_bytes
+        ):
+            _, tamano, ruta = entradas.pop(0)
+            try:
+                ruta.unlink()
+            except OSError:
+                continue
+            total_bytes -= tamano
+
+
+def _serializar_campo(campo: InfoField) -> List[Any]:
+    """Convertir un InfoField en una lista serializable."""
+    return [
+        campo.nombre,
+        campo.tipo_campo,
+        campo.es_lista,
+        campo.es_requerido,
+        {
+            nombre: dict(directiva.argumentos)
+            for nombre, directiva in campo.directivas.items()
+        },
+        campo.huella,
+    ]
+
+
+def serializar_info_parse(info: InfoParseEsquema) -> Dict[str, Any]:
+    """Convertir un InfoParseEsquema en un diccionario serializable."""
+    enums = info.enums
+    # las huellas estructurales se guardan para no recalcularlas
+    return {
+        "huella": info.huella,
+        "enums": {nombre: list(enums[nombre].valores) for nombre in enums},
+        "tablas": {
+            nombre: [
+                tabla.huella,
+                [_serializar_campo(campo) for campo in tabla.campos.values()],
+            ]
+            for nombre, tabla in info.tablas.items()
+        },
+    }
+
+
+def deserializar_info_parse(datos: Dict[str, Any]) -> InfoParseEsquema:
+    """Reconstruir un InfoParseEsquema a partir de su forma serializada."""
+    enums = {
+        nombre: InfoEnum(nombre=nombre, valores=list(valores))
+        for nombre, valores in datos["enums"].items()
+    }
+
+    tablas = {}
+    for nombre_tabla, (huella_tabla, campos) in datos["tablas"].items():
+        info_campos = {}
+        for (
+            nombre,
+            tipo_campo,
+            es_lista,
+            es_requerido,
+            directivas,
+            huella_campo,
+        ) in campos:
+            nombre = sys.intern(nombre)
+            info_campos[nombre] = InfoField(
+                nombre=nombre,
+                tipo_campo=sys.intern(tipo_campo),
+                es_lista=es_lista,
+                es_requerido=es_requerido,
+                directivas=crear_directivas(
+                    [
+                        crear_directiva(nombre_dir, argumentos)
+                        for nombre_dir, argumentos in directivas.items()
+                    ]
+                ),
+                huella=huella_campo,
+            )
+        nombre_tabla = sys.intern(nombre_tabla)
+        tablas[nombre_tabla] = InfoTabla(
+            nombre=nombre_tabla,
+            campos=info_campos,
+            huella=huella_tabla,
+        )
+
+    return InfoParseEsquema(
+        enums=enums,
+        tablas=tablas,
+        huella=datos["huella"],
+    )
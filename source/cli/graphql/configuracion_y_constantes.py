@@ -1,9 +1,12 @@
 """Modulo que contiene las configuraciones y constantes \
     para el CLI de GraphQL."""
 
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 
 class DatabaseType(Enum):
@@ -53,15 +56,76 @@ class OnDelete(Enum):
     SET_NULL = "SET NULL"
 
 
-@dataclass
+class ModoOnline(Enum):
+    """Tratamiento de los cambios que bloquean la tabla en una \
+        migracion online."""
+
+    ADVERTIR = "advertir"
+    RECHAZAR = "rechazar"
+    TABLA_SOMBRA = "sombra"
+
+
+# mapas vacios de solo lectura compartidos por todos los campos sin
+# directivas y todas las directivas sin argumentos
+ARGUMENTOS_VACIOS: Mapping[str, Any] = MappingProxyType({})
+DIRECTIVAS_VACIAS: Mapping[str, "InfoDirectiva"] = MappingProxyType({})
+
+
+@dataclass(slots=True, frozen=True)
 class InfoDirectiva:
     """Clase para almacenar información de una directiva."""
 
     nombre: str
-    argumentos: Dict[str, Any]
+    argumentos: Mapping[str, Any]
 
 
-@dataclass
+def _internar(valor: Any) -> Any:
+    """Internar los valores de tipo texto."""
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+@lru_cache(maxsize=None)
+def _directiva_sin_argumentos(nombre: str) -> InfoDirectiva:
+    """Obtener la instancia compartida de una directiva sin argumentos."""
+    return InfoDirectiva(nombre=nombre, argumentos=ARGUMENTOS_VACIOS)
+
+
+def crear_directiva(
+    nombre: str,
+    argumentos: Mapping[str, Any],
+) -> InfoDirectiva:
+    """
+    Crea una directiva con nombres internados.
+
+    Las directivas sin argumentos (``@id``, ``@unique``...) se comparten \
+        entre todos los campos, ya que InfoDirectiva es inmutable.
+
+    :param nombre: Nombre de la directiva.
+    :param argumentos: Argumentos de la directiva.
+    :return: Instancia de InfoDirectiva.
+    """
+    nombre = sys.intern(nombre)
+    if not argumentos:
+        return _directiva_sin_argumentos(nombre)
+
+    internados = {}
+    for clave, valor in argumentos.items():
+        internados[sys.intern(clave)] = _internar(valor)
+
+    return InfoDirectiva(nombre=nombre, argumentos=internados)
+
+
+def crear_directivas(
+    directivas: List[InfoDirectiva],
+) -> Mapping[str, InfoDirectiva]:
+    """Crear el mapa de directivas de un campo, compartiendo el mapa \
+        vacio entre todos los campos sin directivas."""
+    if not directivas:
+        return DIRECTIVAS_VACIAS
+    return {directiva.nombre: directiva for directiva in directivas}
+
+
+@dataclass(slots=True)
 class InfoField:
     """Clase para almacenar información de un campo."""
 
@@ -69,18 +133,22 @@ class InfoField:
     tipo_campo: str
     es_lista: bool
     es_requerido: bool
-    directivas: Dict[str, InfoDirectiva]
+    directivas: Mapping[str, InfoDirectiva]
+    # huella estructural calculada al parsear ("" si no se calculo)
+    huella: str = field(default="", compare=False, repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class InfoTabla:
     """Clase para almacenar informacion de una tabla."""
 
     nombre: str
     campos: Dict[str, InfoField]
+    # combina las huellas de los campos
+    huella: str = field(default="", compare=False, repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class InfoEnum:
     """Clase para almacenar información de un enum."""
 
@@ -88,15 +156,17 @@ class InfoEnum:
     valores: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class InfoParseEsquema:
     """Clase para almacenar informacion del esquema parseado."""
 
     enums: Dict[str, InfoEnum]
     tablas: Dict[str, InfoTabla]
+    # combina las huellas de las tablas y los enums
+    huella: str = field(default="", compare=False, repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class FuenteRelacion:
     """Clase para almacenar información de la fuente de una relación."""
 
@@ -107,7 +177,7 @@ class FuenteRelacion:
     on_delete: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ObjetivoRelacion:
     """Clase para almacenar información del objetivo de una relación."""
 
@@ -117,7 +187,7 @@ class ObjetivoRelacion:
     on_delete_inverso: str
 
 
-@dataclass
+@dataclass(slots=True)
 class InfoRelacion:
     """Clase para almacenar información de una relación."""
 
@@ -173,6 +243,15 @@ class InfoCambioEnum:
     valores_agregados: List[str]
     valores_eliminados: List[str]
 
+    def solo_agrega_valores(self) -> bool:
+        """Verificar si el cambio solo agrega valores, sin eliminar ni \
+            reordenar los existentes."""
+        antiguos = set(self.valores_antiguos)
+        conservados = [v for v in self.valores_nuevos if v in antiguos]
+        if self.valores_eliminados:
+            return False
+        return conservados == self.valores_antiguos
+
 
 @dataclass
 class InfoDiffEnums:
@@ -190,6 +269,13 @@ class InfoDiffEsquema:
     tablas: InfoDiffTablas = field(default_factory=InfoDiffTablas)
     relaciones: InfoDiffRelaciones = field(default_factory=InfoDiffRelaciones)
     enums: InfoDiffEnums = field(default_factory=InfoDiffEnums)
+    # contexto de la comparacion que necesita la generacion del SQL
+    enums_disponibles: Optional[Dict[str, InfoEnum]] = field(
+        default=None, compare=False, repr=False
+    )
+    tablas_existentes: Optional[Dict[str, InfoTabla]] = field(
+        default=None, compare=False, repr=False
+    )
 
     def tiene_cambios(self) -> bool:
         """Verificar si hay cambios en el esquema."""
@@ -239,6 +325,8 @@ class EstadoMigracion(Enum):
     APLICADA = "APPLIED"
     FALLIDA = "FAILED"
     REVERTIDA = "REVERTED"
+    # sin terminar, pero una migracion posterior llego al esquema destino
+    SUPERADA = "SUPERSEDED"
 
 
 DIRECTIVAS_TEMPORALES = {"createdAt", "updatedAt"}
@@ -25,5 +25,14 @@ class MigrationGenerationError(MigrationError):
     """Excepción para errores en generación de SQL de migración."""
 
 
+class SQLExecutionError(GraphQLStoreError):
+    """Excepcion para sentencias SQL que fallan al ejecutarse."""
+
+    def __init__(self, mensaje: str, resultados=None):
+        super().__init__(mensaje)
+        # resultados de las sentencias ejecutadas hasta la que fallo
+        self.resultados = resultados or []
+
+
 class DatabaseNotSupportedError(Exception):
     """Raised when the specified database type is not supported."""
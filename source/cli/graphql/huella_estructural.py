@@ -0,0 +1,56 @@
+"""Modulo con las huellas estructurales (estilo Merkle) de campos, \
+    tablas y esquemas parseados."""
+
+import hashlib
+from typing import Iterable, Mapping
+
+from .configuracion_y_constantes import (
+    InfoDirectiva,
+    InfoField,
+    InfoParseEsquema,
+    InfoTabla,
+)
+
+
+def _resumir(partes: Iterable[str]) -> str:
+    """Huella hexadecimal estable entre ejecuciones de unas partes."""
+    contenido = "\0".join(partes).encode("utf-8")
+    return hashlib.blake2b(contenido, digest_size=16).hexdigest()
+
+
+def _texto_directivas(directivas: Mapping[str, InfoDirectiva]) -> str:
+    """Directivas de un campo sin depender de su orden."""
+    return repr(
+        sorted(
+            (nombre, sorted(directiva.argumentos.items()))
+            for nombre, directiva in directivas.items()
+        )
+    )
+
+
+def huella_campo(campo: InfoField) -> str:
+    """Huella de todo lo que compara la migracion de un campo."""
+    return _resumir(
+        (
+            campo.nombre,
+            str(campo.tipo_campo),
+            f"{campo.es_lista:d}{campo.es_requerido:d}",
+            _texto_directivas(campo.directivas),
+        )
+    )
+
+
+def huella_tabla(tabla: InfoTabla) -> str:
+    """Huella de una tabla a partir de las de sus campos; como la \
+        comparacion de los campos, no depende de su orden."""
+    huellas = sorted(campo.huella for campo in tabla.campos.values())
+    return _resumir([tabla.nombre, *huellas])
+
+
+def huella_esquema(info: InfoParseEsquema) -> str:
+    """Huella de un esquema a partir de las de sus tablas y de sus \
+        enums (el orden de los valores de un enum si importa)."""
+    partes = sorted(tabla.huella for tabla in info.tablas.values())
+    for nombre in sorted(info.enums):
+        partes.append(_resumir([nombre, *info.enums[nombre].valores]))
+    return _resumir(partes)
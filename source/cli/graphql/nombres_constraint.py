@@ -0,0 +1,117 @@
+"""Modulo para asignar nombres de constraints e indices."""
+
+import hashlib
+from typing import Dict, Set
+
+# limites de longitud de identificadores de cada motor
+LONGITUD_MAXIMA_MYSQL = 64
+LONGITUD_MAXIMA_POSTGRESQL = 63
+
+# limite comun para que un mismo nombre sea valido en ambos motores
+LONGITUD_MAXIMA_IDENTIFICADOR = min(
+    LONGITUD_MAXIMA_MYSQL,
+    LONGITUD_MAXIMA_POSTGRESQL,
+)
+
+LONGITUD_SUFIJO_HASH = 8
+
+
+def acortar_identificador(
+    nombre: str,
+    longitud_maxima: int = LONGITUD_MAXIMA_IDENTIFICADOR,
+) -> str:
+    """
+    Acorta un identificador que supera la longitud maxima.
+
+    El nombre se trunca y se le añade un sufijo con el hash del nombre \
+        completo, de modo que el resultado es determinista y dos nombres \
+        largos con el mismo prefijo no colisionan.
+
+    :param nombre: Identificador original.
+    :param longitud_maxima: Longitud maxima permitida.
+    :return: Identificador con longitud menor o igual a la maxima.
+    """
+    if len(nombre) <= longitud_maxima:
+        return nombre
+
+    sufijo = hashlib.sha1(nombre.encode("utf-8")).hexdigest()
+    sufijo = sufijo[:LONGITUD_SUFIJO_HASH]
+    prefijo = nombre[: longitud_maxima - LONGITUD_SUFIJO_HASH - 1]
+    return f"{prefijo}_{sufijo}"
+
+
+def nombre_unique(
+    tabla: str,
+    columna: str,
+    longitud_maxima: int = LONGITUD_MAXIMA_IDENTIFICADOR,
+) -> str:
+    """
+    Nombre de la constraint unique de una columna.
+
+    Solo depende de la tabla y la columna, asi el generador de esquemas \
+        y los de migraciones usan el mismo nombre y no cambia al añadir \
+        o reordenar tipos.
+
+    :param tabla: Nombre de la tabla.
+    :param columna: Nombre de la columna.
+    :param longitud_maxima: Longitud maxima permitida.
+    :return: Nombre de la constraint.
+    """
+    return acortar_identificador(f"uk_{tabla}_{columna}", longitud_maxima)
+
+
+class RegistroNombresConstraint:
+    """Clase para asignar nombres unicos de constraints e indices."""
+
+    def __init__(self, longitud_maxima: int = LONGITUD_MAXIMA_IDENTIFICADOR):
+        """
+        Inicializa el registro de nombres.
+
+        :param longitud_maxima: Longitud maxima de los nombres asignados.
+        """
+        self.longitud_maxima = longitud_maxima
+        self.nombres_usados: Set[str] = set()
+        # ultimo contador usado para cada nombre base
+        self._contadores: Dict[str, int] = {}
+
+    def reservar(self, nombre_base: str) -> str:
+        """
+        Reserva un nombre unico a partir de un nombre base.
+
+        Si el nombre ya esta en uso se añade un contador (``_1``, \
+            ``_2``...). El contador de cada nombre base se recuerda, por lo \
+            que reservar un nombre tiene coste constante amortizado.
+
+        :param nombre_base: Nombre deseado para la constraint.
+        :return: Nombre unico y con longitud valida.
+        """
+        nombre = acortar_identificador(nombre_base, self.longitud_maxima)
+
+        if nombre in self.nombres_usados:
+            contador = self._contadores.get(nombre_base, 0)
+            while nombre in self.nombres_usados:
+                contador += 1
+                nombre = acortar_identificador(
+                    f"{nombre_base}_{contador}",
+                    self.longitud_maxima,
+                )
+            self._contadores[nombre_base] = contador
+
+        self.nombres_usados.add(nombre)
+        return nombre
+
+    def reservar_unique(self, tabla: str, columna: str) -> str:
+        """
+        Reserva el nombre de la constraint unique de una columna.
+
+        :param tabla: Nombre de la tabla.
+        :param columna: Nombre de la columna.
+        :return: Nombre determinista de la constraint.
+        """
+        nombre = nombre_unique(tabla, columna, self.longitud_maxima)
+        self.nombres_usados.add(nombre)
+        return nombre
+
+    def __contains__(self, nombre: str) -> bool:
+        """Verifica si un nombre ya esta reservado."""
+        return nombre in self.nombres_usados
@@ -1,9 +1,11 @@
 """Modulo GraphQLSchemaParser"""
 
-from typing import Any, Dict
+import sys
+from typing import Dict, Mapping, Optional
 from graphql.language import parse
 from graphql.error import GraphQLError
 from graphql.language.ast import (
+    DocumentNode,
     EnumTypeDefinitionNode,
     ListTypeNode,
     NamedTypeNode,
@@ -17,7 +19,11 @@ from .configuracion_y_constantes import (
     InfoParseEsquema,
     InfoTabla,
     TipoField,
+    crear_directiva,
+    crear_directivas,
 )
+from .cache_esquema import CacheParseEsquema
+from .huella_estructural import huella_campo, huella_esquema, huella_tabla
 from .exceptions import SchemaError
 
 
@@ -25,6 +31,15 @@ class ParserGraphQLEsquema:
     """Clase para parsear un esquema GraphQL \
         y extraer información relevante."""
 
+    def __init__(self, cache: Optional[CacheParseEsquema] = None):
+        """
+        Inicializa el parser.
+
+        :param cache: Cache opcional de esquemas parseados. Si se \
+            proporciona, un esquema ya parseado no se vuelve a parsear.
+        """
+        self.cache = cache
+
     @staticmethod
     def get_type_mapping() -> Dict[str, str]:
         """Retorna un diccionario que mapea tipos GraphQL a tipos SQL."""
@@ -42,37 +57,64 @@ class ParserGraphQLEsquema:
         """Parsear el esquema GraphQL y retornar un \
             diccionario con la información extraída."""
 
-        tablas = {}
-        enums = {}
+        if self.cache is not None:
+            info_cacheada = self.cache.obtener(esquema)
+            if info_cacheada is not None:
+                return info_cacheada
+
+        info_esquema = self.extraer_informacion(
+            self.parsear_documento(esquema),
+        )
+
+        if self.cache is not None:
+            self.cache.guardar(esquema, info_esquema)
+
+        return info_esquema
 
+    @staticmethod
+    def parsear_documento(esquema: str) -> DocumentNode:
+        """
+        Parsea el texto del esquema y retorna el documento AST.
+
+        :param esquema: Texto del esquema GraphQL.
+        :return: Documento AST de graphql-core.
+        :raises SchemaError: Si el esquema no es valido.
+        """
         try:
             # parsear el esquema GraphQL usando parser de graphql-core
             # https://github.com/graphql-python/graphql-core/blob/main\
             # /src/graphql/language/parser.py
-            ast = parse(esquema)
-
-            # procesar cada definicion del documento AST
-            for definition in ast.definitions:
-                if isinstance(definition, EnumTypeDefinitionNode):
-                    info_enum = self._parse_enum_definition(definition)
-                    enums[info_enum.nombre] = info_enum
-
-                if isinstance(
-                    definition, ObjectTypeDefinitionNode
-                ) and definition.name.value not in [
-                    "Query",
-                    "Mutation",
-                    "Subscription",
-                ]:
-                    info_tabla = self._parse_tabla_definition(definition)
-                    tablas[info_tabla.nombre] = info_tabla
-
-            return InfoParseEsquema(tablas=tablas, enums=enums)
+            return parse(esquema)
         except GraphQLError as e:
             raise SchemaError(
                 f"Error al parsear el esquema GraphQL: {str(e)}",
             ) from e
 
+    def extraer_informacion(self, documento: DocumentNode) -> InfoParseEsquema:
+        """Extraer las tablas y enums de un documento AST ya parseado."""
+        tablas = {}
+        enums = {}
+
+        # procesar cada definicion del documento AST
+        for definition in documento.definitions:
+            if isinstance(definition, EnumTypeDefinitionNode):
+                info_enum = self._parse_enum_definition(definition)
+                enums[info_enum.nombre] = info_enum
+
+            if isinstance(
+                definition, ObjectTypeDefinitionNode
+            ) and definition.name.value not in [
+                "Query",
+                "Mutation",
+                "Subscription",
+            ]:
+                info_tabla = self._parse_tabla_definition(definition)
+                tablas[info_tabla.nombre] = info_tabla
+
+        info = InfoParseEsquema(tablas=tablas, enums=enums)
+        info.huella = huella_esquema(info)
+        return info
+
     def _parse_enum_definition(
         self,
         definition: EnumTypeDefinitionNode,
@@ -93,7 +135,7 @@ class ParserGraphQLEsquema:
             y retornar un objeto InfoTabla."""
 
         # Extraer el nombre de la tabla
-        nombre = definition.name.value
+        nombre = sys.intern(definition.name.value)
         # Extraer los campos de la tabla
         fields = {}
 
@@ -102,24 +144,29 @@ class ParserGraphQLEsquema:
             info_field = self._parse_field_definition(field)
             fields[info_field.nombre] = info_field
 
-        return InfoTabla(nombre=nombre, campos=fields)
+        info_tabla = InfoTabla(nombre=nombre, campos=fields)
+        info_tabla.huella = huella_tabla(info_tabla)
+        return info_tabla
 
     def _parse_field_definition(self, field):
         """Parsear una definicion de campo y retornar un objeto InfoField."""
         # extraer el nombre del campo
-        nombre = field.name.value
+        nombre = sys.intern(field.name.value)
         # extraer el tipo del campo despues de parsear el tipo
         tipo_campo, es_lista, es_requerido = self._parse_type(field.type)
         # extraer las directivas del campo
         directivas = self._parse_directives(field.directives)
 
-        return InfoField(
+        info_field = InfoField(
             nombre=nombre,
             tipo_campo=tipo_campo,
             es_lista=es_lista,
             es_requerido=es_requerido,
             directivas=directivas,
         )
+        # las huellas de los campos componen la de su tabla
+        info_field.huella = huella_campo(info_field)
+        return info_field
 
     def _parse_type(self, type_node):
         """Extraer informacion del  tipo de un nodo tipo."""
@@ -141,20 +188,15 @@ class ParserGraphQLEsquema:
 
         # Manejar tipo nombre
         if isinstance(type_node, NamedTypeNode):
-            return type_node.name.value, es_lista, es_requerido
+            return sys.intern(type_node.name.value), es_lista, es_requerido
 
         return None, es_lista, es_requerido
 
-    def _parse_directives(self, directives) -> Dict[str, Any]:
+    def _parse_directives(self, directives) -> Mapping[str, InfoDirectiva]:
         """Parsear directivas de un campo y retornar un diccionario."""
-
-        result = {}
-        for directive in directives:
-            # Parsear cada directiva
-            info_directiva = self._parse_directive(directive)
-            result[info_directiva.nombre] = info_directiva
-
-        return result
+        return crear_directivas(
+            [self._parse_directive(directive) for directive in directives]
+        )
 
     def _parse_directive(self, directive):
         """Parsear una directiva y retornar un objeto InfoDirectiva."""
@@ -166,4 +208,4 @@ class ParserGraphQLEsquema:
             arg_valor = arg.value.value
             argumentos[arg_nombre] = arg_valor
 
-        return InfoDirectiva(nombre=nombre, argumentos=argumentos)
+        return crear_directiva(nombre, argumentos)
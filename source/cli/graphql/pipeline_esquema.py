@@ -0,0 +1,85 @@
+"""Modulo PipelineEsquema"""
+
+from functools import cached_property
+from typing import List, Optional, Union
+
+from graphql.language.ast import DocumentNode
+
+from .configuracion_y_constantes import InfoParseEsquema, InfoRelacion
+from .exceptions import SchemaError
+from .parser import ParserGraphQLEsquema
+from .procesar_relaciones import ProcesarRelaciones
+from .transform_schema_graphql import transform_document_graphql
+
+
+class PipelineEsquema:
+    """Clase que parsea un esquema GraphQL una unica vez y comparte \
+        el documento AST entre la extraccion de tablas y enums, el \
+        procesamiento de relaciones y el esquema cliente."""
+
+    def __init__(
+        self,
+        esquema: str,
+        parser: Optional[ParserGraphQLEsquema] = None,
+    ):
+        """
+        Inicializa el pipeline. Ninguna etapa se ejecuta hasta que \
+            se accede a su resultado.
+
+        :param esquema: Texto del esquema GraphQL.
+        :param parser: Parser a utilizar (con su cache opcional).
+        """
+        self.esquema = esquema
+        self.parser = parser or ParserGraphQLEsquema()
+
+    @classmethod
+    def desde(
+        cls,
+        esquema: Union[str, "PipelineEsquema"],
+        parser: Optional[ParserGraphQLEsquema] = None,
+    ) -> "PipelineEsquema":
+        """Obtener un pipeline a partir de un texto o reutilizar \
+            el pipeline recibido."""
+        if isinstance(esquema, PipelineEsquema):
+            return esquema
+        return cls(esquema, parser)
+
+    @cached_property
+    def documento(self) -> DocumentNode:
+        """Documento AST del esquema, parseado una sola vez."""
+        return self.parser.parsear_documento(self.esquema)
+
+    @cached_property
+    def info(self) -> InfoParseEsquema:
+        """Tablas y enums del esquema."""
+        cache = self.parser.cache
+        if cache is not None:
+            info_cacheada = cache.obtener(self.esquema)
+            if info_cacheada is not None:
+                # con la cache no hace falta parsear el documento
+                return info_cacheada
+
+        info = self.parser.extraer_informacion(self.documento)
+        if cache is not None:
+            cache.guardar(self.esquema, info)
+
+        return info
+
+    @cached_property
+    def relaciones(self) -> List[InfoRelacion]:
+        """Relaciones entre las tablas del esquema."""
+        return ProcesarRelaciones(
+            tablas=self.info.tablas,
+            scalar_types=ParserGraphQLEsquema.get_type_mapping(),
+            enum_types=self.info.enums,
+        ).procesar_relaciones()
+
+    @cached_property
+    def esquema_cliente(self) -> str:
+        """Esquema cliente sin directivas ni campos protegidos."""
+        try:
+            documento = self.documento
+        except SchemaError as e:
+            raise ValueError(f"Error transforming schema: {str(e)}") from e
+
+        return transform_document_graphql(documento)
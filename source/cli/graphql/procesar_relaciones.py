@@ -3,6 +3,7 @@
 from typing import Dict, List, Optional, Tuple
 
 from .exceptions import RelationshipError
+from .nombres_constraint import RegistroNombresConstraint
 
 from .configuracion_y_constantes import (
     FuenteRelacion,
@@ -26,6 +27,7 @@ class ProcesarRelaciones:
         tablas: Dict[str, InfoTabla],
         scalar_types: Dict[str, str],
         enum_types: Dict[str, InfoEnum],
+        registro_nombres: Optional[RegistroNombresConstraint] = None,
     ):
         """
         Inicializa la clase con las tablas y tipos escalares.
@@ -33,6 +35,8 @@ class ProcesarRelaciones:
         :param tablas: Diccionario con las tablas y su información.
         :param scalar_types: Diccionario con los tipos escalares.
         :param enum_types: Diccionario con los tipos enumerados.
+        :param registro_nombres: Registro de nombres de constraints \
+            compartido. Si no se proporciona se crea uno nuevo.
         """
         self.tablas = tablas
         self.scalar_types = scalar_types
@@ -41,7 +45,14 @@ class ProcesarRelaciones:
         # mantener el seguimiento de las relaciones procesadas
         self.relaciones_procesadas: set[Tuple[str, ...]] = set()
         # mantener el seguimiento de nombres constraint usados
-        self.nombres_constraint_usados: set[str] = set()
+        if registro_nombres is None:
+            registro_nombres = RegistroNombresConstraint()
+        self.registro_nombres = registro_nombres
+        self.nombres_constraint_usados = registro_nombres.nombres_usados
+        # indice (relacion, tabla, tipo) -> (campo inverso, on_delete)
+        self._indice_inversas: Dict[Tuple[str, str, str], Tuple[str, str]] = (
+            self._construir_indice_inversas()
+        )
 
     def procesar_relaciones(self) -> List[InfoRelacion]:
         """
@@ -169,6 +180,39 @@ class ProcesarRelaciones:
 
     # pylint: enable=too-many-locals
 
+    def _construir_indice_inversas(
+        self,
+    ) -> Dict[Tuple[str, str, str], Tuple[str, str]]:
+        """
+        Construye un indice de los campos de relacion de todas las tablas.
+
+        La clave es (nombre de la relacion, tabla que contiene el campo, \
+            tipo del campo) y el valor el nombre del campo y su on_delete. \
+            Si varios campos comparten clave se conserva el primero, igual \
+            que al recorrer los campos de la tabla en orden.
+
+        :return: Diccionario con el indice de relaciones inversas.
+        """
+        indice: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+
+        for nombre_tabla, info_tabla in self.tablas.items():
+            for nombre_campo, info_campo in info_tabla.campos.items():
+                info_relacion = info_campo.directivas.get("relation")
+                if info_relacion is None:
+                    continue
+
+                argumentos = info_relacion.argumentos
+                nombre_relacion: Optional[str] = argumentos.get("name")
+                if not nombre_relacion:
+                    continue
+
+                indice.setdefault(
+                    (nombre_relacion, nombre_tabla, info_campo.tipo_campo),
+                    (nombre_campo, argumentos.get("onDelete", "SET_NULL")),
+                )
+
+        return indice
+
     def _buscar_relacion_inversa(
         self,
         nombre_tabla: str,
@@ -184,40 +228,13 @@ class ProcesarRelaciones:
         :return: Tupla con el campo inverso y el on_delete inverso.
         """
 
-        campo_inverso: Optional[str] = None
-        on_delete_inverso: str = "SET_NULL"
-
-        if tabla_objetivo in self.tablas:
-            for nombre_campo_inverso, info_campo_inverso in self.tablas[
-                tabla_objetivo
-            ].campos.items():
-                if info_campo_inverso.tipo_campo == nombre_tabla:
-                    directivas = info_campo_inverso.directivas
-                    info_rel_inver: InfoDirectiva = directivas.get(
-                        "relation",
-                        InfoDirectiva(
-                            nombre="relation",
-                            argumentos={},
-                        ),
-                    )
-                    args_rel_inver = info_rel_inver.argumentos
-                    nombre_rel_inver: Optional[str] = args_rel_inver.get(
-                        "name",
-                    )
-
-                    if (
-                        nombre_relacion
-                        and nombre_rel_inver
-                        and nombre_relacion == nombre_rel_inver
-                    ):
-                        campo_inverso = nombre_campo_inverso
-                        on_delete_inverso = args_rel_inver.get(
-                            "onDelete",
-                            "SET_NULL",
-                        )
-                        break
-
-        return campo_inverso, on_delete_inverso
+        inversa = self._indice_inversas.get(
+            (nombre_relacion, tabla_objetivo, nombre_tabla),
+        )
+        if inversa is None:
+            return None, "SET_NULL"
+
+        return inversa
 
     def _determinar_tipo_relacion(
         self,
@@ -317,27 +334,13 @@ class ProcesarRelaciones:
         if campo_inverso:
             nom_con_fue += f"_{campo_inverso}"
 
-        contador_constraint = 1
-        while nom_con_fue in self.nombres_constraint_usados:
-            nom_con_fue = f"fk_{nombre_tabla}_{nombre_campo}_{tabla_objetivo}"
-            contador_constraint += 1
-
-        self.nombres_constraint_usados.add(nom_con_fue)
+        nom_con_fue = self.registro_nombres.reservar(nom_con_fue)
 
         nombre_constraint_objetivo: Optional[str] = None
         if tipo_relacion == TipoRelacion.MANY_TO_MANY.value and campo_inverso:
-            nombre_constraint_objetivo = (
-                f"fk_{tabla_objetivo}_{campo_inverso}_{nombre_tabla}"
+            nombre_constraint_objetivo = self.registro_nombres.reservar(
+                f"fk_{tabla_objetivo}_{campo_inverso}_{nombre_tabla}",
             )
-            contador_constraint = 1
-            while nombre_constraint_objetivo in self.nombres_constraint_usados:
-                nombre_constraint_objetivo = (
-                    f"fk_{tabla_objetivo}_{campo_inverso}_"
-                    f"{nombre_tabla}_{contador_constraint}"
-                )
-                contador_constraint += 1
-
-            self.nombres_constraint_usados.add(nombre_constraint_objetivo)
 
         return nom_con_fue, nombre_constraint_objetivo
 
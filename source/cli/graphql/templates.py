@@ -54,6 +54,10 @@ TEMPLATE_ELIMINAR_CAMPO = "ALTER TABLE `{tabla}` DROP COLUMN `{campo}`;"
 
 TEMPLATE_MODIFICAR_CAMPO = "ALTER TABLE `{tabla}` MODIFY COLUMN {definicion};"
 
+TEMPLATE_MODIFICAR_CAMPO_ALGORITMO = (
+    TEMPLATE_MODIFICAR_CAMPO[:-1] + ", ALGORITHM={algoritmo};"
+)
+
 # FOREIGN KEYS
 
 TEMPLATE_AGREGAR_FK = (
@@ -84,4 +88,10 @@ def template_modificar_fk(
 
 
 # INDEXES
-TEMPLATE_AGREGAR_UNIQUE = "UNIQUE KEY `uk_{uk_nom_columna}` (`{nom_columna}`)"
+TEMPLATE_AGREGAR_UNIQUE = "UNIQUE KEY `{nombre}` (`{nom_columna}`)"
+
+TEMPLATE_AGREGAR_INDICE_UNIQUE = (
+    "ALTER TABLE `{tabla}` ADD UNIQUE KEY `{nombre}` (`{nom_columna}`);"
+)
+
+TEMPLATE_ELIMINAR_INDICE = "ALTER TABLE `{tabla}` DROP INDEX `{nombre}`;"
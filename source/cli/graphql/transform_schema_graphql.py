@@ -2,34 +2,51 @@
 
 from graphql.error import GraphQLError
 from graphql.language import parse
-from graphql.language.ast import DirectiveNode, FieldDefinitionNode
+from graphql.language.ast import (
+    DirectiveNode,
+    DocumentNode,
+    FieldDefinitionNode,
+)
 from graphql.language.printer import print_ast
 from graphql.language.visitor import IDLE, REMOVE, Visitor, visit
 
 
-def transform_schema_graphql(schema: str) -> str:
-    """Transform GraphQL schema to client schema."""
-    try:
-        ast = parse(schema)
+class RemoveDirectivesVisitor(Visitor):
+    """Remove visitor directive from the AST and \
+        protected fields."""
 
-        class RemoveDirectivesVisitor(Visitor):
-            """Remove visitor directive from the AST and \
-                protected fields."""
+    def enter(self, node, *_):
+        """Enter node in the traversal."""
+        if isinstance(node, DirectiveNode):
+            return REMOVE
 
-            def enter(self, node, *_):
-                """Enter node in the traversal."""
-                if isinstance(node, DirectiveNode):
+        if isinstance(node, FieldDefinitionNode):
+            for directive in node.directives:
+                if directive.name.value == "protected":
                     return REMOVE
 
-                if isinstance(node, FieldDefinitionNode):
-                    for directive in node.directives:
-                        if directive.name.value == "protected":
-                            return REMOVE
+        return IDLE
 
-                return IDLE
 
-        new_ast = visit(ast, RemoveDirectivesVisitor())
+def transform_document_graphql(document: DocumentNode) -> str:
+    """Transform an already parsed GraphQL document to client schema.
+
+    The visitor copies the edited nodes, so the given document is \
+        left untouched and can still be shared with the SQL pipeline.
+    """
+    try:
+        new_ast = visit(document, RemoveDirectivesVisitor())
 
         return print_ast(new_ast)
     except GraphQLError as e:
         raise ValueError(f"Error transforming schema: {str(e)}") from e
+
+
+def transform_schema_graphql(schema: str) -> str:
+    """Transform GraphQL schema to client schema."""
+    try:
+        ast = parse(schema)
+    except GraphQLError as e:
+        raise ValueError(f"Error transforming schema: {str(e)}") from e
+
+    return transform_document_graphql(ast)
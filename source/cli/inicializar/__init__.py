@@ -1,10 +1,17 @@
 """Modulo del inicializar"""
 
-from .comando_inicializar import ComandoInicializar
-from .main import inicializar
-
+from ..carga_perezosa import exportaciones_perezosas
 
 __all__ = [
     "ComandoInicializar",
     "inicializar",
 ]
+
+# las dependencias del comando se cargan solo al ejecutarlo
+__getattr__, __dir__ = exportaciones_perezosas(
+    __name__,
+    {
+        "ComandoInicializar": ".comando_inicializar",
+        "inicializar": ".main",
+    },
+)
@@ -0,0 +1,57 @@
+"""Modulo con la inicializacion asyncio, para orquestar varias bases \
+    de datos."""
+
+import asyncio
+
+from ..database.adaptadores import crear_adaptador_asincrono
+from ..generators.generator_db_schema import GeneratorDBSchema
+from ..graphql import ParserGraphQLEsquema, PipelineEsquema
+from ..graphql.configuracion_y_constantes import DatabaseType
+from ..graphql.exceptions import GraphQLStoreError
+
+
+async def inicializar_esquema(
+    esquema: str,
+    config: dict,
+    db_type: DatabaseType = DatabaseType.MYSQL,
+    rapido: bool = False,
+) -> int:
+    """
+    Crea en una base de datos vacia las tablas de un esquema GraphQL.
+
+    :param esquema: Contenido del esquema GraphQL.
+    :param config: Configuracion de la conexion.
+    :param db_type: Motor de la base de datos.
+    :param rapido: Usar la sesion de arranque rapido del adaptador.
+    :return: Numero de sentencias ejecutadas.
+    :raises GraphQLStoreError: Si la base de datos no esta vacia.
+    """
+    pipeline = PipelineEsquema(esquema, ParserGraphQLEsquema())
+
+    def generar():
+        info = pipeline.info
+        # las foreign keys van dentro de CREATE TABLE, en orden
+        return list(
+            GeneratorDBSchema(db_type).generate_schema_stream(
+                tables=info.tablas,
+                enums=info.enums,
+                relationships=pipeline.relaciones,
+                print_output=False,
+                print_sql=False,
+                inline_foreign_keys=True,
+            )
+        )
+
+    sentencias = await asyncio.to_thread(generar)
+
+    async with crear_adaptador_asincrono(db_type) as adaptador:
+        await adaptador.conectar(config)
+        if not await adaptador.empty_database():
+            raise GraphQLStoreError(
+                "La base de datos no esta vacia, ejecuta el comando "
+                "migracion para modificar el esquema existente."
+            )
+        return await adaptador.ejecutar_sentencias(
+            sentencias,
+            arranque=rapido,
+        )
@@ -1,7 +1,15 @@
 """Modulo del comando inicialiazar"""
 
 from ..base import Comando
-from .main import inicializar
+
+
+def inicializar(args):
+    """Inicializar la base de datos importando el parser, los \
+        generadores y el adaptador solo al ejecutar el comando."""
+    # pylint: disable-next=import-outside-toplevel
+    from .main import inicializar as ejecutar
+
+    ejecutar(args)
 
 
 class ComandoInicializar(Comando):
@@ -42,6 +50,26 @@ class ComandoInicializar(Comando):
             action="store_true",
             help="No visualizar salida SQL",
         )
+        inicializar_parser.add_argument(
+            "--sin-cache",
+            default=False,
+            action="store_true",
+            help="No usar la cache de esquemas parseados",
+        )
+        inicializar_parser.add_argument(
+            "--orden-dependencias",
+            default=False,
+            action="store_true",
+            help="Crear las tablas en orden de dependencias con las "
+            "foreign keys dentro de CREATE TABLE",
+        )
+        inicializar_parser.add_argument(
+            "--rapido",
+            default=False,
+            action="store_true",
+            help="Crear el esquema en una sesion optimizada para una "
+            "base de datos vacia",
+        )
 
     def contenido_comando(self, args):
         """
@@ -1,18 +1,19 @@
 """Modulo para gestionar la inicializacion en la CLI."""
 
+from contextlib import nullcontext
 from pathlib import Path
 from rich.console import Console
 
 from ..database.adaptadores import AdaptadorMySQL
+from ..database.adaptador_database import TAM_LOTE
 
 from ..loaders.conf_json_loader import ConfiguracionJsonLoader
 from ..utilidades import GestorArchivo
-from ..graphql import (
-    ParserGraphQLEsquema,
-    ProcesarRelaciones,
-    transform_schema_graphql,
-)
+from ..utilidades.perfilador import obtener_perfilador
+from ..graphql import ParserGraphQLEsquema, PipelineEsquema
+from ..graphql.cache_esquema import CacheParseEsquema, DIRECTORIO_CACHE
 from ..generators.generator_db_schema import GeneratorDBSchema
+from .arranque_rapido import ArranqueRapido
 from ..graphql.exceptions import (
     GraphQLStoreError,
     SchemaError,
@@ -30,6 +31,7 @@ def inicializar(args):
             la linea de comandos.
     """
     consola = Console()
+    perfilador = obtener_perfilador()
 
     # verificar si el directorio de salida existe
     # si no existe, crearlo
@@ -78,6 +80,16 @@ def inicializar(args):
     consola.print("Desplegando servicio", style="bold green")
     consola.print("NUEVO ESQUEMA:\n", style="bold magenta")
 
+    # parsear el esquema GraphQL (reutilizando la cache del proyecto);
+    # el documento se parsea una vez para el SQL y el esquema cliente
+    cache = None
+    if not args.sin_cache:
+        cache = CacheParseEsquema(Path.cwd() / DIRECTORIO_CACHE)
+    pipeline = PipelineEsquema(
+        esquema_contenido,
+        ParserGraphQLEsquema(cache=cache),
+    )
+
     try:
         # cargar configuracion de la base de datos
         ruta_archivo = Path.cwd() / ".graphqlstore_config.json"
@@ -87,8 +99,9 @@ def inicializar(args):
         if not config:
             return
 
-        adaptador = AdaptadorMySQL()
-        adaptador.conectar(config)
+        with perfilador.fase("conexion"):
+            adaptador = AdaptadorMySQL()
+            adaptador.conectar(config)
 
         if not adaptador.empty_database():
             consola.print(
@@ -99,43 +112,58 @@ def inicializar(args):
             )
             return
 
-        # parsear el esquema GraphQL
-        parser = ParserGraphQLEsquema()
-        informacion_parseada = parser.parse_esquema(esquema_contenido)
+        with perfilador.fase("parseo"):
+            informacion_parseada = pipeline.info
         consola.print("\nEsquema parseado correctamente.", style="bold green")
 
-        procesar_relaciones = ProcesarRelaciones(
-            tablas=informacion_parseada.tablas,
-            scalar_types=ParserGraphQLEsquema.get_type_mapping(),
-            enum_types=informacion_parseada.enums,
-        )
-        relaciones = procesar_relaciones.procesar_relaciones()
+        with perfilador.fase("relaciones"):
+            relaciones = pipeline.relaciones
+
         generador_esquema_mysql = GeneratorDBSchema()
-        sql = generador_esquema_mysql.generate_schema(
+        sentencias = generador_esquema_mysql.generate_schema_stream(
             tables=informacion_parseada.tablas,
             enums=informacion_parseada.enums,
             relationships=relaciones,
             print_output=not args.no_visualizar_salida,
             print_sql=not args.no_visualizar_sql,
+            # el modo rapido crea las foreign keys dentro de CREATE TABLE
+            inline_foreign_keys=args.orden_dependencias or args.rapido,
         )
-        adaptador.ejecutar_consulta(sql)
-        adaptador.cerrar_conexion()
+
+        arranque = None
+        sesion = nullcontext()
+        if args.rapido:
+            arranque = ArranqueRapido(relaciones)
+            sentencias = arranque.contar(sentencias)
+            sesion = adaptador.sesion_arranque()
+
+        # las sentencias se ejecutan por lotes y se escriben en schema.sql
+        # en cuanto se generan, sin construir el esquema completo en memoria
+        with perfilador.fase("generacion_y_ejecucion"):
+            archivo_mysql = Path(salida_dir) / "schema.sql"
+            with arranque.medir() if arranque else nullcontext(), sesion:
+                GestorArchivo.escribir_sentencias(
+                    adaptador.ejecutar_en_flujo(sentencias, TAM_LOTE),
+                    archivo_mysql,
+                )
+            adaptador.cerrar_conexion()
+
+        if arranque:
+            arranque.mostrar_resumen(consola)
 
     except (GraphQLStoreError, SchemaError, RelationshipError) as e:
         consola.print(":cross_mark: ERROR AL CREAR EL ESQUEMA\n")
         consola.print(f"Error: {e}", style="bold red")
 
     try:
-        # crear backup del esquema original
-        archivo_backup = Path(salida_dir) / ".backup.graphql"
-        GestorArchivo.escribir_archivo(esquema_contenido, archivo_backup)
-
-        # escribir esquema MySQL en archivo
-        archivo_mysql = Path(salida_dir) / "schema.sql"
-        GestorArchivo.escribir_archivo(sql, archivo_mysql)
+        with perfilador.fase("escritura_archivos"):
+            # crear backup del esquema original
+            archivo_backup = Path(salida_dir) / ".backup.graphql"
+            GestorArchivo.escribir_archivo(esquema_contenido, archivo_backup)
 
         # transformar esquema graphql
-        graphql_esquema = transform_schema_graphql(esquema_contenido)
+        with perfilador.fase("esquema_cliente"):
+            graphql_esquema = pipeline.esquema_cliente
         archivo_salida = Path(salida_dir) / "schema.graphql"
         GestorArchivo.escribir_archivo(graphql_esquema, archivo_salida)
     except ValueError as e:
@@ -55,7 +55,55 @@ class CLI:
             self.constructor.parser.print_help()
             return
 
-        # ejecutar el comando correspondiente
-        self.lanzamiento_condicionado()
+        args = self.args
+        if not (args.perfil or args.perfil_json or args.perfil_cprofile):
+            # ejecutar el comando correspondiente
+            self.lanzamiento_condicionado()
+            return
+
+        # ejecutar el comando midiendo sus fases y sentencias
+        # pylint: disable-next=import-outside-toplevel
+        from .utilidades.perfilador import (
+            activar_perfilador,
+            desactivar_perfilador,
+        )
+
+        perfilador = activar_perfilador(
+            cprofile=bool(self.args.perfil_cprofile),
+        )
+        perfilador.iniciar_cprofile()
+        try:
+            self.lanzamiento_condicionado()
+        finally:
+            perfilador.detener_cprofile()
+            desactivar_perfilador()
+            self.reportar_perfil(perfilador)
+
+    def reportar_perfil(self, perfilador):
+        """Metodo que muestra o guarda el perfil de la ejecucion"""
+        # rich solo se importa si se ha pedido el perfil
+        # pylint: disable=import-outside-toplevel
+        from pathlib import Path
+        from rich.console import Console
+
+        # pylint: enable=import-outside-toplevel
+
+        consola = Console()
+        perfilador.mostrar_resumen(consola)
+
+        if self.args.perfil_json:
+            perfilador.exportar_json(Path(self.args.perfil_json))
+            consola.print(
+                f":file_folder: Traza del perfil: {self.args.perfil_json}",
+                style="bold green",
+            )
+
+        ruta_cprofile = self.args.perfil_cprofile
+        if ruta_cprofile:
+            perfilador.exportar_cprofile(Path(ruta_cprofile))
+            consola.print(
+                f":file_folder: Estadisticas cProfile: {ruta_cprofile}",
+                style="bold green",
+            )
 
     # pylint: enable=too-many-instance-attributes
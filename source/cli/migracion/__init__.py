@@ -1,9 +1,17 @@
 """Modulo de migracion"""
 
-from .main import migracion
-from .comando_migracion import ComandoMigracion
+from ..carga_perezosa import exportaciones_perezosas
 
 __all__ = [
     "migracion",
     "ComandoMigracion",
 ]
+
+# las dependencias del comando se cargan solo al ejecutarlo
+__getattr__, __dir__ = exportaciones_perezosas(
+    __name__,
+    {
+        "migracion": ".main",
+        "ComandoMigracion": ".comando_migracion",
+    },
+)
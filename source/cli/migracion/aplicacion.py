@@ -0,0 +1,199 @@
+"""Modulo con la aplicacion de una migracion generada en una base de \
+    datos, comun a la migracion de una y de varias bases de datos."""
+
+import time
+from pathlib import Path
+from typing import List
+
+from rich.console import Console
+
+from ..database.adaptador_database import AdaptadorDatabase, ResultadoSentencia
+from ..database.historial import (
+    RegistroMigracion,
+    ResumenHistorial,
+    checksum_sql,
+)
+from ..database.relleno import (
+    ARCHIVO_PROGRESO_RELLENO,
+    ConfiguracionRelleno,
+    ProgresoRelleno,
+)
+from ..graphql.configuracion_y_constantes import EstadoMigracion, InfoMigracion
+from ..graphql.exceptions import MigrationError, SQLExecutionError
+
+
+def configuracion_relleno(
+    args,
+    consola: Console,
+    destino: str = "",
+) -> ConfiguracionRelleno:
+    """
+    Lotes de los pasos que mueven datos, con su progreso en el \
+        directorio de salida para reanudarlos.
+
+    :param args: Argumentos del comando migracion.
+    :param consola: Consola donde se muestra el avance.
+    :param destino: Nombre de la base de datos con ``--destinos``; \
+        cada una guarda su progreso en su propio archivo.
+    :return: Configuracion de los rellenos.
+    """
+    prefijo = f"{destino}: " if destino else ""
+
+    def al_avanzar(paso, filas, _clave):
+        consola.print(
+            f"{prefijo}Relleno de {paso.tabla}: {filas} filas actualizadas",
+            style="dim",
+        )
+
+    archivo = ARCHIVO_PROGRESO_RELLENO
+    if destino:
+        archivo = f"{Path(archivo).stem}.{destino}.json"
+    ruta_progreso = Path.cwd() / args.salida / archivo
+    return ConfiguracionRelleno(
+        tam_lote=args.lote_relleno,
+        pausa=args.pausa_relleno,
+        progreso=ProgresoRelleno(ruta_progreso),
+        al_avanzar=al_avanzar,
+    )
+
+
+def preparar_destino(
+    adaptador: AdaptadorDatabase,
+    args,
+    consola: Console,
+    huella_esquema: str,
+    destino: str = "",
+) -> ResumenHistorial:
+    """
+    Ajusta un adaptador conectado con las opciones del comando \
+        migracion y lee el historial de su base de datos.
+
+    :param adaptador: Adaptador conectado a la base de datos.
+    :param args: Argumentos del comando migracion.
+    :param consola: Consola para los avisos.
+    :param huella_esquema: Huella del esquema que se va a aplicar.
+    :param destino: Nombre de la base de datos con ``--destinos``.
+    :return: Lo que indica el historial antes de migrar.
+    :raises MigrationError: Si la base de datos no esta inicializada.
+    """
+    adaptador.relleno = configuracion_relleno(args, consola, destino)
+    # en modo online un ALTER rechazado no copia la tabla
+    adaptador.permitir_copia = args.online is None
+
+    if adaptador.empty_database():
+        raise MigrationError(
+            "Ejecuta el comando inicializar antes de migrar un esquema "
+            "que no existe."
+        )
+
+    # una sola consulta indica si el esquema ya esta aplicado
+    # y si quedan migraciones sin terminar
+    historial = adaptador.estado_historial(huella_esquema)
+    prefijo = f"{destino}: " if destino else ""
+    for registro in historial.sin_terminar:
+        consola.print(
+            f"⚠️  {prefijo}La migracion {registro.id_migracion} quedo en "
+            f"estado {registro.estado.value}",
+            style="bold yellow",
+        )
+    return historial
+
+
+def aplicar_con_historial(
+    adaptador: AdaptadorDatabase,
+    migra: InfoMigracion,
+    huella_esquema: str,
+    historial: ResumenHistorial,
+) -> List[ResultadoSentencia]:
+    """
+    Aplica el script de la migracion guardando su estado y su \
+        duracion en el historial de la base de datos.
+
+    :param adaptador: Adaptador preparado con ``preparar_destino``.
+    :param migra: Migracion generada.
+    :param huella_esquema: Huella del esquema que deja aplicado.
+    :param historial: Historial leido con ``preparar_destino``.
+    :return: Resultado de cada sentencia.
+    :raises SQLExecutionError: Si una sentencia falla; la migracion \
+        queda fallida y un reintento continua donde se quedo.
+    """
+    # la tabla del historial solo se crea cuando se aplica algo
+    adaptador.asegurar_historial()
+    registro = RegistroMigracion(
+        migra.id_migracion,
+        huella_esquema,
+        checksum_sql(migra.sql_generado),
+        EstadoMigracion.PENDIENTE,
+    )
+    # reintentar el mismo SQL actualiza la fila que quedo sin terminar
+    # y continua desde la primera sentencia que no se aplico
+    for anterior in historial.sin_terminar:
+        if anterior.checksum_sql == registro.checksum_sql:
+            registro.id_migracion = anterior.id_migracion
+            registro.sentencias_aplicadas = anterior.sentencias_aplicadas
+    adaptador.registrar_migracion(registro)
+    relleno = adaptador.relleno
+    if relleno is not None and relleno.progreso is not None:
+        relleno.progreso.ambito = registro.id_migracion
+
+    def al_avanzar(aplicadas):
+        registro.sentencias_aplicadas = aplicadas
+        adaptador.registrar_migracion(registro)
+
+    inicio = time.perf_counter()
+    try:
+        resultados = adaptador.ejecutar_script(
+            migra.sql_generado,
+            desde=registro.sentencias_aplicadas,
+            al_avanzar=al_avanzar,
+        )
+    except SQLExecutionError:
+        registro.estado = EstadoMigracion.FALLIDA
+        registro.duracion = time.perf_counter() - inicio
+        adaptador.registrar_migracion(registro)
+        raise
+    registro.estado = EstadoMigracion.APLICADA
+    registro.duracion = time.perf_counter() - inicio
+    adaptador.registrar_migracion(registro)
+    # la base de datos ya tiene el esquema destino, asi que las filas
+    # que quedaron sin terminar no hay que reintentarlas
+    for anterior in historial.sin_terminar:
+        if anterior.id_migracion != registro.id_migracion:
+            anterior.estado = EstadoMigracion.SUPERADA
+            adaptador.registrar_migracion(anterior)
+    return resultados
+
+
+def migrar_destino(
+    adaptador: AdaptadorDatabase,
+    migra: InfoMigracion,
+    args,
+    consola: Console,
+    huella_esquema: str,
+    destino: str = "",
+) -> List[ResultadoSentencia]:
+    """
+    Aplica una migracion generada en una base de datos conectada, \
+        igual que el comando migracion con una sola base de datos.
+
+    :param adaptador: Adaptador conectado a la base de datos.
+    :param migra: Migracion generada.
+    :param args: Argumentos del comando migracion.
+    :param consola: Consola para los avisos y los rellenos.
+    :param huella_esquema: Huella del esquema que deja aplicado.
+    :param destino: Nombre de la base de datos con ``--destinos``.
+    :return: Resultado de cada sentencia (ninguno si la base de \
+        datos ya tiene el esquema).
+    :raises MigrationError: Si la base de datos no esta inicializada.
+    :raises SQLExecutionError: Si una sentencia falla.
+    """
+    historial = preparar_destino(
+        adaptador,
+        args,
+        consola,
+        huella_esquema,
+        destino,
+    )
+    if not historial.hay_pendientes:
+        return []
+    return aplicar_con_historial(adaptador, migra, huella_esquema, historial)
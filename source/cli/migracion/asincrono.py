@@ -0,0 +1,78 @@
+"""Modulo con la migracion asyncio, para orquestar varias bases de datos."""
+
+import asyncio
+from typing import Callable, List, Optional, Union
+
+from ..database.adaptador_database import AdaptadorDatabase, ResultadoSentencia
+from ..database.adaptadores import crear_adaptador_asincrono
+from ..generators.migration import GeneratorDBMigration
+from ..graphql import PipelineEsquema
+from ..graphql.cache_esquema import CacheParseEsquema
+from ..graphql.configuracion_y_constantes import DatabaseType, InfoMigracion
+from ..graphql.exceptions import MigrationError
+
+# aplica la migracion con el adaptador sincrono ya conectado
+AplicarMigracion = Callable[[AdaptadorDatabase], List[ResultadoSentencia]]
+
+
+async def aplicar_sql_migracion(
+    sql: str,
+    config: dict,
+    db_type: DatabaseType = DatabaseType.MYSQL,
+    aplicar: Optional[AplicarMigracion] = None,
+) -> List[ResultadoSentencia]:
+    """
+    Aplica el SQL de una migracion ya generada a una base de datos.
+
+    :param sql: Script de la migracion.
+    :param config: Configuracion de la conexion.
+    :param db_type: Motor de la base de datos.
+    :param aplicar: Aplica la migracion con el adaptador sincrono ya \
+        conectado en lugar de solo ejecutar ``sql`` (el comando \
+        migracion la guarda asi en el historial).
+    :return: Resultado de cada sentencia.
+    :raises MigrationError: Si la base de datos no esta inicializada.
+    :raises SQLExecutionError: Si una sentencia falla.
+    """
+    async with crear_adaptador_asincrono(db_type) as adaptador:
+        await adaptador.conectar(config)
+        if aplicar is not None:
+            return await adaptador.en_hilo(aplicar)
+        if await adaptador.empty_database():
+            raise MigrationError(
+                "La base de datos esta vacia, ejecuta el comando "
+                "inicializar antes de migrar."
+            )
+        return await adaptador.ejecutar_script(sql)
+
+
+async def migrar(
+    esquema_anterior: Union[str, PipelineEsquema],
+    esquema_nuevo: Union[str, PipelineEsquema],
+    config: dict,
+    db_type: DatabaseType = DatabaseType.MYSQL,
+    cache: Optional[CacheParseEsquema] = None,
+) -> InfoMigracion:
+    """
+    Genera la migracion entre dos esquemas y la aplica.
+
+    :param esquema_anterior: Esquema desplegado actualmente.
+    :param esquema_nuevo: Esquema al que se migra.
+    :param config: Configuracion de la conexion.
+    :param db_type: Motor de la base de datos.
+    :param cache: Cache de esquemas parseados.
+    :return: Informacion de la migracion generada.
+    """
+    generador = GeneratorDBMigration(db_type, cache)
+    # el parseo y la comparacion son CPU, no bloquean el bucle de eventos
+    migra = await asyncio.to_thread(
+        generador.generar_migracion,
+        previous_schema=esquema_anterior,
+        new_schema=esquema_nuevo,
+        print_output=False,
+        print_sql=False,
+    )
+
+    if migra.sql_generado:
+        await aplicar_sql_migracion(migra.sql_generado, config, db_type)
+    return migra
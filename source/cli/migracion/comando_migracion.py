@@ -1,7 +1,15 @@
 """Modulo del comando migracion"""
 
 from ..base import Comando
-from .main import migracion
+
+
+def migracion(args):
+    """Migrar la base de datos; el generador de migraciones se \
+        importa al ejecutar el comando."""
+    # pylint: disable-next=import-outside-toplevel
+    from .main import migracion as ejecutar
+
+    ejecutar(args)
 
 
 class ComandoMigracion(Comando):
@@ -48,6 +56,67 @@ class ComandoMigracion(Comando):
             action="store_true",
             help="No visualizar salida SQL",
         )
+        migracion_parser.add_argument(
+            "--sin-cache",
+            default=False,
+            action="store_true",
+            help="No usar la cache de esquemas parseados",
+        )
+        migracion_parser.add_argument(
+            "--destinos",
+            required=False,
+            help="Archivo JSON con las bases de datos a migrar a la vez "
+            "(lista de conexiones o plantilla DSN)",
+        )
+        migracion_parser.add_argument(
+            "--trabajadores",
+            type=int,
+            default=8,
+            required=False,
+            help="Bases de datos migradas a la vez con --destinos",
+        )
+        migracion_parser.add_argument(
+            "--reanudar",
+            default=False,
+            action="store_true",
+            help="Con --destinos, omitir las bases de datos ya migradas "
+            "en la ejecucion anterior",
+        )
+        migracion_parser.add_argument(
+            "--online",
+            choices=["advertir", "rechazar", "sombra"],
+            required=False,
+            help="Modificar las tablas sin bloquearlas; que hacer con los "
+            "cambios que copian la tabla",
+        )
+        migracion_parser.add_argument(
+            "--lote-relleno",
+            type=int,
+            default=1000,
+            required=False,
+            help="Filas actualizadas por transaccion al mover datos",
+        )
+        migracion_parser.add_argument(
+            "--pausa-relleno",
+            type=float,
+            default=0.0,
+            required=False,
+            help="Segundos de espera entre lotes al mover datos",
+        )
+        migracion_parser.add_argument(
+            "--estimar",
+            default=False,
+            action="store_true",
+            help="Mostrar la duracion y el bloqueo estimados de cada "
+            "sentencia antes de aplicarla",
+        )
+        migracion_parser.add_argument(
+            "--limite-estimacion",
+            type=float,
+            required=False,
+            help="No aplicar la migracion si su duracion estimada supera "
+            "estos segundos",
+        )
 
     def contenido_comando(self, args):
         """
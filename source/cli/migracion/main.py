@@ -2,8 +2,10 @@
 
 from pathlib import Path
 from rich.console import Console
+from rich.table import Table
 
 from ..database.adaptadores.mysql import AdaptadorMySQL
+from ..database.historial import hash_esquema
 
 from ..graphql.exceptions import (
     GraphQLStoreError,
@@ -17,17 +19,104 @@ from ..graphql.exceptions import (
 from ..loaders.conf_json_loader import ConfiguracionJsonLoader
 
 from ..utilidades.gestor_archivo import GestorArchivo
-from ..graphql import (
-    transform_schema_graphql,
-)
+from ..utilidades.perfilador import obtener_perfilador
+from ..graphql import ParserGraphQLEsquema, PipelineEsquema
+from ..graphql.configuracion_y_constantes import ModoOnline
+from ..graphql.cache_esquema import CacheParseEsquema, DIRECTORIO_CACHE
 from ..generators.migration import GeneratorDBMigration
+from ..generators.migration.cost_estimation import LOCK_ALL, LOCK_NONE
+from .aplicacion import aplicar_con_historial, preparar_destino
+from .destinos import huella_migracion, migrar_destinos
+
+
+def _mostrar_algoritmos(consola, resultados):
+    """Mostrar con que ALGORITHM aplico el servidor cada ALTER TABLE \
+        que lo indicaba (puede no ser el pedido si lo rechazo)."""
+    for resultado in resultados:
+        if resultado.algoritmo:
+            sentencia = resultado.sentencia.splitlines()[0]
+            consola.print(
+                f"ALGORITHM={resultado.algoritmo}: {sentencia}",
+                style="bold blue",
+            )
+
+
+def _mostrar_estimacion(consola, estimacion):
+    """Mostrar el tipo de cambio, el bloqueo y la duracion estimada de \
+        cada sentencia y del total."""
+    colores = {LOCK_NONE: "green", LOCK_ALL: "red"}
+    tabla = Table(title="Estimacion de la migracion")
+    tabla.add_column("Sentencia")
+    tabla.add_column("Tabla", style="cyan")
+    tabla.add_column("Cambio")
+    tabla.add_column("Bloquea")
+    tabla.add_column("Tiempo (s)", justify="right")
+
+    for coste in estimacion.statements:
+        color = colores.get(coste.lock, "yellow")
+        tabla.add_row(
+            coste.statement.splitlines()[0][:60],
+            coste.table or "",
+            coste.kind,
+            f"[{color}]{coste.lock}[/{color}]",
+            f"{coste.seconds:.1f}",
+        )
+    consola.print(tabla)
+    consola.print(
+        f"Total estimado: {estimacion.total_seconds:.1f} s, "
+        f"con tablas bloqueadas {estimacion.blocking_seconds:.1f} s",
+        style="bold blue",
+    )
+
+
+def _estimar_y_aplicar(
+    args,
+    consola,
+    adaptador,
+    generador_migracion,
+    migra,
+    huella_esquema,
+    historial,
+):
+    """Aplicar la migracion si su duracion estimada no supera el \
+        limite; devuelve None si no se aplica."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    limite = args.limite_estimacion
+    if args.estimar or limite is not None:
+        # el coste depende del tamano actual de cada tabla
+        estimacion = generador_migracion.estimar_costo(
+            migra.sql_generado,
+            adaptador.estadisticas_tablas(),
+        )
+        _mostrar_estimacion(consola, estimacion)
+        if limite is not None and estimacion.total_seconds > limite:
+            consola.print(
+                "❌ La duracion estimada supera el limite de "
+                f"{limite:.1f} s; la migracion no se aplica.",
+                style="bold red",
+            )
+            adaptador.cerrar_conexion()
+            return None
+
+    with obtener_perfilador().fase("ejecucion"):
+        # el script se divide en sentencias que se envian por lotes
+        resultados = aplicar_con_historial(
+            adaptador,
+            migra,
+            huella_esquema,
+            historial,
+        )
+        adaptador.cerrar_conexion()
+    return resultados
 
 
 def migracion(args):
     """Funcion para generar una migracion de un \
         esquema GraphQL a MySQL"""
     # pylint: disable=too-many-locals, too-many-return-statements
+    # pylint: disable=too-many-branches, too-many-statements
     consola = Console()
+    perfilador = obtener_perfilador()
 
     ruta_archivo = Path.cwd() / ".graphqlstore_config.json"
     loader = ConfiguracionJsonLoader(ruta_archivo)
@@ -94,33 +183,92 @@ def migracion(args):
     consola.print("\nMIGRANDO ESQUEMA...\n", style="bold magenta")
 
     try:
+        adaptador = historial = None
+        huella_esquema = hash_esquema(esquema_nuevo)
+        if not args.destinos:
+            with perfilador.fase("conexion"):
+                adaptador = AdaptadorMySQL()
+                adaptador.conectar(config)
+
+            # antes de generar nada se comprueba que la base de datos esta
+            # inicializada y si ya tiene aplicado el esquema
+            try:
+                historial = preparar_destino(
+                    adaptador,
+                    args,
+                    consola,
+                    huella_esquema,
+                )
+            except MigrationError as err:
+                consola.print(f"\n :cross_mark: {err}", style="bold red")
+                adaptador.cerrar_conexion()
+                return
+
+            if not historial.hay_pendientes:
+                # no se aplico nada: el backup y los archivos generados
+                # se quedan como estan
+                consola.print(
+                    "La base de datos ya tiene aplicado este esquema.",
+                    style="bold green",
+                )
+                adaptador.cerrar_conexion()
+                return
+
+        # cache de esquemas parseados local al proyecto
+        cache = None
+        if not args.sin_cache:
+            cache = CacheParseEsquema(Path.cwd() / DIRECTORIO_CACHE)
+
+        # el nuevo esquema se parsea una vez para la migracion
+        # y para el esquema cliente
+        pipeline_nuevo = PipelineEsquema(
+            esquema_nuevo,
+            ParserGraphQLEsquema(cache=cache),
+        )
+
         # migrar esquema GraphQL
-        generador_migracion = GeneratorDBMigration()
+        generador_migracion = GeneratorDBMigration(cache=cache)
 
         migra = generador_migracion.generar_migracion(
             previous_schema=esquema_antiguo,
-            new_schema=esquema_nuevo,
+            new_schema=pipeline_nuevo,
             print_output=not args.no_visualizar_salida,
             print_sql=not args.no_visualizar_sql,
+            online=ModoOnline(args.online) if args.online else None,
         )
 
         if len(migra.sql_generado) == 0:
+            if adaptador is not None:
+                adaptador.cerrar_conexion()
             return
 
-        adaptador = AdaptadorMySQL()
-        adaptador.conectar(config)
-
-        if adaptador.empty_database():
-            consola.print(
-                "\n :cross_mark: ejecuta el comando "
-                "[bold green]inicializar[/bold green] "
-                "antes de migrar un esquema que no existe.",
-                style="bold red",
+        if args.destinos:
+            # una base de datos por cliente: el SQL se genera una vez
+            # y se aplica en todas a la vez
+            huella = huella_migracion(esquema_antiguo, esquema_nuevo)
+            with perfilador.fase("ejecucion"):
+                if not migrar_destinos(
+                    args,
+                    config,
+                    migra,
+                    huella,
+                    huella_esquema,
+                    consola,
+                ):
+                    return
+        else:
+            resultados = _estimar_y_aplicar(
+                args,
+                consola,
+                adaptador,
+                generador_migracion,
+                migra,
+                huella_esquema,
+                historial,
             )
-            return
-
-        adaptador.ejecutar_consulta(migra.sql_generado)
-        adaptador.cerrar_conexion()
+            if resultados is None:
+                return
+            _mostrar_algoritmos(consola, resultados)
 
         # verificar si el directorio de salida existe
         # si no existe, crearlo
@@ -139,9 +287,8 @@ def migracion(args):
         )
 
         # actualizar el esquema cliente graphql
-        esquema_cliente = transform_schema_graphql(
-            esquema_nuevo,
-        )
+        with perfilador.fase("esquema_cliente"):
+            esquema_cliente = pipeline_nuevo.esquema_cliente
         GestorArchivo.escribir_archivo(
             contenido=esquema_cliente,
             ruta_salida=Path.cwd() / "generated" / "schema.graphql",
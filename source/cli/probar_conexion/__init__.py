@@ -1,7 +1,14 @@
 """Modulo de probar_conexion"""
 
-from .main import proconexion
-from .comando_probar_conexion import ComandoProbarConexion
-
+from ..carga_perezosa import exportaciones_perezosas
 
 __all__ = ["proconexion", "ComandoProbarConexion"]
+
+# las dependencias del comando se cargan solo al ejecutarlo
+__getattr__, __dir__ = exportaciones_perezosas(
+    __name__,
+    {
+        "proconexion": ".main",
+        "ComandoProbarConexion": ".comando_probar_conexion",
+    },
+)
@@ -1,7 +1,15 @@
 """Modulo del comando probar-conexion"""
 
 from ..base import Comando
-from .main import proconexion
+
+
+def proconexion(args):
+    """Probar la conexion; el conector MySQL se importa solo \
+        al ejecutar el comando."""
+    # pylint: disable-next=import-outside-toplevel
+    from .main import proconexion as ejecutar
+
+    ejecutar(args)
 
 
 class ComandoProbarConexion(Comando):
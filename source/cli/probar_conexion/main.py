@@ -32,5 +32,6 @@ def proconexion(args):
     # conectar a la base de datos
     adaptador.conectar(config)
 
-    # probar la conexion
+    # probar la conexion y liberarla (con pool queda lista para reusarse)
     adaptador.probar_conexion(args.verbose)
+    adaptador.cerrar_conexion()
@@ -1,10 +1,17 @@
 """Modulo del servidor"""
 
-from .comando_servidor import ComandoServidor
-from .main import servidor
-
+from ..carga_perezosa import exportaciones_perezosas
 
 __all__ = [
     "ComandoServidor",
     "servidor",
 ]
+
+# las dependencias del comando se cargan solo al ejecutarlo
+__getattr__, __dir__ = exportaciones_perezosas(
+    __name__,
+    {
+        "ComandoServidor": ".comando_servidor",
+        "servidor": ".main",
+    },
+)
@@ -1,7 +1,15 @@
 """Modulo del comando servidor"""
 
 from ..base import Comando
-from .main import servidor
+
+
+def servidor():
+    """Crear la plantilla del servidor importando su modulo \
+        al ejecutar el comando."""
+    # pylint: disable-next=import-outside-toplevel
+    from .main import servidor as ejecutar
+
+    ejecutar()
 
 
 class ComandoServidor(Comando):
@@ -1,6 +1,7 @@
 """Modulo FileManager"""
 
 from pathlib import Path
+from typing import Iterable
 
 
 class GestorArchivo:
@@ -18,6 +19,25 @@ class GestorArchivo:
         with open(ruta_salida, "w", encoding="utf-8") as a:
             a.write(contenido)
 
+    @staticmethod
+    def escribir_sentencias(
+        sentencias: Iterable[str],
+        ruta_salida: Path,
+        separador: str = "\n\n",
+    ) -> int:
+        """Escribir las sentencias a medida que se reciben, sin \
+            construir el contenido completo en memoria.
+
+        Retorna el numero de sentencias escritas."""
+        escritas = 0
+        with open(ruta_salida, "w", encoding="utf-8") as a:
+            for sentencia in sentencias:
+                if escritas:
+                    a.write(separador)
+                a.write(sentencia)
+                escritas += 1
+        return escritas
+
     @staticmethod
     def asegurar_dir_existe(directorio: Path):
         """Asegurar que el directorio exista, si no, crearlo."""
@@ -0,0 +1,251 @@
+"""Modulo para medir el tiempo de las fases y sentencias de la CLI."""
+
+import cProfile
+import functools
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# tipos de registro
+TIPO_FASE = "fase"
+TIPO_SENTENCIA = "sentencia"
+
+# longitud maxima del SQL guardado en cada registro de sentencia
+LONGITUD_MAXIMA_SQL = 200
+
+# numero de sentencias mas lentas mostradas en el resumen
+NUM_SENTENCIAS_LENTAS = 10
+
+
+@dataclass
+class RegistroTiempo:
+    """Clase para almacenar la medicion de una fase o sentencia."""
+
+    nombre: str
+    tipo: str
+    inicio: float
+    tiempo_real: float
+    tiempo_cpu: float
+    error: Optional[str] = None
+
+
+class Perfilador:
+    """Clase para registrar el tiempo real y de CPU de cada fase \
+        y de cada sentencia ejecutada."""
+
+    def __init__(self, activo: bool = False, cprofile: bool = False):
+        """
+        Inicializa el perfilador.
+
+        :param activo: Si es False las mediciones no tienen coste.
+        :param cprofile: Si es True se activa tambien cProfile.
+        """
+        self.activo = activo
+        self.registros: List[RegistroTiempo] = []
+        self.perfil_cprofile = cProfile.Profile() if cprofile else None
+        self._origen = time.perf_counter()
+
+    @contextmanager
+    def fase(self, nombre: str) -> Iterator[None]:
+        """Medir una fase (parseo, relaciones, generacion...)."""
+        with self._medir(nombre, TIPO_FASE):
+            yield
+
+    @contextmanager
+    def sentencia(self, sql: str) -> Iterator[None]:
+        """Medir la ejecucion de una sentencia SQL."""
+        if not self.activo:
+            yield
+            return
+
+        nombre = " ".join(sql.split())[:LONGITUD_MAXIMA_SQL]
+        with self._medir(nombre, TIPO_SENTENCIA):
+            yield
+
+    @contextmanager
+    def _medir(self, nombre: str, tipo: str) -> Iterator[None]:
+        """Medir el bloque y guardar su registro (tambien si falla)."""
+        if not self.activo:
+            yield
+            return
+
+        inicio_real = time.perf_counter()
+        inicio_cpu = time.process_time()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.registros.append(
+                RegistroTiempo(
+                    nombre=nombre,
+                    tipo=tipo,
+                    inicio=inicio_real - self._origen,
+                    tiempo_real=time.perf_counter() - inicio_real,
+                    tiempo_cpu=time.process_time() - inicio_cpu,
+                    error=error,
+                )
+            )
+
+    def iniciar_cprofile(self) -> None:
+        """Comenzar a recoger estadisticas de cProfile."""
+        if self.perfil_cprofile:
+            self.perfil_cprofile.enable()
+
+    def detener_cprofile(self) -> None:
+        """Dejar de recoger estadisticas de cProfile."""
+        if self.perfil_cprofile:
+            self.perfil_cprofile.disable()
+
+    def resumen(self) -> Dict[str, Dict[str, float]]:
+        """
+        Agrupa los registros por nombre de fase.
+
+        Las sentencias se agrupan en una unica entrada ``sentencias``.
+
+        :return: Diccionario nombre -> llamadas, tiempo real y de CPU.
+        """
+        resumen: Dict[str, Dict[str, float]] = {}
+        for registro in self.registros:
+            nombre = registro.nombre
+            if registro.tipo == TIPO_SENTENCIA:
+                nombre = "sentencias"
+            datos = resumen.setdefault(
+                nombre,
+                {"llamadas": 0, "tiempo_real": 0.0, "tiempo_cpu": 0.0},
+            )
+            datos["llamadas"] += 1
+            datos["tiempo_real"] += registro.tiempo_real
+            datos["tiempo_cpu"] += registro.tiempo_cpu
+
+        return resumen
+
+    def sentencias_lentas(
+        self,
+        limite: int = NUM_SENTENCIAS_LENTAS,
+    ) -> List[RegistroTiempo]:
+        """Obtener las sentencias con mayor tiempo real."""
+        sentencias = [r for r in self.registros if r.tipo == TIPO_SENTENCIA]
+        sentencias.sort(key=lambda r: r.tiempo_real, reverse=True)
+        return sentencias[:limite]
+
+    def mostrar_resumen(self, consola: "Console") -> None:
+        """Mostrar el resumen de tiempos en una tabla."""
+        # pylint: disable-next=import-outside-toplevel
+        from rich.table import Table
+
+        tabla = Table(title="⏱️  Perfil de ejecucion")
+        tabla.add_column("Fase")
+        tabla.add_column("Llamadas", justify="right")
+        tabla.add_column("Real (s)", justify="right")
+        tabla.add_column("CPU (s)", justify="right")
+
+        for nombre, datos in self.resumen().items():
+            tabla.add_row(
+                nombre,
+                str(datos["llamadas"]),
+                f"{datos['tiempo_real']:.4f}",
+                f"{datos['tiempo_cpu']:.4f}",
+            )
+        consola.print(tabla)
+
+        sentencias = self.sentencias_lentas()
+        if not sentencias:
+            return
+
+        tabla = Table(title="🐢 Sentencias mas lentas")
+        tabla.add_column("Sentencia")
+        tabla.add_column("Real (s)", justify="right")
+        tabla.add_column("CPU (s)", justify="right")
+        for registro in sentencias:
+            tabla.add_row(
+                registro.nombre[:60],
+                f"{registro.tiempo_real:.4f}",
+                f"{registro.tiempo_cpu:.4f}",
+            )
+        consola.print(tabla)
+
+    def exportar_json(self, ruta: Path) -> None:
+        """
+        Escribe la traza en formato Trace Event (chrome://tracing, \
+            Perfetto) con el resumen en ``otherData``.
+
+        :param ruta: Archivo JSON de salida.
+        """
+        eventos = [
+            {
+                "name": registro.nombre,
+                "cat": registro.tipo,
+                "ph": "X",
+                "ts": registro.inicio * 1_000_000,
+                "dur": registro.tiempo_real * 1_000_000,
+                "pid": 1,
+                "tid": 1,
+                "args": {
+                    "tiempo_cpu": registro.tiempo_cpu,
+                    "error": registro.error,
+                },
+            }
+            for registro in self.registros
+        ]
+        traza = {
+            "traceEvents": eventos,
+            "displayTimeUnit": "ms",
+            "otherData": {"resumen": self.resumen()},
+        }
+
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(traza, archivo, indent=2)
+
+    def exportar_cprofile(self, ruta: Path) -> None:
+        """Guardar las estadisticas de cProfile para analizarlas con \
+            pstats, snakeviz o flameprof."""
+        if self.perfil_cprofile:
+            self.perfil_cprofile.dump_stats(str(ruta))
+
+
+# perfilador inactivo usado cuando no se pasa --perfil
+_perfilador_actual = Perfilador()
+
+
+def obtener_perfilador() -> Perfilador:
+    """Obtener el perfilador activo de la ejecucion actual."""
+    return _perfilador_actual
+
+
+def activar_perfilador(cprofile: bool = False) -> Perfilador:
+    """Activar un nuevo perfilador para la ejecucion actual."""
+    global _perfilador_actual  # pylint: disable=global-statement
+    _perfilador_actual = Perfilador(activo=True, cprofile=cprofile)
+    return _perfilador_actual
+
+
+def desactivar_perfilador() -> None:
+    """Restaurar el perfilador inactivo."""
+    global _perfilador_actual  # pylint: disable=global-statement
+    _perfilador_actual = Perfilador()
+
+
+def medir_fase(nombre: str) -> Callable:
+    """Decorador que mide cada llamada a la funcion como una fase \
+        del perfilador activo."""
+
+    def decorador(funcion: Callable) -> Callable:
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with obtener_perfilador().fase(nombre):
+                return funcion(*args, **kwargs)
+
+        return envoltura
+
+    return decorador
@@ -0,0 +1,118 @@
+"""Pruebas para la suite de benchmarks"""
+
+import json
+
+import pytest
+
+from benchmarks.ejecutar_benchmarks import (
+    comparar_resultados,
+    ejecutar_benchmark,
+    main,
+)
+from benchmarks.memoria_modelo import medir_memoria
+from benchmarks.esquema_sintetico import generar_esquema_sintetico
+from benchmarks.tiempo_importacion import parsear_importtime
+from source.cli.graphql import ParserGraphQLEsquema, ProcesarRelaciones
+from source.cli.graphql.configuracion_y_constantes import (
+    TipoLink,
+    TipoRelacion,
+)
+
+
+@pytest.fixture(name="esquema_sintetico")
+def fixture_esquema_sintetico():
+    """Fixture con un esquema sintetico pequeño."""
+    return generar_esquema_sintetico(8)
+
+
+def test_esquema_sintetico_es_determinista(esquema_sintetico):
+    """Prueba que el mismo tamaño genera siempre el mismo esquema."""
+    assert generar_esquema_sintetico(8) == esquema_sintetico
+    evolucionado = generar_esquema_sintetico(8, evolucionado=True)
+    assert evolucionado != esquema_sintetico
+
+
+def test_esquema_sintetico_mezcla_relaciones(esquema_sintetico):
+    """Prueba que el esquema sintetico contiene enums, directivas \
+        y relaciones 1:1, 1:N y N:M."""
+    info = ParserGraphQLEsquema().parse_esquema(esquema_sintetico)
+    relaciones = ProcesarRelaciones(
+        tablas=info.tablas,
+        scalar_types=ParserGraphQLEsquema.get_type_mapping(),
+        enum_types=info.enums,
+    ).procesar_relaciones()
+
+    assert len(info.tablas) == 8
+    assert info.enums
+    campos = info.tablas["T0"].campos
+    assert "unique" in campos["nombre"].directivas
+    assert "default" in campos["estado"].directivas
+
+    tipos = {relacion.tipo_relation for relacion in relaciones}
+    assert TipoRelacion.ONE_TO_ONE.value in tipos
+    assert TipoRelacion.MANY_TO_MANY.value in tipos
+    assert tipos & {
+        TipoRelacion.ONE_TO_MANY.value,
+        TipoRelacion.MANY_TO_ONE.value,
+    }
+    assert any(r.tipo_link == TipoLink.TABLE.value for r in relaciones)
+
+
+def test_ejecutar_benchmark_mide_todas_las_etapas():
+    """Prueba que se miden todas las etapas para ambos motores."""
+    etapas = ejecutar_benchmark(8, repeticiones=1)
+
+    assert set(etapas) == {
+        "parse_esquema",
+        "procesar_relaciones",
+        "generate_schema_mysql",
+        "generate_schema_postgresql",
+        "diff_schemas_mysql",
+        "diff_schemas_postgresql",
+        "generate_sql_migration_mysql",
+        "generate_sql_migration_postgresql",
+    }
+    assert all(len(t["muestras"]) == 1 for t in etapas.values())
+
+
+def test_main_guarda_y_compara_resultados(tmp_path):
+    """Prueba que los resultados se guardan en JSON y se comparan \
+        con una ejecucion previa."""
+    salida = tmp_path / "resultados.json"
+    argumentos = ["-t", "4", "-r", "1", "-s", str(salida)]
+    main(argumentos)
+
+    anteriores = json.loads(salida.read_text(encoding="utf-8"))
+    assert "4" in anteriores["tamanos"]
+
+    actuales = main(argumentos + ["-c", str(salida)])
+    comparacion = comparar_resultados(anteriores, actuales)
+
+    assert len(comparacion) == len(actuales["tamanos"]["4"])
+    assert all(ratio > 0 for *_, ratio in comparacion)
+
+
+def test_parsear_importtime():
+    """Prueba que se parsea la salida de python -X importtime."""
+    salida = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   argparse\n"
+        "import time:        50 |        150 | source.cli.main\n"
+    )
+
+    modulos = parsear_importtime(salida)
+
+    assert modulos == {
+        "argparse": {"propio": 100, "acumulado": 100},
+        "source.cli.main": {"propio": 50, "acumulado": 150},
+    }
+
+
+def test_medir_memoria_del_modelo():
+    """Prueba que se mide la memoria retenida por el modelo."""
+    resultados = medir_memoria(8)
+
+    assert resultados["tipos"] == 8
+    assert resultados["campos"] > 0
+    assert resultados["relaciones"] > 0
+    assert 0 < resultados["bytes_modelo"] <= resultados["bytes_pico"]
@@ -4,7 +4,21 @@ from unittest.mock import MagicMock, patch
 import mysql.connector
 import pytest
 
+from source.cli.database.adaptador_database import EstadisticasTabla
 from source.cli.database.adaptadores.mysql import AdaptadorMySQL
+from source.cli.database.directivas import (
+    TIPO_RELLENO,
+    TIPO_TABLA_SOMBRA,
+    Directiva,
+)
+from source.cli.database.historial import (
+    TABLA_HISTORIAL,
+    RegistroMigracion,
+    checksum_sql,
+)
+from source.cli.database.relleno import ConfiguracionRelleno
+from source.cli.graphql.configuracion_y_constantes import EstadoMigracion
+from source.cli.graphql.exceptions import SQLExecutionError
 
 
 @pytest.fixture(name="adapt_mysql")
@@ -314,6 +328,19 @@ def test_database_is_empty(adapt_mysql):
     assert result is True
 
 
+def test_database_con_solo_historial_esta_vacia(adapt_mysql):
+    """Prueba que la tabla del historial no cuenta como esquema, asi \
+        que migrar sigue pidiendo el comando inicializar."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.conexion = MagicMock()
+    adapt_mysql.cursor.fetchall.return_value = [(TABLA_HISTORIAL,)]
+
+    assert adapt_mysql.empty_database() is True
+
+    adapt_mysql.cursor.fetchall.return_value = [(TABLA_HISTORIAL,), ("User",)]
+    assert adapt_mysql.empty_database() is False
+
+
 def test_can_not_check_if_database_is_empty(adapt_mysql):
     """Test to verify cursor or connection is None."""
     adapt_mysql.cursor = None
@@ -323,3 +350,462 @@ def test_can_not_check_if_database_is_empty(adapt_mysql):
         adapt_mysql.empty_database()
 
     assert "Base de datos no conectada." in str(exc_info.value)
+
+
+@patch("mysql.connector.connect")
+def test_ejecutar_en_flujo(mock_connect, adapt_mysql, conf_valida):
+    """Prueba que cada sentencia se ejecuta antes de generar la siguiente."""
+    mock_cursor = MagicMock()
+    mock_connect.return_value.cursor.return_value = mock_cursor
+    adapt_mysql.conectar(conf_valida)
+
+    def sentencias():
+        yield "CREATE TABLE a (id INT);"
+        # la primera sentencia ya se ejecuto al pedir la segunda
+        mock_cursor.execute.assert_called_once_with("CREATE TABLE a (id INT);")
+        yield "CREATE TABLE b (id INT);"
+
+    ejecutadas = list(adapt_mysql.ejecutar_en_flujo(sentencias()))
+
+    assert ejecutadas == [
+        "CREATE TABLE a (id INT);",
+        "CREATE TABLE b (id INT);",
+    ]
+    assert mock_cursor.execute.call_count == 2
+
+
+def test_sesion_arranque_restaura_ajustes(adapt_mysql):
+    """Prueba que la sesion de arranque desactiva las comprobaciones y \
+        restaura sus valores aunque falle una sentencia."""
+    adapt_mysql.conexion = MagicMock()
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.fetchone.return_value = (1, 0)
+
+    with pytest.raises(RuntimeError):
+        with adapt_mysql.sesion_arranque():
+            raise RuntimeError("fallo")
+
+    ejecutadas = [c.args[0] for c in adapt_mysql.cursor.execute.call_args_list]
+    assert ejecutadas[1:] == [
+        "SET SESSION foreign_key_checks = 0, unique_checks = 0;",
+        "SET SESSION foreign_key_checks = 1, unique_checks = 0;",
+    ]
+
+
+def test_ejecutar_script_por_lotes(adapt_mysql):
+    """Prueba que el script se envia por lotes y se obtiene el resultado \
+        de cada sentencia."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.cursor.rowcount = 0
+    script = "-- Migration\nCREATE TABLE a (x INT);\nCREATE TABLE b (y INT);"
+
+    resultados = adapt_mysql.ejecutar_script(script, tam_lote=2)
+
+    adapt_mysql.cursor.execute.assert_called_once_with(
+        "CREATE TABLE a (x INT);\nCREATE TABLE b (y INT);"
+    )
+    adapt_mysql.cursor.nextset.assert_called_once()
+    assert [r.sentencia for r in resultados] == [
+        "CREATE TABLE a (x INT);",
+        "CREATE TABLE b (y INT);",
+    ]
+    assert all(r.exitosa for r in resultados)
+
+
+def test_ejecutar_script_informa_sentencia_fallida(adapt_mysql):
+    """Prueba que el error indica la sentencia que fallo y detiene \
+        los lotes siguientes."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.cursor.nextset.side_effect = mysql.connector.Error("duplicada")
+    script = "CREATE TABLE a (x INT); CREATE TABLE a (x INT); SELECT 1;"
+
+    with pytest.raises(SQLExecutionError) as exc_info:
+        adapt_mysql.ejecutar_script(script, tam_lote=2)
+
+    resultados = exc_info.value.resultados
+    assert [r.exitosa for r in resultados] == [True, False]
+    assert "duplicada" in resultados[1].error
+    adapt_mysql.cursor.execute.assert_called_once()
+
+
+def test_ejecutar_script_reanuda_desde_sentencias_aplicadas(adapt_mysql):
+    """Prueba que un reintento omite las sentencias ya aplicadas y que \
+        el avance se informa antes del error."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.cursor.nextset.side_effect = mysql.connector.Error("fallo")
+    avances = []
+    script = "CREATE TABLE a (x INT); CREATE TABLE b (y INT); SELECT 1;"
+
+    with pytest.raises(SQLExecutionError):
+        adapt_mysql.ejecutar_script(script, desde=1, al_avanzar=avances.append)
+
+    adapt_mysql.cursor.execute.assert_called_once_with(
+        "CREATE TABLE b (y INT);\nSELECT 1;"
+    )
+    # CREATE TABLE b quedo aplicada antes de fallar SELECT 1
+    assert avances == [2]
+
+
+def test_ejecutar_script_cambia_algoritmo_rechazado(adapt_mysql):
+    """Prueba que un ALTER con ALGORITHM rechazado se repite con el \
+        siguiente algoritmo y que el lote continua."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    rechazo = mysql.connector.Error("no soportado", errno=1846)
+    adapt_mysql.cursor.execute.side_effect = [rechazo, rechazo, None, None]
+    alter = "ALTER TABLE `u` MODIFY COLUMN `s` ENUM('A'), ALGORITHM=INSTANT;"
+    script = f"{alter}\nSELECT 1;"
+
+    resultados = adapt_mysql.ejecutar_script(script)
+
+    ejecutadas = [c.args[0] for c in adapt_mysql.cursor.execute.call_args_list]
+    assert ejecutadas[1:] == [
+        alter.replace("INSTANT", "INPLACE, LOCK=NONE"),
+        alter.replace("INSTANT", "COPY"),
+        "SELECT 1;",
+    ]
+    assert [r.algoritmo for r in resultados] == ["COPY", None]
+    assert all(r.exitosa for r in resultados)
+
+
+def test_algoritmo_rechazado_en_modo_online_no_copia(adapt_mysql):
+    """Prueba que en modo online un INSTANT rechazado se repite con \
+        INPLACE sin bloqueo y nunca con COPY."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.permitir_copia = False
+    rechazo = mysql.connector.Error("no soportado", errno=1846)
+    adapt_mysql.cursor.execute.side_effect = [rechazo, rechazo]
+    alter = "ALTER TABLE `u` ADD COLUMN `a` INT, ALGORITHM=INSTANT;"
+
+    with pytest.raises(SQLExecutionError) as exc_info:
+        adapt_mysql.ejecutar_script(alter)
+
+    ejecutadas = [c.args[0] for c in adapt_mysql.cursor.execute.call_args_list]
+    assert ejecutadas == [
+        alter,
+        alter.replace("INSTANT", "INPLACE, LOCK=NONE"),
+    ]
+    assert "modo online" in str(exc_info.value)
+
+
+def _script_tabla_sombra():
+    """Script con un ALTER TABLE marcado para la copia en tabla sombra."""
+    directiva = Directiva(
+        TIPO_TABLA_SOMBRA,
+        {"tabla": "u", "alteraciones": "DROP COLUMN `a`"},
+        "ALTER TABLE `u` DROP COLUMN `a`, ALGORITHM=COPY, LOCK=SHARED;",
+    )
+    return f"SELECT 1;\n{directiva.con_sentencia()}"
+
+
+def test_ejecutar_script_copia_en_tabla_sombra(adapt_mysql):
+    """Prueba que la directiva crea la tabla sombra, copia las filas \
+        por lotes de clave y la intercambia con la original."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.conexion = MagicMock()
+    copia = adapt_mysql.conexion.cursor.return_value
+    # claves foraneas, fin del primer lote y sin mas lotes
+    copia.fetchone.side_effect = [(0,), ("k1",), None]
+    copia.fetchall.side_effect = [
+        [("id",), ("b",)],
+        [("id",), ("a",), ("b",)],
+    ]
+    copia.rowcount = 1
+
+    resultados = adapt_mysql.ejecutar_script(_script_tabla_sombra())
+
+    ejecutadas = [c.args[0] for c in copia.execute.call_args_list]
+    assert "CREATE TABLE `_u_sombra` LIKE `u`;" in ejecutadas
+    assert "ALTER TABLE `_u_sombra` DROP COLUMN `a`;" in ejecutadas
+    assert sum("CREATE TRIGGER" in sql for sql in ejecutadas) == 3
+    copias = [sql for sql in ejecutadas if sql.startswith("INSERT IGNORE")]
+    assert copias == [
+        "INSERT IGNORE INTO `_u_sombra` (`id`, `b`) SELECT `id`, `b` "
+        "FROM `u` WHERE `id` <= %s;",
+        "INSERT IGNORE INTO `_u_sombra` (`id`, `b`) SELECT `id`, `b` "
+        "FROM `u` WHERE `id` > %s;",
+    ]
+    assert ejecutadas[-2:] == [
+        "RENAME TABLE `u` TO `_u_antigua`, `_u_sombra` TO `u`;",
+        "DROP TABLE `_u_antigua`;",
+    ]
+    assert adapt_mysql.conexion.commit.call_count == 2
+    assert [r.algoritmo for r in resultados] == [None, "COPY"]
+    assert resultados[1].filas_afectadas == 2
+
+
+def test_tabla_sombra_rechaza_claves_foraneas(adapt_mysql):
+    """Prueba que una tabla con claves foraneas no se copia y que el \
+        error detiene el script."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.conexion = MagicMock()
+    copia = adapt_mysql.conexion.cursor.return_value
+    copia.fetchone.return_value = (2,)
+
+    with pytest.raises(SQLExecutionError) as exc_info:
+        adapt_mysql.ejecutar_script(_script_tabla_sombra())
+
+    assert "claves foraneas" in str(exc_info.value)
+    ejecutadas = [c.args[0] for c in copia.execute.call_args_list]
+    assert not any("CREATE TABLE" in sql for sql in ejecutadas)
+
+
+def test_tabla_sombra_fallida_se_limpia(adapt_mysql):
+    """Prueba que si la copia falla se eliminan los triggers y la \
+        tabla sombra sin tocar la original."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.conexion = MagicMock()
+    copia = adapt_mysql.conexion.cursor.return_value
+    copia.fetchone.return_value = (0,)
+
+    def ejecutar(sql, parametros=()):
+        # pylint: disable=unused-argument
+        if sql.startswith("ALTER TABLE `_u_sombra`"):
+            raise mysql.connector.Error("columna inexistente")
+
+    copia.execute.side_effect = ejecutar
+
+    with pytest.raises(SQLExecutionError):
+        adapt_mysql.ejecutar_script(_script_tabla_sombra())
+
+    ejecutadas = [c.args[0] for c in copia.execute.call_args_list]
+    assert ejecutadas[-1] == "DROP TABLE IF EXISTS `_u_sombra`;"
+    assert not any(sql.startswith("RENAME") for sql in ejecutadas)
+
+
+def _script_relleno():
+    """Script con un UPDATE marcado para aplicarse por lotes."""
+    actualizar = "UPDATE `u` SET `a` = 1"
+    directiva = Directiva(
+        TIPO_RELLENO,
+        {
+            "tabla": "`u`",
+            "sentencia": f"{actualizar} WHERE (`a` IS NULL) AND {{rango}};",
+            "clave": "`id`",
+        },
+        f"{actualizar} WHERE `a` IS NULL;",
+    )
+    return directiva.con_sentencia()
+
+
+def test_ejecutar_script_relleno_por_lotes(adapt_mysql):
+    """Prueba que la directiva de relleno confirma cada lote con el \
+        tamano configurado."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.conexion = MagicMock()
+    adapt_mysql.relleno = ConfiguracionRelleno(tam_lote=2)
+    adapt_mysql.cursor.fetchone.side_effect = [(2,), (4,), None]
+    adapt_mysql.cursor.rowcount = 2
+
+    resultados = adapt_mysql.ejecutar_script(_script_relleno())
+
+    ejecutadas = [c.args[0] for c in adapt_mysql.cursor.execute.call_args_list]
+    assert sum(sql.startswith("UPDATE") for sql in ejecutadas) == 3
+    assert "LIMIT 1 OFFSET 1;" in ejecutadas[0]
+    assert adapt_mysql.conexion.commit.call_count == 3
+    assert resultados[0].filas_afectadas == 6
+    assert resultados[0].sentencia.startswith("UPDATE `u` SET `a` = 1")
+
+
+def _script_quitar_unique(mysql_generator_migra):
+    esquema = "type User {{ id: ID! @id code: String{code} }}"
+    return mysql_generator_migra.generate_migration(
+        previous_schema=esquema.format(code=" @unique"),
+        new_schema=esquema.format(code=""),
+        print_output=False,
+        print_sql=False,
+    ).sql_generado
+
+
+@pytest.mark.parametrize(
+    "nombres",
+    [
+        # esquema creado por el comando inicializar anterior
+        ["uk_code"],
+        # migraciones anteriores con UNIQUE en la columna
+        ["code", "code_2"],
+        ["uk_User_code"],
+    ],
+)
+def test_migrar_esquema_con_nombres_unique_anteriores(
+    adapt_mysql,
+    mysql_generator_migra,
+    nombres,
+):
+    """Prueba que quitar @unique elimina los indices con el nombre que \
+        tienen en la base de datos aunque no sea uk_<tabla>_<columna>."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.cursor.fetchall.return_value = [(n,) for n in nombres]
+
+    adapt_mysql.ejecutar_script(_script_quitar_unique(mysql_generator_migra))
+
+    ejecutadas = [c.args for c in adapt_mysql.cursor.execute.call_args_list]
+    consulta = (adapt_mysql.consulta_nombres_unique, ("User", "code"))
+    assert consulta in ejecutadas
+    sql = "\n".join(args[0] for args in ejecutadas)
+    for nombre in nombres:
+        assert f"ALTER TABLE `User` DROP INDEX `{nombre}`;" in sql
+    assert sql.count("DROP INDEX") == len(nombres)
+
+
+def test_quitar_unique_sin_indice_no_elimina_nada(
+    adapt_mysql,
+    mysql_generator_migra,
+):
+    """Prueba que si la columna ya no tiene indice unique no se ejecuta \
+        el DROP INDEX, que fallaria."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.with_rows = False
+    adapt_mysql.cursor.fetchall.return_value = []
+
+    resultados = adapt_mysql.ejecutar_script(
+        _script_quitar_unique(mysql_generator_migra)
+    )
+
+    ejecutadas = [c.args[0] for c in adapt_mysql.cursor.execute.call_args_list]
+    assert not any("DROP INDEX" in sql for sql in ejecutadas)
+    assert all(r.exitosa for r in resultados)
+
+
+def test_relleno_fallido_detiene_el_script(adapt_mysql):
+    """Prueba que un error del driver en un lote detiene el script."""
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.conexion = MagicMock()
+    error = mysql.connector.Error("bloqueo")
+    adapt_mysql.cursor.execute.side_effect = [None, error]
+    adapt_mysql.cursor.fetchone.return_value = (2,)
+
+    with pytest.raises(SQLExecutionError) as exc_info:
+        adapt_mysql.ejecutar_script(_script_relleno())
+
+    assert "bloqueo" in str(exc_info.value)
+    adapt_mysql.conexion.commit.assert_not_called()
+    adapt_mysql.conexion.rollback.assert_called_once()
+
+
+def test_estadisticas_tablas(adapt_mysql):
+    """Prueba que las estadisticas se leen del catalogo y que los \
+        valores desconocidos cuentan como cero."""
+    adapt_mysql.conexion = MagicMock()
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.fetchall.return_value = [
+        ("User", 1200, 65536, 16384),
+        ("Vacia", None, None, None),
+    ]
+
+    estadisticas = adapt_mysql.estadisticas_tablas()
+
+    consulta = adapt_mysql.cursor.execute.call_args.args[0]
+    assert "information_schema.TABLES" in consulta
+    assert estadisticas["User"] == EstadisticasTabla(1200, 65536, 16384)
+    assert estadisticas["Vacia"] == EstadisticasTabla()
+
+
+def test_registrar_migracion_actualiza_la_fila(adapt_mysql):
+    """Prueba que registrar una migracion inserta su fila o actualiza \
+        su estado y su duracion, y la confirma."""
+    adapt_mysql.conexion = MagicMock()
+    adapt_mysql.cursor = MagicMock()
+    registro = RegistroMigracion(
+        "migration_1",
+        "a" * 64,
+        "b" * 64,
+        EstadoMigracion.APLICADA,
+        1.5,
+    )
+
+    adapt_mysql.registrar_migracion(registro)
+
+    sql, parametros = adapt_mysql.cursor.execute.call_args.args
+    assert sql.startswith(f"INSERT INTO {TABLA_HISTORIAL}")
+    assert "ON DUPLICATE KEY UPDATE" in sql
+    assert parametros == (
+        "migration_1",
+        "a" * 64,
+        "b" * 64,
+        "APPLIED",
+        1.5,
+        0,
+    )
+    adapt_mysql.conexion.commit.assert_called_once()
+
+
+def test_estado_historial_una_consulta(adapt_mysql):
+    """Prueba que una sola consulta indica si el esquema esta aplicado \
+        y que migraciones quedaron sin terminar."""
+    adapt_mysql.conexion = MagicMock()
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.fetchone.return_value = (1,)
+    adapt_mysql.cursor.fetchall.return_value = [
+        ("migration_2", "FAILED", "h2", "c2", 0.5, 3),
+        ("migration_1", "APPLIED", "h1", "c1", 1.5, 7),
+    ]
+
+    resumen = adapt_mysql.estado_historial("h1")
+
+    # la primera consulta solo comprueba que la tabla existe
+    assert adapt_mysql.cursor.execute.call_count == 2
+    sql, parametros = adapt_mysql.cursor.execute.call_args.args
+    assert "ORDER BY actualizada DESC, id DESC LIMIT 1" in sql
+    assert parametros == ("PENDING", "FAILED", "APPLIED")
+    assert resumen.esquema_aplicado
+    assert resumen.sin_terminar[0].duracion == 0.5
+    assert resumen.sin_terminar[0].sentencias_aplicadas == 3
+    assert [r.id_migracion for r in resumen.sin_terminar] == ["migration_2"]
+    assert resumen.sin_terminar[0].estado is EstadoMigracion.FALLIDA
+    assert resumen.hay_pendientes
+
+
+def test_estado_historial_esquema_revertido(adapt_mysql):
+    """Prueba que un esquema aplicado antes pero que no es el de la \
+        ultima migracion aplicada (A, B, A) se vuelve a aplicar."""
+    adapt_mysql.conexion = MagicMock()
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.fetchone.return_value = (1,)
+    # la consulta solo devuelve la ultima aplicada, la del esquema A
+    adapt_mysql.cursor.fetchall.return_value = [
+        ("migration_3", "APPLIED", "hA", "c3", 1.0, 4),
+    ]
+
+    resumen = adapt_mysql.estado_historial("hB")
+
+    assert not resumen.esquema_aplicado
+    assert resumen.hay_pendientes
+
+
+def test_estado_historial_sin_tabla(adapt_mysql):
+    """Prueba que consultar el historial no crea su tabla: sin ella \
+        queda todo por aplicar."""
+    adapt_mysql.conexion = MagicMock()
+    adapt_mysql.cursor = MagicMock()
+    adapt_mysql.cursor.fetchone.return_value = (0,)
+
+    resumen = adapt_mysql.estado_historial("h1")
+
+    adapt_mysql.cursor.execute.assert_called_once_with(
+        adapt_mysql.consulta_existe_historial,
+    )
+    assert TABLA_HISTORIAL in adapt_mysql.consulta_existe_historial
+    assert resumen.hay_pendientes
+    assert not resumen.sin_terminar
+
+
+def test_checksum_sql_ignora_comentarios():
+    """Prueba que el checksum no cambia con la fecha de la cabecera \
+        pero si con las directivas y las sentencias."""
+    sentencia = "ALTER TABLE `User` ADD COLUMN `a` INT;"
+    directiva = "-- graphqlstore:sin-transaccion {}"
+
+    assert checksum_sql(f"-- Date: 2024-01-01\n\n{sentencia}") == (
+        checksum_sql(f"-- Date: 2025-06-30\n{sentencia}\n")
+    )
+    assert checksum_sql(sentencia) != checksum_sql(f"{directiva}\n{sentencia}")
+    assert checksum_sql(sentencia) != checksum_sql(sentencia[:-1] + " NULL;")
@@ -5,6 +5,14 @@ import psycopg2
 import pytest
 
 from source.cli.database.adaptadores.postgresql import AdaptadorPostgreSQL
+from source.cli.database.directivas import (
+    TIPO_RELLENO,
+    TIPO_SIN_TRANSACCION,
+    Directiva,
+)
+from source.cli.database.historial import TABLA_HISTORIAL
+from source.cli.graphql.configuracion_y_constantes import ModoOnline
+from source.cli.graphql.exceptions import SQLExecutionError
 
 
 @pytest.fixture(name="postgresql_adapter")
@@ -308,6 +316,29 @@ def test_database_is_empty(postgresql_adapter):
     assert result is True
 
 
+def test_database_with_only_the_history_table_is_empty(postgresql_adapter):
+    """Test that the migration history table is not part of the schema."""
+    postgresql_adapter.cursor = MagicMock()
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor.fetchall.return_value = [(TABLA_HISTORIAL,)]
+
+    assert postgresql_adapter.empty_database() is True
+
+
+def test_history_status_without_table(postgresql_adapter):
+    """Test that reading the history does not create its table."""
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    postgresql_adapter.cursor.fetchone.return_value = (0,)
+
+    summary = postgresql_adapter.estado_historial("h1")
+
+    sql = postgresql_adapter.cursor.execute.call_args.args[0]
+    assert postgresql_adapter.cursor.execute.call_count == 1
+    assert "current_schema()" in sql
+    assert summary.hay_pendientes
+
+
 def test_can_not_check_if_database_is_empty_without_connection(
     postgresql_adapter,
 ):
@@ -318,3 +349,249 @@ def test_can_not_check_if_database_is_empty_without_connection(
         postgresql_adapter.empty_database()
 
     assert "Base de datos no conectada" in str(exc_info.value)
+
+
+def test_bootstrap_session_commits_once(postgresql_adapter):
+    """Test that the bootstrap session runs in a single transaction."""
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+
+    with postgresql_adapter.sesion_arranque():
+        postgresql_adapter.ejecutar_consulta("CREATE TABLE a (id INT);")
+        postgresql_adapter.ejecutar_consulta("CREATE TABLE b (id INT);")
+
+    assert postgresql_adapter.cursor.execute.call_count == 2
+    postgresql_adapter.conexion.commit.assert_called_once()
+    assert postgresql_adapter.en_transaccion is False
+
+
+def test_bootstrap_session_rolls_back_on_error(postgresql_adapter):
+    """Test that a failing statement leaves nothing created."""
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    postgresql_adapter.cursor.execute.side_effect = [None, psycopg2.Error()]
+
+    with pytest.raises(psycopg2.Error):
+        with postgresql_adapter.sesion_arranque():
+            postgresql_adapter.ejecutar_consulta("CREATE TABLE a (id INT);")
+            postgresql_adapter.ejecutar_consulta("CREATE TABLE b (id INT);")
+
+    postgresql_adapter.conexion.rollback.assert_called_once()
+    postgresql_adapter.conexion.commit.assert_not_called()
+
+
+def test_execute_script_in_one_round_trip(postgresql_adapter):
+    """Test that a batch is sent in a single query with a savepoint."""
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    postgresql_adapter.cursor.rowcount = 3
+
+    results = postgresql_adapter.ejecutar_script(
+        "CREATE TABLE a (x INT);\n-- comment\nUPDATE a SET x = 1;"
+    )
+
+    postgresql_adapter.cursor.execute.assert_called_once_with(
+        "SAVEPOINT lote;\nCREATE TABLE a (x INT);\nUPDATE a SET x = 1;"
+        "\nRELEASE SAVEPOINT lote;"
+    )
+    postgresql_adapter.conexion.commit.assert_called_once()
+    assert [r.filas_afectadas for r in results] == [-1, 3]
+
+
+def test_execute_script_reports_failed_statement(postgresql_adapter):
+    """Test that a failed batch is replayed to find the failing statement \
+        and keeps the previous ones."""
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    postgresql_adapter.cursor.execute.side_effect = [
+        psycopg2.Error("batch"),
+        None,  # rollback to the batch savepoint
+        None,  # first statement
+        psycopg2.Error("duplicate table"),
+        None,  # rollback to the statement savepoint
+    ]
+
+    with pytest.raises(SQLExecutionError) as exc_info:
+        postgresql_adapter.ejecutar_script(
+            "CREATE TABLE a (x INT); CREATE TABLE a (x INT); SELECT 1;"
+        )
+
+    results = exc_info.value.resultados
+    assert [r.exitosa for r in results] == [True, False]
+    assert "duplicate table" in results[1].error
+    # the statement before the failing one is committed
+    postgresql_adapter.conexion.commit.assert_called_once()
+
+
+def test_execute_script_runs_concurrent_index_in_autocommit(
+    postgresql_adapter,
+):
+    """Test that a statement marked as non transactional is run in \
+        autocommit between the batches around it."""
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.conexion.autocommit = False
+    postgresql_adapter.cursor = MagicMock()
+    connection = postgresql_adapter.conexion
+    autocommit_values = []
+    postgresql_adapter.cursor.execute.side_effect = (
+        lambda sql: autocommit_values.append(connection.autocommit)
+    )
+    index = "CREATE UNIQUE INDEX CONCURRENTLY i ON a (x);"
+    directive = Directiva(TIPO_SIN_TRANSACCION, {}, index)
+    script = f"ALTER TABLE a ADD COLUMN x INT;\n{directive.con_sentencia()}"
+
+    results = postgresql_adapter.ejecutar_script(script)
+
+    executed = postgresql_adapter.cursor.execute.call_args_list
+    assert executed[-1].args == (index,)
+    assert autocommit_values == [False, True]
+    assert postgresql_adapter.conexion.autocommit is False
+    assert [r.sentencia for r in results][-1] == index
+
+
+def test_drop_unique_of_a_schema_with_old_names(
+    postgresql_adapter,
+    pg_generator_migra,
+):
+    """Test that removing @unique drops the constraint with the name it \
+        has in the database when the schema was created before the \
+        constraints were named uk_<table>_<column>."""
+    schema = "type User {{ id: ID! @id code: String{code} }}"
+    script = pg_generator_migra.generate_migration(
+        previous_schema=schema.format(code=" @unique"),
+        new_schema=schema.format(code=""),
+        print_output=False,
+        print_sql=False,
+    ).sql_generado
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    postgresql_adapter.cursor.fetchall.return_value = [("uk_code",)]
+
+    postgresql_adapter.ejecutar_script(script)
+
+    calls = postgresql_adapter.cursor.execute.call_args_list
+    executed = [c.args for c in calls]
+    lookup = (postgresql_adapter.consulta_nombres_unique, ("User", "code"))
+    assert lookup in executed
+    sql = "\n".join(args[0] for args in executed)
+    assert "DROP CONSTRAINT IF EXISTS uk_code;" in sql
+    assert sql.count("DROP CONSTRAINT") == 1
+
+
+def test_online_foreign_key_validated_after_commit(
+    postgresql_adapter,
+    pg_generator_migra,
+):
+    """Test that the foreign key of an online migration is validated \
+        after the transaction that added it NOT VALID has committed, \
+        so the scan does not hold the lock of ADD CONSTRAINT."""
+    previous = "type User { id: ID! @id }\ntype Post { id: ID! @id }"
+    new = (
+        'type User { id: ID! @id posts: [Post!]! @relation(name: "UP") }\n'
+        'type Post { id: ID! @id author: User @relation(name: "UP") }'
+    )
+    script = pg_generator_migra.generate_migration(
+        previous_schema=previous,
+        new_schema=new,
+        print_output=False,
+        print_sql=False,
+        online=ModoOnline.ADVERTIR,
+    ).sql_generado
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    events = []
+    connection = postgresql_adapter.conexion
+    postgresql_adapter.cursor.execute.side_effect = events.append
+    connection.commit.side_effect = lambda: events.append("COMMIT")
+
+    postgresql_adapter.ejecutar_script(script)
+
+    add = next(i for i, sql in enumerate(events) if "NOT VALID" in sql)
+    validate = events.index(next(e for e in events if "VALIDATE" in e))
+    assert "COMMIT" in events[add:validate]
+    assert postgresql_adapter.conexion.autocommit is False
+
+
+def test_non_transactional_statement_refused_in_bootstrap_session(
+    postgresql_adapter,
+):
+    """Test that a non transactional statement fails inside the single \
+        transaction of the bootstrap session."""
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    directive = Directiva(
+        TIPO_SIN_TRANSACCION,
+        {},
+        "CREATE INDEX CONCURRENTLY i ON a (x);",
+    )
+
+    with pytest.raises(SQLExecutionError):
+        with postgresql_adapter.sesion_arranque():
+            postgresql_adapter.ejecutar_script(directive.con_sentencia())
+
+    postgresql_adapter.conexion.rollback.assert_called_once()
+
+
+def test_backfill_commits_each_batch_outside_bootstrap_session(
+    postgresql_adapter,
+):
+    """Test that backfill batches are committed one by one, and that \
+        the bootstrap session keeps its single transaction."""
+    update = "UPDATE t SET a = 1"
+    batch = f"{update} WHERE (a IS NULL) AND {{rango}};"
+    directive = Directiva(
+        TIPO_RELLENO,
+        {"tabla": "t", "sentencia": batch},
+        f"{update} WHERE a IS NULL;",
+    )
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    postgresql_adapter.cursor.rowcount = 1
+    postgresql_adapter.cursor.fetchone.side_effect = [(5,), None]
+
+    postgresql_adapter.ejecutar_script(directive.con_sentencia())
+    assert postgresql_adapter.conexion.commit.call_count == 2
+
+    postgresql_adapter.conexion.reset_mock()
+    postgresql_adapter.cursor.fetchone.side_effect = [(5,), None]
+    with postgresql_adapter.sesion_arranque():
+        postgresql_adapter.ejecutar_script(directive.con_sentencia())
+    # only the commit that closes the session
+    assert postgresql_adapter.conexion.commit.call_count == 1
+
+
+def test_history_table_and_status_index(postgresql_adapter):
+    """Test that the history table and its status index are created \
+        if they do not exist."""
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+
+    postgresql_adapter.asegurar_historial()
+
+    sql = postgresql_adapter.cursor.execute.call_args.args[0]
+    assert "CREATE TABLE IF NOT EXISTS graphqlstore_migraciones" in sql
+    assert "CREATE INDEX IF NOT EXISTS" in sql
+    assert "(estado, actualizada)" in sql
+    postgresql_adapter.conexion.commit.assert_called_once()
+
+
+def test_failed_backfill_rolls_back_outside_bootstrap_session(
+    postgresql_adapter,
+):
+    """Test that a failed backfill batch is rolled back so the \
+        connection can still record the failure."""
+    directive = Directiva(
+        TIPO_RELLENO,
+        {"tabla": "t", "sentencia": "UPDATE t SET a = 1 WHERE {rango};"},
+        "UPDATE t SET a = 1;",
+    )
+    postgresql_adapter.conexion = MagicMock()
+    postgresql_adapter.cursor = MagicMock()
+    error = psycopg2.Error("deadlock")
+    postgresql_adapter.cursor.execute.side_effect = [None, error]
+    postgresql_adapter.cursor.fetchone.return_value = (2,)
+
+    with pytest.raises(SQLExecutionError):
+        postgresql_adapter.ejecutar_script(directive.con_sentencia())
+
+    postgresql_adapter.conexion.rollback.assert_called_once()
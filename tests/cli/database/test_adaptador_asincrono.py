@@ -0,0 +1,171 @@
+"""Pruebas para los adaptadores asyncio"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import mysql.connector
+import pytest
+
+from source.cli.database.adaptadores import (
+    AdaptadorMySQLAsincrono,
+    AdaptadorPostgreSQLAsincrono,
+    crear_adaptador_asincrono,
+)
+from source.cli.graphql.configuracion_y_constantes import DatabaseType
+from source.cli.graphql.exceptions import GraphQLStoreError, MigrationError
+from source.cli.inicializar.asincrono import inicializar_esquema
+from source.cli.migracion.asincrono import aplicar_sql_migracion, migrar
+
+# latencia simulada de cada ida y vuelta al servidor
+LATENCIA = 0.1
+
+
+class CursorLento:
+    """Cursor de un servidor simulado que tarda en responder."""
+
+    def __init__(self, tablas):
+        self.tablas = tablas
+        self.ejecutadas = []
+        self.rowcount = 0
+        self.with_rows = False
+
+    def execute(self, sql):
+        time.sleep(LATENCIA)
+        self.ejecutadas.append(sql)
+
+    def nextset(self):
+        return None
+
+    def fetchall(self):
+        return list(self.tablas)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(name="servidor")
+def fixture_servidor():
+    """Fixture que sustituye mysql.connector.connect por un servidor \
+        simulado; cada conexion guarda su cursor."""
+    cursores = []
+
+    def conectar(**_):
+        cursor = CursorLento(servidor.tablas)
+        cursores.append(cursor)
+        conexion = MagicMock()
+        conexion.cursor.return_value = cursor
+        return conexion
+
+    servidor = MagicMock(tablas=[], cursores=cursores)
+    with patch("mysql.connector.connect", side_effect=conectar):
+        yield servidor
+
+
+def test_crear_adaptador_asincrono():
+    """Prueba la creacion del adaptador asyncio de cada motor."""
+    mysql = crear_adaptador_asincrono(DatabaseType.MYSQL)
+    postgresql = crear_adaptador_asincrono(DatabaseType.POSTGRESQL)
+
+    assert isinstance(mysql, AdaptadorMySQLAsincrono)
+    assert isinstance(postgresql, AdaptadorPostgreSQLAsincrono)
+
+
+def test_bases_de_datos_en_paralelo(servidor):
+    """Prueba que varias bases de datos se atienden a la vez."""
+    servidor.tablas = [("user",)]
+
+    async def migrar_todas():
+        return await asyncio.gather(
+            *(aplicar_sql_migracion("SELECT 1;", {}) for _ in range(4))
+        )
+
+    inicio = time.perf_counter()
+    resultados = asyncio.run(migrar_todas())
+    duracion = time.perf_counter() - inicio
+
+    # cada migracion hace 2 idas y vueltas (SHOW TABLES y el script)
+    assert duracion < 4 * 2 * LATENCIA
+    assert [len(resultado) for resultado in resultados] == [1, 1, 1, 1]
+    assert all(c.ejecutadas[-1] == "SELECT 1;" for c in servidor.cursores)
+
+
+def test_consultar(servidor):
+    """Prueba la lectura de filas de una consulta."""
+    servidor.tablas = [("user",), ("post",)]
+
+    async def consultar():
+        async with AdaptadorMySQLAsincrono() as adaptador:
+            await adaptador.conectar({})
+            return await adaptador.consultar("SHOW TABLES;")
+
+    assert asyncio.run(consultar()) == [("user",), ("post",)]
+
+
+def test_cierra_conexion_al_salir(servidor):
+    """Prueba que la conexion se cierra al salir del bloque aunque \
+        haya un error."""
+    adaptador = AdaptadorMySQLAsincrono()
+
+    async def fallar():
+        async with adaptador:
+            await adaptador.conectar({})
+            raise RuntimeError("fallo")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(fallar())
+
+    assert adaptador.adaptador.conexion is None
+    assert len(servidor.cursores) == 1
+
+
+def test_conectar_sin_servidor():
+    """Prueba que un fallo de conexion se convierte en excepcion."""
+    error = mysql.connector.Error("sin servidor")
+
+    async def conectar():
+        await AdaptadorMySQLAsincrono().conectar({})
+
+    with patch("mysql.connector.connect", side_effect=error):
+        with pytest.raises(ConnectionError):
+            asyncio.run(conectar())
+
+
+def test_migracion_base_vacia(servidor):
+    """Prueba que no se migra una base de datos sin inicializar."""
+    with pytest.raises(MigrationError):
+        asyncio.run(aplicar_sql_migracion("SELECT 1;", {}))
+
+    assert servidor.cursores[0].ejecutadas == ["SHOW TABLES;"]
+
+
+def test_inicializar_esquema(servidor):
+    """Prueba la inicializacion asyncio de un esquema."""
+    esquema = 'type User @table(name: "users") { id: ID! @id }'
+
+    total = asyncio.run(inicializar_esquema(esquema, {}))
+
+    assert total > 0
+    ejecutadas = "\n".join(servidor.cursores[0].ejecutadas)
+    assert "CREATE TABLE" in ejecutadas
+
+
+def test_inicializar_esquema_base_no_vacia(servidor):
+    """Prueba que no se inicializa una base de datos con tablas."""
+    servidor.tablas = [("user",)]
+    esquema = 'type User @table(name: "users") { id: ID! @id }'
+
+    with pytest.raises(GraphQLStoreError):
+        asyncio.run(inicializar_esquema(esquema, {}))
+
+
+def test_migrar(servidor):
+    """Prueba que la migracion se genera y se aplica."""
+    servidor.tablas = [("users",)]
+    anterior = 'type User @table(name: "users") { id: ID! @id }'
+    nuevo = 'type User @table(name: "users") { id: ID! @id name: String }'
+
+    migra = asyncio.run(migrar(anterior, nuevo, {}))
+
+    assert "ALTER TABLE" in migra.sql_generado
+    assert "ALTER TABLE" in servidor.cursores[0].ejecutadas[-1]
@@ -0,0 +1,35 @@
+"""Pruebas de las directivas incluidas en los scripts SQL."""
+
+from source.cli.database.directivas import Directiva, dividir_script
+from source.cli.database.tokenizador_sql import DIALECTO_POSTGRESQL
+
+
+def test_directiva_sustituye_a_la_sentencia_siguiente():
+    """Prueba que la directiva guarda la sentencia que la sigue y que \
+        el resto del script se divide igual."""
+    directiva = Directiva("copia", {"tabla": "t"}, "ALTER TABLE t X;")
+    marcada = directiva.con_sentencia()
+    script = f"SELECT 1;\n-- comentario\n{marcada}\nSELECT 2;"
+
+    assert dividir_script(script) == ["SELECT 1;", directiva, "SELECT 2;"]
+
+
+def test_directiva_sin_datos_ni_sentencia():
+    """Prueba que una directiva sin datos se lee vacia y que una sin \
+        sentencia detras se descarta."""
+    script = (
+        "-- graphqlstore:copia\nCREATE TYPE e AS ENUM ('a;b');\n"
+        "-- graphqlstore:copia {}\n-- fin"
+    )
+
+    assert dividir_script(script, DIALECTO_POSTGRESQL) == [
+        Directiva("copia", {}, "CREATE TYPE e AS ENUM ('a;b');"),
+    ]
+
+
+def test_script_sin_directivas():
+    """Prueba que sin directivas se obtienen solo las sentencias."""
+    assert dividir_script("-- x\nSELECT 1; SELECT 2;") == [
+        "SELECT 1;",
+        "SELECT 2;",
+    ]
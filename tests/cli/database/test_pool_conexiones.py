@@ -0,0 +1,126 @@
+"""Pruebas para el pool de conexiones"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from source.cli.database.adaptadores.mysql import AdaptadorMySQL
+from source.cli.database.pool_conexiones import (
+    ConfiguracionPool,
+    PoolConexiones,
+    cerrar_pools,
+)
+
+MODULO = "source.cli.database.pool_conexiones"
+
+
+@pytest.fixture(name="reloj")
+def fixture_reloj():
+    """Fixture que controla el tiempo visto por el pool."""
+    reloj = MagicMock(return_value=0.0)
+    with patch(f"{MODULO}.time.monotonic", reloj):
+        yield reloj
+
+
+@pytest.fixture(name="crear_pool")
+def fixture_crear_pool():
+    """Fixture que crea pools con conexiones simuladas."""
+
+    def crear_pool(verificar=lambda conexion: True, **parametros):
+        return PoolConexiones(
+            MagicMock(side_effect=lambda: MagicMock()),
+            verificar,
+            ConfiguracionPool(**parametros),
+        )
+
+    return crear_pool
+
+
+@pytest.fixture(name="sin_pools")
+def fixture_sin_pools():
+    """Fixture que cierra los pools compartidos al terminar."""
+    yield
+    cerrar_pools()
+
+
+def test_configuracion_desde_config():
+    """Prueba que el pool solo se activa con DB_POOL_TAMANO."""
+    assert ConfiguracionPool.desde_config({"DB_HOST": "x"}) is None
+
+    configuracion = ConfiguracionPool.desde_config(
+        {"DB_POOL_TAMANO": "2", "DB_POOL_INACTIVIDAD": 60}
+    )
+    assert configuracion == ConfiguracionPool(tamano=2, inactividad=60.0)
+
+
+def test_reutiliza_conexiones(crear_pool, reloj):
+    """Prueba que una conexion devuelta se reutiliza."""
+    pool = crear_pool()
+
+    primera = pool.obtener()
+    pool.devolver(primera)
+    reloj.return_value = 1.0
+
+    assert pool.obtener() is primera
+    pool.crear.assert_called_once()
+
+
+def test_pool_lleno_espera_y_falla(crear_pool, reloj):
+    """Prueba que el pool no abre mas conexiones que su tamano."""
+    pool = crear_pool(tamano=1, espera=0)
+    pool.obtener()
+
+    with pytest.raises(TimeoutError):
+        pool.obtener()
+    assert reloj.called
+    assert pool.abiertas == 1
+
+
+def test_desaloja_conexiones_inactivas(crear_pool, reloj):
+    """Prueba que las conexiones libres inactivas se cierran."""
+    pool = crear_pool(inactividad=10)
+    conexion = pool.obtener()
+    pool.devolver(conexion)
+
+    reloj.return_value = 11.0
+    nueva = pool.obtener()
+
+    conexion.close.assert_called_once()
+    assert nueva is not conexion
+    assert pool.abiertas == 1
+
+
+def test_descarta_conexiones_que_fallan_la_verificacion(crear_pool, reloj):
+    """Prueba que solo se verifican las conexiones que llevan tiempo \
+        sin usarse y que se descartan las que no responden."""
+    verificar = MagicMock(return_value=False)
+    pool = crear_pool(verificar=verificar, verificar_tras=5)
+    conexion = pool.obtener()
+    pool.devolver(conexion)
+
+    reloj.return_value = 6.0
+    nueva = pool.obtener()
+
+    verificar.assert_called_once_with(conexion)
+    conexion.close.assert_called_once()
+    assert nueva is not conexion
+
+
+def test_adaptadores_comparten_conexion(sin_pools):
+    """Prueba que dos adaptadores con la misma configuracion reutilizan \
+        la conexion abierta por el primero."""
+    config = {"DB_HOST": "localhost", "DB_NOMBRE": "db", "DB_POOL_TAMANO": 2}
+
+    with patch("mysql.connector.connect") as mock_connect:
+        primero = AdaptadorMySQL()
+        primero.conectar(config)
+        conexion = primero.conexion
+        primero.cerrar_conexion()
+
+        segundo = AdaptadorMySQL()
+        segundo.conectar(config)
+
+    mock_connect.assert_called_once()
+    conexion.rollback.assert_called_once()
+    conexion.close.assert_not_called()
+    assert segundo.conexion is conexion
@@ -0,0 +1,108 @@
+"""Pruebas del relleno de datos por rangos de clave primaria."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from source.cli.database.relleno import (
+    ConfiguracionRelleno,
+    PasoRelleno,
+    ProgresoRelleno,
+    rellenar_por_lotes,
+)
+
+
+@pytest.fixture(name="paso")
+def fixture_paso():
+    """Paso que rellena con un valor por defecto."""
+    return PasoRelleno(
+        "`u`",
+        "UPDATE `u` SET `a` = '50%' WHERE (`a` IS NULL) AND {rango};",
+        "`id`",
+    )
+
+
+@pytest.fixture(name="cursor")
+def fixture_cursor():
+    """Cursor con dos lotes: el limite del primero y ninguno despues."""
+    cursor = MagicMock()
+    cursor.fetchone.side_effect = [(10,), None]
+    cursor.rowcount = 3
+    return cursor
+
+
+def test_relleno_por_lotes_confirma_cada_lote(paso, cursor):
+    """Prueba que cada lote se limita por clave, se confirma y espera \
+        la pausa antes del siguiente."""
+    confirmar = MagicMock()
+    avances = []
+    configuracion = ConfiguracionRelleno(
+        tam_lote=500,
+        pausa=0.5,
+        al_avanzar=lambda _paso, filas, clave: avances.append((filas, clave)),
+    )
+
+    with patch("source.cli.database.relleno.time.sleep") as dormir:
+        filas = rellenar_por_lotes(cursor, paso, configuracion, confirmar)
+
+    limite = "ORDER BY `id` LIMIT 1 OFFSET 499;"
+    actualizar = "UPDATE `u` SET `a` = '50%%' WHERE (`a` IS NULL) AND"
+    ejecutadas = [c.args for c in cursor.execute.call_args_list]
+    assert ejecutadas == [
+        (f"SELECT `id` FROM `u` WHERE 1 = 1 {limite}", ()),
+        (f"{actualizar} `id` <= %s;", (10,)),
+        (f"SELECT `id` FROM `u` WHERE `id` > %s {limite}", (10,)),
+        (f"{actualizar} `id` > %s;", (10,)),
+    ]
+    assert filas == 6
+    assert confirmar.call_count == 2
+    dormir.assert_called_once_with(0.5)
+    assert avances == [(3, 10), (6, 10)]
+
+
+def test_relleno_reanuda_desde_la_ultima_clave(paso, cursor, tmp_path):
+    """Prueba que el relleno continua desde la clave guardada y que \
+        al terminar se elimina el progreso."""
+    ruta = tmp_path / "migraciones" / ".relleno_progreso.json"
+    ruta.parent.mkdir()
+    ruta.write_text(json.dumps({paso.huella: 7}), encoding="utf-8")
+    cursor.fetchone.side_effect = [None]
+    configuracion = ConfiguracionRelleno(progreso=ProgresoRelleno(ruta))
+
+    rellenar_por_lotes(cursor, paso, configuracion, MagicMock())
+
+    assert cursor.execute.call_args_list[0].args[1] == (7,)
+    assert not ruta.exists()
+
+
+def test_relleno_interrumpido_guarda_el_progreso(paso, cursor, tmp_path):
+    """Prueba que un lote fallido deja guardada la ultima clave \
+        completada."""
+    ruta = tmp_path / ".relleno_progreso.json"
+    cursor.execute.side_effect = [None, None, None, RuntimeError("caida")]
+    configuracion = ConfiguracionRelleno(progreso=ProgresoRelleno(ruta))
+
+    with pytest.raises(RuntimeError):
+        rellenar_por_lotes(cursor, paso, configuracion, MagicMock())
+
+    guardado = json.loads(ruta.read_text(encoding="utf-8"))
+    assert guardado == {paso.huella: 10}
+    assert ProgresoRelleno(ruta).ultima_clave(paso) == 10
+
+
+def test_progreso_por_migracion(paso, cursor, tmp_path):
+    """Prueba que el mismo paso en otra migracion no reanuda desde la \
+        clave guardada por la anterior."""
+    ruta = tmp_path / ".relleno_progreso.json"
+    anterior = ProgresoRelleno(ruta, "migration_1")
+    anterior.registrar(paso, 10)
+    cursor.fetchone.side_effect = [None]
+    progreso = ProgresoRelleno(ruta, "migration_2")
+    configuracion = ConfiguracionRelleno(progreso=progreso)
+
+    rellenar_por_lotes(cursor, paso, configuracion, MagicMock())
+
+    assert cursor.execute.call_args_list[0].args[1] == ()
+    guardado = json.loads(ruta.read_text(encoding="utf-8"))
+    assert guardado == {f"migration_1:{paso.huella}": 10}
@@ -0,0 +1,65 @@
+"""Pruebas para dividir scripts SQL en sentencias"""
+
+import pytest
+
+from source.cli.database.tokenizador_sql import (
+    DIALECTO_POSTGRESQL,
+    dividir_sentencias,
+)
+
+
+def test_divide_y_elimina_comentarios():
+    """Prueba que los comentarios no generan sentencias."""
+    script = (
+        "-- Migration: m1; generada\n"
+        "CREATE TABLE a (id INT); -- fin;\n"
+        "/* bloque; */ALTER TABLE a ADD b INT;\n"
+        "# comentario MySQL;\n"
+        ";\n"
+    )
+
+    assert dividir_sentencias(script) == [
+        "CREATE TABLE a (id INT);",
+        "ALTER TABLE a ADD b INT;",
+    ]
+
+
+@pytest.mark.parametrize(
+    "sentencia",
+    [
+        "ALTER TABLE a ADD s VARCHAR(9) DEFAULT 'x;y';",
+        "ALTER TABLE a ADD s VARCHAR(9) DEFAULT 'it''s; ok';",
+        "ALTER TABLE a ADD s VARCHAR(9) DEFAULT 'a\\';b';",
+        "ALTER TABLE `tabla;rara` ADD `c--1` INT;",
+        "ALTER TABLE a ADD s VARCHAR(9) DEFAULT '-- no; es comentario';",
+    ],
+)
+def test_respeta_cadenas_e_identificadores(sentencia):
+    """Prueba que los ';' y '--' entre comillas no separan sentencias."""
+    assert dividir_sentencias(f"{sentencia}\nSELECT 1;") == [
+        sentencia,
+        "SELECT 1;",
+    ]
+
+
+def test_dialecto_postgresql():
+    """Prueba las reglas lexicas de PostgreSQL."""
+    script = (
+        "DO $cuerpo$ BEGIN PERFORM 1; END $cuerpo$;\n"
+        "ALTER TABLE \"a\" ADD s TEXT DEFAULT 'C:\\';\n"
+        "SELECT $$;$$;"
+    )
+
+    assert dividir_sentencias(script, DIALECTO_POSTGRESQL) == [
+        "DO $cuerpo$ BEGIN PERFORM 1; END $cuerpo$;",
+        "ALTER TABLE \"a\" ADD s TEXT DEFAULT 'C:\\';",
+        "SELECT $$;$$;",
+    ]
+
+
+def test_ultima_sentencia_sin_punto_y_coma():
+    """Prueba que la ultima sentencia se cierra con ';'."""
+    assert dividir_sentencias("SELECT 1;\nSELECT 2") == [
+        "SELECT 1;",
+        "SELECT 2;",
+    ]
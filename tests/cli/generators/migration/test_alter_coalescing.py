@@ -0,0 +1,140 @@
+"""Tests for merging the ALTER TABLE statements of a migration."""
+
+from source.cli.database.tokenizador_sql import (
+    DIALECTO_MYSQL,
+    DIALECTO_POSTGRESQL,
+)
+from source.cli.generators.migration import (
+    MySQLMigrationGenerator,
+    PostgreSQLMigrationGenerator,
+)
+from source.cli.generators.migration.alter_coalescing import (
+    coalesce_alter_statements,
+)
+
+
+def test_merge_alters_per_table():
+    """Test that the clauses of each table end in one ALTER TABLE."""
+    blocks = [
+        "-- Remove field a from t\nALTER TABLE `t` DROP COLUMN `a`;",
+        "-- Add field b to u\nALTER TABLE `u` ADD COLUMN `b` INT;",
+        "-- Add field c to t\nALTER TABLE `t` ADD COLUMN `c` INT;",
+    ]
+
+    result = coalesce_alter_statements(blocks, DIALECTO_MYSQL)
+
+    assert result == [
+        "-- Remove field a from t\n-- Add field c to t\n"
+        "ALTER TABLE `t`\n  DROP COLUMN `a`,\n  ADD COLUMN `c` INT;",
+        "-- Add field b to u\nALTER TABLE `u` ADD COLUMN `b` INT;",
+    ]
+
+
+def test_nothing_to_merge_keeps_blocks():
+    """Test that the blocks are returned untouched without merges."""
+    blocks = [
+        "-- Add field a\nALTER TABLE t ADD COLUMN a INT;\n"
+        "ALTER TABLE t RENAME COLUMN a TO b;",
+        "ALTER TABLE u ADD COLUMN c INT;",
+    ]
+
+    assert coalesce_alter_statements(blocks, DIALECTO_POSTGRESQL) is blocks
+
+
+def test_update_and_rename_keep_table_order():
+    """Test that an UPDATE or RENAME on a table is not crossed."""
+    blocks = [
+        "ALTER TABLE t ADD COLUMN s_new TEXT;",
+        "ALTER TABLE u ADD COLUMN x INT;",
+        "UPDATE t SET s_new = s;",
+        "ALTER TABLE t DROP COLUMN s;",
+        "ALTER TABLE t RENAME COLUMN s_new TO s;",
+        "ALTER TABLE u ADD COLUMN y INT;",
+    ]
+
+    result = coalesce_alter_statements(blocks, DIALECTO_POSTGRESQL)
+
+    assert result == [
+        "ALTER TABLE t ADD COLUMN s_new TEXT;",
+        "UPDATE t SET s_new = s;",
+        "ALTER TABLE t DROP COLUMN s;",
+        "ALTER TABLE t RENAME COLUMN s_new TO s;",
+        "ALTER TABLE u\n  ADD COLUMN x INT,\n  ADD COLUMN y INT;",
+    ]
+
+
+def test_other_statements_emit_pending_alters():
+    """Test that a statement without table (CREATE TYPE) is a barrier."""
+    blocks = [
+        "ALTER TABLE t ADD COLUMN a INT;",
+        "CREATE TYPE e_enum AS ENUM ('A');\nALTER TABLE t ADD COLUMN e e;",
+        "ALTER TABLE t ADD COLUMN b INT;",
+    ]
+
+    result = coalesce_alter_statements(blocks, DIALECTO_POSTGRESQL)
+
+    assert result == [
+        "ALTER TABLE t ADD COLUMN a INT;",
+        "CREATE TYPE e_enum AS ENUM ('A');",
+        "ALTER TABLE t\n  ADD COLUMN e e,\n  ADD COLUMN b INT;",
+    ]
+
+
+def test_table_options_are_merged_once():
+    """Test that ALGORITHM is kept once and only merged with the same \
+        options."""
+    blocks = [
+        "ALTER TABLE `t` MODIFY COLUMN `a` ENUM('X'), ALGORITHM=INSTANT;",
+        "ALTER TABLE `t` MODIFY COLUMN `b` ENUM('X'), ALGORITHM=INSTANT;",
+        "ALTER TABLE `t` ADD COLUMN `c` INT;",
+    ]
+
+    result = coalesce_alter_statements(blocks, DIALECTO_MYSQL)
+
+    assert result == [
+        "ALTER TABLE `t`\n  MODIFY COLUMN `a` ENUM('X'),\n"
+        "  MODIFY COLUMN `b` ENUM('X'),\n  ALGORITHM=INSTANT;",
+        "ALTER TABLE `t` ADD COLUMN `c` INT;",
+    ]
+
+
+def test_migration_alters_table_once():
+    """Test that several new columns on a table give one ALTER TABLE \
+        in both generators."""
+    previous = "type User { id: ID! @id name: String old: Int }"
+    new = "type User { id: ID! @id name: String! age: Int email: String }"
+
+    for generator in (
+        MySQLMigrationGenerator(),
+        PostgreSQLMigrationGenerator(),
+    ):
+        migration = generator.generate_migration(
+            previous,
+            new,
+            print_output=False,
+            print_sql=False,
+        )
+
+        sql = migration.sql_generado
+        assert sql.count("ALTER TABLE") == 1
+        assert "DROP COLUMN" in sql
+        assert sql.index("DROP COLUMN") < sql.index("ADD COLUMN")
+
+
+def test_validate_constraint_is_not_merged():
+    """Test that VALIDATE CONSTRAINT stays after the ALTER that adds the \
+        NOT VALID constraint."""
+    blocks = [
+        "ALTER TABLE t ADD COLUMN u_id VARCHAR(25);\n"
+        "ALTER TABLE t ADD CONSTRAINT fk FOREIGN KEY (u_id) "
+        "REFERENCES u(id) NOT VALID;\n"
+        "ALTER TABLE t VALIDATE CONSTRAINT fk;",
+    ]
+
+    result = coalesce_alter_statements(blocks, DIALECTO_POSTGRESQL)
+
+    assert result == [
+        "ALTER TABLE t\n  ADD COLUMN u_id VARCHAR(25),\n"
+        "  ADD CONSTRAINT fk FOREIGN KEY (u_id) REFERENCES u(id) NOT VALID;",
+        "ALTER TABLE t VALIDATE CONSTRAINT fk;",
+    ]
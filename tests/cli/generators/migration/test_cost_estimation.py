@@ -0,0 +1,135 @@
+"""Tests for the migration cost estimate."""
+
+import pytest
+
+from source.cli.database.adaptador_database import EstadisticasTabla
+from source.cli.database.directivas import TIPO_RELLENO, Directiva
+from source.cli.generators.migration import (
+    MySQLMigrationGenerator,
+    PostgreSQLMigrationGenerator,
+)
+from source.cli.generators.migration.cost_estimation import (
+    KIND_INPLACE,
+    KIND_INSTANT,
+    KIND_REWRITE,
+    LOCK_ALL,
+    LOCK_NONE,
+    LOCK_WRITES,
+    REWRITE_BYTES_PER_SECOND,
+    SCAN_BYTES_PER_SECOND,
+    UPDATED_ROWS_PER_SECOND,
+)
+
+MB = 1024 * 1024
+
+
+@pytest.fixture(name="stats")
+def fixture_stats():
+    """Statistics of one large table, as read from the catalog."""
+    return {"user": EstadisticasTabla(400_000, 500 * MB, 100 * MB)}
+
+
+@pytest.mark.parametrize(
+    "statement, kind, lock",
+    [
+        ("ALTER TABLE `user` ADD COLUMN `a` INT;", KIND_INSTANT, LOCK_NONE),
+        (
+            "ALTER TABLE `user` ADD COLUMN `a` INT, ADD UNIQUE (`b`);",
+            KIND_INPLACE,
+            LOCK_NONE,
+        ),
+        (
+            "ALTER TABLE `user` MODIFY COLUMN `a` BIGINT;",
+            KIND_REWRITE,
+            LOCK_WRITES,
+        ),
+        # the statement already asks for the algorithm it can use
+        (
+            "ALTER TABLE `user` MODIFY COLUMN `s` ENUM('A', 'B'), "
+            "ALGORITHM=INSTANT;",
+            KIND_INSTANT,
+            LOCK_NONE,
+        ),
+        ("DROP TABLE IF EXISTS `user`;", KIND_INSTANT, LOCK_NONE),
+    ],
+)
+def test_mysql_statement_kind(statement, kind, lock, stats):
+    """Test the kind and lock of MySQL statements."""
+    estimate = MySQLMigrationGenerator().estimate_cost(statement, stats)
+
+    cost = estimate.statements[0]
+    assert (cost.table, cost.kind, cost.lock) == ("user", kind, lock)
+
+
+@pytest.mark.parametrize(
+    "statement, kind, lock",
+    [
+        ("ALTER TABLE User ADD COLUMN a INT;", KIND_INSTANT, LOCK_NONE),
+        (
+            "ALTER TABLE User ALTER COLUMN a TYPE BIGINT USING a::BIGINT;",
+            KIND_REWRITE,
+            LOCK_ALL,
+        ),
+        (
+            "ALTER TABLE User ALTER COLUMN a SET NOT NULL;",
+            KIND_INPLACE,
+            LOCK_ALL,
+        ),
+        (
+            "ALTER TABLE User ADD CONSTRAINT fk FOREIGN KEY (a) "
+            'REFERENCES "Post"(id) NOT VALID;',
+            KIND_INSTANT,
+            LOCK_NONE,
+        ),
+        (
+            "ALTER TABLE User ADD CONSTRAINT a_unique UNIQUE (a);",
+            KIND_INPLACE,
+            LOCK_WRITES,
+        ),
+        (
+            "CREATE UNIQUE INDEX CONCURRENTLY a_unique ON User (a);",
+            KIND_INPLACE,
+            LOCK_NONE,
+        ),
+    ],
+)
+def test_postgresql_statement_kind(statement, kind, lock, stats):
+    """Test the kind and lock of PostgreSQL statements; unquoted \
+        table names are found in lower case in the catalog."""
+    generator = PostgreSQLMigrationGenerator()
+    estimate = generator.estimate_cost(statement, stats)
+
+    cost = estimate.statements[0]
+    assert (cost.table, cost.kind, cost.lock) == ("User", kind, lock)
+    assert cost.seconds > 0 or kind == KIND_INSTANT
+
+
+def test_duration_follows_table_size(stats):
+    """Test that rewrites cost the whole table, scans its data, \
+        backfills its rows, and new tables nothing."""
+    backfill = Directiva(
+        TIPO_RELLENO,
+        {"tabla": "`user`", "sentencia": "UPDATE `user` SET a = 1 {rango};"},
+        "UPDATE `user` SET a = 1;",
+    )
+    sql = "\n".join(
+        [
+            "ALTER TABLE `user` MODIFY COLUMN `a` BIGINT;",
+            "ALTER TABLE `user` ADD UNIQUE (`b`), ALGORITHM=INPLACE;",
+            backfill.con_sentencia(),
+            "ALTER TABLE `new_table` MODIFY COLUMN `a` BIGINT;",
+        ]
+    )
+
+    estimate = MySQLMigrationGenerator().estimate_cost(sql, stats)
+
+    seconds = [cost.seconds for cost in estimate.statements]
+    assert seconds == [
+        pytest.approx(600 * MB / REWRITE_BYTES_PER_SECOND),
+        pytest.approx(500 * MB / SCAN_BYTES_PER_SECOND),
+        pytest.approx(400_000 / UPDATED_ROWS_PER_SECOND),
+        0.0,
+    ]
+    assert estimate.total_seconds == pytest.approx(sum(seconds))
+    # only the table copy blocks writes; the backfill commits per batch
+    assert estimate.blocking_seconds == pytest.approx(seconds[0])
@@ -2,12 +2,19 @@
 
 from unittest.mock import patch
 import pytest
+from source.cli.database.directivas import (
+    TIPO_ELIMINAR_UNIQUE,
+    TIPO_RELLENO,
+    Directiva,
+    dividir_script,
+)
 from source.cli.graphql.configuracion_y_constantes import (
     InfoDiffCampos,
     InfoDiffEsquema,
     InfoDirectiva,
     InfoField,
     InfoMigracion,
+    ModoOnline,
     OnDelete,
     TipoLink,
     TipoRelacion,
@@ -89,7 +96,11 @@ def test_generar_migracion_exitosa(
     assert "CREATE TABLE" in resultado.sql_generado
     assert resultado.id_migracion.startswith("migration_")
 
-    mock_diff_esquemas.assert_called_once_with(prev_schema_01, new_schema_01)
+    # los esquemas llegan envueltos en su pipeline de parseo
+    mock_diff_esquemas.assert_called_once()
+    anterior, nuevo = mock_diff_esquemas.call_args.args
+    assert anterior.esquema == prev_schema_01
+    assert nuevo.esquema == new_schema_01
     mock_generar_sql.assert_called_once_with(simple_differences)
 
     # verificar que se llamaron ambos prints
@@ -332,6 +343,56 @@ def test_diff_esquemas_procesar_relaciones_auto_relacion(
     assert relacion.tipo_relation == TipoRelacion.MANY_TO_MANY.value
 
 
+def test_diff_esquemas_sin_cambios_compara_solo_huellas(
+    mysql_generator_migra,
+    prev_schema_08,
+):
+    """Prueba que dos esquemas con la misma huella no se comparan tabla \
+        a tabla ni procesan sus relaciones."""
+    with (
+        patch.object(mysql_generator_migra, "_compare_tables") as mock_tablas,
+        patch(
+            "source.cli.graphql.pipeline_esquema.ProcesarRelaciones",
+        ) as mock_relaciones,
+    ):
+        diferencias = mysql_generator_migra.diff_schemas(
+            previous_schema=prev_schema_08,
+            new_schema=prev_schema_08 + "\n",
+        )
+
+    assert not diferencias.tiene_cambios()
+    mock_tablas.assert_not_called()
+    mock_relaciones.assert_not_called()
+    assert "Category" in diferencias.tablas_existentes
+
+
+def test_compare_tables_omite_tablas_con_la_misma_huella(
+    mysql_generator_migra,
+):
+    """Prueba que una tabla con la misma huella se omite sin comparar \
+        sus campos."""
+    # pylint: disable=protected-access
+    parser = mysql_generator_migra.parser
+    tabla_a = "type A { id: ID! @id }\n"
+    anterior = parser.parse_esquema(tabla_a + "type B { id: ID! @id }")
+    nuevo = parser.parse_esquema(tabla_a + "type B { id: ID! @id x: Int }")
+    mysql_generator_migra._available_enums = {}
+
+    with patch.object(
+        mysql_generator_migra,
+        "_compare_fields",
+        wraps=mysql_generator_migra._compare_fields,
+    ) as mock_campos:
+        diferencias = mysql_generator_migra._compare_tables(
+            anterior.tablas,
+            nuevo.tablas,
+        )
+
+    assert list(diferencias.campos) == ["B"]
+    mock_campos.assert_called_once()
+    # pylint: enable=protected-access
+
+
 def test_diff_esquemas_relaciones_con_diferentes_on_delete(
     mysql_generator_migra,
     prev_schema_09,
@@ -456,6 +517,38 @@ def test_generar_migracion_modificar_enum(
 
     sql_generado = resultado.sql_generado
     assert "ENUM('ACTIVE', 'INACTIVE', 'PENDING')" in sql_generado
+    # el valor se agrega al final: MySQL 8 no reconstruye la tabla
+    assert "'PENDING'), ALGORITHM=INSTANT;" in sql_generado
+
+
+@pytest.mark.parametrize(
+    "valores_nuevos",
+    ["PENDING ACTIVE INACTIVE", "ACTIVE PENDING"],
+)
+def test_generar_migracion_enum_sin_algoritmo_instant(
+    mysql_generator_migra,
+    valores_nuevos,
+):
+    """Prueba que insertar o eliminar valores no usa ALGORITHM=INSTANT."""
+    esquema = """
+    enum UserStatus {{ {valores} }}
+
+    type User {{
+        id: ID! @id
+        status: UserStatus
+    }}
+    """
+
+    resultado = mysql_generator_migra.generate_migration(
+        previous_schema=esquema.format(valores="ACTIVE INACTIVE"),
+        new_schema=esquema.format(valores=valores_nuevos),
+        print_output=False,
+        print_sql=False,
+    )
+
+    sql_generado = resultado.sql_generado
+    assert "MODIFY COLUMN `status` ENUM(" in sql_generado
+    assert "ALGORITHM" not in sql_generado
 
 
 def test_generar_migracion_nuevo_enum(
@@ -532,6 +625,95 @@ def test_generar_migracion_eliminar_tablas(
     assert "DROP TABLE IF EXISTS `Post`" in sql_generado
 
 
+def test_campo_obligatorio_rellena_nulos_por_lotes(mysql_generator_migra):
+    """Prueba que al hacer obligatorio un campo con valor por defecto \
+        las filas NULL se rellenan por lotes antes del MODIFY."""
+    esquema = """
+    type User {{
+        id: ID! @id
+        nombre: String{requerido} @default(value: "anonimo")
+    }}
+    """
+
+    resultado = mysql_generator_migra.generate_migration(
+        previous_schema=esquema.format(requerido=""),
+        new_schema=esquema.format(requerido="!"),
+        print_output=False,
+        print_sql=False,
+    )
+
+    sql_generado = resultado.sql_generado
+    partes = dividir_script(sql_generado)
+    relleno = next(p for p in partes if isinstance(p, Directiva))
+    assert relleno.tipo == TIPO_RELLENO
+    assert relleno.datos == {
+        "tabla": "`User`",
+        "sentencia": "UPDATE `User` SET `nombre` = 'anonimo' "
+        "WHERE (`nombre` IS NULL) AND {rango};",
+        "clave": "`id`",
+    }
+    modificar = "ALTER TABLE `User` MODIFY COLUMN `nombre`"
+    assert partes[partes.index(relleno) + 1].startswith(modificar)
+
+
+def test_cambiar_unique_usa_el_nombre_del_generador_de_esquemas(
+    mysql_generator_migra,
+):
+    """Prueba que añadir o quitar @unique crea o elimina el indice con \
+        el nombre uk_<tabla>_<columna> sin repetirlo en el MODIFY."""
+    esquema = """
+    type User {{
+        id: ID! @id
+        email: String{email}
+        code: String{code}
+    }}
+    """
+
+    resultado = mysql_generator_migra.generate_migration(
+        previous_schema=esquema.format(email="!", code=" @unique"),
+        new_schema=esquema.format(email=" @unique", code=""),
+        print_output=False,
+        print_sql=False,
+    )
+
+    sql_generado = resultado.sql_generado
+    assert "ADD UNIQUE KEY `uk_User_email` (`email`)" in sql_generado
+    assert "DROP INDEX `uk_User_code`" in sql_generado
+    assert "VARCHAR(255) UNIQUE" not in sql_generado
+
+
+@pytest.mark.parametrize("online", [None, ModoOnline.ADVERTIR])
+def test_quitar_unique_busca_el_nombre_en_la_base_de_datos(
+    mysql_generator_migra,
+    online,
+):
+    """Prueba que quitar @unique genera una directiva con la tabla y la \
+        columna, para eliminar el indice con el nombre que tenga en un \
+        esquema creado con los nombres anteriores."""
+    esquema = "type User {{ id: ID! @id code: String{code} }}"
+
+    resultado = mysql_generator_migra.generate_migration(
+        previous_schema=esquema.format(code=" @unique"),
+        new_schema=esquema.format(code=""),
+        print_output=False,
+        print_sql=False,
+        online=online,
+    )
+
+    partes = dividir_script(resultado.sql_generado)
+    directivas = [p for p in partes if isinstance(p, Directiva)]
+    (directiva,) = [d for d in directivas if d.tipo == TIPO_ELIMINAR_UNIQUE]
+    assert directiva.datos == {
+        "tabla": "User",
+        "columna": "code",
+        "nombre": "uk_User_code",
+    }
+    assert directiva.sentencia.startswith(
+        "ALTER TABLE `User` DROP INDEX `uk_User_code`"
+    )
+    assert ("ALGORITHM=" in directiva.sentencia) == (online is not None)
+
+
 def test_generar_sql_migracion_error_metodo_privado(mysql_generator_migra):
     """Prueba manejo de errores cuando un método privado falla."""
 
@@ -583,7 +765,8 @@ def test_generar_migracion_con_directivas_avanzadas(
 
     sql_generado = resultado.sql_generado
     assert "`id` VARCHAR(25) NOT NULL PRIMARY KEY" in sql_generado
-    assert "`email` VARCHAR(255) UNIQUE" in sql_generado
+    assert "`email` VARCHAR(255)," in sql_generado
+    assert "UNIQUE KEY `uk_Employee_email` (`email`)" in sql_generado
     assert "`name` VARCHAR(255) NOT NULL DEFAULT 'emp_123'" in sql_generado
     assert "`age` INT DEFAULT 18" in sql_generado
     assert "TIVE', 'FIRED', 'CONTRACTED') DEFAULT 'CONTRACTED'" in sql_generado
@@ -0,0 +1,121 @@
+"""Tests for the MySQL online schema change mode."""
+
+import pytest
+
+from source.cli.database.directivas import dividir_script
+from source.cli.generators.migration import MySQLMigrationGenerator
+from source.cli.generators.migration.online_mysql import (
+    clause_algorithm,
+    plan_online_alter,
+    split_clauses,
+)
+from source.cli.graphql.configuracion_y_constantes import ModoOnline
+from source.cli.graphql.exceptions import MigrationError
+
+PREVIOUS = """
+type User { id: ID! @id name: String old: Int }
+type Post { id: ID! @id title: String }
+"""
+NEW = """
+type User { id: ID! @id name: String! email: String }
+type Post { id: ID! @id title: String views: Int }
+"""
+
+
+def _migrate(online, print_output=False):
+    """Generate the migration from PREVIOUS to NEW."""
+    generator = MySQLMigrationGenerator()
+    return generator.generate_migration(
+        PREVIOUS,
+        NEW,
+        print_output=print_output,
+        print_sql=False,
+        online=online,
+    ).sql_generado
+
+
+def test_split_clauses_ignores_nested_commas():
+    """Test that commas inside ENUM values or quotes are kept."""
+    body = "MODIFY COLUMN `s` ENUM('A','B') DEFAULT 'x,y',\n  DROP COLUMN `a`"
+
+    assert split_clauses(body) == [
+        "MODIFY COLUMN `s` ENUM('A','B') DEFAULT 'x,y'",
+        "DROP COLUMN `a`",
+    ]
+
+
+@pytest.mark.parametrize(
+    "clause, algorithm",
+    [
+        ("ADD COLUMN `a` INT", "INSTANT"),
+        ("DROP COLUMN `a`", "INSTANT"),
+        ("RENAME COLUMN `a` TO `b`", "INSTANT"),
+        ("ADD COLUMN `a` VARCHAR(255) UNIQUE", "INPLACE"),
+        ("DROP FOREIGN KEY `fk`", "INPLACE"),
+        ("ADD COLUMN `n` INT AUTO_INCREMENT", "COPY"),
+        ("MODIFY COLUMN `a` INT NOT NULL", "COPY"),
+    ],
+)
+def test_clause_algorithm(clause, algorithm):
+    """Test the algorithm chosen for each kind of clause."""
+    assert clause_algorithm(clause) == algorithm
+
+
+def test_statement_uses_its_most_expensive_clause():
+    """Test that INPLACE statements also forbid locking the table."""
+    alter = plan_online_alter(
+        "ALTER TABLE `t` ADD COLUMN `a` INT, DROP FOREIGN KEY `fk`;"
+    )
+
+    assert alter.render() == (
+        "ALTER TABLE `t`\n  ADD COLUMN `a` INT,\n  DROP FOREIGN KEY `fk`,"
+        "\n  ALGORITHM=INPLACE,\n  LOCK=NONE;"
+    )
+
+
+def test_statements_with_algorithm_are_kept():
+    """Test that an ALTER that already chooses its algorithm (enum \
+        widening) and other statements are not planned."""
+    tagged = "ALTER TABLE t ADD x INT, ALGORITHM=COPY;"
+    assert plan_online_alter(tagged) is None
+    assert plan_online_alter("DROP TABLE IF EXISTS `t`;") is None
+
+
+def test_without_online_mode_statements_are_untouched():
+    """Test that the default migration has no ALGORITHM clauses."""
+    assert "ALGORITHM" not in _migrate(None)
+
+
+def test_warn_mode_tags_every_alter(capsys):
+    """Test that every ALTER gets its algorithm and the copy is warned."""
+    sql = _migrate(ModoOnline.ADVERTIR, print_output=True)
+
+    instant = "ALTER TABLE `Post` ADD COLUMN `views` INT, ALGORITHM=INSTANT;"
+    assert instant in sql
+    assert "ALGORITHM=COPY,\n  LOCK=SHARED;" in sql
+    assert "ALTER TABLE `User` copies the table" in capsys.readouterr().out
+
+
+def test_refuse_mode_lists_blocking_statements():
+    """Test that the migration is refused when a table is copied."""
+    with pytest.raises(MigrationError) as exc_info:
+        _migrate(ModoOnline.RECHAZAR)
+
+    assert "MODIFY COLUMN `name`" in str(exc_info.value)
+    assert "Post" not in str(exc_info.value)
+
+
+def test_shadow_mode_marks_the_table_copy():
+    """Test that the copy is marked with a directive that keeps the \
+        equivalent ALTER TABLE for other SQL clients."""
+    sql = _migrate(ModoOnline.TABLA_SOMBRA)
+
+    parts = dividir_script(sql)
+    directives = [part for part in parts if not isinstance(part, str)]
+    assert len(directives) == 1
+    directive = directives[0]
+    assert directive.datos["tabla"] == "User"
+    assert "MODIFY COLUMN `name` VARCHAR(255) NOT NULL" in (
+        directive.datos["alteraciones"]
+    )
+    assert directive.sentencia.endswith("ALGORITHM=COPY,\n  LOCK=SHARED;")
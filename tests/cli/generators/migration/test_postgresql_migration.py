@@ -2,12 +2,21 @@
 
 from unittest.mock import patch
 import pytest
+from source.cli.database.directivas import (
+    TIPO_ELIMINAR_UNIQUE,
+    TIPO_RELLENO,
+    TIPO_SIN_TRANSACCION,
+    Directiva,
+    dividir_script,
+)
+from source.cli.database.tokenizador_sql import DIALECTO_POSTGRESQL
 from source.cli.graphql.configuracion_y_constantes import (
     InfoDiffCampos,
     InfoDiffEsquema,
     InfoDirectiva,
     InfoField,
     InfoMigracion,
+    ModoOnline,
     OnDelete,
     TipoLink,
     TipoRelacion,
@@ -82,7 +91,11 @@ def test_generar_migracion_exitosa(
     assert "CREATE TABLE" in resultado.sql_generado
     assert resultado.id_migracion.startswith("migration_")
 
-    mock_diff_esquemas.assert_called_once_with(prev_schema_01, new_schema_01)
+    # los esquemas llegan envueltos en su pipeline de parseo
+    mock_diff_esquemas.assert_called_once()
+    anterior, nuevo = mock_diff_esquemas.call_args.args
+    assert anterior.esquema == prev_schema_01
+    assert nuevo.esquema == new_schema_01
     mock_generar_sql.assert_called_once_with(simple_differences)
 
     assert mock_print.call_count == 3
@@ -440,11 +453,154 @@ def test_generar_migracion_modificar_enum(
     assert cambio_enum.valores_nuevos == ["ACTIVE", "INACTIVE", "PENDING"]
 
     sql_generado = resultado.sql_generado
-    # PostgreSQL usa un proceso más complejo para modificar enums
+    # si solo se agregan valores, el tipo se amplia sin reescribir la tabla
+    assert (
+        "ALTER TYPE UserStatus_enum ADD VALUE IF NOT EXISTS 'PENDING' "
+        "AFTER 'INACTIVE';"
+    ) in sql_generado
+    assert "CREATE TYPE UserStatus_enum_new" not in sql_generado
+    assert "UPDATE" not in sql_generado
+
+
+@pytest.mark.parametrize(
+    "valores_nuevos, esperado",
+    [
+        (
+            "PENDING ACTIVE INACTIVE",
+            ["'PENDING' BEFORE 'ACTIVE'"],
+        ),
+        (
+            "ACTIVE BLOCKED DELETED INACTIVE",
+            ["'BLOCKED' AFTER 'ACTIVE'", "'DELETED' AFTER 'BLOCKED'"],
+        ),
+        (
+            # el primer valor nuevo se ancla en un valor que ya existe
+            "NEW PENDING ACTIVE INACTIVE",
+            ["'NEW' BEFORE 'ACTIVE'", "'PENDING' AFTER 'NEW'"],
+        ),
+    ],
+)
+def test_generar_migracion_agregar_valores_enum_en_posicion(
+    pg_generator_migra,
+    valores_nuevos,
+    esperado,
+):
+    """Prueba que los valores nuevos se agregan en su posicion."""
+    esquema = """
+    enum UserStatus {{ {valores} }}
+
+    type User {{
+        id: ID! @id
+        status: UserStatus
+    }}
+    """
+
+    resultado = pg_generator_migra.generate_migration(
+        previous_schema=esquema.format(valores="ACTIVE INACTIVE"),
+        new_schema=esquema.format(valores=valores_nuevos),
+        print_output=False,
+        print_sql=False,
+    )
+
+    sql_generado = resultado.sql_generado
+    posiciones = []
+    for valor in esperado:
+        sentencia = f"ADD VALUE IF NOT EXISTS {valor};"
+        assert sentencia in sql_generado
+        posiciones.append(sql_generado.index(sentencia))
+    # cada ancla existe cuando se ejecuta la sentencia que la usa
+    assert posiciones == sorted(posiciones)
+    assert "_enum_new" not in sql_generado
+
+
+def test_agregar_valores_enum_fuera_de_transaccion_sin_online(
+    pg_generator_migra,
+):
+    """Prueba que ADD VALUE se marca para ejecutarse fuera de la \
+        transaccion aunque no se use el modo online."""
+    esquema = """
+    enum UserStatus {{ {valores} }}
+
+    type User {{
+        id: ID! @id
+        status: UserStatus
+    }}
+    """
+
+    resultado = pg_generator_migra.generate_migration(
+        previous_schema=esquema.format(valores="ACTIVE"),
+        new_schema=esquema.format(valores="ACTIVE PENDING"),
+        print_output=False,
+        print_sql=False,
+    )
+
+    partes = dividir_script(resultado.sql_generado, DIALECTO_POSTGRESQL)
+    directivas = [p for p in partes if isinstance(p, Directiva)]
+    assert [d.tipo for d in directivas] == [TIPO_SIN_TRANSACCION]
+    assert "ADD VALUE IF NOT EXISTS 'PENDING'" in directivas[0].sentencia
+
+
+def test_generar_migracion_reordenar_enum(pg_generator_migra):
+    """Prueba que reordenar los valores reescribe la columna."""
+    esquema = """
+    enum UserStatus {{ {valores} }}
+
+    type User {{
+        id: ID! @id
+        status: UserStatus
+    }}
+    """
+
+    resultado = pg_generator_migra.generate_migration(
+        previous_schema=esquema.format(valores="ACTIVE INACTIVE"),
+        new_schema=esquema.format(valores="INACTIVE ACTIVE"),
+        print_output=False,
+        print_sql=False,
+    )
+
+    cambio_enum = resultado.diferencias.enums.modificados[0]
+    assert not cambio_enum.valores_agregados
+    assert not cambio_enum.valores_eliminados
+    # PostgreSQL no puede reordenar un enum: se crea un tipo nuevo
+    sql_generado = resultado.sql_generado
     assert "CREATE TYPE UserStatus_enum_new" in sql_generado
     assert "RENAME TO UserStatus_enum" in sql_generado
 
 
+def test_reescritura_enum_copia_la_columna_por_lotes(pg_generator_migra):
+    """Prueba que la copia de la columna al reescribir un enum se \
+        marca para aplicarse por rangos de clave."""
+    esquema = """
+    enum UserStatus {{ {valores} }}
+
+    type User {{
+        id: ID! @id
+        status: UserStatus!
+    }}
+    """
+
+    resultado = pg_generator_migra.generate_migration(
+        previous_schema=esquema.format(valores="ACTIVE INACTIVE"),
+        new_schema=esquema.format(valores="INACTIVE ACTIVE"),
+        print_output=False,
+        print_sql=False,
+    )
+
+    partes = dividir_script(resultado.sql_generado, DIALECTO_POSTGRESQL)
+    directivas = [parte for parte in partes if isinstance(parte, Directiva)]
+    assert len(directivas) == 1
+    relleno = directivas[0]
+    assert relleno.tipo == TIPO_RELLENO
+    assert relleno.datos["sentencia"] == (
+        "UPDATE User SET status_new = status::UserStatus_enum_new "
+        "WHERE (status IS NOT NULL) AND {rango};"
+    )
+    assert relleno.sentencia == (
+        "UPDATE User SET status_new = status::UserStatus_enum_new "
+        "WHERE status IS NOT NULL;"
+    )
+
+
 def test_generar_migracion_nuevo_enum(
     pg_generator_migra,
     prev_schema_14,
@@ -576,7 +732,8 @@ def test_generar_migracion_con_directivas_avanzadas(
     sql_generado = resultado.sql_generado
     # PostgreSQL debería agregar ID automáticamente
     assert "id VARCHAR(25) NOT NULL PRIMARY KEY" in sql_generado
-    assert "email VARCHAR(255) UNIQUE" in sql_generado
+    assert "email VARCHAR(255)," in sql_generado
+    assert "CONSTRAINT uk_Employee_email UNIQUE (email)" in sql_generado
     assert "name VARCHAR(255) NOT NULL DEFAULT 'emp_123'" in sql_generado
     assert "age INT DEFAULT 18" in sql_generado
     assert "status EmployeeStatus_enum DEFAULT 'CONTRACTED'" in sql_generado
@@ -781,5 +938,140 @@ def test_generate_migration_change_unique_constraint(
         )
 
     sql_generado = resultado.sql_generado
-    assert "ADD CONSTRAINT token_unique UNIQUE (token)" in sql_generado
-    assert "DROP CONSTRAINT IF EXISTS code_unique" in sql_generado
+    assert "ADD CONSTRAINT uk_User_token UNIQUE (token)" in sql_generado
+    assert "DROP CONSTRAINT IF EXISTS uk_User_code" in sql_generado
+
+
+def test_drop_unique_looks_up_the_name_in_the_database(
+    pg_generator_migra,
+    prev_schema_22,
+    new_schema_22,
+):
+    """Test that removing @unique emits a directive with the table and \
+        the column, so a schema created with the old constraint names \
+        drops the constraint it actually has."""
+    resultado = pg_generator_migra.generate_migration(
+        previous_schema=prev_schema_22,
+        new_schema=new_schema_22,
+        print_output=False,
+        print_sql=False,
+    )
+
+    partes = dividir_script(resultado.sql_generado, DIALECTO_POSTGRESQL)
+    directivas = [p for p in partes if isinstance(p, Directiva)]
+    directivas = [d for d in directivas if d.tipo == TIPO_ELIMINAR_UNIQUE]
+    assert directivas == [
+        Directiva(
+            TIPO_ELIMINAR_UNIQUE,
+            {"tabla": "User", "columna": "code", "nombre": "uk_User_code"},
+            "ALTER TABLE User DROP CONSTRAINT IF EXISTS uk_User_code;",
+        )
+    ]
+
+
+def test_online_unique_constraint_built_concurrently(
+    pg_generator_migra,
+    prev_schema_22,
+    new_schema_22,
+):
+    """Test that the online mode builds the unique index concurrently, \
+        outside the transaction and after dropping an INVALID leftover, \
+        and then attaches it."""
+    resultado = pg_generator_migra.generate_migration(
+        previous_schema=prev_schema_22,
+        new_schema=new_schema_22,
+        print_output=False,
+        print_sql=False,
+        online=ModoOnline.ADVERTIR,
+    )
+
+    partes = dividir_script(resultado.sql_generado, DIALECTO_POSTGRESQL)
+    directivas = [p for p in partes if isinstance(p, Directiva)]
+    directivas = [d for d in directivas if d.tipo == TIPO_SIN_TRANSACCION]
+    assert [d.sentencia for d in directivas] == [
+        "DROP INDEX CONCURRENTLY IF EXISTS uk_User_token;",
+        'CREATE UNIQUE INDEX CONCURRENTLY uk_User_token ON "User" (token);',
+    ]
+    assert all(d.tipo == TIPO_SIN_TRANSACCION for d in directivas)
+    sentencias = [p for p in partes if isinstance(p, str)]
+    adjuntar = (
+        'ALTER TABLE "User" ADD CONSTRAINT uk_User_token '
+        "UNIQUE USING INDEX uk_User_token"
+    )
+    assert any(adjuntar in sentencia for sentencia in sentencias)
+    assert "UNIQUE (token)" not in resultado.sql_generado
+
+
+def test_online_foreign_key_validated_separately(pg_generator_migra):
+    """Test that the online mode adds the foreign key NOT VALID and \
+        validates it in its own transaction."""
+    anterior = "type User { id: ID! @id }\ntype Post { id: ID! @id }"
+    nuevo = (
+        'type User { id: ID! @id posts: [Post!]! @relation(name: "UP") }\n'
+        'type Post { id: ID! @id author: User @relation(name: "UP") }'
+    )
+
+    resultado = pg_generator_migra.generate_migration(
+        previous_schema=anterior,
+        new_schema=nuevo,
+        print_output=False,
+        print_sql=False,
+        online=ModoOnline.ADVERTIR,
+    )
+
+    partes = dividir_script(resultado.sql_generado, DIALECTO_POSTGRESQL)
+    sentencias = [p for p in partes if isinstance(p, str)]
+    agregar = [s for s in sentencias if "FOREIGN KEY" in s]
+    assert len(agregar) == 1
+    assert agregar[0].startswith('ALTER TABLE "Post"')
+    assert agregar[0].endswith("ON DELETE SET NULL NOT VALID;")
+    constraint = agregar[0].split("ADD CONSTRAINT ")[1].split(" ")[0]
+    validar = f'ALTER TABLE "Post" VALIDATE CONSTRAINT {constraint};'
+    assert partes[-1] == Directiva(TIPO_SIN_TRANSACCION, {}, validar)
+
+
+def test_online_unique_foreign_key_quotes_the_table(pg_generator_migra):
+    """Test that the unique index of a one to one foreign key is built \
+        on the quoted table and named after the bare table."""
+    anterior = "type User { id: ID! @id }\ntype Profile { id: ID! @id }"
+    nuevo = (
+        "type User { id: ID! @id "
+        'profile: Profile @relation(name: "UP", link: INLINE) }\n'
+        'type Profile { id: ID! @id user: User! @relation(name: "UP") }'
+    )
+
+    resultado = pg_generator_migra.generate_migration(
+        previous_schema=anterior,
+        new_schema=nuevo,
+        print_output=False,
+        print_sql=False,
+        online=ModoOnline.ADVERTIR,
+    )
+
+    sql_generado = resultado.sql_generado
+    assert (
+        "CREATE UNIQUE INDEX CONCURRENTLY uk_Profile_profile_id "
+        'ON "Profile" (profile_id);'
+    ) in sql_generado
+    assert 'ALTER TABLE "Profile"\n  ADD CONSTRAINT uk_Profile_profile_id' in (
+        sql_generado
+    )
+    assert 'uk_"' not in sql_generado
+
+
+def test_online_refuses_type_rewrite(pg_generator_migra):
+    """Test that a column type change is refused because it rewrites \
+        the table under an exclusive lock."""
+    anterior = "type User { id: ID! @id age: String }"
+    nuevo = "type User { id: ID! @id age: Int }"
+
+    with pytest.raises(MigrationError) as exc_info:
+        pg_generator_migra.generate_migration(
+            previous_schema=anterior,
+            new_schema=nuevo,
+            print_output=False,
+            print_sql=False,
+            online=ModoOnline.RECHAZAR,
+        )
+
+    assert "ALTER COLUMN age TYPE INT" in str(exc_info.value)
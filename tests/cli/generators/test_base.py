@@ -62,6 +62,12 @@ class ConcreteSchemaGenerator(BaseSchemaGenerator):
     def get_database_type(self) -> DatabaseType:
         return DatabaseType.MYSQL
 
+    def get_foreign_key_column(self, foreign_key) -> str:
+        return f"`{foreign_key.field_fk}` VARCHAR(25)"
+
+    def get_foreign_key_constraint(self, foreign_key) -> str:
+        return f"FOREIGN KEY (`{foreign_key.field_fk}`)"
+
     def _generate_tables(
         self,
         tables: Dict[str, InfoTabla],
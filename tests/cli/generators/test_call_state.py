@@ -0,0 +1,135 @@
+"""Tests for the per-call state of the generators."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from source.cli.generators.migration import MySQLMigrationGenerator
+from source.cli.generators.mysql_generator import GeneratorSchemaMySQL
+from source.cli.graphql import PipelineEsquema
+
+SCHEMA_PREVIOUS = """
+type User {
+    id: ID! @id
+    email: String! @unique
+}
+"""
+
+SCHEMA_NEW = """
+type User {
+    id: ID! @id
+    email: String! @unique
+    groups: [Group] @relation(name: "UserGroups", link: TABLE)
+}
+
+type Group {
+    id: ID! @id
+    name: String! @unique
+    users: [User] @relation(name: "UserGroups", link: TABLE)
+}
+"""
+
+
+def build_schema(num_types: int) -> str:
+    """Build a schema with ``num_types`` types with a unique field."""
+    return "\n".join(
+        f"type T{num_types}x{i} {{ id: ID! @id code: String! @unique }}"
+        for i in range(num_types)
+    )
+
+
+@pytest.fixture(name="generate")
+def fix_generate():
+    """Fixture that generates a schema with a given generator."""
+
+    def generate(generator: GeneratorSchemaMySQL, schema: str) -> str:
+        pipeline = PipelineEsquema(schema)
+        return generator.generate_schema(
+            pipeline.info.tablas,
+            pipeline.info.enums,
+            pipeline.relaciones,
+            print_output=False,
+            print_sql=False,
+        )
+
+    return generate
+
+
+def test_reused_generator_does_not_accumulate(generate):
+    """Test that schema_sql only holds the tables of the last call."""
+    generator = GeneratorSchemaMySQL()
+
+    generate(generator, build_schema(3))
+    generate(generator, build_schema(2))
+
+    assert len(generator.schema_sql) == 2
+    assert "T3x" not in generator.get_schema_sql()
+
+
+def test_concurrent_calls_share_one_instance(generate):
+    """Test that one instance serves concurrent generate_schema calls."""
+    schemas = [build_schema(n) for n in range(1, 9)]
+    expected = [generate(GeneratorSchemaMySQL(), s) for s in schemas]
+
+    generator = GeneratorSchemaMySQL()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(
+            pool.map(lambda schema: generate(generator, schema), schemas * 4)
+        )
+
+    assert results == expected * 4
+
+
+def test_interleaved_streams():
+    """Test that two streams of the same instance do not mix state."""
+    generator = GeneratorSchemaMySQL()
+    first = PipelineEsquema(build_schema(3))
+    second = PipelineEsquema(build_schema(3))
+
+    streams = [
+        generator.generate_schema_stream(
+            p.info.tablas, p.info.enums, p.relaciones, False, False
+        )
+        for p in (first, second)
+    ]
+    statements = [[], []]
+    for _ in range(3):
+        for index, stream in enumerate(streams):
+            statements[index].append(next(stream))
+
+    assert statements[0] == statements[1]
+    assert not generator.schema_sql
+
+
+def test_migration_generator_is_reentrant():
+    """Test that a reused migration generator repeats its SQL."""
+    generator = MySQLMigrationGenerator()
+
+    sql = []
+    for _ in range(2):
+        migration = generator.generate_migration(
+            SCHEMA_PREVIOUS,
+            SCHEMA_NEW,
+            migration_id="m",
+            print_output=False,
+            print_sql=False,
+        )
+        # the header carries the generation date
+        sql.append(migration.sql_generado.split("-- Database Type")[1])
+
+    assert "CREATE TABLE" in sql[0]
+    assert sql[0] == sql[1]
+
+
+def test_migration_sql_from_differences_of_another_call():
+    """Test that the differences carry the context to generate SQL."""
+    generator = MySQLMigrationGenerator()
+    generator.print_output = False
+
+    differences = generator.diff_schemas(SCHEMA_PREVIOUS, SCHEMA_NEW)
+    # another diff replaces the state of this thread
+    generator.diff_schemas(SCHEMA_NEW, SCHEMA_PREVIOUS)
+
+    sql = generator.generate_sql_migration(differences)
+
+    assert "UserGroups" in sql
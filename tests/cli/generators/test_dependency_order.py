@@ -0,0 +1,153 @@
+"""Tests for the dependency-ordered DDL with inline foreign keys."""
+
+import pytest
+
+from source.cli.generators.dependency_order import (
+    InlineForeignKey,
+    order_tables,
+)
+from source.cli.generators.mysql_generator import GeneratorSchemaMySQL
+from source.cli.generators.postgresql_generator import (
+    GeneratorSchemaPostgreSQL,
+)
+from source.cli.graphql import PipelineEsquema
+
+SCHEMA_ACYCLIC = """
+type Post {
+    id: ID! @id
+    author: User! @relation(name: "UserPosts")
+    tags: [Tag] @relation(name: "PostTags", link: TABLE)
+}
+
+type User {
+    id: ID! @id
+    email: String! @unique
+    posts: [Post] @relation(name: "UserPosts")
+}
+
+type Tag {
+    id: ID! @id
+    posts: [Post] @relation(name: "PostTags", link: TABLE)
+}
+"""
+
+SCHEMA_CYCLE = """
+type Team {
+    id: ID! @id
+    captain: Player @relation(name: "TeamCaptain")
+}
+
+type Player {
+    id: ID! @id
+    team: Team @relation(name: "PlayerTeam")
+    parent: Player @relation(name: "PlayerParent")
+}
+"""
+
+
+def foreign_key(table_fk: str, table_ref: str) -> InlineForeignKey:
+    """Build a foreign key from ``table_fk`` to ``table_ref``."""
+    return InlineForeignKey(
+        table_fk=table_fk,
+        field_fk=table_ref.lower(),
+        unique="",
+        constraint=f"fk_{table_fk}_{table_ref}",
+        table_ref=table_ref,
+        on_delete=" ON DELETE SET NULL",
+        is_null="",
+    )
+
+
+@pytest.fixture(name="generate")
+def fix_generate():
+    """Fixture that generates a schema in dependency order."""
+
+    def generate(generator, schema: str) -> str:
+        pipeline = PipelineEsquema(schema)
+        return generator.generate_schema(
+            pipeline.info.tablas,
+            pipeline.info.enums,
+            pipeline.relaciones,
+            print_output=False,
+            print_sql=False,
+            inline_foreign_keys=True,
+        )
+
+    return generate
+
+
+def test_order_tables_referenced_first():
+    """Test that referenced tables come before the tables using them."""
+    order = order_tables(
+        ["Comment", "Post", "User", "Tag"],
+        [foreign_key("Comment", "Post"), foreign_key("Post", "User")],
+    )
+
+    assert order.index("User") < order.index("Post") < order.index("Comment")
+    assert sorted(order) == ["Comment", "Post", "Tag", "User"]
+
+
+def test_order_tables_breaks_cycles_in_schema_order():
+    """Test that a cycle is broken with its first table in schema order \
+        once the independent tables are created."""
+    order = order_tables(
+        ["A", "B", "C"],
+        [
+            foreign_key("A", "B"),
+            foreign_key("B", "A"),
+            foreign_key("C", "C"),
+        ],
+    )
+
+    # the self reference of C does not block it
+    assert order == ["C", "A", "B"]
+
+
+def test_order_tables_long_chain_declared_backwards():
+    """Test that a long chain declared from its last table is sorted \
+        without rescanning the pending tables."""
+    names = [f"T{index}" for index in range(2000)]
+    # each table references the next one
+    fks = [foreign_key(a, b) for a, b in zip(names, names[1:])]
+
+    assert order_tables(names, fks) == names[::-1]
+
+
+@pytest.mark.parametrize(
+    "generator", [GeneratorSchemaMySQL(), GeneratorSchemaPostgreSQL()]
+)
+def test_acyclic_schema_has_no_alter(generate, generator):
+    """Test that an acyclic schema folds every foreign key."""
+    sql = generate(generator, SCHEMA_ACYCLIC)
+
+    assert "ALTER TABLE" not in sql
+    assert sql.count("FOREIGN KEY") == 3
+    # the users table is created before the posts referencing it
+    assert sql.index("User") < sql.index("author_id")
+
+
+def test_cycle_falls_back_to_alter(generate):
+    """Test that only the foreign key closing a cycle uses ALTER."""
+    sql = generate(GeneratorSchemaMySQL(), SCHEMA_CYCLE)
+
+    assert sql.count("ALTER TABLE") == 1
+    # the self reference stays inside CREATE TABLE
+    create_player = sql.split("CREATE TABLE Player")[1].split(";")[0]
+    assert "`parent_id`" in create_player
+
+
+def test_stream_matches_generate_schema(generate):
+    """Test that the ordered stream yields the same statements."""
+    generator = GeneratorSchemaMySQL()
+    pipeline = PipelineEsquema(SCHEMA_CYCLE)
+
+    statements = generator.generate_schema_stream(
+        pipeline.info.tablas,
+        pipeline.info.enums,
+        pipeline.relaciones,
+        print_output=False,
+        print_sql=False,
+        inline_foreign_keys=True,
+    )
+
+    assert "\n\n".join(statements) == generate(generator, SCHEMA_CYCLE)
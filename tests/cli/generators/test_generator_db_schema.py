@@ -143,6 +143,7 @@ class TestGeneratorDBSchema:
                 relationships=mock_relationships,
                 print_output=True,
                 print_sql=False,
+                inline_foreign_keys=False,
             )
 
             # Verify result is correctly returned
@@ -128,6 +128,32 @@ class TestGeneratorDBSchemaIntegration:
         assert "ENGINE=InnoDB DEFAULT CHARSET=utf8mb4" in schema_sql
         assert "FOREIGN KEY" in schema_sql
 
+    @pytest.mark.parametrize(
+        "db_type",
+        [DatabaseType.MYSQL, DatabaseType.POSTGRESQL],
+    )
+    def test_schema_stream_matches_generate_schema(self, sample_data, db_type):
+        """Test that streaming yields the same statements one by one."""
+        tables, enums, relationships = sample_data
+
+        schema_sql = GeneratorDBSchema(db_type).generate_schema(
+            tables, enums, relationships, print_output=False, print_sql=False
+        )
+
+        generator = GeneratorDBSchema(db_type)
+        stream = generator.generate_schema_stream(
+            tables, enums, relationships, print_output=False, print_sql=False
+        )
+
+        # nothing is generated until the stream is consumed
+        assert generator.schema_sql == []
+
+        statements = list(stream)
+        assert len(statements) > 1
+        assert "\n\n".join(statements) == schema_sql
+        # the streamed tables are not kept in memory
+        assert generator.schema_sql == []
+
     # def test_postgresql_generator_creates_valid_schema(self, sample_data):
     #     """Test that the PostgreSQL generator creates a valid schema."""
     #     tables, enums, relationships = sample_data
@@ -225,7 +225,7 @@ def test_generar_esquema_con_directivas_avanzadas(
     assert "`name` VARCHAR(255) NOT NULL DEFAULT 'Anonymous'" in sql
     assert "`hashtags` JSON NOT NULL" in sql
     assert "`age` INT DEFAULT 18" in sql
-    assert "UNIQUE KEY `uk_email` (`email`)" in sql
+    assert "UNIQUE KEY `uk_User_email` (`email`)" in sql
     assert mock_print.called
 
 
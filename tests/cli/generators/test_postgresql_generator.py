@@ -100,7 +100,7 @@ def test_generate_schema_with_advanced_directives(
     assert "name VARCHAR(255) NOT NULL DEFAULT 'Anonymous'" in sql
     assert "hashtags JSONB NOT NULL" in sql
     assert "age INTEGER DEFAULT 18" in sql
-    assert "CONSTRAINT uk_email UNIQUE (email)" in sql
+    assert "CONSTRAINT uk_User_email UNIQUE (email)" in sql
     assert mock_print.called
 
 
@@ -301,3 +301,37 @@ def test_generar_esquema_oto(
         "ADD CONSTRAINT fk_User_profile_Profile FOREIGN KEY (user_id) "
         'REFERENCES "User"(id) ON DELETE CASCADE;'
     ) in sql
+
+
+def test_nombres_unique_sin_colisiones(generator_postgres):
+    """Prueba que los nombres de constraints unique no colisionan \
+        entre tablas y respetan la longitud maxima."""
+    columna = "correo_electronico_" + "x" * 60
+    campo = InfoField(
+        nombre=columna,
+        tipo_campo=TipoField.STRING.value,
+        es_lista=False,
+        es_requerido=True,
+        directivas={"unique": InfoDirectiva(nombre="unique", argumentos={})},
+    )
+    tablas = {
+        nombre: InfoTabla(nombre=nombre, campos={columna: campo})
+        for nombre in ("User", "Admin")
+    }
+
+    sql = generator_postgres.generate_schema(
+        tables=tablas,
+        enums={},
+        relationships=[],
+        print_output=False,
+        print_sql=False,
+    )
+
+    nombres = [
+        linea.split()[1]
+        for linea in sql.splitlines()
+        if linea.strip().startswith("CONSTRAINT")
+    ]
+    assert len(nombres) == 2
+    assert len(set(nombres)) == 2
+    assert all(len(nombre) <= 63 for nombre in nombres)
@@ -0,0 +1,148 @@
+"""Pruebas para CacheParseEsquema"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from source.cli.graphql import ParserGraphQLEsquema
+from source.cli.graphql.cache_esquema import (
+    CacheParseEsquema,
+    deserializar_info_parse,
+    serializar_info_parse,
+)
+
+
+@pytest.fixture(name="esquema")
+def fixture_esquema():
+    """Fixture con un esquema GraphQL con enums, directivas y relaciones."""
+    return """
+    type User {
+        id: ID! @id
+        name: String! @unique
+        role: UserRole @default(value: "USER")
+        posts: [Post] @relation(name: "UserPosts", onDelete: CASCADE)
+    }
+
+    type Post {
+        id: ID! @id
+        author: User @relation(name: "UserPosts")
+    }
+
+    enum UserRole {
+        ADMIN
+        USER
+    }
+    """
+
+
+@pytest.fixture(name="cache")
+def fixture_cache(tmp_path):
+    """Fixture que proporciona una cache en un directorio temporal."""
+    return CacheParseEsquema(tmp_path / "cache", max_entradas=2)
+
+
+def test_serializacion_ida_y_vuelta(esquema):
+    """Prueba que serializar y deserializar conserva la informacion."""
+    info = ParserGraphQLEsquema().parse_esquema(esquema)
+
+    info_cacheada = deserializar_info_parse(serializar_info_parse(info))
+
+    assert info_cacheada == info
+    # las huellas se guardan con el esquema y no se recalculan
+    assert info_cacheada.huella == info.huella
+    for nombre, tabla in info.tablas.items():
+        tabla_cacheada = info_cacheada.tablas[nombre]
+        assert tabla_cacheada.huella == tabla.huella
+        assert [c.huella for c in tabla_cacheada.campos.values()] == [
+            c.huella for c in tabla.campos.values()
+        ]
+
+
+def test_obtener_sin_entrada_devuelve_none(cache, esquema):
+    """Prueba que una cache vacia no devuelve resultados."""
+    assert cache.obtener(esquema) is None
+
+
+def test_parser_guarda_y_reutiliza_cache(cache, esquema):
+    """Prueba que el parser no vuelve a parsear un esquema cacheado."""
+    parser = ParserGraphQLEsquema(cache=cache)
+    info = parser.parse_esquema(esquema)
+
+    assert cache.obtener(esquema) == info
+
+    with patch("source.cli.graphql.parser.parse") as mock_parse:
+        info_cacheada = parser.parse_esquema(esquema)
+
+    mock_parse.assert_not_called()
+    assert info_cacheada == info
+
+
+def test_clave_depende_del_texto(esquema):
+    """Prueba que esquemas distintos generan claves distintas."""
+    clave = CacheParseEsquema.calcular_clave(esquema)
+
+    assert clave == CacheParseEsquema.calcular_clave(esquema)
+    assert clave != CacheParseEsquema.calcular_clave(esquema + " ")
+
+
+def test_desaloja_entrada_menos_usada(cache):
+    """Prueba que se desaloja la entrada menos usada recientemente."""
+    parser = ParserGraphQLEsquema(cache=cache)
+    esquemas = [f"type T{i} {{ id: ID! }}" for i in range(3)]
+
+    parser.parse_esquema(esquemas[0])
+    parser.parse_esquema(esquemas[1])
+
+    # envejecer la primera entrada y usarla para que pase a ser la mas
+    # reciente, dejando la segunda como candidata a desalojo
+    for i, esquema in enumerate(esquemas[:2]):
+        ruta = cache.directorio / f"{cache.calcular_clave(esquema)}.json"
+        os.utime(ruta, (1000 + i, 1000 + i))
+    assert cache.obtener(esquemas[0]) is not None
+
+    parser.parse_esquema(esquemas[2])
+
+    assert len(list(cache.directorio.glob("*.json"))) == 2
+    assert cache.obtener(esquemas[0]) is not None
+    assert cache.obtener(esquemas[1]) is None
+    assert cache.obtener(esquemas[2]) is not None
+
+
+def test_desaloja_por_tamano(tmp_path, esquema):
+    """Prueba que la cache respeta el tamaño maximo en bytes."""
+    cache = CacheParseEsquema(tmp_path / "cache", max_bytes=1)
+    ParserGraphQLEsquema(cache=cache).parse_esquema(esquema)
+
+    assert not list(cache.directorio.glob("*.json"))
+
+
+def test_entrada_corrupta_es_fallo_de_cache(cache, esquema):
+    """Prueba que una entrada corrupta se ignora."""
+    cache.directorio.mkdir(parents=True)
+    ruta = cache.directorio / f"{cache.calcular_clave(esquema)}.json"
+    ruta.write_text("{no es json", encoding="utf-8")
+
+    assert cache.obtener(esquema) is None
+
+    info = ParserGraphQLEsquema(cache=cache).parse_esquema(esquema)
+    assert cache.obtener(esquema) == info
+
+
+def test_error_de_escritura_no_rompe_el_parseo(tmp_path, esquema):
+    """Prueba que un error al escribir la cache no afecta al parseo."""
+    archivo = tmp_path / "archivo"
+    archivo.write_text("", encoding="utf-8")
+    cache = CacheParseEsquema(archivo / "cache")
+
+    info = ParserGraphQLEsquema(cache=cache).parse_esquema(esquema)
+
+    assert "User" in info.tablas
+
+
+def test_limpiar(cache, esquema):
+    """Prueba que limpiar elimina todas las entradas."""
+    ParserGraphQLEsquema(cache=cache).parse_esquema(esquema)
+    cache.limpiar()
+
+    assert cache.obtener(esquema) is None
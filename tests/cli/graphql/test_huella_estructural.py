@@ -0,0 +1,83 @@
+"""Pruebas para las huellas estructurales del esquema parseado"""
+
+import pytest
+
+from source.cli.graphql import ParserGraphQLEsquema
+
+
+@pytest.fixture(name="parser")
+def fix_parser():
+    """Fixture que proporciona una instancia del parser."""
+    return ParserGraphQLEsquema()
+
+
+ESQUEMA = """
+type User {
+    id: ID! @id
+    name: String! @unique
+    role: UserRole @default(value: "USER")
+}
+
+type Post {
+    id: ID! @id
+    title: String
+}
+
+enum UserRole {
+    ADMIN
+    USER
+}
+"""
+
+
+def test_huellas_calculadas_al_parsear(parser):
+    """Prueba que el parser calcula la huella de cada campo, tabla y \
+        del esquema."""
+    info = parser.parse_esquema(ESQUEMA)
+
+    assert info.huella
+    assert all(tabla.huella for tabla in info.tablas.values())
+    campos = info.tablas["User"].campos.values()
+    assert len({campo.huella for campo in campos}) == 3
+
+
+def test_huella_no_depende_del_orden_de_los_campos(parser):
+    """Prueba que reordenar los campos no cambia las huellas, igual \
+        que la comparacion de campos."""
+    reordenado = ESQUEMA.replace(
+        "id: ID! @id\n    name: String! @unique",
+        "name: String! @unique\n    id: ID! @id",
+    )
+    info = parser.parse_esquema(ESQUEMA)
+    info_reordenado = parser.parse_esquema(reordenado)
+
+    huella_user = info.tablas["User"].huella
+    assert info_reordenado.tablas["User"].huella == huella_user
+    assert info_reordenado.huella == info.huella
+
+
+def test_cambio_de_directiva_cambia_campo_tabla_y_esquema(parser):
+    """Prueba que un cambio en un campo llega a la huella de su tabla \
+        y del esquema, y no a las otras tablas."""
+    info = parser.parse_esquema(ESQUEMA)
+    nuevo_default = ESQUEMA.replace('value: "USER"', 'value: "ADMIN"')
+    cambiado = parser.parse_esquema(nuevo_default)
+
+    anterior = info.tablas["User"]
+    nuevo = cambiado.tablas["User"]
+    assert nuevo.campos["role"].huella != anterior.campos["role"].huella
+    assert nuevo.campos["name"].huella == anterior.campos["name"].huella
+    assert nuevo.huella != anterior.huella
+    assert cambiado.tablas["Post"].huella == info.tablas["Post"].huella
+    assert cambiado.huella != info.huella
+
+
+def test_orden_de_valores_enum_cambia_esquema(parser):
+    """Prueba que reordenar los valores de un enum cambia la huella \
+        del esquema."""
+    info = parser.parse_esquema(ESQUEMA)
+    reordenado = parser.parse_esquema(
+        ESQUEMA.replace("ADMIN\n    USER", "USER\n    ADMIN")
+    )
+
+    assert reordenado.huella != info.huella
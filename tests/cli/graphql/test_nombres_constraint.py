@@ -0,0 +1,83 @@
+"""Pruebas para RegistroNombresConstraint"""
+
+from source.cli.graphql.nombres_constraint import (
+    LONGITUD_MAXIMA_MYSQL,
+    LONGITUD_MAXIMA_POSTGRESQL,
+    RegistroNombresConstraint,
+    acortar_identificador,
+    nombre_unique,
+)
+
+
+def test_acortar_identificador_corto_no_cambia():
+    """Prueba que un nombre dentro del limite no se modifica."""
+    assert acortar_identificador("fk_User_posts_Post") == "fk_User_posts_Post"
+
+
+def test_acortar_identificador_largo():
+    """Prueba que un nombre largo se trunca de forma determinista."""
+    nombre = "fk_" + "a" * 100
+    acortado = acortar_identificador(nombre, LONGITUD_MAXIMA_POSTGRESQL)
+
+    assert len(acortado) == LONGITUD_MAXIMA_POSTGRESQL
+    assert acortado == acortar_identificador(
+        nombre,
+        LONGITUD_MAXIMA_POSTGRESQL,
+    )
+    # nombres con el mismo prefijo no colisionan al acortarse
+    assert acortado != acortar_identificador(
+        nombre + "b",
+        LONGITUD_MAXIMA_POSTGRESQL,
+    )
+
+
+def test_reservar_nombres_repetidos():
+    """Prueba que los nombres repetidos reciben un contador."""
+    registro = RegistroNombresConstraint()
+
+    assert registro.reservar("fk_User_posts_Post") == "fk_User_posts_Post"
+    assert registro.reservar("fk_User_posts_Post") == "fk_User_posts_Post_1"
+    assert registro.reservar("fk_User_posts_Post") == "fk_User_posts_Post_2"
+    assert "fk_User_posts_Post_1" in registro
+
+
+def test_reservar_respeta_longitud_maxima():
+    """Prueba que los nombres con contador respetan el limite."""
+    registro = RegistroNombresConstraint(LONGITUD_MAXIMA_MYSQL)
+    nombre_base = "fk_" + "x" * 80
+
+    nombres = {registro.reservar(nombre_base) for _ in range(50)}
+
+    assert len(nombres) == 50
+    assert all(len(nombre) <= LONGITUD_MAXIMA_MYSQL for nombre in nombres)
+
+
+def test_reservar_es_estable_entre_registros():
+    """Prueba que dos registros asignan los mismos nombres \
+        para la misma secuencia de reservas."""
+    nombres_base = ["fk_A_b_B", "fk_A_b_B", "fk_" + "c" * 70]
+
+    primero = RegistroNombresConstraint()
+    segundo = RegistroNombresConstraint()
+
+    assert [primero.reservar(nombre) for nombre in nombres_base] == [
+        segundo.reservar(nombre) for nombre in nombres_base
+    ]
+
+
+def test_nombre_unique_depende_solo_de_tabla_y_columna():
+    """Prueba que el nombre unique no depende del orden de las reservas \
+        y que la misma columna en dos tablas no colisiona."""
+    primero = RegistroNombresConstraint(LONGITUD_MAXIMA_POSTGRESQL)
+    segundo = RegistroNombresConstraint(LONGITUD_MAXIMA_POSTGRESQL)
+
+    assert primero.reservar_unique("User", "email") == "uk_User_email"
+    assert primero.reservar_unique("Admin", "email") == "uk_Admin_email"
+    assert segundo.reservar_unique("Admin", "email") == "uk_Admin_email"
+    assert segundo.reservar_unique("User", "email") == nombre_unique(
+        "User",
+        "email",
+        LONGITUD_MAXIMA_POSTGRESQL,
+    )
+    largo = nombre_unique("T" * 40, "c" * 40, LONGITUD_MAXIMA_MYSQL)
+    assert len(largo) == LONGITUD_MAXIMA_MYSQL
@@ -343,3 +343,29 @@ def test_parse_esquema_invalido(parser, esquema_invalido):
         parser.parse_esquema(esquema_invalido)
 
     assert "Error al parsear el esquema GraphQL" in str(exc_info.value)
+
+
+def test_modelo_compacto_comparte_directivas(parser, esquema_con_directivas):
+    """Test que el modelo parseado comparte directivas y mapas vacios."""
+    esquema = esquema_con_directivas + "\ntype Post { id: ID! @id }"
+    resultado = parser.parse_esquema(esquema)
+
+    id_user = resultado.tablas["User"].campos["id"]
+    id_post = resultado.tablas["Post"].campos["id"]
+
+    # las directivas sin argumentos son la misma instancia
+    assert id_user.directivas["id"] is id_post.directivas["id"]
+    # los nombres quedan internados
+    assert id_user.nombre is id_post.nombre
+    # los modelos usan __slots__
+    assert not hasattr(id_user, "__dict__")
+    assert not hasattr(resultado.tablas["User"], "__dict__")
+
+
+def test_campos_sin_directivas_comparten_mapa(parser, esquema_simple):
+    """Test que los campos sin directivas comparten un mapa inmutable."""
+    campos = parser.parse_esquema(esquema_simple).tablas["User"].campos
+
+    assert campos["name"].directivas is campos["email"].directivas
+    with pytest.raises(TypeError):
+        campos["name"].directivas["id"] = InfoDirectiva("id", {})
@@ -0,0 +1,94 @@
+"""Pruebas para PipelineEsquema"""
+
+from unittest.mock import patch
+
+import pytest
+
+from source.cli.graphql import (
+    CacheParseEsquema,
+    ParserGraphQLEsquema,
+    PipelineEsquema,
+    transform_schema_graphql,
+)
+from source.cli.graphql.exceptions import SchemaError
+from source.cli.graphql.parser import parse
+
+
+@pytest.fixture(name="esquema")
+def fix_esquema():
+    """Fixture con un esquema con directivas y una relacion."""
+    return """
+    type User {
+        id: ID! @id
+        email: String! @unique
+        password: String! @protected
+        posts: [Post] @relation(name: "UserPosts")
+    }
+
+    type Post {
+        id: ID! @id
+        author: User @relation(name: "UserPosts")
+    }
+    """
+
+
+def test_pipeline_parsea_el_documento_una_vez(esquema):
+    """Test que tablas, relaciones y esquema cliente comparten el AST."""
+    with patch(
+        "source.cli.graphql.parser.parse",
+        wraps=parse,
+    ) as mock_parse:
+        pipeline = PipelineEsquema(esquema)
+
+        assert set(pipeline.info.tablas) == {"User", "Post"}
+        assert len(pipeline.relaciones) == 1
+        assert "@" not in pipeline.esquema_cliente
+
+    mock_parse.assert_called_once_with(esquema)
+
+
+def test_pipeline_esquema_cliente_igual_a_transform(esquema):
+    """Test que el esquema cliente coincide con transform_schema_graphql."""
+    pipeline = PipelineEsquema(esquema)
+
+    assert pipeline.esquema_cliente == transform_schema_graphql(esquema)
+    # el documento compartido no se modifica al transformar
+    info = pipeline.parser.extraer_informacion(pipeline.documento)
+    assert "password" in info.tablas["User"].campos
+    assert "password" in pipeline.info.tablas["User"].campos
+
+
+def test_pipeline_con_cache_no_parsea(esquema, tmp_path):
+    """Test que con la cache caliente solo se parsea para el cliente."""
+    cache = CacheParseEsquema(tmp_path)
+    ParserGraphQLEsquema(cache=cache).parse_esquema(esquema)
+
+    with patch(
+        "source.cli.graphql.parser.parse",
+        wraps=parse,
+    ) as mock_parse:
+        pipeline = PipelineEsquema(esquema, ParserGraphQLEsquema(cache=cache))
+        assert set(pipeline.info.tablas) == {"User", "Post"}
+        mock_parse.assert_not_called()
+
+        assert pipeline.esquema_cliente
+        mock_parse.assert_called_once()
+
+
+def test_pipeline_desde_reutiliza_instancia(esquema):
+    """Test que desde() no crea un nuevo pipeline si ya recibe uno."""
+    pipeline = PipelineEsquema(esquema)
+
+    assert PipelineEsquema.desde(pipeline) is pipeline
+    assert PipelineEsquema.desde(esquema).esquema == esquema
+
+
+def test_pipeline_esquema_invalido():
+    """Test que se mantienen las excepciones de cada etapa."""
+    pipeline = PipelineEsquema("type User {")
+
+    with pytest.raises(SchemaError):
+        _ = pipeline.info
+
+    with pytest.raises(ValueError):
+        _ = pipeline.esquema_cliente
@@ -860,3 +860,74 @@ def test_procesar_relacion_one_to_one(
     # verificar objetivo
     assert rela.objetivo.tabla_objetivo == "Profile"
     assert rela.objetivo.campo_inverso == "user"
+
+
+def test_indice_relaciones_inversas(
+    process_with_relation_many_to_one,
+):
+    """Prueba que el indice de relaciones inversas se construye \
+        una sola vez con todos los campos de relacion"""
+    indice = process_with_relation_many_to_one._indice_inversas
+
+    assert indice[("UserPosts", "User", "Post")] == ("posts", "SET_NULL")
+    assert indice[("UserPosts", "Post", "User")] == ("author", "CASCADE")
+
+    buscar = process_with_relation_many_to_one._buscar_relacion_inversa
+    assert buscar("User", "UserPosts", "Post") == ("author", "CASCADE")
+    assert buscar("User", "OtraRelacion", "Post") == (None, "SET_NULL")
+    assert buscar("User", "UserPosts", "NoExiste") == (None, "SET_NULL")
+
+
+def test_procesar_relaciones_tabla_muy_conectada(tipos_escalares):
+    """Prueba que una tabla con miles de relaciones se procesa \
+        resolviendo cada relacion inversa con el indice"""
+    total = 5000
+    relacion = "relation"
+
+    campos_hub = {}
+    tablas = {}
+    for i in range(total):
+        nombre_rel = f"HubItem{i}"
+        campos_hub[f"items{i}"] = InfoField(
+            nombre=f"items{i}",
+            tipo_campo=f"Item{i}",
+            es_lista=True,
+            es_requerido=False,
+            directivas={
+                relacion: InfoDirectiva(
+                    nombre=relacion,
+                    argumentos={"name": nombre_rel},
+                ),
+            },
+        )
+        tablas[f"Item{i}"] = InfoTabla(
+            nombre=f"Item{i}",
+            campos={
+                "hub": InfoField(
+                    nombre="hub",
+                    tipo_campo="Hub",
+                    es_lista=False,
+                    es_requerido=False,
+                    directivas={
+                        relacion: InfoDirectiva(
+                            nombre=relacion,
+                            argumentos={"name": nombre_rel},
+                        ),
+                    },
+                ),
+            },
+        )
+    tablas["Hub"] = InfoTabla(nombre="Hub", campos=campos_hub)
+
+    relaciones = ProcesarRelaciones(
+        tablas=tablas,
+        scalar_types=tipos_escalares,
+        enum_types={},
+    ).procesar_relaciones()
+
+    assert len(relaciones) == total
+    assert all(
+        rel.tipo_relation == TipoRelacion.ONE_TO_MANY.value
+        and rel.objetivo.campo_inverso.startswith("items")
+        for rel in relaciones
+    )
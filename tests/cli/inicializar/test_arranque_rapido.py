@@ -0,0 +1,67 @@
+"""Pruebas para la medicion del modo rapido de inicializar"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from source.cli.graphql import PipelineEsquema
+from source.cli.inicializar.arranque_rapido import ArranqueRapido
+
+ESQUEMA = """
+type User {
+    id: ID! @id
+    posts: [Post] @relation(name: "UserPosts")
+    roles: [Role] @relation(name: "UserRoles", link: TABLE)
+}
+
+type Post {
+    id: ID! @id
+    author: User @relation(name: "UserPosts")
+}
+
+type Role {
+    id: ID! @id
+    users: [User] @relation(name: "UserRoles", link: TABLE)
+}
+"""
+
+
+@pytest.fixture(name="arranque")
+def fixture_arranque():
+    """Fixture que proporciona el contador de un esquema con una \
+        relacion inline y una tabla junction."""
+    return ArranqueRapido(PipelineEsquema(ESQUEMA).relaciones)
+
+
+def test_cuenta_sentencias_y_alter(arranque):
+    """Prueba que se cuentan las sentencias y los ALTER TABLE."""
+    sentencias = ["CREATE TABLE a;", "  alter table b ADD c;", "CREATE x;"]
+
+    assert list(arranque.contar(sentencias)) == sentencias
+    assert arranque.foreign_keys == 1
+    assert arranque.sentencias == 3
+    assert arranque.sentencias_alter == 1
+    assert arranque.sentencias_evitadas == 0
+
+
+def test_estima_tiempo_ahorrado(arranque):
+    """Prueba que el tiempo ahorrado usa el tiempo medio por sentencia."""
+    with patch(
+        "source.cli.inicializar.arranque_rapido.time.perf_counter",
+        side_effect=[10.0, 13.0],
+    ):
+        with arranque.medir():
+            list(arranque.contar(["CREATE TABLE a;"] * 3))
+
+    assert arranque.tiempo == 3.0
+    assert arranque.sentencias_evitadas == 1
+    assert arranque.tiempo_ahorrado == 1.0
+
+    consola = Mock()
+    arranque.mostrar_resumen(consola)
+    assert "ahorro estimado ~1.00s" in consola.print.call_args.args[0]
+
+
+def test_sin_sentencias_no_hay_ahorro(arranque):
+    """Prueba que sin sentencias ejecutadas no se estima ahorro."""
+    assert arranque.tiempo_ahorrado == 0.0
@@ -63,6 +63,32 @@ def test_crear_comando_agregar_argumentos(comando_init):
                 "help": "No visualizar salida SQL",
             },
         ),
+        (
+            ("--sin-cache",),
+            {
+                "default": False,
+                "action": "store_true",
+                "help": "No usar la cache de esquemas parseados",
+            },
+        ),
+        (
+            ("--orden-dependencias",),
+            {
+                "default": False,
+                "action": "store_true",
+                "help": "Crear las tablas en orden de dependencias con las "
+                "foreign keys dentro de CREATE TABLE",
+            },
+        ),
+        (
+            ("--rapido",),
+            {
+                "default": False,
+                "action": "store_true",
+                "help": "Crear el esquema en una sesion optimizada para una "
+                "base de datos vacia",
+            },
+        ),
     ]
 
     assert mock_parser.add_argument.call_count == len(argumentos_esperados)
@@ -1,15 +1,13 @@
 """Pruebas para la funcion inicializar"""
 
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 import pytest
 from source.cli.generators.generator_db_schema import GeneratorDBSchema
 from source.cli.inicializar.main import inicializar
 from source.cli.database.adaptadores.mysql import AdaptadorMySQL
-from source.cli.graphql import (
-    ParserGraphQLEsquema,
-    ProcesarRelaciones,
-)
+from source.cli.database.adaptador_database import TAM_LOTE
+from source.cli.graphql import PipelineEsquema
 
 
 @pytest.fixture(name="mock_args")
@@ -20,6 +18,8 @@ def fixture_mock_args():
     args.salida = "output"
     args.no_visualizar_salida = False
     args.no_visualizar_sql = False
+    args.orden_dependencias = False
+    args.rapido = False
     return args
 
 
@@ -32,6 +32,8 @@ def fixture_mock_args_sin_esquema():
     args.salida = "output"
     args.no_visualizar_salida = True
     args.no_visualizar_sql = True
+    args.orden_dependencias = False
+    args.rapido = False
     return args
 
 
@@ -59,30 +61,25 @@ def fixture_adaptador_mysql():
     return adaptador
 
 
-@pytest.fixture(name="mock_parser")
-def fixture_parser_graphql():
-    """Fixture que proporciona un parser GraphQL simulado."""
-    parser = Mock(spec=ParserGraphQLEsquema)
-    mock_info_parseada = Mock()
-    mock_info_parseada.tablas = {}
-    mock_info_parseada.enums = {}
-    parser.parse_esquema.return_value = mock_info_parseada
-    return parser
-
-
-@pytest.fixture(name="mock_procesar_relaciones")
-def fixture_procesar_relaciones():
-    """Fixture que proporciona un procesador de relaciones simulado."""
-    procesador = Mock(spec=ProcesarRelaciones)
-    procesador.procesar_relaciones.return_value = []
-    return procesador
+@pytest.fixture(name="mock_pipeline")
+def fixture_pipeline_esquema():
+    """Fixture que proporciona un pipeline de esquema simulado."""
+    pipeline = Mock(spec=PipelineEsquema)
+    pipeline.info = Mock()
+    pipeline.info.tablas = {}
+    pipeline.info.enums = {}
+    pipeline.relaciones = []
+    pipeline.esquema_cliente = "type User { id: ID! }"
+    return pipeline
 
 
 @pytest.fixture(name="mock_generador")
 def fixture_generador_mysql():
     """Fixture que proporciona un generador de esquema MySQL simulado."""
     generador = Mock(spec=GeneratorDBSchema)
-    generador.generate_schema.return_value = "CREATE TABLE test (id INT);"
+    generador.generate_schema_stream.return_value = iter(
+        ["CREATE TABLE test (id INT);"],
+    )
     return generador
 
 
@@ -98,8 +95,7 @@ def test_inicializar_con_esquema_especificado_exitoso(
     config_valida,
     mock_loader,
     mock_adaptador,
-    mock_parser,
-    mock_procesar_relaciones,
+    mock_pipeline,
     mock_generador,
     ruta_proyecto,
 ):
@@ -121,6 +117,9 @@ def test_inicializar_con_esquema_especificado_exitoso(
         patch(
             "source.cli.inicializar.main.GestorArchivo.escribir_archivo",
         ),
+        patch(
+            "source.cli.inicializar.main.GestorArchivo.escribir_sentencias",
+        ),
         patch(
             "source.cli.inicializar.main.ConfiguracionJsonLoader",
             return_value=mock_loader,
@@ -130,13 +129,9 @@ def test_inicializar_con_esquema_especificado_exitoso(
             return_value=mock_adaptador,
         ),
         patch(
-            "source.cli.inicializar.main.ParserGraphQLEsquema",
-            return_value=mock_parser,
-        ),
-        patch(
-            "source.cli.inicializar.main.ProcesarRelaciones",
-            return_value=mock_procesar_relaciones,
-        ),
+            "source.cli.inicializar.main.PipelineEsquema",
+            return_value=mock_pipeline,
+        ) as mock_clase_pipeline,
         patch(
             "source.cli.inicializar.main.GeneratorDBSchema",
             return_value=mock_generador,
@@ -157,19 +152,25 @@ def test_inicializar_con_esquema_especificado_exitoso(
         # verificar que se leyo el esquema del archivo
         GestorArchivo.leer_archivo.assert_called()
 
-        # verificar que se parceo el esquema
-        mock_parser.parse_esquema.assert_called_once_with(esquema_contenido)
-
-        # verificar que se procesaron las relaciones
-        mock_procesar_relaciones.procesar_relaciones.assert_called_once()
+        # verificar que se parseo el esquema una sola vez
+        mock_clase_pipeline.assert_called_once()
+        assert mock_clase_pipeline.call_args.args[0] == esquema_contenido
 
         # verificar que se genero el esquema MySQL
-        mock_generador.generate_schema.assert_called_once()
+        mock_generador.generate_schema_stream.assert_called_once()
 
         # verificar conexion a la base de datos
         mock_loader.cargar_configuracion.assert_called_once()
         mock_adaptador.conectar.assert_called_once_with(config_valida)
-        mock_adaptador.ejecutar_consulta.assert_called()
+        mock_adaptador.ejecutar_en_flujo.assert_called_once_with(
+            mock_generador.generate_schema_stream.return_value,
+            TAM_LOTE,
+        )
+
+        # verificar que las sentencias ejecutadas se escriben en schema.sql
+        GestorArchivo.escribir_sentencias.assert_called_once()
+        _, ruta_sql = GestorArchivo.escribir_sentencias.call_args.args
+        assert ruta_sql.name == "schema.sql"
         mock_adaptador.cerrar_conexion.assert_called_once()
 
 
@@ -178,8 +179,7 @@ def test_inicializar_sin_esquema_encuentra_archivo_graphql(
     esquema_contenido,
     mock_loader,
     mock_adaptador,
-    mock_parser,
-    mock_procesar_relaciones,
+    mock_pipeline,
     mock_generador,
     ruta_proyecto,
 ):
@@ -203,6 +203,9 @@ def test_inicializar_sin_esquema_encuentra_archivo_graphql(
         patch(
             "source.cli.inicializar.main.GestorArchivo.escribir_archivo",
         ),
+        patch(
+            "source.cli.inicializar.main.GestorArchivo.escribir_sentencias",
+        ),
         patch.object(Path, "glob", return_value=iter([mock_esquema_archivo])),
         patch(
             "source.cli.inicializar.main.ConfiguracionJsonLoader",
@@ -213,13 +216,9 @@ def test_inicializar_sin_esquema_encuentra_archivo_graphql(
             return_value=mock_adaptador,
         ),
         patch(
-            "source.cli.inicializar.main.ParserGraphQLEsquema",
-            return_value=mock_parser,
-        ),
-        patch(
-            "source.cli.inicializar.main.ProcesarRelaciones",
-            return_value=mock_procesar_relaciones,
-        ),
+            "source.cli.inicializar.main.PipelineEsquema",
+            return_value=mock_pipeline,
+        ) as mock_clase_pipeline,
         patch(
             "source.cli.inicializar.main.GeneratorDBSchema",
             return_value=mock_generador,
@@ -237,8 +236,9 @@ def test_inicializar_sin_esquema_encuentra_archivo_graphql(
         # pylint: enable=import-outside-toplevel
         GestorArchivo.leer_archivo.assert_called()
 
-        # verificar que se parceo el esquema
-        mock_parser.parse_esquema.assert_called_once_with(esquema_contenido)
+        # verificar que se parseo el esquema una sola vez
+        mock_clase_pipeline.assert_called_once()
+        assert mock_clase_pipeline.call_args.args[0] == esquema_contenido
 
 
 def test_inicializar_falla_sin_esquema_y_sin_archivo_graphql(
@@ -310,8 +310,7 @@ def test_inicializar_falla_esquema_no_existe(
 def test_inicializar_sin_configuracion_db(
     mock_args,
     esquema_contenido,
-    mock_parser,
-    mock_procesar_relaciones,
+    mock_pipeline,
     mock_generador,
     ruta_proyecto,
 ):
@@ -338,16 +337,15 @@ def test_inicializar_sin_configuracion_db(
             "source.cli.inicializar.main.GestorArchivo.escribir_archivo",
         ),
         patch(
-            "source.cli.inicializar.main.ConfiguracionJsonLoader",
-            return_value=mock_loader,
+            "source.cli.inicializar.main.GestorArchivo.escribir_sentencias",
         ),
         patch(
-            "source.cli.inicializar.main.ParserGraphQLEsquema",
-            return_value=mock_parser,
+            "source.cli.inicializar.main.ConfiguracionJsonLoader",
+            return_value=mock_loader,
         ),
         patch(
-            "source.cli.inicializar.main.ProcesarRelaciones",
-            return_value=mock_procesar_relaciones,
+            "source.cli.inicializar.main.PipelineEsquema",
+            return_value=mock_pipeline,
         ),
         patch(
             "source.cli.inicializar.main.GeneratorDBSchema",
@@ -368,8 +366,7 @@ def test_inicializar_db_con_tablas_existentes(
     mock_args,
     esquema_contenido,
     mock_loader,
-    mock_parser,
-    mock_procesar_relaciones,
+    mock_pipeline,
     mock_generador,
     ruta_proyecto,
 ):
@@ -405,12 +402,8 @@ def test_inicializar_db_con_tablas_existentes(
             return_value=mock_adaptador,
         ),
         patch(
-            "source.cli.inicializar.main.ParserGraphQLEsquema",
-            return_value=mock_parser,
-        ),
-        patch(
-            "source.cli.inicializar.main.ProcesarRelaciones",
-            return_value=mock_procesar_relaciones,
+            "source.cli.inicializar.main.PipelineEsquema",
+            return_value=mock_pipeline,
         ),
         patch(
             "source.cli.inicializar.main.GeneratorDBSchema",
@@ -463,3 +456,70 @@ def test_ini_multi_archivos_gql_sin_esquema_especificado(
             "esquema específico usando el parámetro --esquema.",
             style="bold red",
         )
+
+
+def test_inicializar_modo_rapido(
+    mock_args,
+    esquema_contenido,
+    mock_loader,
+    mock_adaptador,
+    mock_pipeline,
+    mock_generador,
+    ruta_proyecto,
+):
+    """Prueba que el modo rapido ejecuta el esquema dentro de la sesion \
+        de arranque y con las foreign keys dentro de CREATE TABLE."""
+    mock_args.rapido = True
+    mock_adaptador.sesion_arranque = MagicMock()
+    mock_adaptador.ejecutar_en_flujo.side_effect = lambda s, _: list(s)
+
+    with (
+        patch(
+            "source.cli.inicializar.main.Path.cwd",
+            return_value=ruta_proyecto,
+        ),
+        patch(
+            "source.cli.inicializar.main.GestorArchivo.asegurar_dir_existe",
+        ),
+        patch("source.cli.inicializar.main.Path.exists", return_value=True),
+        patch(
+            "source.cli.inicializar.main.GestorArchivo.leer_archivo",
+            return_value=esquema_contenido,
+        ),
+        patch(
+            "source.cli.inicializar.main.GestorArchivo.escribir_archivo",
+        ),
+        patch(
+            "source.cli.inicializar.main.GestorArchivo.escribir_sentencias",
+        ) as mock_escribir,
+        patch(
+            "source.cli.inicializar.main.ConfiguracionJsonLoader",
+            return_value=mock_loader,
+        ),
+        patch(
+            "source.cli.inicializar.main.AdaptadorMySQL",
+            return_value=mock_adaptador,
+        ),
+        patch(
+            "source.cli.inicializar.main.PipelineEsquema",
+            return_value=mock_pipeline,
+        ),
+        patch(
+            "source.cli.inicializar.main.GeneratorDBSchema",
+            return_value=mock_generador,
+        ),
+        patch("source.cli.inicializar.main.Console") as mock_consola,
+    ):
+        inicializar(mock_args)
+
+    kwargs = mock_generador.generate_schema_stream.call_args.kwargs
+    assert kwargs["inline_foreign_keys"] is True
+
+    # las sentencias se ejecutan dentro de la sesion de arranque
+    sesion = mock_adaptador.sesion_arranque.return_value
+    sesion.__enter__.assert_called_once()
+    sesion.__exit__.assert_called_once()
+    assert mock_escribir.call_args.args[0] == ["CREATE TABLE test (id INT);"]
+
+    mensajes = [str(c) for c in mock_consola.return_value.print.call_args_list]
+    assert any("Modo rapido: 1 sentencias" in m for m in mensajes)
@@ -65,6 +65,84 @@ def test_crear_comando_agregar_argumentos(comando_migracion):
                 "help": "No visualizar salida SQL",
             },
         ),
+        (
+            ("--sin-cache",),
+            {
+                "default": False,
+                "action": "store_true",
+                "help": "No usar la cache de esquemas parseados",
+            },
+        ),
+        (
+            ("--destinos",),
+            requerido(
+                "Archivo JSON con las bases de datos a migrar a la vez "
+                "(lista de conexiones o plantilla DSN)"
+            ),
+        ),
+        (
+            ("--trabajadores",),
+            {
+                "type": int,
+                "default": 8,
+                "required": False,
+                "help": "Bases de datos migradas a la vez con --destinos",
+            },
+        ),
+        (
+            ("--reanudar",),
+            {
+                "default": False,
+                "action": "store_true",
+                "help": "Con --destinos, omitir las bases de datos ya "
+                "migradas en la ejecucion anterior",
+            },
+        ),
+        (
+            ("--online",),
+            {
+                "choices": ["advertir", "rechazar", "sombra"],
+                "required": False,
+                "help": "Modificar las tablas sin bloquearlas; que hacer "
+                "con los cambios que copian la tabla",
+            },
+        ),
+        (
+            ("--lote-relleno",),
+            {
+                "type": int,
+                "default": 1000,
+                "required": False,
+                "help": "Filas actualizadas por transaccion al mover datos",
+            },
+        ),
+        (
+            ("--pausa-relleno",),
+            {
+                "type": float,
+                "default": 0.0,
+                "required": False,
+                "help": "Segundos de espera entre lotes al mover datos",
+            },
+        ),
+        (
+            ("--estimar",),
+            {
+                "default": False,
+                "action": "store_true",
+                "help": "Mostrar la duracion y el bloqueo estimados de "
+                "cada sentencia antes de aplicarla",
+            },
+        ),
+        (
+            ("--limite-estimacion",),
+            {
+                "type": float,
+                "required": False,
+                "help": "No aplicar la migracion si su duracion estimada "
+                "supera estos segundos",
+            },
+        ),
     ]
 
     assert mock_parser.add_argument.call_count == len(argumentos_esperados)
@@ -0,0 +1,249 @@
+"""Pruebas para la migracion en varios destinos"""
+
+import asyncio
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rich.console import Console
+
+from source.cli.database.adaptador_asincrono import AdaptadorAsincrono
+from source.cli.database.adaptadores.mysql import AdaptadorMySQL
+from source.cli.database.historial import (
+    RegistroMigracion,
+    ResumenHistorial,
+    checksum_sql,
+)
+from source.cli.graphql.configuracion_y_constantes import EstadoMigracion
+from source.cli.graphql.exceptions import MigrationError
+from source.cli.migracion.destinos import (
+    ARCHIVO_PROGRESO,
+    ProgresoDestinos,
+    ResultadoDestino,
+    aplicar_en_destinos,
+    cargar_destinos,
+    huella_migracion,
+    migrar_destinos,
+)
+
+MODULO = "source.cli.migracion.destinos"
+CONFIG = {"DB_HOST": "localhost", "DB_PASSWORD": "secreto"}
+
+
+@pytest.fixture(name="escribir_destinos")
+def fixture_escribir_destinos(tmp_path):
+    """Fixture que escribe un archivo de destinos."""
+
+    def escribir(contenido):
+        ruta = tmp_path / "destinos.json"
+        ruta.write_text(json.dumps(contenido), encoding="utf-8")
+        return ruta
+
+    return escribir
+
+
+@pytest.fixture(name="servidor")
+def fixture_servidor():
+    """Fixture que sustituye la aplicacion del SQL en un destino; \
+        falla en los destinos de ``servidor.fallan``."""
+    servidor = MagicMock(fallan=set(), aplicados=[], activos=0, maximo=0)
+
+    async def aplicar(sql, config, db_type, aplicar_destino=None):
+        # pylint: disable=unused-argument
+        servidor.activos += 1
+        servidor.maximo = max(servidor.maximo, servidor.activos)
+        await asyncio.sleep(0.01)
+        servidor.activos -= 1
+        if config["DB_NOMBRE"] in servidor.fallan:
+            raise MigrationError("tabla bloqueada")
+        servidor.aplicados.append(config["DB_NOMBRE"])
+
+    with patch(f"{MODULO}.aplicar_sql_migracion", side_effect=aplicar):
+        yield servidor
+
+
+def test_cargar_destinos_lista(escribir_destinos):
+    """Prueba una lista de conexiones que heredan la configuracion."""
+    ruta = escribir_destinos(
+        [
+            {"NOMBRE": "acme", "DB_NOMBRE": "db_acme"},
+            {"DB_NOMBRE": "db_globex", "DB_HOST": "otro"},
+        ]
+    )
+
+    destinos = cargar_destinos(ruta, CONFIG)
+
+    assert destinos == {
+        "acme": {**CONFIG, "DB_NOMBRE": "db_acme"},
+        "db_globex": {**CONFIG, "DB_NOMBRE": "db_globex", "DB_HOST": "otro"},
+    }
+
+
+def test_cargar_destinos_plantilla_dsn(escribir_destinos):
+    """Prueba una plantilla DSN con un destino por cliente."""
+    ruta = escribir_destinos(
+        {
+            "plantilla": "mysql://admin:p%40ss@db:3307/cliente_{destino}",
+            "destinos": ["acme"],
+        }
+    )
+
+    assert cargar_destinos(ruta, CONFIG) == {
+        "acme": {
+            "DB_HOST": "db",
+            "DB_PUERTO": 3307,
+            "DB_USUARIO": "admin",
+            "DB_PASSWORD": "p@ss",
+            "DB_NOMBRE": "cliente_acme",
+        }
+    }
+
+
+def test_cargar_destinos_plantilla_config(escribir_destinos):
+    """Prueba una plantilla con las claves de la configuracion."""
+    ruta = escribir_destinos(
+        {"plantilla": {"DB_NOMBRE": "t_{destino}"}, "destinos": ["a", "b"]}
+    )
+
+    destinos = cargar_destinos(ruta, CONFIG)
+
+    assert destinos["b"] == {**CONFIG, "DB_NOMBRE": "t_b"}
+
+
+@pytest.mark.parametrize("contenido", [[], "no es json", {"plantilla": ""}])
+def test_cargar_destinos_invalido(tmp_path, contenido):
+    """Prueba que un archivo de destinos invalido es un error."""
+    ruta = tmp_path / "destinos.json"
+    texto = contenido if isinstance(contenido, str) else json.dumps(contenido)
+    ruta.write_text(texto, encoding="utf-8")
+
+    with pytest.raises(MigrationError):
+        cargar_destinos(ruta, CONFIG)
+
+
+def test_aplicar_en_destinos_limita_trabajadores(servidor):
+    """Prueba que no se migran mas destinos a la vez que trabajadores \
+        y que un fallo no detiene al resto."""
+    servidor.fallan = {"db_3"}
+    destinos = {f"t{i}": {"DB_NOMBRE": f"db_{i}"} for i in range(10)}
+    terminados = []
+
+    resultados = asyncio.run(
+        aplicar_en_destinos("SELECT 1;", destinos, 3, terminados.append)
+    )
+
+    assert servidor.maximo == 3
+    assert [r.nombre for r in resultados] == list(destinos)
+    assert len(terminados) == 10
+    assert len(servidor.aplicados) == 9
+    fallido = resultados[3]
+    assert not fallido.exitoso
+    assert fallido.error == "tabla bloqueada"
+
+
+def test_progreso_de_otra_migracion(tmp_path):
+    """Prueba que solo se reanuda la misma migracion."""
+    ruta = tmp_path / ARCHIVO_PROGRESO
+    ProgresoDestinos(ruta, "a").registrar(ResultadoDestino("t", True, 1.0))
+
+    assert ProgresoDestinos(ruta, "a").cargar()
+    assert not ProgresoDestinos(ruta, "b").cargar()
+
+
+def test_migrar_destinos_reanudar(tmp_path, escribir_destinos, servidor):
+    """Prueba que al reanudar solo se migran los destinos pendientes."""
+    ruta = escribir_destinos(
+        {"plantilla": {"DB_NOMBRE": "{destino}"}, "destinos": ["a", "b", "c"]}
+    )
+    args = MagicMock(destinos=str(ruta), salida="migraciones")
+    args.trabajadores = 2
+    args.reanudar = False
+    huella = huella_migracion("type A", "type B")
+    consola = Console(file=io.StringIO())
+    migra = MagicMock(id_migracion="migration_1", sql_generado="SQL;")
+    servidor.fallan = {"b"}
+
+    with patch(f"{MODULO}.Path.cwd", return_value=tmp_path):
+        assert not migrar_destinos(args, CONFIG, migra, huella, "h", consola)
+        progreso = tmp_path / "migraciones" / ARCHIVO_PROGRESO
+        assert progreso.exists()
+
+        servidor.fallan = set()
+        servidor.aplicados.clear()
+        args.reanudar = True
+        assert migrar_destinos(args, CONFIG, migra, huella, "h", consola)
+
+    assert servidor.aplicados == ["b"]
+    assert not progreso.exists()
+
+
+def test_migrar_destinos_online_con_historial(tmp_path, escribir_destinos):
+    """Prueba que con --online cada destino se prepara como la base de \
+        datos del comando sin --destinos: no copia tablas, usa los lotes \
+        de relleno, guarda su historial y un destino que fallo a medias \
+        continua donde se quedo."""
+    ruta = escribir_destinos(
+        {"plantilla": {"DB_NOMBRE": "{destino}"}, "destinos": ["a", "b"]}
+    )
+    args = MagicMock(destinos=str(ruta), salida="migraciones", online="sombra")
+    args.trabajadores = 2
+    args.reanudar = False
+    args.lote_relleno = 50
+    args.pausa_relleno = 0.5
+    migra = MagicMock(id_migracion="migration_2", sql_generado="SQL;")
+    fallida = RegistroMigracion(
+        "migration_1",
+        "h",
+        checksum_sql("SQL;"),
+        EstadoMigracion.FALLIDA,
+        sentencias_aplicadas=2,
+    )
+    historiales = {
+        "a": ResumenHistorial(),
+        "b": ResumenHistorial(sin_terminar=[fallida]),
+    }
+    adaptadores = {}
+
+    def crear_adaptador(_db_type):
+        adaptador = MagicMock(spec=AdaptadorMySQL)
+        adaptador.empty_database.return_value = False
+        adaptador.ejecutar_script.return_value = []
+
+        def conectar(config):
+            nombre = config["DB_NOMBRE"]
+            adaptador.conexion = MagicMock()
+            adaptador.estado_historial.return_value = historiales[nombre]
+            adaptadores[nombre] = adaptador
+
+        adaptador.conectar.side_effect = conectar
+        return AdaptadorAsincrono(adaptador)
+
+    consola = Console(file=io.StringIO())
+    with (
+        patch(f"{MODULO}.Path.cwd", return_value=tmp_path),
+        patch(
+            "source.cli.migracion.asincrono.crear_adaptador_asincrono",
+            side_effect=crear_adaptador,
+        ),
+    ):
+        assert migrar_destinos(args, CONFIG, migra, "huella", "h", consola)
+
+    for nombre, adaptador in adaptadores.items():
+        # en modo online un ALTER rechazado no copia la tabla
+        assert adaptador.permitir_copia is False
+        assert adaptador.relleno.tam_lote == 50
+        assert adaptador.relleno.pausa == 0.5
+        # cada destino guarda el progreso de sus rellenos aparte
+        progreso = adaptador.relleno.progreso.ruta
+        assert progreso.name == f".relleno_progreso.{nombre}.json"
+        adaptador.estado_historial.assert_called_once_with("h")
+        adaptador.asegurar_historial.assert_called_once()
+        registro = adaptador.registrar_migracion.call_args.args[0]
+        assert registro.estado is EstadoMigracion.APLICADA
+
+    llamada = adaptadores["a"].ejecutar_script.call_args
+    assert llamada.kwargs["desde"] == 0
+    llamada = adaptadores["b"].ejecutar_script.call_args
+    assert llamada.kwargs["desde"] == 2
+    assert adaptadores["b"].relleno.progreso.ambito == "migration_1"
@@ -5,14 +5,28 @@ from unittest.mock import Mock, patch
 import pytest
 from source.cli.migracion.main import migracion
 from source.cli.database.adaptadores.mysql import AdaptadorMySQL
+from source.cli.database.historial import (
+    RegistroMigracion,
+    ResumenHistorial,
+    checksum_sql,
+    hash_esquema,
+)
 from source.cli.generators.migration import GeneratorDBMigration
+from source.cli.generators.migration.cost_estimation import (
+    KIND_REWRITE,
+    LOCK_WRITES,
+    MigrationEstimate,
+    StatementCost,
+)
 from source.cli.graphql.configuracion_y_constantes import (
+    EstadoMigracion,
     InfoMigracion,
     InfoDiffEsquema,
 )
 from source.cli.graphql.exceptions import (
     GraphQLStoreError,
     MigrationError,
+    SQLExecutionError,
 )
 
 
@@ -25,6 +39,12 @@ def fixture_mock_args():
     args.salida = "migraciones"
     args.no_visualizar_salida = False
     args.no_visualizar_sql = False
+    args.destinos = None
+    args.online = None
+    args.lote_relleno = 1000
+    args.pausa_relleno = 0.0
+    args.estimar = False
+    args.limite_estimacion = None
     return args
 
 
@@ -38,6 +58,12 @@ def fixture_mock_args_sin_esquema():
     args.salida = "migraciones"
     args.no_visualizar_salida = True
     args.no_visualizar_sql = True
+    args.destinos = None
+    args.online = None
+    args.lote_relleno = 1000
+    args.pausa_relleno = 0.0
+    args.estimar = False
+    args.limite_estimacion = None
     return args
 
 
@@ -82,6 +108,8 @@ def fixture_adaptador_mysql():
     adaptador.ejecutar_consulta.return_value = None
     adaptador.cerrar_conexion.return_value = None
     adaptador.empty_database.return_value = False
+    adaptador.ejecutar_script.return_value = []
+    adaptador.estado_historial.return_value = ResumenHistorial()
     adaptador.cursor = Mock()
     adaptador.cursor.fetchall.return_value = [("users",), ("posts",)]
     return adaptador
@@ -119,9 +147,9 @@ def fixture_generador_migracion():
     return generador
 
 
-@pytest.fixture(name="mock_generador_esquema")
-def fixture_generador_esquema():
-    """Fixture que proporciona un transform_schema_graphql simulado."""
+@pytest.fixture(name="mock_pipeline_esquema")
+def fixture_pipeline_esquema():
+    """Fixture que proporciona la clase PipelineEsquema simulada."""
     esquema_cliente = """
     type User {
         id: ID!
@@ -138,9 +166,9 @@ def fixture_generador_esquema():
         author: User
     }
     """
-    transform_schema = Mock()
-    transform_schema.return_value = esquema_cliente
-    return transform_schema
+    clase_pipeline = Mock()
+    clase_pipeline.return_value.esquema_cliente = esquema_cliente
+    return clase_pipeline
 
 
 @pytest.fixture(name="ruta_proyecto")
@@ -156,7 +184,7 @@ def test_migracion_con_esquema_especificado_exitoso(
     mock_loader,
     mock_adaptador,
     mock_generador_migracion,
-    mock_generador_esquema,
+    mock_pipeline_esquema,
     ruta_proyecto,
 ):
     """Prueba migración exitosa con esquema especificado."""
@@ -186,8 +214,8 @@ def test_migracion_con_esquema_especificado_exitoso(
             return_value=mock_generador_migracion,
         ),
         patch(
-            "source.cli.migracion.main.transform_schema_graphql",
-            mock_generador_esquema,
+            "source.cli.migracion.main.PipelineEsquema",
+            mock_pipeline_esquema,
         ),
         patch("source.cli.migracion.main.Console"),
     ):
@@ -206,25 +234,31 @@ def test_migracion_con_esquema_especificado_exitoso(
         # verificar que se genero la migracion
         mock_generador_migracion.generar_migracion.assert_called_once_with(
             previous_schema=esquema_anterior,
-            new_schema=esquema_nuevo,
+            new_schema=mock_pipeline_esquema.return_value,
             print_output=True,
             print_sql=True,
+            online=None,
         )
 
         # verificar conexion a BD y verificacion de tablas
         mock_adaptador.conectar.assert_called_once()
         mock_adaptador.empty_database.assert_called_once()
-        mock_adaptador.ejecutar_consulta.assert_called()
+        # el script de la migracion se ejecuta sentencia a sentencia
+        migra = mock_generador_migracion.generar_migracion.return_value
+        mock_adaptador.ejecutar_script.assert_called_once()
+        llamada = mock_adaptador.ejecutar_script.call_args
+        assert llamada.args == (migra.sql_generado,)
+        assert llamada.kwargs["desde"] == 0
         mock_adaptador.cerrar_conexion.assert_called_once()
 
         # verificar que se guardo la migracion
         GestorArchivo.escribir_archivo.assert_called()
         GestorArchivo.asegurar_dir_existe.assert_called()
 
-        # verificar que se actualizó el esquema cliente
-        mock_generador_esquema.assert_called_once_with(
-            esquema_nuevo,
-        )
+        # verificar que el nuevo esquema se parseo una sola vez para
+        # la migracion y el esquema cliente
+        mock_pipeline_esquema.assert_called_once()
+        assert mock_pipeline_esquema.call_args.args[0] == esquema_nuevo
 
 
 def test_migracion_con_esquema_especificado_no_existe(
@@ -271,7 +305,7 @@ def test_migracion_sin_esquema_encuentra_archivo_graphql(
     mock_loader,
     mock_adaptador,
     mock_generador_migracion,
-    mock_generador_esquema,
+    mock_pipeline_esquema,
     ruta_proyecto,
 ):
     """Prueba migración exitosa sin esquema especificado, \
@@ -305,8 +339,8 @@ def test_migracion_sin_esquema_encuentra_archivo_graphql(
             return_value=mock_generador_migracion,
         ),
         patch(
-            "source.cli.migracion.main.transform_schema_graphql",
-            return_value=mock_generador_esquema,
+            "source.cli.migracion.main.PipelineEsquema",
+            mock_pipeline_esquema,
         ),
         patch("source.cli.migracion.main.Console"),
     ):
@@ -398,6 +432,318 @@ def test_migracion_bd_sin_tablas_existentes(
         mock_consola_instancia = mock_console.return_value
         llamadas = mock_consola_instancia.print.call_args_list
         assert any("inicializar" in str(call) for call in llamadas)
+        mock_generador_migracion.generar_migracion.assert_not_called()
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def test_migracion_estimacion_sobre_el_limite_no_se_aplica(
+    mock_args,
+    esquema_anterior,
+    esquema_nuevo,
+    mock_loader,
+    mock_adaptador,
+    mock_generador_migracion,
+    ruta_proyecto,
+):
+    """Prueba que la migracion no se aplica si su duracion estimada \
+        supera el limite."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    mock_args.limite_estimacion = 60.0
+    coste = StatementCost(
+        "ALTER TABLE `User` MODIFY COLUMN `age` BIGINT;",
+        "User",
+        KIND_REWRITE,
+        LOCK_WRITES,
+        120.0,
+    )
+    estimacion = MigrationEstimate([coste])
+    mock_generador_migracion.estimar_costo.return_value = estimacion
+    with (
+        patch(
+            "source.cli.migracion.main.Path.cwd",
+            return_value=ruta_proyecto,
+        ),
+        patch("source.cli.migracion.main.Path.exists", return_value=True),
+        patch(
+            "source.cli.migracion.main.GestorArchivo.leer_archivo",
+            side_effect=[esquema_anterior, esquema_nuevo],
+        ),
+        patch(
+            "source.cli.migracion.main.ConfiguracionJsonLoader",
+            return_value=mock_loader,
+        ),
+        patch(
+            "source.cli.migracion.main.AdaptadorMySQL",
+            return_value=mock_adaptador,
+        ),
+        patch(
+            "source.cli.migracion.main.GeneratorDBMigration",
+            return_value=mock_generador_migracion,
+        ),
+        patch("source.cli.migracion.main.Console") as mock_console,
+    ):
+        migracion(mock_args)
+
+    mock_adaptador.estadisticas_tablas.assert_called_once()
+    mock_adaptador.ejecutar_script.assert_not_called()
+    # una estimacion no crea la tabla del historial
+    mock_adaptador.asegurar_historial.assert_not_called()
+    mock_adaptador.cerrar_conexion.assert_called_once()
+    llamadas = mock_console.return_value.print.call_args_list
+    assert any("supera el limite" in str(call) for call in llamadas)
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def _migrar_con_adaptador(
+    mock_args,
+    esquemas,
+    mock_loader,
+    mock_adaptador,
+    mock_generador_migracion,
+    ruta_proyecto,
+):
+    """Ejecutar la migracion con el adaptador y el generador simulados \
+        y devolver la consola y la escritura de archivos simuladas."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    with (
+        patch(
+            "source.cli.migracion.main.Path.cwd",
+            return_value=ruta_proyecto,
+        ),
+        patch("source.cli.migracion.main.Path.exists", return_value=True),
+        patch(
+            "source.cli.migracion.main.GestorArchivo.leer_archivo",
+            side_effect=esquemas,
+        ),
+        patch(
+            "source.cli.migracion.main.GestorArchivo.escribir_archivo"
+        ) as mock_escribir,
+        patch("source.cli.migracion.main.GestorArchivo.asegurar_dir_existe"),
+        patch(
+            "source.cli.migracion.main.ConfiguracionJsonLoader",
+            return_value=mock_loader,
+        ),
+        patch(
+            "source.cli.migracion.main.AdaptadorMySQL",
+            return_value=mock_adaptador,
+        ),
+        patch(
+            "source.cli.migracion.main.GeneratorDBMigration",
+            return_value=mock_generador_migracion,
+        ),
+        patch("source.cli.migracion.main.Console") as mock_console,
+    ):
+        migracion(mock_args)
+    return mock_console, mock_escribir
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def test_migracion_registra_historial(
+    mock_args,
+    esquema_anterior,
+    esquema_nuevo,
+    mock_loader,
+    mock_adaptador,
+    mock_generador_migracion,
+    ruta_proyecto,
+):
+    """Prueba que la migracion queda pendiente y despues aplicada en \
+        el historial de la base de datos."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    estados = []
+    mock_adaptador.registrar_migracion.side_effect = lambda registro: (
+        estados.append(registro.estado)
+    )
+
+    _migrar_con_adaptador(
+        mock_args,
+        [esquema_anterior, esquema_nuevo],
+        mock_loader,
+        mock_adaptador,
+        mock_generador_migracion,
+        ruta_proyecto,
+    )
+
+    mock_adaptador.asegurar_historial.assert_called_once()
+    mock_adaptador.estado_historial.assert_called_once()
+    assert estados == [EstadoMigracion.PENDIENTE, EstadoMigracion.APLICADA]
+    registro = mock_adaptador.registrar_migracion.call_args.args[0]
+    assert registro.id_migracion == "migration_20241217_143022_abcd1234"
+    assert registro.duracion is not None
+    # sin --online un ALTER rechazado puede copiar la tabla
+    assert mock_adaptador.permitir_copia
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def test_migracion_esquema_ya_aplicado_no_se_ejecuta(
+    mock_args,
+    esquema_anterior,
+    esquema_nuevo,
+    mock_loader,
+    mock_adaptador,
+    mock_generador_migracion,
+    ruta_proyecto,
+):
+    """Prueba que no se aplica un esquema que el historial marca como \
+        aplicado."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    aplicado = ResumenHistorial(esquema_aplicado=True)
+    mock_adaptador.estado_historial.return_value = aplicado
+
+    mock_console, mock_escribir = _migrar_con_adaptador(
+        mock_args,
+        [esquema_anterior, esquema_nuevo],
+        mock_loader,
+        mock_adaptador,
+        mock_generador_migracion,
+        ruta_proyecto,
+    )
+
+    # el historial se consulta antes de generar y sin crear su tabla
+    mock_generador_migracion.generar_migracion.assert_not_called()
+    mock_adaptador.asegurar_historial.assert_not_called()
+    mock_adaptador.ejecutar_script.assert_not_called()
+    mock_adaptador.registrar_migracion.assert_not_called()
+    mock_adaptador.cerrar_conexion.assert_called_once()
+    # sin nada aplicado no se tocan el backup ni los archivos generados
+    mock_escribir.assert_not_called()
+    llamadas = mock_console.return_value.print.call_args_list
+    assert any("ya tiene aplicado" in str(call) for call in llamadas)
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def test_migracion_exitosa_supera_las_filas_sin_terminar(
+    mock_args,
+    esquema_anterior,
+    esquema_nuevo,
+    mock_loader,
+    mock_adaptador,
+    mock_generador_migracion,
+    ruta_proyecto,
+):
+    """Prueba que reintentar el mismo SQL reutiliza su fila aunque la \
+        cabecera tenga otra fecha, y que al terminar las demas filas sin \
+        terminar quedan superadas."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    sql = mock_generador_migracion.generar_migracion.return_value.sql_generado
+    fallida = RegistroMigracion(
+        "migration_1",
+        "h1",
+        checksum_sql(f"-- Date: 2024-01-01T00:00:00\n{sql}"),
+        EstadoMigracion.FALLIDA,
+    )
+    pendiente = RegistroMigracion(
+        "migration_2",
+        "h2",
+        "c2",
+        EstadoMigracion.PENDIENTE,
+    )
+    mock_adaptador.estado_historial.return_value = ResumenHistorial(
+        sin_terminar=[fallida, pendiente],
+    )
+    registros = []
+    mock_adaptador.registrar_migracion.side_effect = lambda registro: (
+        registros.append((registro.id_migracion, registro.estado))
+    )
+
+    _migrar_con_adaptador(
+        mock_args,
+        [esquema_anterior, esquema_nuevo],
+        mock_loader,
+        mock_adaptador,
+        mock_generador_migracion,
+        ruta_proyecto,
+    )
+
+    assert registros == [
+        ("migration_1", EstadoMigracion.PENDIENTE),
+        ("migration_1", EstadoMigracion.APLICADA),
+        ("migration_2", EstadoMigracion.SUPERADA),
+    ]
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def test_reintento_continua_tras_las_sentencias_aplicadas(
+    mock_args,
+    esquema_anterior,
+    esquema_nuevo,
+    mock_loader,
+    mock_adaptador,
+    mock_generador_migracion,
+    ruta_proyecto,
+):
+    """Prueba que reintentar una migracion fallida empieza en la primera \
+        sentencia que no se aplico y guarda el avance en su fila."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    sql = mock_generador_migracion.generar_migracion.return_value.sql_generado
+    fallida = RegistroMigracion(
+        "migration_1",
+        "h1",
+        checksum_sql(sql),
+        EstadoMigracion.FALLIDA,
+        sentencias_aplicadas=2,
+    )
+    mock_adaptador.estado_historial.return_value = ResumenHistorial(
+        sin_terminar=[fallida],
+    )
+    avances = []
+    mock_adaptador.registrar_migracion.side_effect = lambda registro: (
+        avances.append(registro.sentencias_aplicadas)
+    )
+
+    def ejecutar_script(_sql, desde, al_avanzar):
+        al_avanzar(desde + 1)
+        return []
+
+    mock_adaptador.ejecutar_script.side_effect = ejecutar_script
+
+    _migrar_con_adaptador(
+        mock_args,
+        [esquema_anterior, esquema_nuevo],
+        mock_loader,
+        mock_adaptador,
+        mock_generador_migracion,
+        ruta_proyecto,
+    )
+
+    llamada = mock_adaptador.ejecutar_script.call_args
+    assert llamada.kwargs["desde"] == 2
+    # pendiente, avance y aplicada
+    assert avances == [2, 3, 3]
+    # el progreso de los rellenos es el de esta migracion
+    assert mock_adaptador.relleno.progreso.ambito == "migration_1"
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def test_migracion_fallida_queda_en_historial(
+    mock_args,
+    esquema_anterior,
+    esquema_nuevo,
+    mock_loader,
+    mock_adaptador,
+    mock_generador_migracion,
+    ruta_proyecto,
+):
+    """Prueba que una migracion que falla queda marcada como fallida."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    estados = []
+    mock_adaptador.registrar_migracion.side_effect = lambda registro: (
+        estados.append(registro.estado)
+    )
+    mock_adaptador.ejecutar_script.side_effect = SQLExecutionError("fallo")
+
+    mock_console, mock_escribir = _migrar_con_adaptador(
+        mock_args,
+        [esquema_anterior, esquema_nuevo],
+        mock_loader,
+        mock_adaptador,
+        mock_generador_migracion,
+        ruta_proyecto,
+    )
+
+    assert estados == [EstadoMigracion.PENDIENTE, EstadoMigracion.FALLIDA]
+    llamadas = mock_console.return_value.print.call_args_list
+    assert any("error inesperado" in str(c).lower() for c in llamadas)
     # pylint: enable=too-many-arguments,too-many-positional-arguments
 
 
@@ -406,6 +752,7 @@ def test_migracion_manejo_graphqlstore_error(
     esquema_anterior,
     esquema_nuevo,
     mock_loader,
+    mock_adaptador,
     ruta_proyecto,
 ):
     """Prueba manejo de GraphQLStoreError durante migración."""
@@ -429,6 +776,10 @@ def test_migracion_manejo_graphqlstore_error(
             "source.cli.migracion.main.ConfiguracionJsonLoader",
             return_value=mock_loader,
         ),
+        patch(
+            "source.cli.migracion.main.AdaptadorMySQL",
+            return_value=mock_adaptador,
+        ),
         patch(
             "source.cli.migracion.main.GeneratorDBMigration",
             return_value=mock_generador_error,
@@ -449,6 +800,7 @@ def test_migracion_manejo_migration_error(
     esquema_anterior,
     esquema_nuevo,
     mock_loader,
+    mock_adaptador,
     ruta_proyecto,
 ):
     """Prueba manejo de MigrationError durante migración."""
@@ -472,6 +824,10 @@ def test_migracion_manejo_migration_error(
             "source.cli.migracion.main.ConfiguracionJsonLoader",
             return_value=mock_loader,
         ),
+        patch(
+            "source.cli.migracion.main.AdaptadorMySQL",
+            return_value=mock_adaptador,
+        ),
         patch(
             "source.cli.migracion.main.GeneratorDBMigration",
             return_value=mock_generador_error,
@@ -495,7 +851,7 @@ def test_migracion_flujo_completo_integracion(
     mock_loader,
     mock_adaptador,
     mock_generador_migracion,
-    mock_generador_esquema,
+    mock_pipeline_esquema,
     ruta_proyecto,
 ):
     """Prueba de integración del flujo completo de migración."""
@@ -525,8 +881,8 @@ def test_migracion_flujo_completo_integracion(
             return_value=mock_generador_migracion,
         ),
         patch(
-            "source.cli.migracion.main.transform_schema_graphql",
-            mock_generador_esquema,
+            "source.cli.migracion.main.PipelineEsquema",
+            mock_pipeline_esquema,
         ),
         patch("source.cli.migracion.main.Console") as mock_console,
     ):
@@ -549,14 +905,14 @@ def test_migracion_flujo_completo_integracion(
         # conexion a BD establecida
         mock_adaptador.conectar.assert_called_once()
 
-        # tablas verificadas
-        mock_adaptador.ejecutar_consulta.assert_called()
+        # migracion ejecutada
+        mock_adaptador.ejecutar_script.assert_called_once()
 
         # archivos escritos
         assert GestorArchivo.escribir_archivo.call_count == 3
 
         # esquema cliente actualizado
-        mock_generador_esquema.assert_called_once()
+        mock_pipeline_esquema.assert_called_once()
 
         # mostrar mensajes de exito
         mock_consola_instancia = mock_console.return_value
@@ -601,10 +957,7 @@ def test_migracion_validacion_parametros_entrada(
             "source.cli.migracion.main.GeneratorDBMigration",
             return_value=mock_generador_migracion,
         ),
-        patch(
-            "source.cli.migracion.main.transform_schema_graphql",
-            return_value="",
-        ),
+        patch("source.cli.migracion.main.PipelineEsquema"),
         patch("source.cli.migracion.main.Console"),
     ):
         migracion(mock_args)
@@ -663,3 +1016,59 @@ def test_mig_multi_archivos_gql_sin_esquema_especificado(
             "esquema específico usando el parámetro --esquema.",
             style="bold red",
         )
+
+
+@pytest.mark.parametrize("exitoso", [True, False])
+def test_migracion_con_destinos(
+    mock_args,
+    esquema_anterior,
+    esquema_nuevo,
+    mock_loader,
+    mock_generador_migracion,
+    mock_pipeline_esquema,
+    exitoso,
+):
+    """Prueba que con --destinos la migracion se aplica en todos los \
+        destinos y el backup solo se actualiza si todos terminan."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    mock_args.destinos = "destinos.json"
+    with (
+        patch("source.cli.migracion.main.Path.exists", return_value=True),
+        patch(
+            "source.cli.migracion.main.GestorArchivo.leer_archivo",
+            side_effect=[esquema_anterior, esquema_nuevo],
+        ),
+        patch(
+            "source.cli.migracion.main.GestorArchivo.escribir_archivo",
+        ) as mock_escribir,
+        patch("source.cli.migracion.main.GestorArchivo.asegurar_dir_existe"),
+        patch(
+            "source.cli.migracion.main.ConfiguracionJsonLoader",
+            return_value=mock_loader,
+        ),
+        patch("source.cli.migracion.main.AdaptadorMySQL") as mock_clase,
+        patch(
+            "source.cli.migracion.main.GeneratorDBMigration",
+            return_value=mock_generador_migracion,
+        ),
+        patch(
+            "source.cli.migracion.main.PipelineEsquema",
+            mock_pipeline_esquema,
+        ),
+        patch(
+            "source.cli.migracion.main.migrar_destinos",
+            return_value=exitoso,
+        ) as mock_destinos,
+        patch("source.cli.migracion.main.Console"),
+    ):
+        migracion(mock_args)
+
+    migra = mock_generador_migracion.generar_migracion.return_value
+    args_destinos = mock_destinos.call_args.args
+    assert args_destinos[0] is mock_args
+    assert args_destinos[2] is migra
+    # cada destino guarda en su historial la huella del esquema nuevo
+    assert args_destinos[4] == hash_esquema(esquema_nuevo)
+    mock_clase.assert_not_called()
+    assert mock_escribir.called == exitoso
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
@@ -0,0 +1,42 @@
+"""Pruebas para la carga perezosa de los comandos de la CLI"""
+
+import subprocess
+import sys
+
+import pytest
+
+import source.cli.inicializar as paquete_inicializar
+
+
+def test_importar_cli_no_carga_dependencias_pesadas():
+    """Prueba que importar la CLI no importa graphql-core, los \
+        conectores de base de datos, rich ni los generadores."""
+    codigo = (
+        "import sys, source.cli.main\n"
+        "pesados = ('graphql', 'mysql.connector', 'psycopg2', 'rich', "
+        "'source.cli.generators', 'source.cli.inicializar.main')\n"
+        "print(','.join(m for m in pesados if m in sys.modules))\n"
+    )
+    resultado = subprocess.run(
+        [sys.executable, "-c", codigo],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert resultado.stdout.strip() == ""
+
+
+def test_exportacion_perezosa_resuelve_nombre():
+    """Prueba que el paquete reexporta los nombres al accederlos."""
+    # pylint: disable-next=import-outside-toplevel
+    from source.cli.inicializar.main import inicializar
+
+    assert paquete_inicializar.inicializar is inicializar
+    assert "ComandoInicializar" in dir(paquete_inicializar)
+
+
+def test_exportacion_perezosa_nombre_desconocido():
+    """Prueba que un nombre no exportado lanza AttributeError."""
+    with pytest.raises(AttributeError):
+        _ = paquete_inicializar.no_existe
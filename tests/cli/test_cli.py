@@ -6,6 +6,15 @@ from source.cli.conexion.comando_conexion import ComandoConexion
 from source.cli.main import CLI
 
 
+def crear_args():
+    """Crear argumentos simulados sin las opciones de perfil activas."""
+    args = MagicMock()
+    args.perfil = False
+    args.perfil_json = None
+    args.perfil_cprofile = None
+    return args
+
+
 @pytest.fixture(name="inst_cli")
 def fixture_instancia_cli():
     """Fixture para proporcionar una instancia de CLI."""
@@ -24,7 +33,7 @@ def fixture_instancia_cli_titulo():
 def fixture_mock_args():
     """Fixture para proporcionar argumnetos simulados.
     para el comando conexion."""
-    args = MagicMock()
+    args = crear_args()
     args.comando = "conexion"
     return args
 
@@ -33,7 +42,7 @@ def fixture_mock_args():
 def fixture_mock_args_probar_conexion():
     """Fixture para proporcionar argumentos simulados \
     para el comando probar_conexion."""
-    args = MagicMock()
+    args = crear_args()
     args.comando = "probar_conexion"
     return args
 
@@ -42,7 +51,7 @@ def fixture_mock_args_probar_conexion():
 def fixture_mock_args_params():
     """Fixture para proporcionar argumentos simulados \
     con parámetros específicos."""
-    args = MagicMock()
+    args = crear_args()
     args.comando = "conexion"
     args.archivo = "./home/user/file.json"
     args.host = "localhost"
@@ -57,7 +66,7 @@ def fixture_mock_args_params():
 def fixture_mock_args_params_probar_conexion():
     """Fixture para proporcionar argumentos simulados \
     con parámetros específicos para probar_conexion."""
-    args = MagicMock()
+    args = crear_args()
     args.comando = "probar_conexion"
     args.verbose = True
     return args
@@ -67,7 +76,7 @@ def fixture_mock_args_params_probar_conexion():
 def fixture_mock_args_params_inicializar():
     """Fixture para proporcionar argumentos simulados \
     con parámetros específicos para inicializar."""
-    args = MagicMock()
+    args = crear_args()
     args.comando = "inicializar"
     args.esquema = "./home/user/schema.graphql"
     args.salida = "generated"
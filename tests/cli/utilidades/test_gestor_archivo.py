@@ -68,3 +68,21 @@ def test_asegurar_dir_existe_ya_existe():
         # debe seguir existiendo
         assert directorio_existente.exists()
         assert directorio_existente.is_dir()
+
+
+def test_escribir_sentencias_en_flujo():
+    """Prueba de escritura de sentencias a medida que se generan"""
+    with tempfile.TemporaryDirectory() as dir_temp:
+        archivo_test = Path(dir_temp) / "schema.sql"
+
+        escritas = GestorArchivo.escribir_sentencias(
+            (f"CREATE TABLE t{i} (id INT);" for i in range(3)),
+            archivo_test,
+        )
+
+        assert escritas == 3
+        assert GestorArchivo.leer_archivo(archivo_test) == (
+            "CREATE TABLE t0 (id INT);\n\n"
+            "CREATE TABLE t1 (id INT);\n\n"
+            "CREATE TABLE t2 (id INT);"
+        )
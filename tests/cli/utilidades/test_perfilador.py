@@ -0,0 +1,134 @@
+"""Pruebas para Perfilador"""
+
+import json
+import pstats
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from source.cli.main import CLI
+from source.cli.utilidades.perfilador import (
+    TIPO_FASE,
+    TIPO_SENTENCIA,
+    Perfilador,
+    activar_perfilador,
+    desactivar_perfilador,
+    medir_fase,
+    obtener_perfilador,
+)
+
+
+@pytest.fixture(name="perfilador")
+def fixture_perfilador():
+    """Fixture que proporciona un perfilador activo."""
+    return Perfilador(activo=True)
+
+
+def test_perfilador_inactivo_no_registra():
+    """Prueba que un perfilador inactivo no guarda registros."""
+    perfilador = Perfilador()
+
+    with perfilador.fase("parseo"):
+        pass
+    with perfilador.sentencia("SELECT 1;"):
+        pass
+
+    assert not perfilador.registros
+
+
+def test_registrar_fases_y_sentencias(perfilador):
+    """Prueba que se registran fases y sentencias con sus tiempos."""
+    with perfilador.fase("ejecucion"):
+        with perfilador.sentencia("CREATE TABLE\n  `User` (id INT);"):
+            pass
+
+    sentencia, fase = perfilador.registros
+    assert sentencia.tipo == TIPO_SENTENCIA
+    assert sentencia.nombre == "CREATE TABLE `User` (id INT);"
+    assert fase.tipo == TIPO_FASE
+    assert fase.tiempo_real >= sentencia.tiempo_real >= 0
+
+    resumen = perfilador.resumen()
+    assert resumen["ejecucion"]["llamadas"] == 1
+    assert resumen["sentencias"]["llamadas"] == 1
+
+
+def test_registrar_error(perfilador):
+    """Prueba que una fase que falla se registra con su error."""
+    with pytest.raises(ValueError):
+        with perfilador.fase("parseo"):
+            raise ValueError("fallo")
+
+    assert perfilador.registros[0].error == "ValueError"
+
+
+def test_medir_fase_usa_perfilador_activo():
+    """Prueba que el decorador mide en el perfilador activo."""
+
+    @medir_fase("generacion_sql")
+    def generar():
+        return "SQL"
+
+    perfilador = activar_perfilador()
+    try:
+        assert generar() == "SQL"
+    finally:
+        desactivar_perfilador()
+
+    assert [r.nombre for r in perfilador.registros] == ["generacion_sql"]
+    assert not obtener_perfilador().activo
+
+
+def test_exportar_json(perfilador, tmp_path):
+    """Prueba que la traza se exporta en formato Trace Event."""
+    with perfilador.fase("parseo"):
+        pass
+    ruta = tmp_path / "perfil" / "traza.json"
+
+    perfilador.exportar_json(ruta)
+
+    traza = json.loads(ruta.read_text(encoding="utf-8"))
+    evento = traza["traceEvents"][0]
+    assert evento["name"] == "parseo"
+    assert evento["ph"] == "X"
+    assert "parseo" in traza["otherData"]["resumen"]
+
+
+def test_mostrar_resumen(perfilador):
+    """Prueba que el resumen muestra fases y sentencias lentas."""
+    with perfilador.sentencia("SELECT 1;"):
+        pass
+    consola = MagicMock()
+
+    perfilador.mostrar_resumen(consola)
+
+    assert consola.print.call_count == 2
+
+
+def test_cli_con_perfil(tmp_path):
+    """Prueba que la CLI ejecuta el comando perfilado y guarda la \
+        traza JSON y las estadisticas de cProfile."""
+    cli = CLI()
+    args = MagicMock()
+    args.comando = "inicializar"
+    args.perfil = True
+    args.perfil_json = str(tmp_path / "traza.json")
+    args.perfil_cprofile = str(tmp_path / "perfil.pstats")
+
+    def contenido(_args):
+        with obtener_perfilador().fase("parseo"):
+            sum(range(1000))
+
+    with patch.object(cli.constructor, "parsear", return_value=args):
+        with patch.object(
+            cli.comando_inicializar,
+            "contenido_comando",
+            side_effect=contenido,
+        ):
+            with patch("rich.console.Console"):
+                cli.ejecutar()
+
+    traza = json.loads((tmp_path / "traza.json").read_text(encoding="utf-8"))
+    assert traza["traceEvents"][0]["name"] == "parseo"
+    assert pstats.Stats(args.perfil_cprofile).total_calls > 0
+    assert not obtener_perfilador().activo